@@ -0,0 +1,425 @@
+# apps/common/attachments.py
+"""
+Shared attachment pipeline (reimbursement receipts / bank documents, vendor
+bills).
+
+Reimbursement uploads used to be stored exactly as uploaded, and vendor
+uploads were resized / recompressed with Pillow and pikepdf inside the upload
+request. The same bill uploaded several times was stored several times.
+
+Storing (in the request)
+------------------------
+register_attachment_fields(Model, "field", ...) hooks pre_save for those
+FileFields. A fresh upload is hashed (SHA-256, streamed in chunks) and
+stored once at
+
+    attachments/<hash[:2]>/<hash><ext>
+
+The key has a fixed length (about 85 characters), well inside the
+FileField max_length of 100, and store_attachment checks the field's
+max_length before writing. The uploaded file name is kept per row in
+<field>_name (see attachment_display_name), so rows sharing a file still
+download under their own names.
+
+If a file with that hash is already stored, the row simply points at it and
+nothing is written. Identical files are therefore shared across
+ExpenseItem, ReimbursementLine and the vendor models. Because files are
+shared, nothing may delete a stored attachment on behalf of a single row;
+a blob left behind by a failed save is reused by the next identical upload.
+
+Variants (on a worker)
+----------------------
+After commit, process_attachment (Celery) writes:
+
+    attachments/<hash[:2]>/variants/<hash>-compressed<ext>
+        images <= 1920px at q75, PDFs recompressed; kept only when smaller
+        than the original
+    attachments/<hash[:2]>/variants/<hash>-thumb.jpg
+        images only
+
+variant_name(name, kind) returns the stored variant, or None.
+attachment_response(request, field_file) is the download view body: it
+serves the compressed variant when there is one (the original otherwise)
+under the row's display name. Files stored before this
+pipeline (outside attachments/) keep working unchanged and have no variants.
+
+Pillow and pikepdf are optional; without them no variants are produced.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from celery import shared_task
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.http import FileResponse, Http404
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_PREFIX = str(getattr(settings, "ATTACHMENT_STORAGE_PREFIX", "attachments")).strip("/")
+
+IMAGE_MAX_DIM = int(getattr(settings, "ATTACHMENT_IMAGE_MAX_DIM", 1920))
+IMAGE_QUALITY = int(getattr(settings, "ATTACHMENT_IMAGE_QUALITY", 75))
+THUMBNAIL_SIZE = int(getattr(settings, "ATTACHMENT_THUMBNAIL_SIZE", 320))
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+PDF_EXTENSION = ".pdf"
+
+VARIANTS_DIR = "variants"
+
+_STORED_NAME_RE = re.compile(
+    rf"^{re.escape(ATTACHMENT_PREFIX)}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.[a-z0-9]+)?$"
+)
+
+__all__ = [
+    "content_hash",
+    "store_attachment",
+    "is_stored_attachment",
+    "attachment_display_name",
+    "variant_name",
+    "attachment_response",
+    "compress_image",
+    "compress_pdf",
+    "process_attachment_variants",
+    "process_attachment",
+    "register_attachment_fields",
+]
+
+
+# =============================================================================
+# Content-addressed storage
+# =============================================================================
+def content_hash(fileobj) -> str:
+    """SHA-256 hex digest of an uploaded / stored file, read in chunks."""
+    digest = hashlib.sha256()
+
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+
+    if hasattr(fileobj, "chunks"):
+        for chunk in fileobj.chunks():
+            digest.update(chunk)
+    else:
+        for chunk in iter(lambda: fileobj.read(64 * 1024), b""):
+            digest.update(chunk)
+
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+
+    return digest.hexdigest()
+
+
+def _stored_name(digest: str, ext: str) -> str:
+    return f"{ATTACHMENT_PREFIX}/{digest[:2]}/{digest}{ext}"
+
+
+def _extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if re.fullmatch(r"\.[a-z0-9]{1,10}", ext) else ""
+
+
+def store_attachment(fileobj, *, storage=None, max_length: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Store `fileobj` under its content hash.
+
+    Returns (stored name, created). created is False when an identical file
+    was already stored and no write happened. Raises ValidationError, before
+    anything is written, when the name would not fit in max_length.
+    """
+    storage = storage or default_storage
+    digest = content_hash(fileobj)
+    name = _stored_name(digest, _extension(getattr(fileobj, "name", "")))
+
+    if max_length and len(name) > max_length:
+        name = _stored_name(digest, "")
+        if len(name) > max_length:
+            raise ValidationError(
+                f"Attachment name needs {len(name)} characters; the field allows {max_length}."
+            )
+
+    if storage.exists(name):
+        return name, False
+
+    saved = storage.save(name, fileobj)
+
+    if saved != name:
+        # Lost a race with an identical upload: keep the first copy.
+        storage.delete(saved)
+        return name, False
+
+    return saved, True
+
+
+def is_stored_attachment(name: str) -> bool:
+    return bool(name) and bool(_STORED_NAME_RE.match(name))
+
+
+def display_name_field(field_name: str) -> str:
+    return f"{field_name}_name"
+
+
+def attachment_display_name(instance, field_name: str) -> str:
+    """File name `instance.<field_name>` was uploaded as."""
+    display = getattr(instance, display_name_field(field_name), "") or ""
+    if display:
+        return display
+
+    field_file = getattr(instance, field_name, None)
+    return os.path.basename(getattr(field_file, "name", "") or "")
+
+
+def _variant_path(name: str, kind: str) -> str:
+    shard_dir, basename = os.path.split(name)
+    digest, ext = os.path.splitext(basename)
+
+    if kind == "thumb":
+        return f"{shard_dir}/{VARIANTS_DIR}/{digest}-thumb.jpg"
+
+    return f"{shard_dir}/{VARIANTS_DIR}/{digest}-compressed{ext}"
+
+
+def variant_name(name: str, kind: str = "compressed", *, storage=None) -> Optional[str]:
+    """Stored `kind` variant ("compressed" / "thumb") of `name`, or None."""
+    if not is_stored_attachment(name):
+        return None
+
+    storage = storage or default_storage
+    path = _variant_path(name, kind)
+
+    try:
+        return path if storage.exists(path) else None
+    except Exception:
+        logger.exception("Attachment variant lookup failed for %s", path)
+        return None
+
+
+def attachment_response(request, field_file, missing_message: str = "File not found.") -> FileResponse:
+    """
+    Stream a stored attachment inline under its display name.
+
+    ?variant=thumb serves the thumbnail, ?variant=original the file as
+    uploaded; by default the compressed variant is served when one exists.
+    """
+    storage = field_file.storage
+    name = field_file.name
+
+    if not name or not storage.exists(name):
+        raise Http404(missing_message)
+
+    filename = attachment_display_name(field_file.instance, field_file.field.name) or os.path.basename(name)
+    requested = (request.GET.get("variant") or "").strip().lower()
+
+    if requested != "original":
+        kind = "thumb" if requested == "thumb" else "compressed"
+        variant = variant_name(name, kind, storage=storage)
+
+        if variant:
+            name = variant
+            if kind == "thumb":
+                filename = f"{os.path.splitext(filename)[0]}.jpg"
+
+    return FileResponse(
+        storage.open(name, "rb"),
+        as_attachment=False,
+        filename=filename,
+    )
+
+
+# =============================================================================
+# Compression (optional Pillow / pikepdf)
+# =============================================================================
+def compress_image(fileobj, ext: str) -> Optional[bytes]:
+    """Image resized to IMAGE_MAX_DIM and re-encoded, or None."""
+    try:
+        from PIL import Image
+
+        fileobj.seek(0)
+        img = Image.open(fileobj)
+        if img.mode in ("RGBA", "P", "LA"):
+            img = img.convert("RGB")
+        if max(img.size) > IMAGE_MAX_DIM:
+            img.thumbnail((IMAGE_MAX_DIM, IMAGE_MAX_DIM), Image.LANCZOS)
+        output = io.BytesIO()
+        fmt = "JPEG" if ext in (".jpg", ".jpeg") else ext.lstrip(".").upper()
+        img.save(output, format=fmt, quality=IMAGE_QUALITY, optimize=True)
+        return output.getvalue()
+    except Exception:
+        logger.debug("Image compression skipped", exc_info=True)
+        return None
+
+
+def compress_pdf(fileobj) -> Optional[bytes]:
+    """PDF with recompressed streams, or None."""
+    try:
+        import pikepdf
+
+        fileobj.seek(0)
+        with pikepdf.open(fileobj) as pdf:
+            output = io.BytesIO()
+            pdf.save(output, compress_streams=True, recompress_flate=True)
+        return output.getvalue()
+    except Exception:
+        logger.debug("PDF compression skipped", exc_info=True)
+        return None
+
+
+def _thumbnail(fileobj) -> Optional[bytes]:
+    try:
+        from PIL import Image
+
+        fileobj.seek(0)
+        img = Image.open(fileobj)
+        img = img.convert("RGB")
+        img.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS)
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=70, optimize=True)
+        return output.getvalue()
+    except Exception:
+        logger.debug("Thumbnail skipped", exc_info=True)
+        return None
+
+
+# =============================================================================
+# Variant processing (worker)
+# =============================================================================
+def process_attachment_variants(name: str, *, storage=None) -> Dict[str, str]:
+    """
+    Write missing variants for a stored attachment. Idempotent: existing
+    variants are kept. Returns {kind: outcome}.
+    """
+    storage = storage or default_storage
+    result: Dict[str, str] = {}
+
+    if not is_stored_attachment(name) or not storage.exists(name):
+        return {"original": "missing"}
+
+    ext = os.path.splitext(name)[1].lower()
+    if ext not in IMAGE_EXTENSIONS and ext != PDF_EXTENSION:
+        return {"original": "unsupported"}
+
+    with storage.open(name, "rb") as fh:
+        data = io.BytesIO(fh.read())
+
+    original_size = len(data.getvalue())
+
+    compressed_path = _variant_path(name, "compressed")
+    if storage.exists(compressed_path):
+        result["compressed"] = "exists"
+    else:
+        compressed = compress_pdf(data) if ext == PDF_EXTENSION else compress_image(data, ext)
+        if compressed and len(compressed) < original_size:
+            storage.save(compressed_path, ContentFile(compressed))
+            result["compressed"] = f"{original_size}->{len(compressed)}"
+        else:
+            result["compressed"] = "not_smaller"
+
+    if ext in IMAGE_EXTENSIONS:
+        thumb_path = _variant_path(name, "thumb")
+        if storage.exists(thumb_path):
+            result["thumb"] = "exists"
+        else:
+            thumb = _thumbnail(data)
+            if thumb:
+                storage.save(thumb_path, ContentFile(thumb))
+                result["thumb"] = "created"
+            else:
+                result["thumb"] = "failed"
+
+    return result
+
+
+@shared_task(
+    bind=True,
+    name="common.process_attachment",
+    max_retries=3,
+    default_retry_delay=60,
+)
+def process_attachment(self, name: str) -> dict:
+    try:
+        return process_attachment_variants(name)
+    except Exception as exc:
+        logger.exception("Attachment processing failed for %s", name)
+        raise self.retry(exc=exc)
+
+
+def _queue_processing(name: str) -> None:
+    def _send():
+        try:
+            process_attachment.delay(name)
+        except Exception:
+            # Variants are optional: downloads fall back to the original.
+            logger.exception("Could not queue attachment processing for %s", name)
+
+    transaction.on_commit(_send)
+
+
+# =============================================================================
+# Model hook
+# =============================================================================
+_REGISTERED_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _store_uploads(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+
+    for field_name in _REGISTERED_FIELDS.get(sender, ()):
+        if update_fields is not None and field_name not in update_fields:
+            continue
+
+        field_file = getattr(instance, field_name, None)
+
+        # Only fresh uploads; already stored files (and copies of another
+        # row's file) are committed.
+        if not field_file or getattr(field_file, "_committed", True):
+            continue
+
+        field = instance._meta.get_field(field_name)
+        display = os.path.basename(getattr(field_file, "name", "") or "")
+        name, created = store_attachment(field_file.file, storage=field.storage, max_length=field.max_length)
+        setattr(instance, field_name, name)
+
+        name_field = display_name_field(field_name)
+        max_display = instance._meta.get_field(name_field).max_length
+        setattr(instance, name_field, display[-max_display:] if max_display else display)
+
+        if update_fields is not None and name_field not in update_fields:
+            # save(update_fields=[field]) would drop the display name.
+            instance.__dict__.setdefault("_attachment_pending_names", {})[name_field] = getattr(instance, name_field)
+
+        if created:
+            _queue_processing(name)
+
+
+def _store_display_names(sender, instance, raw=False, **kwargs):
+    pending = instance.__dict__.pop("_attachment_pending_names", None)
+    if pending and not raw:
+        sender._default_manager.filter(pk=instance.pk).update(**pending)
+
+
+def register_attachment_fields(model, *field_names: str) -> None:
+    """
+    Route uploads to model.<field_names> through the attachment pipeline.
+    Each field needs a <field>_name CharField for the uploaded file name.
+    """
+    _REGISTERED_FIELDS[model] = tuple(dict.fromkeys(_REGISTERED_FIELDS.get(model, ()) + field_names))
+    pre_save.connect(
+        _store_uploads,
+        sender=model,
+        dispatch_uid=f"attachments_{model._meta.label_lower}",
+    )
+    post_save.connect(
+        _store_display_names,
+        sender=model,
+        dispatch_uid=f"attachment_names_{model._meta.label_lower}",
+    )
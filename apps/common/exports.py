@@ -0,0 +1,236 @@
+# apps/common/exports.py
+"""
+Shared streaming export facility (CSV / XLSX).
+
+List and report exports used to write every row into an in-memory
+HttpResponse, often iterating full model instances with per-row reverse()
+and build_absolute_uri() calls. On the full reimbursement history that held
+a worker for the whole build and kept the entire file in memory.
+
+Building rows
+-------------
+keyset_rows(qs, fields, order_by=...)
+    Yield dicts from qs.values(*fields), fetched in EXPORT_CHUNK_SIZE pages
+    using keyset pagination on the ordering columns (no OFFSET, no server-side
+    cursor, constant memory). The last ordering column must be unique
+    (normally "id") and ordering columns must not be NULL.
+
+url_template(request, viewname)
+    Absolute URL for a view taking one integer argument, as a "{}" format
+    string: reverse() / build_absolute_uri() run once per export instead of
+    once per row.
+
+Writing responses
+-----------------
+csv_response(filename, header, rows)
+    StreamingHttpResponse that encodes rows as they are produced.
+
+xlsx_response(filename, header, rows, sheet_title=..., column_widths=...)
+    openpyxl write-only workbook (rows are not kept in memory) built into a
+    spooled temp file, then streamed in chunks. An .xlsx is a zip, so it can
+    only be sent once complete.
+
+export_response(request, basename, header, rows, ...)
+    Picks CSV or XLSX from ?format=csv|xlsx (default CSV).
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import tempfile
+from functools import reduce
+from operator import and_, or_
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = max(int(getattr(settings, "EXPORT_CHUNK_SIZE", 2000)), 1)
+
+# XLSX build buffer kept in memory up to this size, then spilled to disk.
+XLSX_SPOOL_BYTES = int(getattr(settings, "EXPORT_XLSX_SPOOL_BYTES", 8 * 1024 * 1024))
+
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Sentinel argument used to build URL templates.
+_URL_SENTINEL = 987654321
+
+__all__ = [
+    "CSV_CONTENT_TYPE",
+    "XLSX_CONTENT_TYPE",
+    "keyset_rows",
+    "url_template",
+    "csv_response",
+    "xlsx_response",
+    "export_response",
+    "requested_format",
+]
+
+
+# =============================================================================
+# Row sources
+# =============================================================================
+def _keyset_after(order_by: Sequence[str], last: Dict[str, Any]) -> Q:
+    """
+    Rows strictly after `last` in `order_by` (mixed directions allowed):
+    (a > x) | (a = x & b > y) | ...
+    """
+    branches = []
+
+    for index, column in enumerate(order_by):
+        descending = column.startswith("-")
+        name = column.lstrip("-")
+        equal = [Q(**{col.lstrip("-"): last[col.lstrip("-")]}) for col in order_by[:index]]
+        step = Q(**{f"{name}__{'lt' if descending else 'gt'}": last[name]})
+        branches.append(reduce(and_, equal + [step]))
+
+    return reduce(or_, branches)
+
+
+def keyset_rows(
+    qs,
+    fields: Sequence[str],
+    *,
+    order_by: Sequence[str] = ("id",),
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield qs.values(*fields) rows in `order_by` order, one keyset page at a
+    time. Ordering columns are added to the projection when missing.
+    """
+    order_by = list(order_by)
+    columns = list(dict.fromkeys([*fields, *(c.lstrip("-") for c in order_by)]))
+    base = qs.order_by(*order_by).values(*columns)
+    page_qs = base
+    last: Optional[Dict[str, Any]] = None
+
+    while True:
+        if last is not None:
+            page_qs = base.filter(_keyset_after(order_by, last))
+
+        page = list(page_qs[:chunk_size])
+        if not page:
+            return
+
+        yield from page
+
+        if len(page) < chunk_size:
+            return
+        last = page[-1]
+
+
+def url_template(request, viewname: str) -> str:
+    """
+    Absolute URL of `viewname` for one integer argument, with "{}" in place of
+    the argument: url_template(request, "app:detail").format(obj_id).
+    """
+    url = reverse(viewname, args=[_URL_SENTINEL])
+    if request is not None:
+        url = request.build_absolute_uri(url)
+    return url.replace("{", "{{").replace("}", "}}").replace(str(_URL_SENTINEL), "{}")
+
+
+# =============================================================================
+# Writers
+# =============================================================================
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _attachment(response, filename: str):
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def csv_response(filename: str, header: Sequence[Any], rows: Iterable[Sequence[Any]]) -> StreamingHttpResponse:
+    """Stream `header` + `rows` as CSV; rows may be a generator."""
+    writer = csv.writer(_Echo())
+
+    def _lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    return _attachment(
+        StreamingHttpResponse(_lines(), content_type=CSV_CONTENT_TYPE),
+        filename,
+    )
+
+
+def xlsx_response(
+    filename: str,
+    header: Sequence[Any],
+    rows: Iterable[Sequence[Any]],
+    *,
+    sheet_title: str = "Export",
+    column_widths: Optional[Sequence[float]] = None,
+) -> HttpResponse:
+    """Write rows to a write-only workbook and stream the finished file."""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+    except Exception:
+        logger.exception("openpyxl is not installed. Excel export failed.")
+        return HttpResponse(
+            "Excel export requires openpyxl to be installed.",
+            status=500,
+            content_type="text/plain",
+        )
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title[:31] or "Export")
+
+    for index, width in enumerate(column_widths or [], start=1):
+        if width:
+            ws.column_dimensions[get_column_letter(index)].width = width
+
+    ws.append(list(header))
+    for row in rows:
+        ws.append(list(row))
+
+    spool = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_BYTES)
+    wb.save(spool)
+    size = spool.seek(0, 2)
+    spool.seek(0)
+
+    response = StreamingHttpResponse(FileWrapper(spool, 64 * 1024), content_type=XLSX_CONTENT_TYPE)
+    response["Content-Length"] = str(size)
+    return _attachment(response, filename)
+
+
+def requested_format(request, default: str = "csv") -> str:
+    """"xlsx" for ?format=xlsx / excel, else "csv"."""
+    value = (request.GET.get("format") or default).strip().lower()
+    return "xlsx" if value in {"xlsx", "excel"} else "csv"
+
+
+def export_response(
+    request,
+    basename: str,
+    header: Sequence[Any],
+    rows: Iterable[Sequence[Any]],
+    *,
+    sheet_title: str = "Export",
+    column_widths: Optional[List[float]] = None,
+    default_format: str = "csv",
+):
+    """CSV or XLSX download of `rows`, chosen by ?format=."""
+    if requested_format(request, default_format) == "xlsx":
+        return xlsx_response(
+            f"{basename}.xlsx",
+            header,
+            rows,
+            sheet_title=sheet_title,
+            column_widths=column_widths,
+        )
+    return csv_response(f"{basename}.csv", header, rows)
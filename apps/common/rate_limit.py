@@ -0,0 +1,307 @@
+# apps/common/rate_limit.py
+"""
+Token-bucket rate limiter shared across processes.
+
+Google Sheets quotas are per project, but each gunicorn worker and Celery
+process used to keep its own per-minute budget in module globals, so
+together they overshot the quota and then stalled in retry sleeps.
+
+A bucket holds up to `capacity` tokens and refills at `per_minute / 60`
+tokens per second. State lives in Redis (one hash per bucket, updated by
+an atomic Lua script using the Redis server clock) when the default cache
+is django-redis; otherwise, or if Redis errors, an in-process bucket is
+used.
+
+Acquisition is a reservation: a caller that finds the bucket empty books
+the next free slot and is told how long to wait, so a burst of callers is
+spread out in arrival order instead of all retrying at once.
+
+Public API
+----------
+get_bucket(name, per_minute, capacity=None) -> TokenBucket
+TokenBucket.try_acquire(n=1) -> bool          non-blocking
+TokenBucket.reserve(n=1, max_wait=0) -> float  wait seconds, or -1 if refused
+TokenBucket.acquire(n=1, timeout=None) -> bool blocks up to timeout
+rate_limit_metrics() -> dict
+
+Google Sheets
+-------------
+The Sheets API quota is per Google Cloud project (reads and writes are
+counted separately), so every integration draws from the same two buckets:
+
+take_sheets_quota(kind, n=1)      kind is "read" or "write"; raises
+                                  RateLimited when no slot is free within
+                                  GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT seconds
+
+Background callers catch RateLimited and retry their Celery task with
+`countdown=exc.retry_after` instead of calling the API over quota.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit:bucket:"
+
+# Stand-in for "no timeout" (Lua has no portable infinity literal).
+_UNBOUNDED_WAIT = 1e9
+
+# KEYS[1] bucket hash; ARGV: capacity, rate (tokens/s), n, max_wait (s).
+# Returns the wait in seconds as a string, or "-1" when the reservation
+# would exceed max_wait (nothing is consumed in that case).
+_RESERVE_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local n = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < n then
+  wait = (n - tokens) / rate
+end
+if wait > max_wait then
+  return "-1"
+end
+
+tokens = tokens - n
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity / rate + math.min(max_wait, 3600)) * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+# =============================================================================
+# Metrics (per process)
+# =============================================================================
+@dataclass
+class BucketMetrics:
+    granted: int = 0
+    waited: int = 0
+    refused: int = 0
+    wait_seconds: float = 0.0
+    redis_errors: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "granted": self.granted,
+            "waited": self.waited,
+            "refused": self.refused,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "redis_errors": self.redis_errors,
+        }
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+class _LocalState:
+    def __init__(self, capacity: float):
+        self.lock = threading.Lock()
+        self.tokens = float(capacity)
+        self.ts = time.monotonic()
+
+
+def _redis_client():
+    """django-redis client for the default cache, or None."""
+    backend = (getattr(settings, "CACHES", {}).get("default") or {}).get("BACKEND", "")
+    if "django_redis" not in backend:
+        return None
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        logger.warning("Rate limiter: Redis unavailable, using in-process buckets", exc_info=True)
+        return None
+
+
+_redis_lock = threading.Lock()
+_redis_state: Dict[str, object] = {"client": None, "script": None, "resolved": False}
+
+
+def _redis_script():
+    with _redis_lock:
+        if not _redis_state["resolved"]:
+            client = _redis_client()
+            _redis_state["client"] = client
+            _redis_state["script"] = client.register_script(_RESERVE_LUA) if client else None
+            _redis_state["resolved"] = True
+        return _redis_state["script"]
+
+
+# =============================================================================
+# Bucket
+# =============================================================================
+class TokenBucket:
+    def __init__(self, name: str, per_minute: float, capacity: Optional[float] = None):
+        self.name = name
+        self.rate = max(float(per_minute), 1.0) / 60.0
+        self.capacity = float(capacity if capacity is not None else max(per_minute, 1))
+        self.metrics = BucketMetrics()
+        self._local = _LocalState(self.capacity)
+
+    # -- core -----------------------------------------------------------------
+    def _reserve_redis(self, n: float, max_wait: float) -> Optional[float]:
+        script = _redis_script()
+        if script is None:
+            return None
+        try:
+            raw = script(
+                keys=[f"{KEY_PREFIX}{self.name}"],
+                args=[self.capacity, self.rate, n, max_wait],
+            )
+            return float(raw.decode() if isinstance(raw, bytes) else raw)
+        except Exception:
+            self.metrics.redis_errors += 1
+            logger.warning("Rate limiter %s: Redis error, using local bucket", self.name, exc_info=True)
+            return None
+
+    def _reserve_local(self, n: float, max_wait: float) -> float:
+        state = self._local
+        with state.lock:
+            now = time.monotonic()
+            state.tokens = min(self.capacity, state.tokens + (now - state.ts) * self.rate)
+            state.ts = now
+
+            wait = 0.0 if state.tokens >= n else (n - state.tokens) / self.rate
+            if wait > max_wait:
+                return -1.0
+
+            state.tokens -= n
+            return wait
+
+    def reserve(self, n: float = 1, max_wait: float = 0.0) -> float:
+        """
+        Book n tokens. Returns seconds to wait before using them (0 = now),
+        or -1 if that wait would exceed max_wait (nothing booked).
+        Never sleeps.
+        """
+        wait = self._reserve_redis(n, max_wait)
+        if wait is None:
+            wait = self._reserve_local(n, max_wait)
+
+        if wait < 0:
+            self.metrics.refused += 1
+        else:
+            self.metrics.granted += 1
+            if wait > 0:
+                self.metrics.waited += 1
+                self.metrics.wait_seconds += wait
+        return wait
+
+    # -- convenience ----------------------------------------------------------
+    def try_acquire(self, n: float = 1) -> bool:
+        """Take n tokens only if available right now."""
+        return self.reserve(n, 0.0) == 0.0
+
+    def acquire(self, n: float = 1, timeout: Optional[float] = None) -> bool:
+        """
+        Take n tokens, sleeping for the booked slot. Returns False (without
+        sleeping) if the slot is further away than timeout.
+        """
+        wait = self.reserve(n, _UNBOUNDED_WAIT if timeout is None else float(timeout))
+        if wait < 0:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+
+class RateLimited(Exception):
+    """A shared quota bucket has no slot soon enough; retry after `retry_after` seconds."""
+
+    def __init__(self, bucket: str, retry_after: float):
+        self.bucket = bucket
+        self.retry_after = retry_after
+        super().__init__(f"{bucket} budget exhausted; retry in {retry_after:.0f}s")
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(name: str, per_minute: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Process-wide bucket for `name` (state shared via Redis when available)."""
+    with _buckets_lock:
+        bucket = _buckets.get(name)
+        if bucket is None or bucket.rate != max(float(per_minute), 1.0) / 60.0:
+            bucket = TokenBucket(name, per_minute, capacity)
+            _buckets[name] = bucket
+        return bucket
+
+
+# =============================================================================
+# Google Sheets project quota
+# =============================================================================
+SHEETS_QUOTA_PROJECT = getattr(settings, "GOOGLE_SHEETS_QUOTA_PROJECT", "default")
+
+SHEETS_READS_PER_MINUTE = int(getattr(settings, "GOOGLE_SHEETS_READS_PER_MINUTE", 48))
+
+SHEETS_WRITES_PER_MINUTE = int(getattr(settings, "GOOGLE_SHEETS_WRITES_PER_MINUTE", 30))
+
+# Short waits are absorbed in place; anything longer is handed back to the
+# caller as RateLimited so no worker sleeps on the quota.
+SHEETS_MAX_WAIT_SECONDS = float(getattr(settings, "GOOGLE_SHEETS_RATE_LIMIT_MAX_WAIT", 5))
+
+# Suggested delay before retrying after a refusal: one quota window.
+SHEETS_RETRY_AFTER_SECONDS = float(getattr(settings, "GOOGLE_SHEETS_RATE_LIMIT_RETRY_AFTER", 60))
+
+
+def sheets_bucket(kind: str) -> TokenBucket:
+    """The project-wide Sheets "read" or "write" bucket."""
+    if kind == "read":
+        return get_bucket(f"google_sheets:{SHEETS_QUOTA_PROJECT}:read", SHEETS_READS_PER_MINUTE)
+    return get_bucket(f"google_sheets:{SHEETS_QUOTA_PROJECT}:write", SHEETS_WRITES_PER_MINUTE)
+
+
+def take_sheets_quota(kind: str, n: float = 1) -> None:
+    """
+    Take n Sheets API requests from the project budget. Waits at most
+    SHEETS_MAX_WAIT_SECONDS; raises RateLimited (nothing booked) otherwise.
+    """
+    bucket = sheets_bucket(kind)
+    wait = bucket.reserve(n, SHEETS_MAX_WAIT_SECONDS)
+    if wait < 0:
+        raise RateLimited(bucket.name, SHEETS_RETRY_AFTER_SECONDS)
+    if wait > 0:
+        time.sleep(wait)
+
+
+def rate_limit_metrics() -> Dict[str, dict]:
+    """Per-bucket counters for this process."""
+    with _buckets_lock:
+        return {name: bucket.metrics.as_dict() for name, bucket in _buckets.items()}
+
+
+__all__ = [
+    "RateLimited",
+    "TokenBucket",
+    "get_bucket",
+    "rate_limit_metrics",
+    "sheets_bucket",
+    "take_sheets_quota",
+]
@@ -92,6 +92,7 @@ CORE_KAM_MODELS = [
     models.CallLog,
     models.CollectionTxn,
     models.KpiSnapshotDaily,
+    models.KamDailyFact,
     models.VisitApprovalAudit,
     models.SyncIntent,
 ]
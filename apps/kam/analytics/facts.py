@@ -0,0 +1,634 @@
+# apps/kam/analytics/facts.py
+"""
+Per-KAM daily fact table (KamDailyFact).
+
+Dashboards and performance reports used to aggregate InvoiceFact, LeadFact,
+VisitPlan/VisitActual, CallLog and CollectionTxn for every window on every
+page load (and per KAM in the weekly/monthly report jobs). The additive
+measures are now materialized per (kam, local day), so any window is one
+GROUP BY over at most days x KAMs small rows.
+
+Freshness
+---------
+- Sheet sync marks the days its rows moved from / to (see
+  sheets_adapter._TabSyncState.commit), once per run.
+- post_save / post_delete on the source models (apps/kam/signals.py) mark
+  the old and new day of the edited row.
+- A mark is a KamFactDirtyDay row written in the marking transaction. After
+  commit, refresh_dirty_kam_daily_facts (Celery) rebuilds the marked days,
+  most recent first, and deletes a mark only once its day is rebuilt. A
+  busy refresh lock retries the task; nothing is dropped and no web request
+  waits on a rebuild.
+- The nightly task marks the trailing KAM_DAILY_FACTS_RECONCILE_DAYS as a
+  safety net for queryset.update() paths that send no signals, and queues a
+  drain of every outstanding mark, however old.
+- Migration 0032 marks every day with source data, so the first drain
+  backfills the table. `manage.py kam_snapshot_daily` rebuilds a date range
+  synchronously.
+
+A refresh always rebuilds whole days for every KAM, so it is idempotent and
+order-independent. Non-additive figures (distinct customers, latest overdue
+snapshot, collection plans) are still read from the source tables.
+
+Public API
+----------
+refresh_kam_daily_facts(days) -> int         rebuild these local days now
+rebuild_kam_daily_facts(start, end) -> int   rebuild [start, end] inclusive
+mark_days_dirty(days)                        rebuild on a worker after commit
+deferred_refresh()                           collect marks, mark once on exit
+refresh_dirty_days() -> (rows, remaining)    rebuild one batch of marked days
+fact_totals(kam_ids, start, end) -> dict
+fact_totals_by_kam(kam_ids, start, end) -> {kam_id: dict}
+fact_buckets(kam_ids, buckets) -> [dict]     one query for many windows
+fact_buckets_by_kam(kam_ids, buckets) -> {kam_id: [dict]}
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.kam.models import (
+    CallLog,
+    CollectionTxn,
+    InvoiceFact,
+    KamDailyFact,
+    KamFactDirtyDay,
+    LeadFact,
+    VisitPlan,
+)
+
+logger = logging.getLogger(__name__)
+
+SALES_TAB = "Sales (F)"
+SHEET1_TAB = "Sheet1"
+
+RECONCILE_DAYS = int(getattr(settings, "KAM_DAILY_FACTS_RECONCILE_DAYS", 35))
+
+# Requested days closer than this are rebuilt as one contiguous run; long
+# runs are split so one backfill query never spans years.
+RUN_GAP_DAYS = 7
+MAX_RUN_DAYS = 92
+
+_LOCK_KEY = "kam:daily_facts:refresh:lock"
+_LOCK_TTL = 10 * 60
+_LOCK_WAIT_SECONDS = 30
+
+# Marked days rebuilt per drain task run; the task re-queues itself while
+# marks remain.
+DIRTY_BATCH_DAYS = int(getattr(settings, "KAM_DAILY_FACTS_DIRTY_BATCH_DAYS", 366))
+
+# Set while a drain task is queued but not started, so a burst of edits
+# queues one task.
+_QUEUED_KEY = "kam:daily_facts:refresh:queued"
+_QUEUED_TTL = 10 * 60
+
+ZERO = Decimal("0")
+
+DECIMAL_MEASURES = (
+    "sales_mt",
+    "sales_value",
+    "sheet1_mt",
+    "invoice_mt",
+    "leads_mt",
+    "leads_won_mt",
+    "leads_converted_mt",
+    "collections_amount",
+)
+INT_MEASURES = (
+    "sales_invoices",
+    "sheet1_invoices",
+    "invoice_count",
+    "leads_count",
+    "leads_won_count",
+    "leads_converted_count",
+    "leads_pending_count",
+    "leads_lost_count",
+    "visits_planned",
+    "visits_actual",
+    "visits_successful",
+    "visits_on_time",
+    "visits_open",
+    "calls",
+    "calls_productive",
+    "calls_followup",
+    "calls_with_outcome",
+    "collections_count",
+)
+MEASURES = DECIMAL_MEASURES + INT_MEASURES
+
+# Model -> field whose (local) date buckets the row.
+SOURCE_DAY_FIELDS = {
+    InvoiceFact: "invoice_date",
+    LeadFact: "doe",
+    VisitPlan: "visit_date",
+    CallLog: "call_datetime",
+    CollectionTxn: "txn_datetime",
+}
+
+KamIds = Union[None, int, Iterable[int]]
+
+
+def fact_day(value) -> Optional[date]:
+    """Local calendar day of a date / datetime (aware datetimes in TIME_ZONE)."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            return timezone.localtime(value).date()
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+def source_day_field(model) -> Optional[str]:
+    return SOURCE_DAY_FIELDS.get(model)
+
+
+def empty_totals() -> Dict[str, object]:
+    totals: Dict[str, object] = {name: ZERO for name in DECIMAL_MEASURES}
+    totals.update({name: 0 for name in INT_MEASURES})
+    totals["visits_missed"] = 0
+    return totals
+
+
+# =============================================================================
+# Source aggregation (one GROUP BY per source table)
+# =============================================================================
+def _local_bounds(lo: date, hi: date) -> Tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(lo, datetime.min.time()))
+    end = timezone.make_aware(datetime.combine(hi + timedelta(days=1), datetime.min.time()))
+    return start, end
+
+
+def _invoice_rows(lo: date, hi: date):
+    sales_q = Q(source_tab=SALES_TAB)
+    sheet1_q = Q(source_tab=SHEET1_TAB)
+    return (
+        InvoiceFact.objects
+        .filter(invoice_date__gte=lo, invoice_date__lte=hi)
+        .values("kam_id", day=F("invoice_date"))
+        .annotate(
+            sales_mt=Sum("qty_mt", filter=sales_q),
+            sales_value=Sum("invoice_value", filter=sales_q),
+            sales_invoices=Count("id", filter=sales_q),
+            sheet1_mt=Sum("qty_mt", filter=sheet1_q),
+            sheet1_invoices=Count("id", filter=sheet1_q),
+            invoice_mt=Sum("qty_mt"),
+            invoice_count=Count("id"),
+        )
+    )
+
+
+def _lead_rows(lo: date, hi: date):
+    won_q = Q(status="WON")
+    converted_q = (
+        Q(status__iexact="WON")
+        | Q(status__iexact="CONVERTED")
+        | Q(status__iexact="ORDER CONVERTED")
+    )
+    return (
+        LeadFact.objects
+        .filter(doe__gte=lo, doe__lte=hi)
+        .values("kam_id", day=F("doe"))
+        .annotate(
+            leads_count=Count("id"),
+            leads_mt=Sum("qty_mt"),
+            leads_won_count=Count("id", filter=won_q),
+            leads_won_mt=Sum("qty_mt", filter=won_q),
+            leads_converted_count=Count("id", filter=converted_q),
+            leads_converted_mt=Sum("qty_mt", filter=converted_q),
+            leads_pending_count=Count("id", filter=Q(status__in=["OPEN", "NEGOTIATION"])),
+            leads_lost_count=Count("id", filter=Q(status="LOST")),
+        )
+    )
+
+
+def _visit_rows(lo: date, hi: date):
+    on_time_q = Q(actual__isnull=False) & (
+        Q(visit_date_to__isnull=True, actual__actual_datetime__date__lte=F("visit_date"))
+        | Q(visit_date_to__isnull=False, actual__actual_datetime__date__lte=F("visit_date_to"))
+    )
+    return (
+        VisitPlan.objects
+        .filter(visit_date__gte=lo, visit_date__lte=hi)
+        .values("kam_id", day=F("visit_date"))
+        .annotate(
+            visits_planned=Count("id"),
+            visits_actual=Count("actual"),
+            visits_successful=Count("actual", filter=Q(actual__successful=True)),
+            visits_on_time=Count("actual", filter=on_time_q),
+            visits_open=Count("id", filter=Q(actual__isnull=True)),
+        )
+    )
+
+
+def _call_rows(lo: date, hi: date):
+    start, end = _local_bounds(lo, hi)
+    productive_q = (
+        Q(outcome__icontains="productive")
+        | Q(outcome__icontains="positive")
+        | Q(outcome__icontains="converted")
+        | Q(outcome__icontains="won")
+        | Q(outcome__icontains="success")
+        | Q(duration_minutes__gt=0)
+    )
+    followup_q = (
+        Q(outcome__icontains="follow")
+        | Q(notes__icontains="follow")
+        | Q(summary__icontains="follow")
+    )
+    return (
+        CallLog.objects
+        .filter(call_datetime__gte=start, call_datetime__lt=end)
+        .annotate(day=TruncDate("call_datetime"))
+        .values("kam_id", "day")
+        .annotate(
+            calls=Count("id"),
+            calls_productive=Count("id", filter=productive_q),
+            calls_followup=Count("id", filter=followup_q),
+            calls_with_outcome=Count("id", filter=Q(outcome__isnull=False) & ~Q(outcome="")),
+        )
+    )
+
+
+def _collection_rows(lo: date, hi: date):
+    start, end = _local_bounds(lo, hi)
+    return (
+        CollectionTxn.objects
+        .filter(txn_datetime__gte=start, txn_datetime__lt=end)
+        .annotate(day=TruncDate("txn_datetime"))
+        .values("kam_id", "day")
+        .annotate(
+            collections_amount=Sum("amount"),
+            collections_count=Count("id"),
+        )
+    )
+
+
+_SOURCES = (_invoice_rows, _lead_rows, _visit_rows, _call_rows, _collection_rows)
+
+
+# =============================================================================
+# Refresh
+# =============================================================================
+def _runs(days: Sequence[date]) -> Iterator[Tuple[date, date]]:
+    """Sorted days -> inclusive (lo, hi) runs, gaps <= RUN_GAP_DAYS merged."""
+    lo = hi = None
+    for d in days:
+        if lo is None:
+            lo = hi = d
+        elif (d - hi).days <= RUN_GAP_DAYS and (d - lo).days < MAX_RUN_DAYS:
+            hi = d
+        else:
+            yield lo, hi
+            lo = hi = d
+    if lo is not None:
+        yield lo, hi
+
+
+def _refresh_run(lo: date, hi: date) -> int:
+    now = timezone.now()
+    facts: Dict[Tuple[Optional[int], date], KamDailyFact] = {}
+
+    for source in _SOURCES:
+        for row in source(lo, hi):
+            key = (row.pop("kam_id"), fact_day(row.pop("day")))
+            fact = facts.get(key)
+            if fact is None:
+                fact = facts[key] = KamDailyFact(kam_id=key[0], day=key[1], refreshed_at=now)
+            for name, value in row.items():
+                setattr(fact, name, value or 0)
+
+    with transaction.atomic():
+        KamDailyFact.objects.filter(day__gte=lo, day__lte=hi).delete()
+        KamDailyFact.objects.bulk_create(facts.values(), batch_size=1000)
+
+    return len(facts)
+
+
+class KamFactsRefreshBusy(Exception):
+    """Another process held the refresh lock for the whole wait."""
+
+
+@contextmanager
+def _refresh_lock(wait_seconds: float) -> Iterator[bool]:
+    """Serialize refreshes across processes; yields False if the wait timed out."""
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait_seconds
+    acquired = cache.add(_LOCK_KEY, token, timeout=_LOCK_TTL)
+
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.2)
+        acquired = cache.add(_LOCK_KEY, token, timeout=_LOCK_TTL)
+
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(_LOCK_KEY) == token:
+            cache.delete(_LOCK_KEY)
+
+
+def refresh_kam_daily_facts(days: Iterable, *, wait_seconds: float = _LOCK_WAIT_SECONDS) -> int:
+    """
+    Rebuild KamDailyFact for the given local days (dates or datetimes), all
+    KAMs. Returns the number of fact rows written. Raises
+    KamFactsRefreshBusy if the lock stays taken for wait_seconds.
+    """
+    wanted = sorted({d for d in (fact_day(v) for v in days) if d})
+    if not wanted:
+        return 0
+
+    with _refresh_lock(wait_seconds) as acquired:
+        if not acquired:
+            raise KamFactsRefreshBusy(
+                f"KAM daily facts refresh lock busy for {wait_seconds}s; {len(wanted)} day(s) not rebuilt"
+            )
+
+        written = 0
+        for lo, hi in _runs(wanted):
+            written += _refresh_run(lo, hi)
+
+    logger.debug(
+        "KAM daily facts refreshed: %d day(s) %s..%s, %d row(s)",
+        len(wanted),
+        wanted[0],
+        wanted[-1],
+        written,
+    )
+    return written
+
+
+def rebuild_kam_daily_facts(start: date, end: date) -> int:
+    """Rebuild every day in [start, end] (inclusive)."""
+    if end < start:
+        return 0
+    return refresh_kam_daily_facts(
+        start + timedelta(days=i) for i in range((end - start).days + 1)
+    )
+
+
+def source_date_bounds() -> Tuple[Optional[date], Optional[date]]:
+    """Earliest and latest local day present in any source table."""
+    from django.db.models import Max, Min
+
+    lows: List[date] = []
+    highs: List[date] = []
+
+    for model, field_name in SOURCE_DAY_FIELDS.items():
+        agg = model.objects.aggregate(lo=Min(field_name), hi=Max(field_name))
+        if agg["lo"] is not None:
+            lows.append(fact_day(agg["lo"]))
+            highs.append(fact_day(agg["hi"]))
+
+    return (min(lows) if lows else None, max(highs) if highs else None)
+
+
+# -----------------------------------------------------------------------------
+# Dirty-day tracking
+# -----------------------------------------------------------------------------
+_local = threading.local()
+
+
+def queue_dirty_refresh() -> None:
+    """Queue refresh_dirty_kam_daily_facts unless one is already waiting."""
+    if not cache.add(_QUEUED_KEY, True, _QUEUED_TTL):
+        return
+    try:
+        from apps.kam.tasks import refresh_dirty_kam_daily_facts
+
+        refresh_dirty_kam_daily_facts.delay()
+    except Exception:
+        # The marks stay; the nightly job queues the next drain.
+        cache.delete(_QUEUED_KEY)
+        logger.exception("KAM daily facts: could not queue the dirty-day refresh")
+
+
+def mark_days_dirty(days: Iterable) -> None:
+    """
+    Mark these days for rebuild (in the current transaction) and queue the
+    drain task after commit. Inside deferred_refresh() the days are only
+    collected.
+    """
+    days = {d for d in (fact_day(v) for v in days) if d}
+    if not days:
+        return
+
+    deferred = getattr(_local, "deferred", None)
+    if deferred is not None:
+        deferred.update(days)
+        return
+
+    now = timezone.now()
+    KamFactDirtyDay.objects.bulk_create(
+        [KamFactDirtyDay(day=d, marked_at=now) for d in sorted(days)],
+        update_conflicts=True,
+        unique_fields=["day"],
+        update_fields=["marked_at"],
+    )
+    transaction.on_commit(queue_dirty_refresh)
+
+
+def refresh_dirty_days(
+    *,
+    limit: int = DIRTY_BATCH_DAYS,
+    wait_seconds: float = 0,
+) -> Tuple[int, bool]:
+    """
+    Rebuild up to `limit` marked days, most recent first, and clear their
+    marks. Returns (fact rows written, whether marks remain). Raises
+    KamFactsRefreshBusy with every mark left in place.
+
+    A mark re-set while its day was being rebuilt has a new marked_at and
+    survives the clean-up, so that day is rebuilt again.
+    """
+    marks = list(
+        KamFactDirtyDay.objects.order_by("-day").values_list("day", "marked_at")[:max(int(limit), 1)]
+    )
+    if not marks:
+        return 0, False
+
+    written = refresh_kam_daily_facts([day for day, _ in marks], wait_seconds=wait_seconds)
+
+    by_mark: Dict[datetime, List[date]] = {}
+    for day, marked_at in marks:
+        by_mark.setdefault(marked_at, []).append(day)
+    for marked_at, marked_days in by_mark.items():
+        KamFactDirtyDay.objects.filter(day__in=marked_days, marked_at=marked_at).delete()
+
+    return written, KamFactDirtyDay.objects.exists()
+
+
+def clear_refresh_queued() -> None:
+    """Called by the drain task on start: later marks queue a new run."""
+    cache.delete(_QUEUED_KEY)
+
+
+@contextmanager
+def deferred_refresh() -> Iterator[Set[date]]:
+    """
+    Collect mark_days_dirty() calls (e.g. a whole sheet sync run) and mark
+    the union once on exit. Nested use joins the outer collection.
+    """
+    outer = getattr(_local, "deferred", None)
+    if outer is not None:
+        yield outer
+        return
+
+    collected: Set[date] = set()
+    _local.deferred = collected
+    try:
+        yield collected
+    finally:
+        _local.deferred = None
+        if collected:
+            mark_days_dirty(collected)
+
+
+# =============================================================================
+# Roll-ups
+# =============================================================================
+def _scoped(qs, kam_ids: KamIds):
+    if kam_ids is None:
+        return qs
+    if isinstance(kam_ids, int):
+        return qs.filter(kam_id=kam_ids)
+    ids = list(kam_ids)
+    return qs.filter(kam_id__in=ids) if ids else qs.none()
+
+
+def _window(qs, start, end):
+    """[start, end) where either bound may be a date or a datetime."""
+    return qs.filter(day__gte=fact_day(start), day__lt=fact_day(end))
+
+
+def _sum_annotations(today: date) -> Dict[str, object]:
+    annotations: Dict[str, object] = {f"t_{name}": Sum(name) for name in MEASURES}
+    annotations["t_visits_missed"] = Sum("visits_open", filter=Q(day__lt=today))
+    return annotations
+
+
+def _clean(row: Dict[str, object]) -> Dict[str, object]:
+    totals = empty_totals()
+    for name in totals:
+        value = row.get(f"t_{name}")
+        if value is not None:
+            totals[name] = value
+    return totals
+
+
+def fact_totals(kam_ids: KamIds, start, end) -> Dict[str, object]:
+    """Summed measures over [start, end) for the KAM(s); None = everyone."""
+    qs = _window(_scoped(KamDailyFact.objects.all(), kam_ids), start, end)
+    return _clean(qs.aggregate(**_sum_annotations(timezone.localdate())))
+
+
+def fact_totals_by_kam(kam_ids: KamIds, start, end) -> Dict[Optional[int], Dict[str, object]]:
+    """Summed measures per KAM over [start, end). KAMs with no rows are absent."""
+    qs = _window(_scoped(KamDailyFact.objects.all(), kam_ids), start, end)
+    rows = qs.values("kam_id").annotate(**_sum_annotations(timezone.localdate())).order_by()
+    return {row["kam_id"]: _clean(row) for row in rows}
+
+
+def fact_buckets(kam_ids: KamIds, buckets: Sequence[Tuple[date, date]]) -> List[Dict[str, object]]:
+    """
+    Summed measures for each [start, end) bucket, from one per-day query over
+    the span of all buckets. Buckets may overlap.
+    """
+    results = [empty_totals() for _ in buckets]
+    if not buckets:
+        return results
+
+    bounds = [(fact_day(lo), fact_day(hi)) for lo, hi in buckets]
+    span_start = min(lo for lo, _hi in bounds)
+    span_end = max(hi for _lo, hi in bounds)
+    today = timezone.localdate()
+
+    rows = (
+        _window(_scoped(KamDailyFact.objects.all(), kam_ids), span_start, span_end)
+        .values("day")
+        .annotate(**_sum_annotations(today))
+        .order_by()
+    )
+
+    for row in rows:
+        _add_to_buckets(results, bounds, row)
+
+    return results
+
+
+def _add_to_buckets(results: List[Dict[str, object]], bounds, row: Dict[str, object]) -> None:
+    day = row["day"]
+    for index, (lo, hi) in enumerate(bounds):
+        if not (lo <= day < hi):
+            continue
+        totals = results[index]
+        for name in MEASURES + ("visits_missed",):
+            value = row.get(f"t_{name}")
+            if value:
+                totals[name] += value
+
+
+def fact_buckets_by_kam(
+    kam_ids: Iterable[int],
+    buckets: Sequence[Tuple[date, date]],
+) -> Dict[int, List[Dict[str, object]]]:
+    """
+    fact_buckets() for several KAMs from one (kam, day) query. Every
+    requested KAM is present, with zero buckets when it has no rows.
+    """
+    kam_ids = list(kam_ids)
+    results = {kam_id: [empty_totals() for _ in buckets] for kam_id in kam_ids}
+    if not buckets or not kam_ids:
+        return results
+
+    bounds = [(fact_day(lo), fact_day(hi)) for lo, hi in buckets]
+    span_start = min(lo for lo, _hi in bounds)
+    span_end = max(hi for _lo, hi in bounds)
+    today = timezone.localdate()
+
+    rows = (
+        _window(_scoped(KamDailyFact.objects.all(), kam_ids), span_start, span_end)
+        .values("kam_id", "day")
+        .annotate(**_sum_annotations(today))
+        .order_by()
+    )
+
+    for row in rows:
+        _add_to_buckets(results[row["kam_id"]], bounds, row)
+
+    return results
+
+
+__all__ = [
+    "DECIMAL_MEASURES",
+    "INT_MEASURES",
+    "MEASURES",
+    "SOURCE_DAY_FIELDS",
+    "deferred_refresh",
+    "empty_totals",
+    "fact_buckets",
+    "fact_buckets_by_kam",
+    "fact_day",
+    "fact_totals",
+    "fact_totals_by_kam",
+    "mark_days_dirty",
+    "rebuild_kam_daily_facts",
+    "refresh_kam_daily_facts",
+    "source_date_bounds",
+    "source_day_field",
+]
@@ -8,21 +8,25 @@ from datetime import date, timedelta
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.db import models
-from django.db.models import Q, F
+from django.db.models import Q, F, Prefetch
 from django.utils import timezone
 
+from apps.kam.analytics.facts import (
+    empty_totals,
+    fact_buckets,
+    fact_buckets_by_kam,
+    fact_totals,
+    fact_totals_by_kam,
+)
 from apps.kam.models import (
     Customer,
     InvoiceFact,
-    LeadFact,
     OverdueSnapshot,
     TargetSetting,
     TargetLine,
     TargetHeader,
-    VisitPlan,
     VisitActual,
     CallLog,
-    CollectionTxn,
     CollectionPlan,
 )
 
@@ -112,29 +116,6 @@ def _sales_qs(kam_id: int, start_dt, end_dt):
     )
 
 
-def _lead_qs(kam_id: int, start_dt, end_dt):
-    return (
-        LeadFact.objects
-        .filter(
-            kam_id=kam_id,
-            doe__isnull=False,
-            doe__gte=start_dt.date(),
-            doe__lt=end_dt.date(),
-        )
-    )
-
-
-def _visit_plan_qs(kam_id: int, start_dt, end_dt):
-    return (
-        VisitPlan.objects
-        .filter(
-            kam_id=kam_id,
-            visit_date__gte=start_dt.date(),
-            visit_date__lt=end_dt.date(),
-        )
-    )
-
-
 def _visit_actual_qs(kam_id: int, start_dt, end_dt):
     return (
         VisitActual.objects
@@ -158,17 +139,6 @@ def _call_qs(kam_id: int, start_dt, end_dt):
     )
 
 
-def _collection_txn_qs(kam_id: int, start_dt, end_dt):
-    return (
-        CollectionTxn.objects
-        .filter(
-            kam_id=kam_id,
-            txn_datetime__gte=start_dt,
-            txn_datetime__lt=end_dt,
-        )
-    )
-
-
 def _collection_plan_qs(kam_id: int):
     return CollectionPlan.objects.filter(kam_id=kam_id)
 
@@ -202,6 +172,23 @@ def _target_for_window(kam_id: int, start_dt, end_dt) -> Dict:
         .first()
     )
 
+    line = None
+    if not setting:
+        line = (
+            TargetLine.objects
+            .filter(
+                kam_id=kam_id,
+                header__period_type=TargetHeader.PERIOD_MONTH,
+                header__period_id=start_date.strftime("%Y-%m"),
+            )
+            .select_related("header")
+            .first()
+        )
+
+    return _targets_from(setting, line)
+
+
+def _targets_from(setting: Optional[TargetSetting], line: Optional[TargetLine]) -> Dict:
     if setting:
         return {
             "sales_target_mt": _dec(setting.sales_target_mt),
@@ -212,18 +199,6 @@ def _target_for_window(kam_id: int, start_dt, end_dt) -> Dict:
             "source": "TargetSetting",
         }
 
-    month_period = start_date.strftime("%Y-%m")
-    line = (
-        TargetLine.objects
-        .filter(
-            kam_id=kam_id,
-            header__period_type=TargetHeader.PERIOD_MONTH,
-            header__period_id=month_period,
-        )
-        .select_related("header")
-        .first()
-    )
-
     if line:
         return {
             "sales_target_mt": _dec(line.sales_target_mt),
@@ -248,13 +223,17 @@ def _basic_info(kam) -> Dict:
     manager_name = "-"
 
     try:
-        mapping = (
-            kam.kam_manager_mappings
-            .filter(active=True)
-            .select_related("manager")
-            .order_by("-assigned_at")
-            .first()
-        )
+        prefetched = getattr(kam, "active_manager_mappings", None)
+        if prefetched is not None:
+            mapping = prefetched[0] if prefetched else None
+        else:
+            mapping = (
+                kam.kam_manager_mappings
+                .filter(active=True)
+                .select_related("manager")
+                .order_by("-assigned_at")
+                .first()
+            )
         if mapping:
             manager_name = _kam_display_name(mapping.manager)
     except Exception:
@@ -272,90 +251,51 @@ def _basic_info(kam) -> Dict:
     }
 
 
-def _sales_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
-    sales = _sales_qs(kam_id, start_dt, end_dt)
-
-    agg = sales.aggregate(
-        total_sales_mt=models.Sum("qty_mt"),
-        total_value=models.Sum("invoice_value"),
-        invoices=models.Count("id"),
-        customers=models.Count("customer_id", distinct=True),
+def _sales_metrics(kam_id: int, start_dt, end_dt, targets: Dict, facts: Dict) -> Dict:
+    customers = (
+        _sales_qs(kam_id, start_dt, end_dt)
+        .aggregate(c=models.Count("customer_id", distinct=True))
+        .get("c")
     )
+    return _sales_block(targets, facts, customers)
+
 
-    lead_qty = _lead_qs(kam_id, start_dt, end_dt).aggregate(q=models.Sum("qty_mt")).get("q")
+def _sales_block(targets: Dict, facts: Dict, customers) -> Dict:
+    lead_qty = facts["leads_mt"]
 
-    total_sales_mt = _dec(agg.get("total_sales_mt"))
+    total_sales_mt = _dec(facts["sales_mt"])
     target_mt = _dec(targets.get("sales_target_mt"))
 
     return {
         "total_sales_mt": _float(total_sales_mt),
         "won_mt": _float(total_sales_mt),
-        "sales_value": _float(agg.get("total_value")),
-        "invoice_count": _int(agg.get("invoices")),
-        "customer_count": _int(agg.get("customers")),
+        "sales_value": _float(facts["sales_value"]),
+        "invoice_count": _int(facts["sales_invoices"]),
+        "customer_count": _int(customers),
         "target_mt": _float(target_mt),
         "achievement_pct": _pct(total_sales_mt, target_mt),
         "conversion_pct": _pct(total_sales_mt, lead_qty),
     }
 
 
-def _lead_metrics(kam_id: int, start_dt, end_dt) -> Dict:
-    leads = _lead_qs(kam_id, start_dt, end_dt)
-
-    agg = leads.aggregate(
-        total=models.Count("id"),
-        converted=models.Count("id", filter=Q(status="WON")),
-        pending=models.Count("id", filter=Q(status__in=["OPEN", "NEGOTIATION"])),
-        lost=models.Count("id", filter=Q(status="LOST")),
-        total_qty=models.Sum("qty_mt"),
-        converted_qty=models.Sum("qty_mt", filter=Q(status="WON")),
-    )
-
-    total = _int(agg.get("total"))
-    converted = _int(agg.get("converted"))
+def _lead_metrics(facts: Dict) -> Dict:
+    total = _int(facts["leads_count"])
+    converted = _int(facts["leads_won_count"])
 
     return {
         "total_leads": total,
         "converted_leads": converted,
-        "pending_leads": _int(agg.get("pending")),
-        "lost_leads": _int(agg.get("lost")),
-        "total_qty_mt": _float(agg.get("total_qty")),
-        "converted_qty_mt": _float(agg.get("converted_qty")),
+        "pending_leads": _int(facts["leads_pending_count"]),
+        "lost_leads": _int(facts["leads_lost_count"]),
+        "total_qty_mt": _float(facts["leads_mt"]),
+        "converted_qty_mt": _float(facts["leads_won_mt"]),
         "conversion_ratio": _pct(converted, total),
     }
 
 
-def _visit_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
-    plans = _visit_plan_qs(kam_id, start_dt, end_dt)
-    actuals = _visit_actual_qs(kam_id, start_dt, end_dt)
-
-    planned = plans.count()
-    actual = actuals.count()
-
-    successful = actuals.filter(successful=True).count()
-
-    today = timezone.localdate()
-
-    missed = (
-        plans
-        .filter(visit_date__lt=today)
-        .exclude(actual__isnull=False)
-        .count()
-    )
-
-    on_time = (
-        plans
-        .filter(actual__isnull=False)
-        .filter(
-            Q(visit_date_to__isnull=True, actual__actual_datetime__date__lte=F("visit_date"))
-            |
-            Q(visit_date_to__isnull=False, actual__actual_datetime__date__lte=F("visit_date_to"))
-        )
-        .count()
-    )
-
+def _visit_metrics(kam_id: int, start_dt, end_dt, targets: Dict, facts: Dict) -> Dict:
     visited_customers = (
-        actuals
+        _visit_actual_qs(kam_id, start_dt, end_dt)
         .exclude(plan__customer_id__isnull=True)
         .values("plan__customer_id")
         .distinct()
@@ -369,6 +309,16 @@ def _visit_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
         .count()
     )
 
+    return _visit_block(targets, facts, visited_customers, assigned_customers)
+
+
+def _visit_block(targets: Dict, facts: Dict, visited_customers: int, assigned_customers: int) -> Dict:
+    planned = _int(facts["visits_planned"])
+    actual = _int(facts["visits_actual"])
+    successful = _int(facts["visits_successful"])
+    missed = _int(facts["visits_missed"])
+    on_time = _int(facts["visits_on_time"])
+
     visits_target = _int(targets.get("visits_target")) or planned
 
     return {
@@ -387,36 +337,9 @@ def _visit_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
     }
 
 
-def _call_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
-    calls = _call_qs(kam_id, start_dt, end_dt)
-
-    total = calls.count()
-
-    productive = (
-        calls
-        .filter(
-            Q(outcome__icontains="productive")
-            | Q(outcome__icontains="positive")
-            | Q(outcome__icontains="converted")
-            | Q(outcome__icontains="won")
-            | Q(outcome__icontains="success")
-            | Q(duration_minutes__gt=0)
-        )
-        .count()
-    )
-
-    followups = (
-        calls
-        .filter(
-            Q(outcome__icontains="follow")
-            | Q(notes__icontains="follow")
-            | Q(summary__icontains="follow")
-        )
-        .count()
-    )
-
+def _call_metrics(kam_id: int, start_dt, end_dt, targets: Dict, facts: Dict) -> Dict:
     called_customer_ids = list(
-        calls
+        _call_qs(kam_id, start_dt, end_dt)
         .exclude(customer_id__isnull=True)
         .values_list("customer_id", flat=True)
         .distinct()
@@ -432,6 +355,13 @@ def _call_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
             .count()
         )
 
+    return _call_block(targets, facts, converted_from_calls, len(called_customer_ids))
+
+
+def _call_block(targets: Dict, facts: Dict, converted_from_calls: int, called_customers: int) -> Dict:
+    total = _int(facts["calls"])
+    productive = _int(facts["calls_productive"])
+    followups = _int(facts["calls_followup"])
     target_calls = _int(targets.get("calls_target"))
 
     return {
@@ -440,29 +370,31 @@ def _call_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
         "followups": followups,
         "converted_from_calls": converted_from_calls,
         "productive_pct": _pct(productive, total),
-        "conversion_from_calls_pct": _pct(converted_from_calls, len(called_customer_ids)),
+        "conversion_from_calls_pct": _pct(converted_from_calls, called_customers),
         "target_calls": target_calls,
         "achievement_pct": _pct(total, target_calls),
     }
 
 
-def _collection_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
+def _collection_metrics(kam_id: int, targets: Dict, facts: Dict) -> Dict:
     plans = _collection_plan_qs(kam_id)
 
-    plan_agg = plans.aggregate(
-        total_overdue=models.Sum("overdue_amount"),
-        total_actual=models.Sum("actual_amount"),
-        pending_count=models.Count("id", filter=Q(collection_status__in=[
+    plan_agg = plans.aggregate(**_collection_plan_aggregates())
+    return _collection_block(targets, facts, plan_agg)
+
+
+def _collection_plan_aggregates() -> Dict:
+    return {
+        "total_overdue": models.Sum("overdue_amount"),
+        "total_actual": models.Sum("actual_amount"),
+        "pending_count": models.Count("id", filter=Q(collection_status__in=[
             CollectionPlan.STATUS_OPEN,
             CollectionPlan.STATUS_PARTIAL,
         ])),
-    )
+    }
 
-    txn_agg = _collection_txn_qs(kam_id, start_dt, end_dt).aggregate(
-        collected_in_range=models.Sum("amount"),
-        txn_count=models.Count("id"),
-    )
 
+def _collection_block(targets: Dict, facts: Dict, plan_agg: Dict) -> Dict:
     total_overdue = _dec(plan_agg.get("total_overdue"))
     total_actual = _dec(plan_agg.get("total_actual"))
     pending_collection = total_overdue - total_actual
@@ -474,13 +406,13 @@ def _collection_metrics(kam_id: int, start_dt, end_dt, targets: Dict) -> Dict:
     return {
         "total_overdue": _float(total_overdue),
         "total_collected": _float(total_actual),
-        "collected_in_range": _float(txn_agg.get("collected_in_range")),
+        "collected_in_range": _float(facts["collections_amount"]),
         "pending_collection": _float(pending_collection),
         "pending_count": _int(plan_agg.get("pending_count")),
         "collection_efficiency_pct": _pct(total_actual, total_overdue),
         "target_amount": _float(target_amount),
         "achievement_pct": _pct(total_actual, target_amount),
-        "txn_count": _int(txn_agg.get("txn_count")),
+        "txn_count": _int(facts["collections_count"]),
     }
 
 
@@ -582,12 +514,7 @@ def _task_metrics(kam_id: int, start_dt, end_dt) -> Dict:
 def _risk_metrics(kam_id: int) -> Dict:
     overdue_qs, latest_date = _latest_overdue_qs(kam_id)
 
-    agg = overdue_qs.aggregate(
-        risk_customers=models.Count("customer_id", filter=Q(overdue__gt=0), distinct=True),
-        exposure=models.Sum("exposure"),
-        overdue=models.Sum("overdue"),
-        delayed_collections=models.Sum("ageing_90_plus"),
-    )
+    agg = overdue_qs.aggregate(**_overdue_aggregates())
 
     assigned_credit_limit = (
         Customer.objects
@@ -596,6 +523,19 @@ def _risk_metrics(kam_id: int) -> Dict:
         .get("v")
     )
 
+    return _risk_block(latest_date, agg, assigned_credit_limit)
+
+
+def _overdue_aggregates() -> Dict:
+    return {
+        "risk_customers": models.Count("customer_id", filter=Q(overdue__gt=0), distinct=True),
+        "exposure": models.Sum("exposure"),
+        "overdue": models.Sum("overdue"),
+        "delayed_collections": models.Sum("ageing_90_plus"),
+    }
+
+
+def _risk_block(latest_date: Optional[date], agg: Dict, assigned_credit_limit) -> Dict:
     exposure = _dec(agg.get("exposure"))
 
     return {
@@ -609,65 +549,22 @@ def _risk_metrics(kam_id: int) -> Dict:
     }
 
 
-def _weekly_trend(kam_id: int, anchor_date: Optional[date] = None) -> List[Dict]:
-    anchor_date = anchor_date or timezone.localdate()
-
+def _weekly_windows(anchor_date: date) -> List[Tuple[date, date]]:
+    """Six Mon–Sat windows ending with the anchor's week."""
     monday = anchor_date - timedelta(days=anchor_date.weekday())
-
-    rows = []
+    windows = []
 
     for i in range(5, -1, -1):
         week_start = monday - timedelta(days=i * 7)
-        week_end_exclusive = week_start + timedelta(days=6)
-
-        sales = (
-            InvoiceFact.objects
-            .filter(
-                kam_id=kam_id,
-                source_tab="Sales (F)",
-                invoice_date__gte=week_start,
-                invoice_date__lt=week_end_exclusive,
-            )
-            .aggregate(v=models.Sum("qty_mt"))
-            .get("v")
-        )
+        windows.append((week_start, week_start + timedelta(days=6)))
 
-        collections = (
-            CollectionTxn.objects
-            .filter(
-                kam_id=kam_id,
-                txn_datetime__date__gte=week_start,
-                txn_datetime__date__lt=week_end_exclusive,
-            )
-            .aggregate(v=models.Sum("amount"))
-            .get("v")
-        )
-
-        visits = (
-            VisitActual.objects
-            .filter(
-                plan__kam_id=kam_id,
-                plan__visit_date__gte=week_start,
-                plan__visit_date__lt=week_end_exclusive,
-            )
-            .count()
-        )
+    return windows
 
-        rows.append({
-            "label": f"{week_start.strftime('%d %b')} - {(week_end_exclusive - timedelta(days=1)).strftime('%d %b')}",
-            "sales_mt": _float(sales),
-            "collections": _float(collections),
-            "visits": visits,
-        })
 
-    return rows
-
-
-def _monthly_trend(kam_id: int, anchor_date: Optional[date] = None) -> List[Dict]:
-    anchor_date = anchor_date or timezone.localdate()
+def _monthly_windows(anchor_date: date) -> List[Tuple[date, date]]:
+    """Six calendar months ending with the anchor's month."""
     first_this_month = anchor_date.replace(day=1)
-
-    rows = []
+    windows = []
 
     for i in range(5, -1, -1):
         month_start = first_this_month
@@ -683,42 +580,45 @@ def _monthly_trend(kam_id: int, anchor_date: Optional[date] = None) -> List[Dict
         else:
             month_end = month_start.replace(month=month_start.month + 1)
 
-        sales = (
-            InvoiceFact.objects
-            .filter(
-                kam_id=kam_id,
-                source_tab="Sales (F)",
-                invoice_date__gte=month_start,
-                invoice_date__lt=month_end,
-            )
-            .aggregate(v=models.Sum("qty_mt"))
-            .get("v")
-        )
+        windows.append((month_start, month_end))
 
-        leads_total = (
-            LeadFact.objects
-            .filter(
-                kam_id=kam_id,
-                doe__gte=month_start,
-                doe__lt=month_end,
-            )
-            .count()
-        )
+    return windows
+
+
+def _weekly_trend(kam_id: int, anchor_date: Optional[date] = None) -> List[Dict]:
+    windows = _weekly_windows(anchor_date or timezone.localdate())
+    return _weekly_trend_rows(windows, fact_buckets(kam_id, windows))
 
-        leads_won = (
-            LeadFact.objects
-            .filter(
-                kam_id=kam_id,
-                doe__gte=month_start,
-                doe__lt=month_end,
-                status="WON",
-            )
-            .count()
-        )
+
+def _weekly_trend_rows(windows: List[Tuple[date, date]], buckets: List[Dict]) -> List[Dict]:
+    rows = []
+
+    for (week_start, week_end_exclusive), totals in zip(windows, buckets):
+        rows.append({
+            "label": f"{week_start.strftime('%d %b')} - {(week_end_exclusive - timedelta(days=1)).strftime('%d %b')}",
+            "sales_mt": _float(totals["sales_mt"]),
+            "collections": _float(totals["collections_amount"]),
+            "visits": _int(totals["visits_actual"]),
+        })
+
+    return rows
+
+
+def _monthly_trend(kam_id: int, anchor_date: Optional[date] = None) -> List[Dict]:
+    windows = _monthly_windows(anchor_date or timezone.localdate())
+    return _monthly_trend_rows(windows, fact_buckets(kam_id, windows))
+
+
+def _monthly_trend_rows(windows: List[Tuple[date, date]], buckets: List[Dict]) -> List[Dict]:
+    rows = []
+
+    for (month_start, _month_end), totals in zip(windows, buckets):
+        leads_total = _int(totals["leads_count"])
+        leads_won = _int(totals["leads_won_count"])
 
         rows.append({
             "label": month_start.strftime("%b %Y"),
-            "sales_mt": _float(sales),
+            "sales_mt": _float(totals["sales_mt"]),
             "leads_total": leads_total,
             "leads_won": leads_won,
             "lead_conversion_pct": _pct(leads_won, leads_total),
@@ -772,12 +672,13 @@ def build_kam_performance_report(kam_id: int, start_dt, end_dt) -> Dict:
     kam = User.objects.get(id=kam_id, is_active=True)
 
     targets = _target_for_window(kam_id, start_dt, end_dt)
+    facts = fact_totals(kam_id, start_dt, end_dt)
 
-    sales = _sales_metrics(kam_id, start_dt, end_dt, targets)
-    leads = _lead_metrics(kam_id, start_dt, end_dt)
-    visits = _visit_metrics(kam_id, start_dt, end_dt, targets)
-    calls = _call_metrics(kam_id, start_dt, end_dt, targets)
-    collections = _collection_metrics(kam_id, start_dt, end_dt, targets)
+    sales = _sales_metrics(kam_id, start_dt, end_dt, targets, facts)
+    leads = _lead_metrics(facts)
+    visits = _visit_metrics(kam_id, start_dt, end_dt, targets, facts)
+    calls = _call_metrics(kam_id, start_dt, end_dt, targets, facts)
+    collections = _collection_metrics(kam_id, targets, facts)
     tasks = _task_metrics(kam_id, start_dt, end_dt)
     risk = _risk_metrics(kam_id)
 
@@ -792,6 +693,41 @@ def build_kam_performance_report(kam_id: int, start_dt, end_dt) -> Dict:
     weekly_trend = _weekly_trend(kam_id, _inclusive_end_date(end_dt))
     monthly_trend = _monthly_trend(kam_id, _inclusive_end_date(end_dt))
 
+    return _report_payload(
+        kam,
+        start_dt,
+        end_dt,
+        targets=targets,
+        sales=sales,
+        leads=leads,
+        visits=visits,
+        calls=calls,
+        collections=collections,
+        tasks=tasks,
+        risk=risk,
+        score=score,
+        weekly_trend=weekly_trend,
+        monthly_trend=monthly_trend,
+    )
+
+
+def _report_payload(
+    kam,
+    start_dt,
+    end_dt,
+    *,
+    targets: Dict,
+    sales: Dict,
+    leads: Dict,
+    visits: Dict,
+    calls: Dict,
+    collections: Dict,
+    tasks: Dict,
+    risk: Dict,
+    score: Dict,
+    weekly_trend: List[Dict],
+    monthly_trend: List[Dict],
+) -> Dict:
     return {
         "basic": _basic_info(kam),
         "date_range": {
@@ -820,4 +756,251 @@ def build_kam_performance_report(kam_id: int, start_dt, end_dt) -> Dict:
             "collection_trend": weekly_trend,
             "lead_conversion_trend": monthly_trend,
         },
-    }
\ No newline at end of file
+    }
+
+# =============================================================================
+# Multi-KAM reports (weekly / monthly email jobs)
+# =============================================================================
+def _report_users(kam_ids: List[int]) -> Dict[int, object]:
+    from apps.kam.models import KamManagerMapping
+
+    active_mappings = Prefetch(
+        "kam_manager_mappings",
+        queryset=(
+            KamManagerMapping.objects
+            .filter(active=True)
+            .select_related("manager")
+            .order_by("-assigned_at")
+        ),
+        to_attr="active_manager_mappings",
+    )
+
+    users = (
+        User.objects
+        .filter(id__in=kam_ids, is_active=True)
+        .select_related("profile")
+        .prefetch_related(active_mappings)
+    )
+    return {user.id: user for user in users}
+
+
+def _targets_by_kam(kam_ids: List[int], start_dt, end_dt) -> Dict[int, Dict]:
+    start_date = start_dt.date()
+    end_date = _inclusive_end_date(end_dt)
+
+    settings_by_kam: Dict[int, TargetSetting] = {}
+    for setting in (
+        TargetSetting.objects
+        .filter(kam_id__in=kam_ids, from_date__lte=start_date, to_date__gte=end_date)
+        .order_by("-created_at")
+    ):
+        settings_by_kam.setdefault(setting.kam_id, setting)
+
+    lines_by_kam: Dict[int, TargetLine] = {}
+    without_setting = [kam_id for kam_id in kam_ids if kam_id not in settings_by_kam]
+    if without_setting:
+        for line in (
+            TargetLine.objects
+            .filter(
+                kam_id__in=without_setting,
+                header__period_type=TargetHeader.PERIOD_MONTH,
+                header__period_id=start_date.strftime("%Y-%m"),
+            )
+            .select_related("header")
+            .order_by("pk")
+        ):
+            lines_by_kam.setdefault(line.kam_id, line)
+
+    return {
+        kam_id: _targets_from(settings_by_kam.get(kam_id), lines_by_kam.get(kam_id))
+        for kam_id in kam_ids
+    }
+
+
+def _customer_sets(pairs) -> Dict[int, set]:
+    """(kam_id, customer_id) rows -> {kam_id: {customer_id, ...}}, null customers skipped."""
+    out: Dict[int, set] = {}
+    for kam_id, customer_id in pairs:
+        if customer_id is not None:
+            out.setdefault(kam_id, set()).add(customer_id)
+    return out
+
+
+def _assigned_customers_by_kam(kam_ids: List[int]) -> Tuple[Dict[int, int], Dict[int, Decimal]]:
+    """Assigned customer count and credit limit per KAM (kam or primary_kam)."""
+    wanted = set(kam_ids)
+    counts: Dict[int, int] = {}
+    credit: Dict[int, Decimal] = {}
+
+    rows = (
+        Customer.objects
+        .filter(Q(kam_id__in=kam_ids) | Q(primary_kam_id__in=kam_ids))
+        .values_list("kam_id", "primary_kam_id", "credit_limit")
+    )
+    for kam_id, primary_kam_id, credit_limit in rows:
+        for owner in {kam_id, primary_kam_id} & wanted:
+            counts[owner] = counts.get(owner, 0) + 1
+            if credit_limit is not None:
+                credit[owner] = credit.get(owner, ZERO) + credit_limit
+
+    return counts, credit
+
+
+def _latest_overdue_by_kam(kam_ids: List[int]) -> Tuple[Dict[int, date], Dict[int, Dict]]:
+    latest = {
+        row["kam_id"]: row["d"]
+        for row in (
+            OverdueSnapshot.objects
+            .filter(kam_id__in=kam_ids)
+            .values("kam_id")
+            .annotate(d=models.Max("snapshot_date"))
+            .order_by()
+        )
+        if row["d"]
+    }
+    if not latest:
+        return {}, {}
+
+    latest_q = Q()
+    for kam_id, snapshot_date in latest.items():
+        latest_q |= Q(kam_id=kam_id, snapshot_date=snapshot_date)
+
+    aggs = {
+        row.pop("kam_id"): row
+        for row in (
+            OverdueSnapshot.objects
+            .filter(latest_q)
+            .values("kam_id")
+            .annotate(**_overdue_aggregates())
+            .order_by()
+        )
+    }
+    return latest, aggs
+
+
+def build_kam_performance_reports(kam_ids, start_dt, end_dt) -> Dict[int, Dict]:
+    """
+    build_kam_performance_report() for many KAMs at once.
+
+    Every metric is read with one GROUP BY kam_id (or kam, customer) query
+    for the whole list and the weekly + monthly trends come from a single
+    bucketed fact query, so the query count does not grow with the number
+    of KAMs. Returns {kam_id: report} with the single-KAM payload shape;
+    inactive or unknown users are absent.
+    """
+    users = _report_users(list(kam_ids))
+    kam_ids = [kam_id for kam_id in kam_ids if kam_id in users]
+    if not kam_ids:
+        return {}
+
+    start_date = start_dt.date()
+    end_date = end_dt.date()
+    anchor = _inclusive_end_date(end_dt)
+
+    targets_by_kam = _targets_by_kam(kam_ids, start_dt, end_dt)
+    facts_by_kam = fact_totals_by_kam(kam_ids, start_dt, end_dt)
+
+    sales_customers = _customer_sets(
+        InvoiceFact.objects
+        .filter(
+            kam_id__in=kam_ids,
+            invoice_date__gte=start_date,
+            invoice_date__lt=end_date,
+            source_tab="Sales (F)",
+        )
+        .values_list("kam_id", "customer_id")
+        .distinct()
+    )
+    visited_customers = _customer_sets(
+        VisitActual.objects
+        .filter(
+            plan__kam_id__in=kam_ids,
+            plan__visit_date__gte=start_date,
+            plan__visit_date__lt=end_date,
+        )
+        .values_list("plan__kam_id", "plan__customer_id")
+        .distinct()
+    )
+    called_customers = _customer_sets(
+        CallLog.objects
+        .filter(
+            kam_id__in=kam_ids,
+            call_datetime__gte=start_dt,
+            call_datetime__lt=end_dt,
+        )
+        .values_list("kam_id", "customer_id")
+        .distinct()
+    )
+    assigned_counts, assigned_credit = _assigned_customers_by_kam(kam_ids)
+
+    plan_aggs = {
+        row.pop("kam_id"): row
+        for row in (
+            CollectionPlan.objects
+            .filter(kam_id__in=kam_ids)
+            .values("kam_id")
+            .annotate(**_collection_plan_aggregates())
+            .order_by()
+        )
+    }
+    latest_overdue, overdue_aggs = _latest_overdue_by_kam(kam_ids)
+
+    weekly_windows = _weekly_windows(anchor)
+    monthly_windows = _monthly_windows(anchor)
+    buckets_by_kam = fact_buckets_by_kam(kam_ids, weekly_windows + monthly_windows)
+
+    reports: Dict[int, Dict] = {}
+
+    for kam_id in kam_ids:
+        targets = targets_by_kam[kam_id]
+        facts = facts_by_kam.get(kam_id) or empty_totals()
+        sold_to = sales_customers.get(kam_id, set())
+        called = called_customers.get(kam_id, set())
+
+        sales = _sales_block(targets, facts, len(sold_to))
+        leads = _lead_metrics(facts)
+        visits = _visit_block(
+            targets,
+            facts,
+            len(visited_customers.get(kam_id, ())),
+            assigned_counts.get(kam_id, 0),
+        )
+        calls = _call_block(targets, facts, len(called & sold_to), len(called))
+        collections = _collection_block(targets, facts, plan_aggs.get(kam_id, {}))
+        tasks = _task_metrics(kam_id, start_dt, end_dt)
+        risk = _risk_block(
+            latest_overdue.get(kam_id),
+            overdue_aggs.get(kam_id, {}),
+            assigned_credit.get(kam_id),
+        )
+
+        score = _score_metrics(
+            sales=sales,
+            visits=visits,
+            collections=collections,
+            tasks=tasks,
+            calls=calls,
+        )
+
+        buckets = buckets_by_kam[kam_id]
+        weekly_trend = _weekly_trend_rows(weekly_windows, buckets[:len(weekly_windows)])
+        monthly_trend = _monthly_trend_rows(monthly_windows, buckets[len(weekly_windows):])
+
+        reports[kam_id] = _report_payload(
+            users[kam_id],
+            start_dt,
+            end_dt,
+            targets=targets,
+            sales=sales,
+            leads=leads,
+            visits=visits,
+            calls=calls,
+            collections=collections,
+            tasks=tasks,
+            risk=risk,
+            score=score,
+            weekly_trend=weekly_trend,
+            monthly_trend=monthly_trend,
+        )
+
+    return reports
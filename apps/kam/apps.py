@@ -8,3 +8,6 @@ class KamConfig(AppConfig):
     # Optional stable app label (keeps migrations referencing 'kam' working)
     label = "kam"
     verbose_name = "KAM (Sales Performance)"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -13,6 +13,8 @@ from django.template.loader import render_to_string
 from django.urls import NoReverseMatch, reverse
 from django.utils.html import strip_tags
 
+from apps.common.mail_pipeline import send_message
+
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
@@ -228,7 +230,7 @@ def _send_email_message(
         if is_html:
             email.attach_alternative(body, "text/html")
 
-        sent_count = email.send(fail_silently=False)
+        sent_count = send_message(email, fail_silently=False)
 
         logger.info(
             "KAM email sent. subject=%r to=%s cc=%s sent_count=%s",
@@ -691,7 +693,7 @@ def send_monthly_kam_performance_report_email(
                     filename,
                 )
 
-        sent_count = email.send(fail_silently=False)
+        sent_count = send_message(email, fail_silently=False)
 
         logger.info(
             "Monthly KAM performance report sent. period=%s to=%s cc=%s sent_count=%s kam_count=%s",
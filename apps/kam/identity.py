@@ -0,0 +1,66 @@
+# FILE: apps/kam/identity.py
+# PURPOSE: Canonical customer identity key (legal-name alias matching).
+#
+# Stored on Customer.identity_key (indexed, kept current in Customer.save,
+# backfilled by migration 0030 / `manage.py backfill_customer_identity`), so
+# alias lookups are an equality match instead of icontains scans.
+#
+#   AAM Forge Pvt. Ltd.          == AAM FORGE PRIVATE LIMITED
+#   AKAR AUTO INDUSTRIES LIMITED == AKAR AUTO INDUSTRIES PVT LTD
+#
+# Pure function: no model imports, safe to use from migrations.
+# Changing the rules requires re-running the backfill command.
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_REPLACEMENTS = {
+    "&": " AND ",
+    ".": " ",
+    ",": " ",
+    "-": " ",
+    "_": " ",
+    "/": " ",
+    "\\": " ",
+    "(": " ",
+    ")": " ",
+    "PRIVATE": "PVT",
+    "LIMITED": "LTD",
+}
+
+_REMOVABLE_SUFFIXES = frozenset({
+    "PVT",
+    "LTD",
+    "PRIVATE",
+    "LIMITED",
+    "LLP",
+    "LLC",
+    "INC",
+    "CO",
+    "COMPANY",
+    "CORP",
+    "CORPORATION",
+})
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+
+IDENTITY_KEY_MAX_LENGTH = 255
+
+
+def customer_identity_key(name: str) -> str:
+    """
+    Canonical customer key: ASCII-folded, upper-cased, punctuation and
+    legal suffixes (PVT, LTD, LLP, ...) removed. Display names are untouched.
+    """
+    text = unicodedata.normalize("NFKD", str(name or ""))
+    text = text.encode("ascii", "ignore").decode()
+    text = text.upper()
+
+    for old, new in _REPLACEMENTS.items():
+        text = text.replace(old, new)
+
+    tokens = [token for token in text.split() if token not in _REMOVABLE_SUFFIXES]
+
+    return _NON_ALNUM.sub("", "".join(tokens))[:IDENTITY_KEY_MAX_LENGTH]
@@ -0,0 +1,61 @@
+# FILE: apps/kam/management/commands/backfill_customer_identity.py
+# PURPOSE: Recompute Customer.identity_key for every customer.
+#
+# Customer.save() keeps the key current; run this after changing the rules in
+# apps/kam/identity.py or after bulk edits that bypass save()
+# (queryset.update(name=...), raw SQL, restores).
+#
+# USAGE:
+#   python manage.py backfill_customer_identity
+#   python manage.py backfill_customer_identity --dry-run
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.kam.identity import customer_identity_key
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored customer identity key used for alias matching"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many keys are stale.",
+        )
+
+    def handle(self, *args, **options):
+        from apps.kam.models import Customer
+
+        dry_run = options["dry_run"]
+        scanned = 0
+        stale = 0
+        batch = []
+
+        for customer_id, name, stored_key in (
+            Customer.objects
+            .order_by("pk")
+            .values_list("id", "name", "identity_key")
+            .iterator(chunk_size=BATCH_SIZE)
+        ):
+            scanned += 1
+            key = customer_identity_key(name)
+            if key == stored_key:
+                continue
+
+            stale += 1
+            if not dry_run:
+                batch.append(Customer(pk=customer_id, identity_key=key))
+                if len(batch) >= BATCH_SIZE:
+                    Customer.objects.bulk_update(batch, ["identity_key"])
+                    batch = []
+
+        if batch:
+            Customer.objects.bulk_update(batch, ["identity_key"])
+
+        verb = "would update" if dry_run else "updated"
+        self.stdout.write(self.style.SUCCESS(f"Scanned {scanned} customers; {verb} {stale} identity keys."))
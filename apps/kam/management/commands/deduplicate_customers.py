@@ -5,7 +5,10 @@
 #   python manage.py deduplicate_customers --apply  # actually merges + deletes dupes
 #
 # HOW IT WORKS:
-#   Groups all Customer rows by case-insensitive name.
+#   Groups all Customer rows by Customer.identity_key (indexed canonical name:
+#   case, punctuation and legal suffixes like PVT/LTD ignored — see
+#   apps/kam/identity.py). Run `backfill_customer_identity` first if names
+#   were edited outside Customer.save().
 #   For each group with 2+ rows:
 #     - Keeps the row with the LOWEST pk (oldest / first created)
 #     - Re-points all FK relations (InvoiceFact, LeadFact, OverdueSnapshot, etc.)
@@ -20,7 +23,7 @@ from django.db.models import Count
 
 
 class Command(BaseCommand):
-    help = "Merge duplicate Customer records (group by case-insensitive name)"
+    help = "Merge duplicate Customer records (group by customer identity key)"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -47,14 +50,14 @@ class Command(BaseCommand):
                 )
             )
 
-        # Find all names that have more than 1 row
-        from django.db.models.functions import Lower
+        # Find all identity keys that have more than 1 row
         dupes = (
             Customer.objects
-            .values("name")
+            .exclude(identity_key="")
+            .values("identity_key")
             .annotate(cnt=Count("id"))
             .filter(cnt__gt=1)
-            .order_by("name")
+            .order_by("identity_key")
         )
 
         if not dupes:
@@ -65,21 +68,9 @@ class Command(BaseCommand):
         total_groups = 0
 
         for group in dupes:
-            name = group["name"]
-            count = group["cnt"]
-
-            # Case-insensitive fetch — catches "ABC" and "abc" etc.
-            matches = list(
-                Customer.objects.filter(name__iexact=name).order_by("pk")
-            )
-
-            # Re-check — there may be both exact and case-variant dupes in one group
-            # We want ALL case-insensitive variants grouped together
-            all_names_in_group = set(m.name for m in matches)
-
-            # Fetch ALL case variants that haven't been picked up yet
+            # Indexed equality fetch — catches "ABC Pvt Ltd", "abc private limited" etc.
             all_matches = list(
-                Customer.objects.filter(name__in=all_names_in_group).order_by("pk")
+                Customer.objects.filter(identity_key=group["identity_key"]).order_by("pk")
             )
 
             if len(all_matches) < 2:
@@ -90,7 +81,7 @@ class Command(BaseCommand):
             total_groups += 1
 
             self.stdout.write(
-                f"\n  Group: \"{name}\"  ({len(all_matches)} records)\n"
+                f"\n  Group: \"{survivor.name}\"  ({len(all_matches)} records)\n"
                 f"    KEEP   pk={survivor.pk}  name=\"{survivor.name}\"\n"
             )
             for d in duplicates:
@@ -0,0 +1,79 @@
+# FILE: apps/kam/management/commands/kam_snapshot_daily.py
+# PURPOSE: Build / rebuild the per-KAM daily fact table (KamDailyFact)
+#
+# USAGE:
+#   python manage.py kam_snapshot_daily                 (trailing KAM_DAILY_FACTS_RECONCILE_DAYS)
+#   python manage.py kam_snapshot_daily --days 90
+#   python manage.py kam_snapshot_daily --from 2025-04-01 --to 2026-03-31
+#   python manage.py kam_snapshot_daily --all           (every day with source data, synchronously)
+#
+# Deploys need no manual run: migration 0032 marks every day with source data
+# and the dirty-day drain (apps.kam.tasks.refresh_dirty_kam_daily_facts)
+# builds them.
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.kam.analytics.facts import (
+    RECONCILE_DAYS,
+    KamFactsRefreshBusy,
+    rebuild_kam_daily_facts,
+    source_date_bounds,
+)
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as exc:
+        raise CommandError(f"Invalid date {value!r}; expected YYYY-MM-DD.") from exc
+
+
+class Command(BaseCommand):
+    help = "Rebuild KAM daily facts (dashboard / report roll-ups) for a date range"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", default=None, help="First day (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="date_to", default=None, help="Last day, inclusive (YYYY-MM-DD).")
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help=f"Rebuild the trailing N days up to today (default {RECONCILE_DAYS}).",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every day between the earliest and latest source row.",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        if options["all"]:
+            start, end = source_date_bounds()
+            if start is None:
+                self.stdout.write(self.style.WARNING("No source data; nothing to build."))
+                return
+        elif options["date_from"] or options["date_to"]:
+            start = _parse_date(options["date_from"]) if options["date_from"] else today
+            end = _parse_date(options["date_to"]) if options["date_to"] else today
+        else:
+            days = options["days"] if options["days"] is not None else RECONCILE_DAYS
+            if days < 1:
+                raise CommandError("--days must be at least 1.")
+            start, end = today - timedelta(days=days - 1), today
+
+        if end < start:
+            raise CommandError(f"Empty range: {start} > {end}.")
+
+        self.stdout.write(self.style.NOTICE(f"Rebuilding KAM daily facts {start} → {end}"))
+        try:
+            rows = rebuild_kam_daily_facts(start, end)
+        except KamFactsRefreshBusy as exc:
+            raise CommandError(f"{exc}; try again shortly.") from exc
+        self.stdout.write(self.style.SUCCESS(f"Done: {rows} fact row(s) for {(end - start).days + 1} day(s)."))
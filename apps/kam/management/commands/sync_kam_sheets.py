@@ -11,6 +11,7 @@
 #   python manage.py sync_kam_sheets --section overdues
 #   python manage.py sync_kam_sheets --section collection_plan_sync
 #   python manage.py sync_kam_sheets --section collection
+#   python manage.py sync_kam_sheets --full      (ignore stored row fingerprints)
 
 from __future__ import annotations
 
@@ -61,6 +62,11 @@ class Command(BaseCommand):
                 "Default: sync all sections."
             ),
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-upsert every row, ignoring stored tab/row fingerprints.",
+        )
 
     def handle(self, *args, **options):
         section = options.get("section")
@@ -83,7 +89,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.NOTICE("Running full sync."))
 
         try:
-            stats = sheets_adapter.run_sync_now()
+            stats = sheets_adapter.run_sync_now(full=bool(options.get("full")))
         except Exception as exc:
             raise CommandError(f"Sync failed: {exc}") from exc
 
@@ -101,6 +107,8 @@ class Command(BaseCommand):
         self.stdout.write(f"  Leads upserted       : {stats.leads_upserted}")
         self.stdout.write(f"  Overdues upserted    : {stats.overdues_upserted}")
         self.stdout.write(f"  Collections upserted : {stats.collections_upserted}")
+        self.stdout.write(f"  Unchanged rows       : {stats.unchanged}")
+        self.stdout.write(f"  Deleted rows         : {stats.deleted}")
         self.stdout.write(f"  Skipped rows         : {stats.skipped}")
         self.stdout.write(f"  Unknown KAM names    : {stats.unknown_kam}")
 
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.1 on 2026-10-16 18:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kam', '0027_kamemailapprovalsettings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetTabChecksum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section', models.CharField(max_length=32, unique=True)),
+                ('tab_name', models.CharField(blank=True, default='', max_length=64)),
+                ('digest', models.CharField(max_length=64)),
+                ('row_count', models.IntegerField(default=0)),
+                ('last_synced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SheetRowFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(max_length=32)),
+                ('row_uuid', models.CharField(max_length=64)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('synced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'unique_together': {('section', 'row_uuid')},
+            },
+        ),
+    ]
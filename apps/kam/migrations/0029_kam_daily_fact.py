@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-16 19:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kam', '0028_sheet_sync_fingerprints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KamDailyFact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True)),
+                ('sales_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('sales_value', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('sales_invoices', models.IntegerField(default=0)),
+                ('sheet1_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('sheet1_invoices', models.IntegerField(default=0)),
+                ('invoice_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('invoice_count', models.IntegerField(default=0)),
+                ('leads_count', models.IntegerField(default=0)),
+                ('leads_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('leads_won_count', models.IntegerField(default=0)),
+                ('leads_won_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('leads_converted_count', models.IntegerField(default=0)),
+                ('leads_converted_mt', models.DecimalField(decimal_places=3, default=0, max_digits=16)),
+                ('leads_pending_count', models.IntegerField(default=0)),
+                ('leads_lost_count', models.IntegerField(default=0)),
+                ('visits_planned', models.IntegerField(default=0)),
+                ('visits_actual', models.IntegerField(default=0)),
+                ('visits_successful', models.IntegerField(default=0)),
+                ('visits_on_time', models.IntegerField(default=0)),
+                ('visits_open', models.IntegerField(default=0)),
+                ('calls', models.IntegerField(default=0)),
+                ('calls_productive', models.IntegerField(default=0)),
+                ('calls_followup', models.IntegerField(default=0)),
+                ('calls_with_outcome', models.IntegerField(default=0)),
+                ('collections_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('collections_count', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('kam', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='kam_daily_facts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('kam', 'day')},
+            },
+        ),
+    ]
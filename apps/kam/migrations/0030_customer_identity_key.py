@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-16 19:12
+
+from django.db import migrations, models
+
+from apps.kam.identity import customer_identity_key
+
+
+def backfill_identity_keys(apps, schema_editor):
+    Customer = apps.get_model("kam", "Customer")
+    batch = []
+
+    for customer in Customer.objects.only("id", "name").iterator(chunk_size=2000):
+        customer.identity_key = customer_identity_key(customer.name)
+        batch.append(customer)
+        if len(batch) >= 2000:
+            Customer.objects.bulk_update(batch, ["identity_key"])
+            batch = []
+
+    if batch:
+        Customer.objects.bulk_update(batch, ["identity_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kam', '0029_kam_daily_fact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='identity_key',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='customer_identity_key(name); alias matching across legal-name variants.', max_length=255),
+        ),
+        migrations.RunPython(backfill_identity_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-16 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kam', '0030_customer_identity_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncintent',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='full',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='pending_fact_days',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='result',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='rows_done',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='rows_total',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='section',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='syncintent',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-16 20:17
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+# (model, day field, is datetime) as in apps.kam.analytics.facts.SOURCE_DAY_FIELDS
+FACT_SOURCES = (
+    ("InvoiceFact", "invoice_date", False),
+    ("LeadFact", "doe", False),
+    ("VisitPlan", "visit_date", False),
+    ("CallLog", "call_datetime", True),
+    ("CollectionTxn", "txn_datetime", True),
+)
+
+
+def queue_fact_backfill(apps, schema_editor):
+    """
+    Mark every local day with source data dirty. The next drain
+    (refresh_dirty_kam_daily_facts, queued by the nightly job at the latest)
+    builds KamDailyFact for the whole history.
+    """
+    KamFactDirtyDay = apps.get_model("kam", "KamFactDirtyDay")
+    days = set()
+
+    for model_name, field_name, is_datetime in FACT_SOURCES:
+        qs = apps.get_model("kam", model_name).objects.filter(**{f"{field_name}__isnull": False})
+        if is_datetime:
+            qs = qs.annotate(fact_day=TruncDate(field_name)).values_list("fact_day", flat=True)
+        else:
+            qs = qs.values_list(field_name, flat=True)
+        days.update(qs.order_by().distinct())
+
+    now = django.utils.timezone.now()
+    KamFactDirtyDay.objects.bulk_create(
+        [KamFactDirtyDay(day=day, marked_at=now) for day in sorted(days)],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kam', '0031_sync_intent_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KamFactDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(queue_fact_backfill, migrations.RunPython.noop),
+    ]
@@ -9,6 +9,8 @@ from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
 
+from .identity import IDENTITY_KEY_MAX_LENGTH, customer_identity_key
+
 User = get_user_model()
 
 
@@ -30,6 +32,10 @@ class Customer(TimeStamped):
 
     code = models.CharField(max_length=64, blank=True, null=True, db_index=True)
     name = models.CharField(max_length=255)
+    identity_key = models.CharField(
+        max_length=IDENTITY_KEY_MAX_LENGTH, blank=True, default="", db_index=True, editable=False,
+        help_text="customer_identity_key(name); alias matching across legal-name variants.",
+    )
     gst_number = models.CharField(max_length=32, blank=True, null=True, db_index=True)
 
     contact_person = models.CharField(max_length=128, blank=True, null=True)
@@ -91,6 +97,10 @@ class Customer(TimeStamped):
 
     def save(self, *args, **kwargs):
         self.sync_owner_fields()
+        self.identity_key = customer_identity_key(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "identity_key"}
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -885,6 +895,84 @@ class KpiSnapshotDaily(TimeStamped):
         unique_together = ("snapshot_date", "kam")
 
 
+class KamDailyFact(models.Model):
+    """
+    Additive per-KAM, per-local-day measures behind dashboards and reports.
+
+    Derived data only: rebuilt day by day from InvoiceFact, LeadFact,
+    VisitPlan/VisitActual, CallLog and CollectionTxn by
+    apps.kam.analytics.facts. Any window is a SUM over its days.
+    kam is NULL for sheet rows without a resolved KAM.
+    """
+
+    kam = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.CASCADE, related_name="kam_daily_facts",
+    )
+    day = models.DateField(db_index=True)
+
+    # Invoices: Sales (F) is the sales KPI; Sheet1 / all tabs back the
+    # _preferred_inv_qs fallback.
+    sales_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    sales_value = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    sales_invoices = models.IntegerField(default=0)
+    sheet1_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    sheet1_invoices = models.IntegerField(default=0)
+    invoice_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    invoice_count = models.IntegerField(default=0)
+
+    # Leads by date of enquiry. "won" is status WON; "converted" also
+    # accepts CONVERTED / ORDER CONVERTED (dashboard definition).
+    leads_count = models.IntegerField(default=0)
+    leads_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    leads_won_count = models.IntegerField(default=0)
+    leads_won_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    leads_converted_count = models.IntegerField(default=0)
+    leads_converted_mt = models.DecimalField(max_digits=16, decimal_places=3, default=0)
+    leads_pending_count = models.IntegerField(default=0)
+    leads_lost_count = models.IntegerField(default=0)
+
+    # Visits by planned visit_date.
+    visits_planned = models.IntegerField(default=0)
+    visits_actual = models.IntegerField(default=0)
+    visits_successful = models.IntegerField(default=0)
+    visits_on_time = models.IntegerField(default=0)
+    visits_open = models.IntegerField(default=0)
+
+    # Calls by local date of call_datetime.
+    calls = models.IntegerField(default=0)
+    calls_productive = models.IntegerField(default=0)
+    calls_followup = models.IntegerField(default=0)
+    calls_with_outcome = models.IntegerField(default=0)
+
+    # Collections by local date of txn_datetime.
+    collections_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    collections_count = models.IntegerField(default=0)
+
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("kam", "day")
+
+    def __str__(self):
+        return f"{self.kam_id or '-'} @ {self.day}"
+
+
+class KamFactDirtyDay(models.Model):
+    """
+    Local day whose KamDailyFact rows must be rebuilt.
+
+    Written in the same transaction as the source change and removed only
+    once that day has been rebuilt, so no edit is lost to a busy lock or a
+    failed worker (apps.kam.analytics.facts).
+    """
+
+    day = models.DateField(unique=True)
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.day} (marked {self.marked_at:%Y-%m-%d %H:%M})"
+
+
 class VisitApprovalAudit(TimeStamped):
     ACTION_APPROVE = "APPROVE"
     ACTION_REJECT = "REJECT"
@@ -945,9 +1033,54 @@ class SyncIntent(TimeStamped):
     step_count = models.IntegerField(default=0)
     last_error = models.TextField(blank=True, null=True)
 
+    # Background run progress (see sheets_adapter.run_sync_intent).
+    full = models.BooleanField(default=False)
+    section = models.CharField(max_length=32, blank=True, default="")
+    rows_total = models.IntegerField(default=0)
+    rows_done = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    pending_fact_days = models.JSONField(default=list, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
     class Meta:
         indexes = [models.Index(fields=["status", "created_at"])]
 
+
+class SheetTabChecksum(TimeStamped):
+    """
+    Whole-tab digest of the last successful Google Sheet sync per section.
+
+    When the digest of the freshly fetched tab matches, the section is skipped.
+    """
+
+    section = models.CharField(max_length=32, unique=True)
+    tab_name = models.CharField(max_length=64, blank=True, default="")
+    digest = models.CharField(max_length=64)
+    row_count = models.IntegerField(default=0)
+    last_synced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.section} @ {self.last_synced_at:%Y-%m-%d %H:%M}"
+
+
+class SheetRowFingerprint(models.Model):
+    """
+    Per-row content hash keyed by the sheet row_uuid.
+
+    Lets the sync touch only new, changed and deleted rows.
+    """
+
+    section = models.CharField(max_length=32)
+    row_uuid = models.CharField(max_length=64)
+    fingerprint = models.CharField(max_length=64)
+    synced_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("section", "row_uuid")
+
 # ---------------------------------------------------------------------------
 # Administrator-managed KAM approval email recipients
 # ---------------------------------------------------------------------------
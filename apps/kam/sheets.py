@@ -8,6 +8,7 @@ import logging
 import os
 from typing import Any, Dict, Optional
 
+from django.db import transaction
 from django.utils import timezone
 
 # Soft import — if apps.common.google_auth doesn't exist, define locally.
@@ -18,12 +19,18 @@ except ImportError:
     class GoogleCredentialError(Exception):  # type: ignore[no-redef]
         pass
 
+from apps.common.rate_limit import RateLimited
+
 from . import sheets_adapter
 
 logger = logging.getLogger(__name__)
 
 SHEET_ID_ENV = "KAM_SALES_SHEET_ID"
 
+# A RUNNING intent without a heartbeat (or a PENDING one never picked up) for
+# this long is presumed dead and re-queued; the next attempt resumes it.
+SYNC_STALE_SECONDS = int(os.getenv("KAM_SYNC_STALE_SECONDS") or 300)
+
 
 def _require_env(name: str) -> str:
     val = (os.getenv(name) or "").strip()
@@ -35,7 +42,7 @@ def _require_env(name: str) -> str:
     return val
 
 
-def run_sync_now(*, worksheet_name: Optional[str] = None) -> Dict[str, Any]:
+def run_sync_now(*, worksheet_name: Optional[str] = None, full: bool = False) -> Dict[str, Any]:
     """
     Sync entrypoint called by:
     - views.sync_now (manual manager trigger)
@@ -43,7 +50,8 @@ def run_sync_now(*, worksheet_name: Optional[str] = None) -> Dict[str, Any]:
     - Management command: python manage.py sync_kam_sheets
 
     Returns a dict with summary info for UI banners.
-    Never swallows GoogleCredentialError or RuntimeError — callers handle those.
+    Never swallows GoogleCredentialError, RuntimeError or RateLimited — callers
+    handle those.
     """
     sheet_id = _require_env(SHEET_ID_ENV)
 
@@ -53,11 +61,13 @@ def run_sync_now(*, worksheet_name: Optional[str] = None) -> Dict[str, Any]:
         os.environ["KAM_SALES_TAB"] = worksheet_name  # legacy key
 
     try:
-        stats = sheets_adapter.run_sync_now()
+        stats = sheets_adapter.run_sync_now(full=full)
     except GoogleCredentialError:
         raise
     except RuntimeError:
         raise
+    except RateLimited:
+        raise
     except Exception as exc:
         logger.exception("Unexpected error in run_sync_now")
         raise RuntimeError(f"Sync failed unexpectedly: {exc}") from exc
@@ -74,6 +84,8 @@ def run_sync_now(*, worksheet_name: Optional[str] = None) -> Dict[str, Any]:
         "overdues_upserted":  stats.overdues_upserted,
         "skipped":            stats.skipped,
         "unknown_kam":        stats.unknown_kam,
+        "unchanged":          stats.unchanged,
+        "deleted":            stats.deleted,
         "notes":              stats.notes,
     }
     logger.info("KAM sync complete: %s", stats.as_message())
@@ -85,4 +97,127 @@ def step_sync(intent, *args, **kwargs) -> Dict[str, Any]:
     Stepped sync for progressive UI (one section at a time).
     Called by views.sync_step with a SyncIntent instance.
     """
-    return sheets_adapter.step_sync(intent)
\ No newline at end of file
+    return sheets_adapter.step_sync(intent)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Background sync (views.sync_now / sync_trigger / sync_step / sync_status)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _queue_sync(intent) -> None:
+    from .tasks import run_kam_sync_intent  # lazy: tasks imports this module
+
+    token = intent.token
+
+    def _send():
+        try:
+            run_kam_sync_intent.delay(token)
+        except Exception:
+            logger.exception("Could not queue KAM sync %s; running it inline.", token)
+            run_kam_sync_intent(token)
+
+    transaction.on_commit(_send)
+
+
+def start_background_sync(user, *, full: bool = False):
+    """
+    Queue a team sync and return its SyncIntent. While another sync is in
+    flight that intent is returned instead of starting a second one.
+    """
+    from .models import SyncIntent
+
+    active = (
+        SyncIntent.objects
+        .filter(status__in=[SyncIntent.STATUS_PENDING, SyncIntent.STATUS_RUNNING], started_at__isnull=False)
+        .order_by("-created_at")
+        .first()
+    )
+    if active is not None and not is_sync_stale(active):
+        return active
+
+    token = timezone.now().strftime("%Y%m%d%H%M%S") + f"_{user.id}"
+    intent, created = SyncIntent.objects.get_or_create(
+        token=token,
+        defaults={
+            "created_by": user,
+            "scope": SyncIntent.SCOPE_TEAM,
+            "full": full,
+            "started_at": timezone.now(),
+        },
+    )
+    if created:
+        _queue_sync(intent)
+    return intent
+
+
+def is_sync_stale(intent) -> bool:
+    from .models import SyncIntent
+
+    if intent.status == SyncIntent.STATUS_RUNNING:
+        last_seen = intent.heartbeat_at or intent.updated_at
+    elif intent.status == SyncIntent.STATUS_PENDING:
+        last_seen = intent.updated_at
+    else:
+        return False
+
+    return last_seen is None or (timezone.now() - last_seen).total_seconds() > SYNC_STALE_SECONDS
+
+
+def resume_stale_sync(intent) -> bool:
+    """Re-queue an intent whose worker died or whose message was lost."""
+    if not is_sync_stale(intent):
+        return False
+
+    logger.warning("KAM sync %s looks stale (status=%s); re-queuing.", intent.token, intent.status)
+    intent.save(update_fields=["updated_at"])  # one re-queue per stale window
+    _queue_sync(intent)
+    return True
+
+
+def sync_intent_status(intent) -> Dict[str, Any]:
+    """Polling payload: position, rows processed, throughput and ETA."""
+    from .models import SyncIntent
+
+    labels = dict(sheets_adapter._STEPS)
+    done = intent.status in (SyncIntent.STATUS_SUCCESS, SyncIntent.STATUS_ERROR)
+    rows_total = intent.rows_total or 0
+    rows_done = min(intent.rows_done or 0, rows_total) if rows_total else intent.rows_done or 0
+
+    rows_per_sec = None
+    eta_seconds = None
+    if intent.started_at and rows_done:
+        until = intent.finished_at or intent.heartbeat_at or timezone.now()
+        elapsed = (until - intent.started_at).total_seconds()
+        if elapsed > 0:
+            rows_per_sec = round(rows_done / elapsed, 1)
+            if not done and rows_total:
+                eta_seconds = int((rows_total - rows_done) / (rows_done / elapsed))
+
+    if intent.status == SyncIntent.STATUS_SUCCESS:
+        percent = 100.0
+    else:
+        percent = round(100.0 * rows_done / rows_total, 1) if rows_total else 0.0
+
+    result = intent.result or {}
+
+    return {
+        "token": intent.token,
+        "status": intent.status,
+        "done": done,
+        "section": intent.section,
+        "step": labels.get(intent.section, ""),
+        "cursor": intent.cursor_position,
+        "steps": len(sheets_adapter._STEPS),
+        "rows_done": rows_done,
+        "rows_total": rows_total,
+        "percent": percent,
+        "rows_per_sec": rows_per_sec,
+        "eta_seconds": eta_seconds,
+        "attempts": intent.attempts,
+        "started_at": intent.started_at.isoformat() if intent.started_at else None,
+        "heartbeat_at": intent.heartbeat_at.isoformat() if intent.heartbeat_at else None,
+        "finished_at": intent.finished_at.isoformat() if intent.finished_at else None,
+        "message": result.get("summary", ""),
+        "stats": result.get("stats", {}),
+        "error": intent.last_error or "",
+    }
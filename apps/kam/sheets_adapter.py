@@ -23,16 +23,24 @@ import json
 import logging
 import os
 import re
+import threading
+import time
 import unicodedata
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.utils import timezone
 
+from apps.common.rate_limit import RateLimited, take_sheets_quota
+
+from .analytics.facts import deferred_refresh, fact_day, mark_days_dirty, source_day_field
+from .identity import customer_identity_key
+
 try:
     from apps.common.google_auth import GoogleCredentialError
 except ImportError:
@@ -47,6 +55,8 @@ from .models import (
     InvoiceFact,
     LeadFact,
     OverdueSnapshot,
+    SheetRowFingerprint,
+    SheetTabChecksum,
     SyncIntent,
 )
 
@@ -243,6 +253,8 @@ class SyncStats:
     collections_upserted: int = 0
     skipped: int = 0
     unknown_kam: int = 0
+    unchanged: int = 0
+    deleted: int = 0
     notes: List[str] = field(default_factory=list)
 
     def merge(self, other: "SyncStats") -> None:
@@ -253,6 +265,8 @@ class SyncStats:
         self.collections_upserted += other.collections_upserted
         self.skipped += other.skipped
         self.unknown_kam += other.unknown_kam
+        self.unchanged += other.unchanged
+        self.deleted += other.deleted
         self.notes.extend(other.notes)
 
     def as_message(self) -> str:
@@ -272,6 +286,10 @@ class SyncStats:
             parts.append(f"Skipped: {self.skipped}")
         if self.unknown_kam:
             parts.append(f"Unknown KAM: {self.unknown_kam}")
+        if self.deleted:
+            parts.append(f"Deleted: {self.deleted}")
+        if self.unchanged:
+            parts.append(f"Unchanged: {self.unchanged}")
 
         return " | ".join(parts) if parts else "No changes"
 
@@ -280,8 +298,141 @@ class SyncStats:
 # GOOGLE SHEETS CLIENT
 # ─────────────────────────────────────────────────────────────────────────────
 
+class PrefetchedSheetService:
+    """
+    Wraps a Sheets service together with tab values fetched up front.
+
+    Section functions keep receiving a "service"; _get_sheet_values serves
+    prefetched tabs from memory and falls back to a live read otherwise.
+    """
+
+    def __init__(self, service, sheet_id: str, values: Dict[str, List[List[str]]]):
+        self.service = service
+        self.sheet_id = sheet_id
+        self.values = values
+
+    def spreadsheets(self):
+        return self.service.spreadsheets()
+
+
+def _acquire_read_quota(n: int = 1) -> None:
+    """
+    Take n requests from the project-wide Sheets read budget shared with the
+    other integrations. Raises RateLimited when it is used up; the Celery
+    tasks retry with a countdown.
+    """
+    take_sheets_quota("read", n)
+
+
+def _section_tab(section_key: str) -> Optional[str]:
+    resolver = {
+        "customers": _tab_customers,
+        "sales_f": _tab_sales_f,
+        "sheet1": _tab_sheet1,
+        "frontend": _tab_frontend,
+        "enquiry_f": _tab_enquiry_f,
+        "overdues": _tab_overdues,
+        "collection_plan_sync": _tab_overdues,
+        "collection": _tab_collection,
+    }.get(section_key)
+    return resolver() if resolver else None
+
+
+def _tabs_for_sections(sections: Dict[str, bool]) -> List[str]:
+    tabs = [_tab_kam_names()]
+
+    for section_key, enabled in sections.items():
+        tab = _section_tab(section_key)
+
+        if enabled and tab and tab not in tabs:
+            tabs.append(tab)
+
+    return tabs
+
+
+def _fetch_tabs_threaded(sheet_id: str, tabs: List[str]) -> Dict[str, List[List[str]]]:
+    """
+    Fallback when batchGet fails (usually one missing tab fails the whole
+    batch). googleapiclient services are not thread-safe, so each worker
+    builds its own.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max(1, min(len(tabs), int(_env("KAM_SYNC_FETCH_WORKERS", "4") or 4)))
+
+    def _fetch(tab: str) -> List[List[str]]:
+        return _get_sheet_values(build_sheets_service(), sheet_id, tab)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kam-fetch") as pool:
+        return dict(zip(tabs, pool.map(_fetch, tabs)))
+
+
+def fetch_tabs(service, sheet_id: str, tabs: List[str]) -> Dict[str, List[List[str]]]:
+    """
+    Read every tab in one values().batchGet round trip.
+
+    Falls back to a bounded thread pool of per-tab reads, so a missing tab
+    still yields [] for that tab only, like _get_sheet_values.
+    """
+    if not tabs:
+        return {}
+
+    started = timezone.now()
+
+    try:
+        _acquire_read_quota()
+        result = (
+            service.spreadsheets()
+            .values()
+            .batchGet(spreadsheetId=sheet_id, ranges=tabs)
+            .execute()
+        )
+        value_ranges = result.get("valueRanges", [])
+        values = {
+            tab: (value_ranges[idx].get("values", []) if idx < len(value_ranges) else [])
+            for idx, tab in enumerate(tabs)
+        }
+        mode = "batchGet"
+    except RateLimited:
+        raise
+    except Exception as exc:
+        logger.warning(
+            "batchGet for %d tabs failed (%s); fetching tabs in parallel.",
+            len(tabs),
+            exc,
+        )
+        values = _fetch_tabs_threaded(sheet_id, tabs)
+        mode = "threaded"
+
+    logger.info(
+        "Fetched %d tabs via %s in %.2fs: %s",
+        len(tabs),
+        mode,
+        (timezone.now() - started).total_seconds(),
+        ", ".join(f"{tab}={max(len(rows) - 1, 0)}" for tab, rows in values.items()),
+    )
+    return values
+
+
+def prefetch_service(service, sheet_id: str, sections: Dict[str, bool]) -> PrefetchedSheetService:
+    if isinstance(service, PrefetchedSheetService):
+        return service
+
+    return PrefetchedSheetService(
+        service,
+        sheet_id,
+        fetch_tabs(service, sheet_id, _tabs_for_sections(sections)),
+    )
+
+
 def _get_sheet_values(service, sheet_id: str, tab: str) -> List[List[str]]:
+    if isinstance(service, PrefetchedSheetService):
+        if service.sheet_id == sheet_id and tab in service.values:
+            return service.values[tab]
+        service = service.service
+
     try:
+        _acquire_read_quota()
         result = (
             service.spreadsheets()
             .values()
@@ -289,6 +440,9 @@ def _get_sheet_values(service, sheet_id: str, tab: str) -> List[List[str]]:
             .execute()
         )
         return result.get("values", [])
+    except RateLimited:
+        # Not an empty tab: the sync must stop, not see zero rows.
+        raise
     except Exception as exc:
         logger.warning(
             "Could not read tab %r from sheet %r: %s",
@@ -535,93 +689,107 @@ def _customer_identity_key(name: str) -> str:
     - AAM Forge Pvt. Ltd. == AAM FORGE PRIVATE LIMITED
     - AKAR AUTO INDUSTRIES LIMITED == AKAR AUTO INDUSTRIES PVT LTD
 
-    This does not modify display names.
-    This does not delete duplicates.
+    Stored on Customer.identity_key (see apps/kam/identity.py).
     """
-    text = unicodedata.normalize("NFKD", str(name or ""))
-    text = text.encode("ascii", "ignore").decode()
-    text = text.upper()
-
-    replacements = {
-        "&": " AND ",
-        ".": " ",
-        ",": " ",
-        "-": " ",
-        "_": " ",
-        "/": " ",
-        "\\": " ",
-        "(": " ",
-        ")": " ",
-        "PRIVATE": "PVT",
-        "LIMITED": "LTD",
-    }
+    return customer_identity_key(name)
 
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-
-    tokens = [token.strip() for token in text.split() if token.strip()]
-
-    removable_suffixes = {
-        "PVT",
-        "LTD",
-        "PRIVATE",
-        "LIMITED",
-        "LLP",
-        "LLC",
-        "INC",
-        "CO",
-        "COMPANY",
-        "CORP",
-        "CORPORATION",
-    }
 
-    tokens = [token for token in tokens if token not in removable_suffixes]
+class _CustomerIndex:
+    """
+    identity_key -> [(pk, name)] for every customer, loaded once per sync run
+    so alias resolution for each sheet row is a dict lookup. Customers
+    resolved during the run are cached; ones created are added.
+    """
+
+    def __init__(self):
+        self.by_key: Dict[str, List[Tuple[int, str]]] = {}
+        self._objects: Dict[int, Customer] = {}
 
-    return re.sub(r"[^A-Z0-9]", "", "".join(tokens))
+        for pk, name, key in (
+            Customer.objects
+            .order_by("pk")
+            .values_list("pk", "name", "identity_key")
+            .iterator(chunk_size=5000)
+        ):
+            self.by_key.setdefault(key or customer_identity_key(name), []).append((pk, name))
 
+        logger.info("Customer alias index loaded: %d keys", len(self.by_key))
 
-def _customer_candidate_queryset(clean_name: str):
-    """
-    Narrow DB scan for customer alias matching.
+    def candidates(self, key: str) -> List[Tuple[int, str]]:
+        return self.by_key.get(key, [])
+
+    def get(self, pk: int) -> Optional[Customer]:
+        customer = self._objects.get(pk)
+        if customer is None:
+            customer = Customer.objects.filter(pk=pk).first()
+            if customer is not None:
+                self._objects[pk] = customer
+        return customer
+
+    def add(self, customer: Customer) -> None:
+        entries = self.by_key.setdefault(customer.identity_key, [])
+        if all(pk != customer.pk for pk, _name in entries):
+            entries.append((customer.pk, customer.name))
+            entries.sort()
+        self._objects[customer.pk] = customer
 
-    First tries exact match.
-    If exact match does not exist, searches by first meaningful token.
-    Final decision is made by _customer_identity_key().
+
+_customer_index_state = threading.local()
+
+
+def _active_customer_index() -> Optional[_CustomerIndex]:
+    if not getattr(_customer_index_state, "active", False):
+        return None
+    index = getattr(_customer_index_state, "index", None)
+    if index is None:
+        index = _customer_index_state.index = _CustomerIndex()
+    return index
+
+
+@contextmanager
+def customer_index_scope():
+    """Share one lazily loaded _CustomerIndex across the sections of a run."""
+    if getattr(_customer_index_state, "active", False):
+        yield
+        return
+
+    _customer_index_state.active = True
+    _customer_index_state.index = None
+    try:
+        yield
+    finally:
+        _customer_index_state.active = False
+        _customer_index_state.index = None
+
+
+@contextmanager
+def sync_run_scope():
     """
-    exact_qs = Customer.objects.filter(name__iexact=clean_name).order_by("pk")
-
-    if exact_qs.exists():
-        return exact_qs
-
-    text = unicodedata.normalize("NFKD", str(clean_name or ""))
-    text = text.encode("ascii", "ignore").decode()
-    text = text.upper()
-
-    for ch in ". ,-/\\()_&":
-        text = text.replace(ch, " ")
-
-    skip = {
-        "PVT",
-        "PRIVATE",
-        "LTD",
-        "LIMITED",
-        "LLP",
-        "LLC",
-        "INC",
-        "CO",
-        "COMPANY",
-        "CORP",
-        "CORPORATION",
-        "AND",
-    }
+    Per-run state for one or more sections: alias index, deferred fact
+    refresh. Yields the set of fact days collected so far.
+    """
+    with deferred_refresh() as fact_days, customer_index_scope():
+        yield fact_days
 
-    tokens = [token for token in text.split() if token and token not in skip]
-    first_token = tokens[0] if tokens else ""
 
-    if not first_token:
-        return Customer.objects.none()
+def _customer_candidates(clean_name: str, key: str) -> List[Tuple[int, str]]:
+    """Indexed alias lookup when no run-wide index is active."""
+    qs = Customer.objects.filter(identity_key=key) if key else Customer.objects.filter(name__iexact=clean_name)
+    return list(qs.order_by("pk").values_list("pk", "name"))
+
+
+def _matching_customer_ids(clean_name: str, key: str, candidates: List[Tuple[int, str]]) -> List[int]:
+    """
+    Exact (case-insensitive) name matches win; otherwise every customer with
+    the same identity key. A blank key only matches by exact name.
+    """
+    lowered = clean_name.lower()
+    exact = [pk for pk, name in candidates if (name or "").strip().lower() == lowered]
+
+    if exact or not key:
+        return exact
 
-    return Customer.objects.filter(name__icontains=first_token).order_by("pk")
+    return [pk for pk, _name in candidates]
 
 
 def _safe_get_or_create_customer(
@@ -654,34 +822,36 @@ def _safe_get_or_create_customer(
     if extra_defaults:
         defaults.update(extra_defaults)
 
-    incoming_key = _customer_identity_key(clean_name)
-
-    matches = []
+    incoming_key = customer_identity_key(clean_name)
+    index = _active_customer_index()
 
-    for candidate in _customer_candidate_queryset(clean_name):
-        candidate_key = _customer_identity_key(candidate.name)
+    candidates = (
+        index.candidates(incoming_key)
+        if index is not None
+        else _customer_candidates(clean_name, incoming_key)
+    )
+    match_ids = _matching_customer_ids(clean_name, incoming_key, candidates)
 
-        if candidate.name.strip().lower() == clean_name.lower() or (
-            incoming_key and candidate_key and incoming_key == candidate_key
-        ):
-            matches.append(candidate)
+    customer = None
+    if match_ids:
+        customer = index.get(match_ids[0]) if index is not None else Customer.objects.filter(pk=match_ids[0]).first()
 
-    if not matches:
+    if customer is None:
         with transaction.atomic():
             customer, _created = Customer.objects.get_or_create(
                 name=clean_name,
                 defaults=defaults,
             )
-            return customer
+        if index is not None:
+            index.add(customer)
+        return customer
 
-    customer = sorted(matches, key=lambda item: item.pk)[0]
-
-    if len(matches) > 1:
+    if len(match_ids) > 1:
         logger.warning(
             "Duplicate customer aliases found for %r. Using pk=%s. Matched pks=%s. No rows deleted.",
             clean_name,
             customer.pk,
-            [item.pk for item in matches],
+            match_ids,
         )
 
     changed = False
@@ -889,6 +1059,473 @@ def _resolve_kam_user(
     return user
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# INCREMENTAL SYNC STATE
+#
+# Every section fingerprints the raw rows it reads. A tab whose digest matches
+# the last successful run is skipped outright; otherwise only rows whose
+# fingerprint changed are resolved and written, and rows that disappeared from
+# the sheet are removed. KAM_SYNC_INCREMENTAL=0 (or full=True) forces a full
+# re-upsert; KAM_SYNC_DELETE_STALE=0 keeps rows that vanished from the sheet.
+#
+# Large tabs are checkpointed every KAM_SYNC_CHECKPOINT_ROWS written rows:
+# staged rows are flushed and their fingerprints saved, so a run that dies
+# mid-tab resumes from the first row it had not yet persisted.
+# ─────────────────────────────────────────────────────────────────────────────
+
+SYNC_BATCH_SIZE = 500
+
+_progress_state = threading.local()
+
+
+def _checkpoint_rows() -> int:
+    return max(int(_env("KAM_SYNC_CHECKPOINT_ROWS", "2000") or 2000), SYNC_BATCH_SIZE)
+
+
+@contextmanager
+def sync_progress_scope(callback):
+    """
+    Report to callback(rows, checkpoint) while the scope is active: rows
+    processed since the last call, and checkpoint=True right after a mid-tab
+    flush (before its fingerprints are saved).
+    """
+    previous = getattr(_progress_state, "callback", None)
+    _progress_state.callback = callback
+    try:
+        yield
+    finally:
+        _progress_state.callback = previous
+
+
+def _report_progress(rows: int, *, checkpoint: bool = False) -> None:
+    callback = getattr(_progress_state, "callback", None)
+
+    if callback is not None and (rows > 0 or checkpoint):
+        callback(rows, checkpoint)
+
+
+def _chunks(items: List[Any], size: int = SYNC_BATCH_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _sync_context_digest(tab_mapping, db_lookup, env_usermap, *extra) -> str:
+    """
+    Digest of everything besides the row itself that decides what a row
+    resolves to. A new user or KAM mapping therefore re-touches the tabs.
+    """
+    payload = json.dumps(
+        [
+            sorted(tab_mapping.items()),
+            sorted(env_usermap.items()),
+            sorted((key, getattr(user, "pk", None)) for key, user in db_lookup.items()),
+            [str(item) for item in extra],
+        ],
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _row_digest(row: List[Any]) -> str:
+    return json.dumps([str(cell or "").strip() for cell in row], ensure_ascii=False)
+
+
+class _TabSyncState:
+    """
+    Row-fingerprint bookkeeping for one section during one sync run.
+
+    Usage:
+        state = _TabSyncState("sales_f", tab_name, rows, context=..., full=full,
+                              model=InvoiceFact)       # model-backed sections
+        if state.unchanged: return
+        state.see(row_uuid, row)              # every row that has a key
+        if state.is_changed(row_uuid): ...    # resolve + stage only these
+        state.stage(row_uuid, defaults)       # model-backed sections
+        state.mark_written(row_uuid)          # sections that write themselves
+        state.commit(stats, delete_filter={...})
+    """
+
+    def __init__(
+        self,
+        section: str,
+        tab_name: str,
+        rows: List[List[str]],
+        *,
+        context: str,
+        full: bool = False,
+        model=None,
+    ):
+        self.section = section
+        self.tab_name = tab_name
+        self.context = context
+        self.full = full or not _env_flag("KAM_SYNC_INCREMENTAL", True)
+        self.model = model
+        self.row_count = max(len(rows) - 1, 0)
+
+        tab_hash = hashlib.sha256(context.encode("utf-8"))
+        for row in rows:
+            tab_hash.update(_row_digest(row).encode("utf-8"))
+            tab_hash.update(b"\x1e")
+        self.tab_digest = tab_hash.hexdigest()
+
+        self._checksum = SheetTabChecksum.objects.filter(section=section).first()
+        self._stored: Dict[str, Tuple[int, str]] = {}
+        self._loaded = False
+        self._seen: Dict[str, Any] = {}
+        self._staged: Dict[str, Dict[str, Any]] = {}
+        self._written: set = set()
+        self._failed: set = set()
+        self._fingerprinted: set = set()
+        self._checkpoint_every = _checkpoint_rows()
+        self._checkpointed = 0
+        self._reported = 0
+        self.failed = 0
+
+    @property
+    def unchanged(self) -> bool:
+        return bool(
+            not self.full
+            and self._checksum
+            and self._checksum.digest == self.tab_digest
+        )
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        self._stored = {
+            row_uuid: (pk, fingerprint)
+            for row_uuid, pk, fingerprint in SheetRowFingerprint.objects
+            .filter(section=self.section)
+            .values_list("row_uuid", "pk", "fingerprint")
+            .iterator(chunk_size=5000)
+        }
+        self._loaded = True
+
+    def see(self, row_uuid: str, row: List[Any]) -> None:
+        digest = self._seen.get(row_uuid)
+
+        if digest is None:
+            digest = hashlib.sha256(self.context.encode("utf-8"))
+            self._seen[row_uuid] = digest
+
+        digest.update(_row_digest(row).encode("utf-8"))
+        digest.update(b"\x1e")
+
+    def fingerprint(self, row_uuid: str) -> str:
+        digest = self._seen.get(row_uuid)
+        return digest.hexdigest() if digest is not None else ""
+
+    def is_changed(self, row_uuid: str) -> bool:
+        self._tick(1)
+
+        if self.full:
+            return True
+
+        self._load()
+        stored = self._stored.get(row_uuid)
+        return stored is None or stored[1] != self.fingerprint(row_uuid)
+
+    def stage(self, row_uuid: str, defaults: Dict[str, Any]) -> None:
+        self._staged[row_uuid] = defaults
+
+        if self.model is not None and len(self._staged) >= self._checkpoint_every:
+            self._checkpoint()
+
+    def mark_written(self, row_uuid: str) -> None:
+        self._written.add(row_uuid)
+
+        if len(self._written) - len(self._fingerprinted) >= self._checkpoint_every:
+            self._save_fingerprints()
+
+    def mark_failed(self, row_uuid: str = "") -> None:
+        self.failed += 1
+
+        if row_uuid:
+            self._failed.add(row_uuid)
+
+    # ── progress ──────────────────────────────────────────────────────────
+
+    def _tick(self, rows: int) -> None:
+        rows = min(rows, self.row_count - self._reported)
+
+        if rows > 0:
+            self._reported += rows
+            _report_progress(rows)
+
+    def _finish_progress(self) -> None:
+        self._tick(self.row_count - self._reported)
+
+    # ── writes ────────────────────────────────────────────────────────────
+
+    def _checkpoint(self) -> None:
+        """
+        Flush the staged rows mid-tab. On failure they stay staged and the
+        final commit retries them (row by row if needed).
+        """
+        fact_days = self._fact_days(self.model, include_stale=False)
+
+        try:
+            created, updated = self._bulk_upsert(self.model)
+        except Exception as exc:
+            logger.warning("%s: checkpoint upsert failed (%s); deferring to commit.", self.tab_name, exc)
+            return
+
+        # The dirty days must be durable before the fingerprints: a resumed
+        # run will not re-stage these rows.
+        mark_days_dirty(fact_days)
+        _report_progress(0, checkpoint=True)
+
+        self._written.update(self._staged)
+        self._checkpointed += created + updated
+        self._staged = {}
+        self._save_fingerprints()
+
+        logger.info(
+            "%s: checkpoint created=%d updated=%d (total %d)",
+            self.tab_name,
+            created,
+            updated,
+            self._checkpointed,
+        )
+
+    def _bulk_upsert(self, model) -> Tuple[int, int]:
+        staged = self._staged
+        uuids = list(staged)
+        existing: Dict[str, int] = {}
+
+        for chunk in _chunks(uuids):
+            existing.update(
+                model.objects
+                .filter(row_uuid__in=chunk)
+                .values_list("row_uuid", "pk")
+            )
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        update_fields = {"updated_at"}
+
+        for row_uuid, defaults in staged.items():
+            obj = model(row_uuid=row_uuid, **defaults)
+            pk = existing.get(row_uuid)
+
+            if pk:
+                obj.pk = pk
+                obj.updated_at = now
+                update_fields.update(defaults)
+                to_update.append(obj)
+            else:
+                to_create.append(obj)
+
+        with transaction.atomic():
+            if to_create:
+                model.objects.bulk_create(to_create, batch_size=SYNC_BATCH_SIZE)
+            if to_update:
+                model.objects.bulk_update(
+                    to_update,
+                    sorted(update_fields),
+                    batch_size=SYNC_BATCH_SIZE,
+                )
+
+        return len(to_create), len(to_update)
+
+    def _upsert_individually(self, model, stats: SyncStats) -> int:
+        written = 0
+
+        for row_uuid, defaults in self._staged.items():
+            try:
+                with transaction.atomic():
+                    model.objects.update_or_create(row_uuid=row_uuid, defaults=defaults)
+                written += 1
+            except Exception as exc:
+                logger.error("%s row %s upsert failed: %s", self.tab_name, row_uuid[:12], exc)
+                self._staged[row_uuid] = None  # type: ignore[assignment]
+                self.failed += 1
+                stats.skipped += 1
+
+        return written
+
+    def _delete_stale(self, model, delete_filter: Optional[Dict[str, Any]]) -> int:
+        if not _env_flag("KAM_SYNC_DELETE_STALE", True):
+            return 0
+
+        self._load()
+        stale = [row_uuid for row_uuid in self._stored if row_uuid not in self._seen]
+
+        if not stale:
+            return 0
+
+        deleted = 0
+
+        for chunk in _chunks(stale):
+            with transaction.atomic():
+                if model is not None:
+                    deleted += (
+                        model.objects
+                        .filter(row_uuid__in=chunk, **(delete_filter or {}))
+                        .delete()[0]
+                    )
+                SheetRowFingerprint.objects.filter(
+                    section=self.section,
+                    row_uuid__in=chunk,
+                ).delete()
+
+        logger.info(
+            "%s: %d rows removed from sheet, %d DB rows deleted.",
+            self.tab_name,
+            len(stale),
+            deleted,
+        )
+        return deleted
+
+    def _save_fingerprints(self) -> None:
+        self._load()
+        now = timezone.now()
+        to_create = []
+        to_update = []
+
+        pending = self._written - self._failed - self._fingerprinted
+
+        for row_uuid in pending:
+            fingerprint = self.fingerprint(row_uuid)
+
+            if not fingerprint:
+                continue
+
+            stored = self._stored.get(row_uuid)
+
+            if stored is None:
+                to_create.append(
+                    SheetRowFingerprint(
+                        section=self.section,
+                        row_uuid=row_uuid,
+                        fingerprint=fingerprint,
+                        synced_at=now,
+                    )
+                )
+            elif stored[1] != fingerprint:
+                to_update.append(
+                    SheetRowFingerprint(
+                        pk=stored[0],
+                        fingerprint=fingerprint,
+                        synced_at=now,
+                    )
+                )
+
+        with transaction.atomic():
+            if to_create:
+                SheetRowFingerprint.objects.bulk_create(
+                    to_create,
+                    batch_size=SYNC_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+            if to_update:
+                SheetRowFingerprint.objects.bulk_update(
+                    to_update,
+                    ["fingerprint", "synced_at"],
+                    batch_size=SYNC_BATCH_SIZE,
+                )
+
+        self._fingerprinted |= pending
+
+    def _fact_days(self, model, *, include_stale: bool = True) -> set:
+        """
+        KamDailyFact days this commit moves rows from or to: the stored day
+        of every staged / stale row and the staged new day. Read before the
+        writes so the old days are still visible.
+        """
+        field_name = source_day_field(model)
+        if not field_name:
+            return set()
+
+        self._load()
+        stale = (
+            [row_uuid for row_uuid in self._stored if row_uuid not in self._seen]
+            if include_stale
+            else []
+        )
+        touched = list(self._staged) + stale
+        days = {fact_day(defaults.get(field_name)) for defaults in self._staged.values() if defaults}
+
+        for chunk in _chunks(touched):
+            days.update(
+                fact_day(value)
+                for value in model.objects
+                .filter(row_uuid__in=chunk)
+                .values_list(field_name, flat=True)
+            )
+
+        return days
+
+    def commit(
+        self,
+        stats: SyncStats,
+        *,
+        model=None,
+        delete_filter: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Flush staged rows, remove vanished rows, persist fingerprints and the
+        tab digest. Returns the number of staged rows written, checkpoints
+        included.
+        """
+        model = model if model is not None else self.model
+        written = self._checkpointed
+
+        fact_days = self._fact_days(model) if model is not None else set()
+
+        if self._staged and model is not None:
+            try:
+                created, updated = self._bulk_upsert(model)
+                written += created + updated
+                logger.info(
+                    "%s: bulk upsert created=%d updated=%d",
+                    self.tab_name,
+                    created,
+                    updated,
+                )
+            except Exception as exc:
+                logger.warning(
+                    "%s: bulk upsert failed (%s); retrying row by row.",
+                    self.tab_name,
+                    exc,
+                )
+                written += self._upsert_individually(model, stats)
+
+            self._written.update(
+                row_uuid for row_uuid, defaults in self._staged.items() if defaults is not None
+            )
+
+        if model is not None:
+            stats.deleted += self._delete_stale(model, delete_filter)
+            mark_days_dirty(fact_days)
+
+        self._save_fingerprints()
+        self._finish_progress()
+
+        if self.failed:
+            return written
+
+        SheetTabChecksum.objects.update_or_create(
+            section=self.section,
+            defaults={
+                "tab_name": self.tab_name,
+                "digest": self.tab_digest,
+                "row_count": self.row_count,
+                "last_synced_at": timezone.now(),
+            },
+        )
+        return written
+
+    def skip_unchanged(self, stats: SyncStats, label: str) -> SyncStats:
+        self._finish_progress()
+        stats.unchanged += self.row_count
+        stats.notes.append(f"{label}: tab unchanged since last sync")
+        logger.info("%s: tab digest unchanged — section skipped.", label)
+        return stats
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # POST-SYNC BACKFILL
 # ─────────────────────────────────────────────────────────────────────────────
@@ -953,6 +1590,8 @@ def _sync_customers(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_customers())
@@ -961,12 +1600,36 @@ def _sync_customers(
         stats.notes.append("Customer Details tab: no data rows")
         return stats
 
+    tab_name = _tab_customers()
+    state = _TabSyncState(
+        "customers",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap),
+        full=full,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Customer Details")
+
+    parsed: List[Tuple[str, List[str]]] = []
+
     for row in rows[1:]:
         name = _cell(row, 0)
 
         if not name:
             continue
 
+        row_uuid = _make_row_uuid(tab_name, _normalize_customer_name(name).lower())
+        state.see(row_uuid, row)
+        parsed.append((row_uuid, row))
+
+    for row_uuid, row in parsed:
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        name = _cell(row, 0)
         kam_name = _cell(row, 1)
 
         kam_user = (
@@ -994,11 +1657,14 @@ def _sync_customers(
 
                 customer.save()
                 stats.customers_upserted += 1
+                state.mark_written(row_uuid)
 
         except Exception as exc:
             logger.error("Customer upsert failed for %r: %s", name, exc)
             stats.skipped += 1
+            state.mark_failed(row_uuid)
 
+    state.commit(stats)
     return stats
 
 
@@ -1010,6 +1676,8 @@ def _sync_sales_f(
     service, sheet_id: str,
     tab_mapping, db_lookup, env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     """
     Sync Sales (F) tab into InvoiceFact.
@@ -1078,6 +1746,29 @@ def _sync_sales_f(
         col_full_name,
     )
 
+    state = _TabSyncState(
+        "sales_f",
+        tab_name,
+        rows,
+        context=_sync_context_digest(
+            tab_mapping,
+            db_lookup,
+            env_usermap,
+            col_invoice_date,
+            col_customer,
+            col_kam,
+            col_qty,
+            col_full_name,
+        ),
+        full=full,
+        model=InvoiceFact,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Sales (F)")
+
+    parsed: Dict[str, Dict[str, Any]] = {}
+
     for i, row in enumerate(rows[1:], start=2):
         invoice_date_raw = _cell(row, col_invoice_date)
         customer_name = _cell(row, col_customer)
@@ -1085,6 +1776,19 @@ def _sync_sales_f(
         qty_raw = _cell(row, col_qty)
         full_name = _cell(row, col_full_name)
 
+        # Prefer short KAM column. If blank, use Full Name column.
+        effective_kam_name = kam_name or full_name
+
+        row_uuid = _make_row_uuid(
+            tab_name,
+            invoice_date_raw,
+            customer_name,
+            effective_kam_name,
+            qty_raw,
+            i,
+        )
+        state.see(row_uuid, row)
+
         if not customer_name:
             stats.skipped += 1
             logger.debug("Sales (F) row %d skipped: blank customer", i)
@@ -1112,8 +1816,24 @@ def _sync_sales_f(
             )
             continue
 
-        # Prefer short KAM column. If blank, use Full Name column.
-        effective_kam_name = kam_name or full_name
+        parsed[row_uuid] = {
+            "row_number": i,
+            "customer_name": customer_name,
+            "kam_name": kam_name,
+            "full_name": full_name,
+            "effective_kam_name": effective_kam_name,
+            "invoice_date": invoice_date,
+            "qty": qty,
+        }
+
+    for row_uuid, item in parsed.items():
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        i = item["row_number"]
+        customer_name = item["customer_name"]
+        effective_kam_name = item["effective_kam_name"]
 
         kam_user = (
             _resolve_kam_user(
@@ -1133,49 +1853,42 @@ def _sync_sales_f(
             logger.warning(
                 "Sales (F) row %d skipped: unknown KAM %r / full name %r for customer %r",
                 i,
-                kam_name,
-                full_name,
+                item["kam_name"],
+                item["full_name"],
                 customer_name,
             )
             continue
 
         try:
             customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
-
-            row_uuid = _make_row_uuid(
-                tab_name,
-                invoice_date_raw,
-                customer_name,
-                effective_kam_name,
-                qty_raw,
-                i,
-            )
-
-            with transaction.atomic():
-                InvoiceFact.objects.update_or_create(
-                    row_uuid=row_uuid,
-                    defaults={
-                        "customer": customer,
-                        "kam": kam_user,
-                        "invoice_date": invoice_date,
-                        "source_timestamp": None,
-                        "qty_mt": qty,
-                        "invoice_value": Decimal("0"),
-                        "revenue_gst": Decimal("0"),
-                        "raw_buyer_name": customer_name,
-                        "source_tab": tab_name,
-                        "source_status": "IMPORTED",
-                    },
-                )
-
-            stats.sales_upserted += 1
-
         except Exception as exc:
             stats.skipped += 1
+            state.mark_failed(row_uuid)
             logger.error("Sales (F) row %d upsert failed: %s", i, exc)
+            continue
+
+        state.stage(
+            row_uuid,
+            {
+                "customer": customer,
+                "kam": kam_user,
+                "invoice_date": item["invoice_date"],
+                "source_timestamp": None,
+                "qty_mt": item["qty"],
+                "invoice_value": Decimal("0"),
+                "revenue_gst": Decimal("0"),
+                "raw_buyer_name": customer_name,
+                "source_tab": tab_name,
+                "source_status": "IMPORTED",
+            },
+        )
+
+    stats.sales_upserted += state.commit(
+        stats,
+        delete_filter={"source_tab": tab_name},
+    )
+    return stats
 
-    return stats
-
 # ─────────────────────────────────────────────────────────────────────────────
 # SECTION: SALES — Sheet1
 # ─────────────────────────────────────────────────────────────────────────────
@@ -1187,6 +1900,8 @@ def _sync_sheet1(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_sheet1())
@@ -1198,24 +1913,38 @@ def _sync_sheet1(
     tab_name = _tab_sheet1()
     date_parse_failures: List[str] = []
 
+    state = _TabSyncState(
+        "sheet1",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap),
+        full=full,
+        model=InvoiceFact,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Sheet1")
+
+    parsed: Dict[str, Dict[str, Any]] = {}
+
     for row_number, row in enumerate(rows[1:], start=2):
         kam_name = _cell(row, 0)
         customer_name = _cell(row, 1)
         invoice_no = _cell(row, 4)
         invoice_date_raw = _cell(row, 5)
-        value_gst = _decimal(_cell(row, 6))
-        grade = _cell(row, 12)
-        size = _cell(row, 13)
-        qty = _decimal(_cell(row, 14)) or Decimal("0")
-        rate_mt = _decimal(_cell(row, 16))
-        invoice_value = _decimal(_cell(row, 17))
+        invoice_date = _parse_date(invoice_date_raw)
+
+        row_uuid = (
+            _make_row_uuid(tab_name, invoice_no)
+            if invoice_no
+            else _make_row_uuid(tab_name, row_number, invoice_date, customer_name, kam_name)
+        )
+        state.see(row_uuid, row)
 
         if not customer_name:
             stats.skipped += 1
             continue
 
-        invoice_date = _parse_date(invoice_date_raw)
-
         if not invoice_date:
             if invoice_date_raw and invoice_date_raw not in date_parse_failures:
                 date_parse_failures.append(invoice_date_raw)
@@ -1229,45 +1958,60 @@ def _sync_sheet1(
             stats.skipped += 1
             continue
 
+        value_gst = _decimal(_cell(row, 6))
+        invoice_value = _decimal(_cell(row, 17))
+        final_value = value_gst or invoice_value or Decimal("0")
+
+        parsed[row_uuid] = {
+            "kam_name": kam_name,
+            "customer_name": customer_name,
+            "defaults": {
+                "invoice_date": invoice_date,
+                "invoice_no": invoice_no,
+                "invoice_value": final_value,
+                "revenue_gst": final_value,
+                "qty_mt": _decimal(_cell(row, 14)) or Decimal("0"),
+                "rate_mt": _decimal(_cell(row, 16)),
+                "grade": _cell(row, 12),
+                "size": _cell(row, 13),
+                "source_tab": tab_name,
+            },
+        }
+
+    for row_uuid, item in parsed.items():
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        kam_name = item["kam_name"]
+
         kam_user = (
             _resolve_kam_user(kam_name, tab_mapping, db_lookup, env_usermap, stats, local_cache)
             if kam_name
             else None
         )
 
-        customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
-
-        row_uuid = (
-            _make_row_uuid(tab_name, invoice_no)
-            if invoice_no
-            else _make_row_uuid(tab_name, row_number, invoice_date, customer_name, kam_name)
-        )
-
-        final_value = value_gst or invoice_value or Decimal("0")
-
         try:
-            with transaction.atomic():
-                InvoiceFact.objects.update_or_create(
-                    row_uuid=row_uuid,
-                    defaults={
-                        "customer": customer,
-                        "kam": kam_user,
-                        "invoice_date": invoice_date,
-                        "invoice_no": invoice_no,
-                        "invoice_value": final_value,
-                        "revenue_gst": final_value,
-                        "qty_mt": qty,
-                        "rate_mt": rate_mt,
-                        "grade": grade,
-                        "size": size,
-                        "source_tab": tab_name,
-                    },
-                )
-                stats.sales_upserted += 1
-
+            customer = _safe_get_or_create_customer(item["customer_name"], kam_user=kam_user)
         except Exception as exc:
-            logger.error("Sheet1 row %d upsert failed: %s", row_number, exc)
+            logger.error("Sheet1 row %s upsert failed: %s", item["customer_name"], exc)
             stats.skipped += 1
+            state.mark_failed(row_uuid)
+            continue
+
+        state.stage(
+            row_uuid,
+            {
+                "customer": customer,
+                "kam": kam_user,
+                **item["defaults"],
+            },
+        )
+
+    stats.sales_upserted += state.commit(
+        stats,
+        delete_filter={"source_tab": tab_name},
+    )
 
     if date_parse_failures:
         stats.notes.append(
@@ -1289,6 +2033,8 @@ def _sync_frontend(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_frontend())
@@ -1325,70 +2071,97 @@ def _sync_frontend(
         col_remarks,
     )
 
+    state = _TabSyncState(
+        "frontend",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap, header),
+        full=full,
+        model=LeadFact,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Front End")
+
     fallback_doe_count = 0
+    parsed: Dict[str, Dict[str, Any]] = {}
 
     for row_number, row in enumerate(rows[1:], start=2):
         enquiry_no = _cell(row, col_enquiry_no)
         timestamp_raw = _cell(row, col_timestamp)
         kam_name = _cell(row, col_kam_name)
         customer_name = _cell(row, col_customer_name)
-        grade = _cell(row, col_grade)
-        size = _cell(row, col_size)
-        qty_raw = _cell(row, col_qty)
-        status = _cell(row, col_status)
-        revenue_mt = _decimal(_cell(row, col_revenue_mt))
-        remarks = _cell(row, col_remarks)
+
+        row_uuid = (
+            _make_row_uuid(tab_name, enquiry_no)
+            if enquiry_no
+            else _make_row_uuid(tab_name, row_number, timestamp_raw, customer_name, kam_name)
+        )
+        state.see(row_uuid, row)
 
         if not customer_name:
             stats.skipped += 1
             continue
 
-        timestamp = _parse_timestamp(timestamp_raw)
+        parsed[row_uuid] = {
+            "row_number": row_number,
+            "row": row,
+            "kam_name": kam_name,
+            "customer_name": customer_name,
+            "timestamp_raw": timestamp_raw,
+            "enquiry_no": enquiry_no,
+        }
+
+    for row_uuid, item in parsed.items():
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        row = item["row"]
+        kam_name = item["kam_name"]
+
+        timestamp = _parse_timestamp(item["timestamp_raw"])
         doe_date = timestamp.date() if timestamp else None
 
         if not doe_date:
             doe_date = timezone.localdate()
             fallback_doe_count += 1
 
-        qty = _decimal(qty_raw) or Decimal("0")
-
         kam_user = (
             _resolve_kam_user(kam_name, tab_mapping, db_lookup, env_usermap, stats, local_cache)
             if kam_name
             else None
         )
 
-        customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
-
-        row_uuid = (
-            _make_row_uuid(tab_name, enquiry_no)
-            if enquiry_no
-            else _make_row_uuid(tab_name, row_number, timestamp_raw, customer_name, kam_name)
-        )
-
         try:
-            with transaction.atomic():
-                LeadFact.objects.update_or_create(
-                    row_uuid=row_uuid,
-                    defaults={
-                        "customer": customer,
-                        "kam": kam_user,
-                        "doe": doe_date,
-                        "qty_mt": qty,
-                        "status": _normalize_lead_status(status),
-                        "grade": grade,
-                        "size": size,
-                        "revenue_mt": revenue_mt,
-                        "remarks": remarks,
-                        "source_tab": tab_name,
-                        "enquiry_no": enquiry_no,
-                    },
-                )
-                stats.leads_upserted += 1
-
+            customer = _safe_get_or_create_customer(item["customer_name"], kam_user=kam_user)
         except Exception as exc:
-            logger.error("Front End row %d upsert failed: %s", row_number, exc)
+            logger.error("Front End row %d upsert failed: %s", item["row_number"], exc)
             stats.skipped += 1
+            state.mark_failed(row_uuid)
+            continue
+
+        state.stage(
+            row_uuid,
+            {
+                "customer": customer,
+                "kam": kam_user,
+                "doe": doe_date,
+                "qty_mt": _decimal(_cell(row, col_qty)) or Decimal("0"),
+                "status": _normalize_lead_status(_cell(row, col_status)),
+                "grade": _cell(row, col_grade),
+                "size": _cell(row, col_size),
+                "revenue_mt": _decimal(_cell(row, col_revenue_mt)),
+                "remarks": _cell(row, col_remarks),
+                "source_tab": tab_name,
+                "enquiry_no": item["enquiry_no"],
+            },
+        )
+
+    stats.leads_upserted += state.commit(
+        stats,
+        delete_filter={"source_tab": tab_name},
+    )
 
     if fallback_doe_count:
         stats.notes.append(
@@ -1410,6 +2183,8 @@ def _sync_enquiry_f(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_enquiry_f())
@@ -1421,62 +2196,93 @@ def _sync_enquiry_f(
     tab_name = _tab_enquiry_f()
     fallback_doe_count = 0
 
+    state = _TabSyncState(
+        "enquiry_f",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap),
+        full=full,
+        model=LeadFact,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Enquiry (F)")
+
+    parsed: Dict[str, Dict[str, Any]] = {}
+
     for row_number, row in enumerate(rows[1:], start=2):
         timestamp_raw = _cell(row, 0)
         kam_name = _cell(row, 1)
         customer_name = _cell(row, 2)
-        qty_raw = _cell(row, 3)
-        status = _cell(row, 4)
-        remarks = _cell(row, 5)
+
+        row_uuid = _make_row_uuid(
+            tab_name,
+            row_number,
+            timestamp_raw,
+            customer_name,
+            kam_name,
+        )
+        state.see(row_uuid, row)
 
         if not customer_name:
             stats.skipped += 1
             continue
 
-        timestamp = _parse_timestamp(timestamp_raw)
+        parsed[row_uuid] = {
+            "row_number": row_number,
+            "timestamp_raw": timestamp_raw,
+            "kam_name": kam_name,
+            "customer_name": customer_name,
+            "qty_raw": _cell(row, 3),
+            "status": _cell(row, 4),
+            "remarks": _cell(row, 5),
+        }
+
+    for row_uuid, item in parsed.items():
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        kam_name = item["kam_name"]
+
+        timestamp = _parse_timestamp(item["timestamp_raw"])
         doe_date = timestamp.date() if timestamp else None
 
         if not doe_date:
             doe_date = timezone.localdate()
             fallback_doe_count += 1
 
-        qty = _decimal(qty_raw) or Decimal("0")
-
         kam_user = (
             _resolve_kam_user(kam_name, tab_mapping, db_lookup, env_usermap, stats, local_cache)
             if kam_name
             else None
         )
 
-        customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
-
-        row_uuid = _make_row_uuid(
-            tab_name,
-            row_number,
-            timestamp_raw,
-            customer_name,
-            kam_name,
-        )
-
         try:
-            with transaction.atomic():
-                LeadFact.objects.update_or_create(
-                    row_uuid=row_uuid,
-                    defaults={
-                        "customer": customer,
-                        "kam": kam_user,
-                        "doe": doe_date,
-                        "qty_mt": qty,
-                        "status": _normalize_lead_status(status),
-                        "remarks": remarks,
-                        "source_tab": tab_name,
-                    },
-                )
-                stats.leads_upserted += 1
-
+            customer = _safe_get_or_create_customer(item["customer_name"], kam_user=kam_user)
         except Exception as exc:
-            logger.error("Enquiry (F) row %d upsert failed: %s", row_number, exc)
+            logger.error("Enquiry (F) row %d upsert failed: %s", item["row_number"], exc)
             stats.skipped += 1
+            state.mark_failed(row_uuid)
+            continue
+
+        state.stage(
+            row_uuid,
+            {
+                "customer": customer,
+                "kam": kam_user,
+                "doe": doe_date,
+                "qty_mt": _decimal(item["qty_raw"]) or Decimal("0"),
+                "status": _normalize_lead_status(item["status"]),
+                "remarks": item["remarks"],
+                "source_tab": tab_name,
+            },
+        )
+
+    stats.leads_upserted += state.commit(
+        stats,
+        delete_filter={"source_tab": tab_name},
+    )
 
     if fallback_doe_count:
         stats.notes.append(
@@ -1497,6 +2303,8 @@ def _sync_overdues(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_overdues())
@@ -1529,16 +2337,44 @@ def _sync_overdues(
         )
 
     snapshot_date = timezone.localdate()
+    tab_name = _tab_overdues()
+
+    state = _TabSyncState(
+        "overdues",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap, header, snapshot_date),
+        full=full,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Overdues")
+
+    parsed: List[Tuple[str, int, List[str]]] = []
 
     for row_number, row in enumerate(rows[1:], start=2):
         customer_name = _cell(row, col_customer)
-        kam_name = _cell(row, col_kam)
-        overdue_raw = _cell(row, col_overdue)
 
         if not customer_name:
             continue
 
-        overdue_amount = _decimal(overdue_raw)
+        row_uuid = _make_row_uuid(tab_name, _normalize_customer_name(customer_name).lower())
+        state.see(row_uuid, row)
+        parsed.append((row_uuid, row_number, row))
+
+    # customer_id -> defaults; the last sheet row per customer wins,
+    # matching the previous update_or_create(customer, snapshot_date) behaviour.
+    staged: Dict[int, Dict[str, Any]] = {}
+    staged_uuids: List[str] = []
+
+    for row_uuid, row_number, row in parsed:
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        customer_name = _cell(row, col_customer)
+        kam_name = _cell(row, col_kam)
+        overdue_amount = _decimal(_cell(row, col_overdue))
 
         if overdue_amount is None:
             stats.skipped += 1
@@ -1562,30 +2398,76 @@ def _sync_overdues(
             else None
         )
 
-        customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
+        try:
+            customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
+        except Exception as exc:
+            logger.error("Overdues row %d upsert failed: %s", row_number, exc)
+            stats.skipped += 1
+            state.mark_failed(row_uuid)
+            continue
+
+        staged[customer.pk] = {
+            "kam": kam_user,
+            "overdue": overdue_amount,
+            "overdue_amt": overdue_amount,
+            "exposure": exposure,
+            "ageing_0_30": ageing_0_30,
+            "ageing_31_60": ageing_31_60,
+            "ageing_61_90": ageing_61_90,
+            "ageing_90_plus": ageing_90_plus,
+        }
+        staged_uuids.append(row_uuid)
+
+    if staged:
+        existing: Dict[int, int] = {}
+
+        for chunk in _chunks(list(staged)):
+            existing.update(
+                OverdueSnapshot.objects
+                .filter(snapshot_date=snapshot_date, customer_id__in=chunk)
+                .values_list("customer_id", "pk")
+            )
+
+        now = timezone.now()
+        to_create = []
+        to_update = []
+
+        for customer_id, defaults in staged.items():
+            obj = OverdueSnapshot(
+                customer_id=customer_id,
+                snapshot_date=snapshot_date,
+                **defaults,
+            )
+
+            if customer_id in existing:
+                obj.pk = existing[customer_id]
+                obj.updated_at = now
+                to_update.append(obj)
+            else:
+                to_create.append(obj)
 
         try:
             with transaction.atomic():
-                OverdueSnapshot.objects.update_or_create(
-                    customer=customer,
-                    snapshot_date=snapshot_date,
-                    defaults={
-                        "kam": kam_user,
-                        "overdue": overdue_amount,
-                        "overdue_amt": overdue_amount,
-                        "exposure": exposure,
-                        "ageing_0_30": ageing_0_30,
-                        "ageing_31_60": ageing_31_60,
-                        "ageing_61_90": ageing_61_90,
-                        "ageing_90_plus": ageing_90_plus,
-                    },
+                OverdueSnapshot.objects.bulk_create(to_create, batch_size=SYNC_BATCH_SIZE)
+                OverdueSnapshot.objects.bulk_update(
+                    to_update,
+                    ["updated_at", *sorted(next(iter(staged.values())))],
+                    batch_size=SYNC_BATCH_SIZE,
                 )
-                stats.overdues_upserted += 1
+
+            stats.overdues_upserted += len(staged)
+
+            for row_uuid in staged_uuids:
+                state.mark_written(row_uuid)
 
         except Exception as exc:
-            logger.error("Overdues row %d upsert failed: %s", row_number, exc)
-            stats.skipped += 1
+            logger.error("Overdues bulk upsert failed: %s", exc)
+            stats.skipped += len(staged)
+
+            for row_uuid in staged_uuids:
+                state.mark_failed(row_uuid)
 
+    state.commit(stats)
     return stats
 
 
@@ -1600,6 +2482,8 @@ def _sync_overdues_to_collection_plan(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     """
     Sync Google Sheet Overdues tab → CollectionPlan.overdue_amount snapshot.
@@ -1641,8 +2525,35 @@ def _sync_overdues_to_collection_plan(
     snapshot_date = timezone.localdate()
     now_ts = timezone.now()
     processed_pairs = set()
+    tab_name = _tab_overdues()
+
+    state = _TabSyncState(
+        "collection_plan_sync",
+        tab_name,
+        rows,
+        context=_sync_context_digest(tab_mapping, db_lookup, env_usermap, header),
+        full=full,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Collection Plan")
+
+    parsed: List[Tuple[str, int, List[str]]] = []
 
     for row_number, row in enumerate(rows[1:], start=2):
+        row_uuid = _make_row_uuid(
+            tab_name,
+            _normalize_customer_name(_cell(row, col_customer)).lower(),
+            _normalize(_cell(row, col_kam)),
+        )
+        state.see(row_uuid, row)
+        parsed.append((row_uuid, row_number, row))
+
+    for row_uuid, row_number, row in parsed:
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
         customer_name = _cell(row, col_customer)
         kam_name = _cell(row, col_kam)
         overdue_raw = _cell(row, col_overdue)
@@ -1731,6 +2642,7 @@ def _sync_overdues_to_collection_plan(
                     )
 
                 stats.customers_upserted += 1
+                state.mark_written(row_uuid)
 
         except Exception as exc:
             logger.error(
@@ -1741,6 +2653,9 @@ def _sync_overdues_to_collection_plan(
                 exc,
             )
             stats.skipped += 1
+            state.mark_failed(row_uuid)
+
+    state.commit(stats)
 
     logger.info(
         "Collection Plan sync complete: synced=%d skipped=%d unknown_kam=%d",
@@ -1767,6 +2682,8 @@ def _sync_collections(
     db_lookup,
     env_usermap,
     local_cache: Dict,
+    *,
+    full: bool = False,
 ) -> SyncStats:
     stats = SyncStats()
     rows = _get_sheet_values(service, sheet_id, _tab_collection())
@@ -1833,21 +2750,55 @@ def _sync_collections(
         col_remarks,
     )
 
+    state = _TabSyncState(
+        "collection",
+        tab_name,
+        rows,
+        context=_sync_context_digest(
+            tab_mapping,
+            db_lookup,
+            env_usermap,
+            col_date,
+            col_customer,
+            col_kam,
+            col_amount,
+            col_mode,
+            col_ref,
+            col_remarks,
+        ),
+        full=full,
+        model=CollectionTxn,
+    )
+
+    if state.unchanged:
+        return state.skip_unchanged(stats, "Collection")
+
+    parsed: Dict[str, Dict[str, Any]] = {}
+
     for row_number, row in enumerate(rows[1:], start=2):
         date_raw = _cell(row, col_date)
         customer_name = _cell(row, col_customer)
         kam_name = _cell(row, col_kam)
         amount_raw = _cell(row, col_amount)
-        mode = _cell(row, col_mode)
         reference = _cell(row, col_ref)
-        remarks = _cell(row, col_remarks)
+
+        txn_date = _parse_date(date_raw)
+
+        row_uuid = _make_row_uuid(
+            tab_name,
+            row_number,
+            txn_date,
+            customer_name,
+            kam_name,
+            amount_raw,
+            reference,
+        )
+        state.see(row_uuid, row)
 
         if not customer_name or not amount_raw:
             stats.skipped += 1
             continue
 
-        txn_date = _parse_date(date_raw)
-
         if not txn_date:
             logger.warning(
                 "Collection row %d skipped: cannot parse date %r.",
@@ -1878,6 +2829,26 @@ def _sync_collections(
             stats.skipped += 1
             continue
 
+        parsed[row_uuid] = {
+            "row_number": row_number,
+            "customer_name": customer_name,
+            "kam_name": kam_name,
+            "txn_date": txn_date,
+            "amount": amount,
+            "mode": _cell(row, col_mode),
+            "reference": reference,
+            "remarks": _cell(row, col_remarks),
+        }
+
+    for row_uuid, item in parsed.items():
+        if not state.is_changed(row_uuid):
+            stats.unchanged += 1
+            continue
+
+        row_number = item["row_number"]
+        customer_name = item["customer_name"]
+        kam_name = item["kam_name"]
+
         kam_user = _resolve_kam_user(
             kam_name,
             tab_mapping,
@@ -1897,69 +2868,38 @@ def _sync_collections(
             stats.skipped += 1
             continue
 
-        customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
-
-        row_uuid = _make_row_uuid(
-            tab_name,
-            row_number,
-            txn_date,
-            customer_name,
-            kam_name,
-            amount_raw,
-            reference,
-        )
-
         try:
-            with transaction.atomic():
-                transaction_datetime = timezone.make_aware(
-                    datetime(txn_date.year, txn_date.month, txn_date.day)
-                )
-
-                obj, created = CollectionTxn.objects.get_or_create(
-                    row_uuid=row_uuid,
-                    defaults={
-                        "customer": customer,
-                        "kam": kam_user,
-                        "txn_datetime": transaction_datetime,
-                        "amount": amount,
-                        "mode": mode or None,
-                        "reference": reference or None,
-                        "reference_no": reference or None,
-                        "notes": remarks or None,
-                        "source": COLLECTION_SOURCE_SHEET,
-                    },
-                )
-
-                if not created:
-                    obj.customer = customer
-                    obj.kam = kam_user
-                    obj.txn_datetime = transaction_datetime
-                    obj.amount = amount
-                    obj.mode = mode or None
-                    obj.reference = reference or None
-                    obj.reference_no = reference or None
-                    obj.notes = remarks or None
-                    obj.source = COLLECTION_SOURCE_SHEET
-                    obj.save(
-                        update_fields=[
-                            "customer",
-                            "kam",
-                            "txn_datetime",
-                            "amount",
-                            "mode",
-                            "reference",
-                            "reference_no",
-                            "notes",
-                            "source",
-                            "updated_at",
-                        ]
-                    )
-
-                stats.collections_upserted += 1
-
+            customer = _safe_get_or_create_customer(customer_name, kam_user=kam_user)
         except Exception as exc:
             logger.error("Collection row %d upsert failed: %s", row_number, exc)
             stats.skipped += 1
+            state.mark_failed(row_uuid)
+            continue
+
+        txn_date = item["txn_date"]
+        reference = item["reference"]
+
+        state.stage(
+            row_uuid,
+            {
+                "customer": customer,
+                "kam": kam_user,
+                "txn_datetime": timezone.make_aware(
+                    datetime(txn_date.year, txn_date.month, txn_date.day)
+                ),
+                "amount": item["amount"],
+                "mode": item["mode"] or None,
+                "reference": reference or None,
+                "reference_no": reference or None,
+                "notes": item["remarks"] or None,
+                "source": COLLECTION_SOURCE_SHEET,
+            },
+        )
+
+    stats.collections_upserted += state.commit(
+        stats,
+        delete_filter={"source": COLLECTION_SOURCE_SHEET},
+    )
 
     logger.info(
         "Collection sync complete: %d upserted, %d skipped, source=%s.",
@@ -1975,12 +2915,41 @@ def _sync_collections(
 # MAIN SYNC ORCHESTRATOR
 # ─────────────────────────────────────────────────────────────────────────────
 
-def run_sync_now() -> SyncStats:
+def run_sync_now(*, full: bool = False) -> SyncStats:
+    """
+    Sync every enabled section.
+
+    All enabled tabs are fetched up front in one batchGet (see fetch_tabs),
+    so parsing and DB writes never wait on the network.
+
+    Sections are incremental by default (see INCREMENTAL SYNC STATE);
+    full=True re-upserts every row regardless of stored fingerprints.
+
+    KamDailyFact days touched by any section are rebuilt once at the end.
+    """
+    with sync_run_scope():
+        return _run_sync_sections(full=full)
+
+
+def _merge_section_stats(total: SyncStats, section_key: str, stats: SyncStats) -> None:
+    if section_key != "collection_plan_sync":
+        total.merge(stats)
+        return
+
+    # The collection-plan snapshot counts its rows as customers_upserted.
+    total.collections_upserted += stats.customers_upserted
+    total.skipped += stats.skipped
+    total.unknown_kam += stats.unknown_kam
+    total.unchanged += stats.unchanged
+    total.notes.extend(stats.notes)
+
+
+def _run_sync_sections(*, full: bool) -> SyncStats:
     sheet_id = _require_env("KAM_SALES_SHEET_ID")
     sections = resolve_sections()
     total = SyncStats()
 
-    service = build_sheets_service()
+    service = prefetch_service(build_sheets_service(), sheet_id, sections)
 
     tab_mapping = _load_kam_names_tab(service, sheet_id)
     db_lookup = _build_user_lookup()
@@ -1996,37 +2965,37 @@ def run_sync_now() -> SyncStats:
 
     if sections.get("customers"):
         logger.info("Syncing: Customer Details")
-        stats = _sync_customers(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_customers(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → customers=%d skipped=%d", stats.customers_upserted, stats.skipped)
 
     if sections.get("sales_f"):
         logger.info("Syncing: Sales (F)")
-        stats = _sync_sales_f(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_sales_f(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → sales=%d skipped=%d", stats.sales_upserted, stats.skipped)
 
     if sections.get("sheet1"):
         logger.info("Syncing: Sheet1")
-        stats = _sync_sheet1(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_sheet1(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → sales=%d skipped=%d", stats.sales_upserted, stats.skipped)
 
     if sections.get("frontend"):
         logger.info("Syncing: Front End (leads)")
-        stats = _sync_frontend(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_frontend(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → leads=%d skipped=%d", stats.leads_upserted, stats.skipped)
 
     if sections.get("enquiry_f"):
         logger.info("Syncing: Enquiry (F) (leads)")
-        stats = _sync_enquiry_f(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_enquiry_f(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → leads=%d skipped=%d", stats.leads_upserted, stats.skipped)
 
     if sections.get("overdues"):
         logger.info("Syncing: Overdues")
-        stats = _sync_overdues(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_overdues(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → overdues=%d skipped=%d", stats.overdues_upserted, stats.skipped)
 
@@ -2039,12 +3008,10 @@ def run_sync_now() -> SyncStats:
             db_lookup,
             env_usermap,
             local_cache,
+            full=full,
         )
 
-        total.collections_upserted += stats.customers_upserted
-        total.skipped += stats.skipped
-        total.unknown_kam += stats.unknown_kam
-        total.notes.extend(stats.notes)
+        _merge_section_stats(total, "collection_plan_sync", stats)
 
         logger.info(
             "  → collection_plan_synced=%d skipped=%d unknown_kam=%d",
@@ -2055,7 +3022,7 @@ def run_sync_now() -> SyncStats:
 
     if sections.get("collection"):
         logger.info("Syncing: Collection")
-        stats = _sync_collections(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache)
+        stats = _sync_collections(service, sheet_id, tab_mapping, db_lookup, env_usermap, local_cache, full=full)
         total.merge(stats)
         logger.info("  → collections=%d skipped=%d", stats.collections_upserted, stats.skipped)
 
@@ -2117,7 +3084,11 @@ def step_sync(intent: SyncIntent, *args, **kwargs) -> Dict[str, Any]:
     section_key, section_label = _STEPS[cursor]
 
     try:
-        service = build_sheets_service()
+        service = prefetch_service(
+            build_sheets_service(),
+            sheet_id,
+            {section_key: bool(sections.get(section_key))},
+        )
         tab_mapping = _load_kam_names_tab(service, sheet_id)
         db_lookup = _build_user_lookup()
         env_usermap = _load_env_usermap()
@@ -2129,14 +3100,16 @@ def step_sync(intent: SyncIntent, *args, **kwargs) -> Dict[str, Any]:
             sync_function = _STEP_FN_MAP.get(section_key)
 
             if sync_function:
-                stats = sync_function(
-                    service,
-                    sheet_id,
-                    tab_mapping,
-                    db_lookup,
-                    env_usermap,
-                    local_cache,
-                )
+                with sync_run_scope():
+                    stats = sync_function(
+                        service,
+                        sheet_id,
+                        tab_mapping,
+                        db_lookup,
+                        env_usermap,
+                        local_cache,
+                        full=bool(kwargs.get("full", False)),
+                    )
 
         next_cursor = cursor + 1
         is_last = next_cursor >= len(_STEPS)
@@ -2167,6 +3140,8 @@ def step_sync(intent: SyncIntent, *args, **kwargs) -> Dict[str, Any]:
                 "collections_upserted": stats.collections_upserted,
                 "skipped": stats.skipped,
                 "unknown_kam": stats.unknown_kam,
+                "unchanged": stats.unchanged,
+                "deleted": stats.deleted,
                 "kam_backfilled": backfilled,
             },
         }
@@ -2176,4 +3151,120 @@ def step_sync(intent: SyncIntent, *args, **kwargs) -> Dict[str, Any]:
         intent.status = SyncIntent.STATUS_ERROR
         intent.last_error = str(exc)
         intent.save(update_fields=["status", "last_error", "updated_at"])
-        raise
\ No newline at end of file
+        raise
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BACKGROUND SYNC
+#
+# run_sync_intent() drives a whole sync for one SyncIntent from a Celery
+# worker. The cursor (finished sections), accumulated stats, rows processed
+# and the fact days still owed a rebuild are persisted on the intent while it
+# runs; together with the per-tab row checkpoints this lets the next attempt
+# resume a crashed or deferred run where it stopped.
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SyncDeferred(Exception):
+    """Raised between rows once a run has used up its time budget."""
+
+
+class _IntentProgress:
+    """Progress sink for sync_progress_scope() that writes to a SyncIntent."""
+
+    def __init__(self, intent: SyncIntent, fact_days: set, *, deadline: Optional[float] = None):
+        self.intent = intent
+        self.fact_days = fact_days
+        self.deadline = deadline
+        self.interval = float(_env("KAM_SYNC_PROGRESS_INTERVAL", "2") or 2)
+        self._saved_at = 0.0
+
+    def __call__(self, rows: int, checkpoint: bool = False) -> None:
+        self.intent.rows_done += rows
+
+        if checkpoint or time.monotonic() - self._saved_at >= self.interval:
+            self.save()
+
+        # Never between a checkpoint flush and its fingerprints.
+        if not checkpoint and self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SyncDeferred(f"time budget used at {self.intent.section or 'start'}")
+
+    def save(self, *fields: str) -> None:
+        self.intent.heartbeat_at = timezone.now()
+        self.intent.pending_fact_days = sorted(day.isoformat() for day in self.fact_days)
+        self.intent.save(
+            update_fields=["rows_done", "heartbeat_at", "pending_fact_days", *fields, "updated_at"]
+        )
+        self._saved_at = time.monotonic()
+
+
+def run_sync_intent(intent: SyncIntent, *, deadline: Optional[float] = None) -> SyncStats:
+    """
+    Run or resume the sync recorded on intent.
+
+    Sections before intent.cursor_position are skipped; the section at the
+    cursor re-reads its tab and only writes rows past its last checkpoint.
+    deadline is a time.monotonic() value: once passed, SyncDeferred is raised
+    between rows with everything so far persisted. Status is left to the caller.
+    """
+    sheet_id = _require_env("KAM_SALES_SHEET_ID")
+    sections = resolve_sections()
+    cursor = intent.cursor_position or 0
+
+    service = prefetch_service(build_sheets_service(), sheet_id, sections)
+    section_rows = {
+        key: max(len(service.values.get(_section_tab(key), [])) - 1, 0) if sections.get(key) else 0
+        for key, _label in _STEPS
+    }
+
+    total = SyncStats(**(intent.result or {}).get("stats", {}))
+    intent.rows_total = sum(section_rows.values())
+    intent.rows_done = sum(section_rows[key] for key, _label in _STEPS[:cursor])
+
+    tab_mapping = _load_kam_names_tab(service, sheet_id)
+    db_lookup = _build_user_lookup()
+    env_usermap = _load_env_usermap()
+    local_cache: Dict[str, Optional[User]] = {}
+
+    with sync_run_scope() as fact_days:
+        fact_days.update(date.fromisoformat(day) for day in intent.pending_fact_days or [])
+        progress = _IntentProgress(intent, fact_days, deadline=deadline)
+        progress.save("rows_total")
+
+        with sync_progress_scope(progress):
+            for key, label in _STEPS[cursor:]:
+                intent.section = key
+                progress.save("section")
+                sync_function = _STEP_FN_MAP.get(key)
+
+                if sections.get(key) and sync_function:
+                    logger.info("Syncing: %s (intent %s)", label, intent.token)
+                    stats = sync_function(
+                        service,
+                        sheet_id,
+                        tab_mapping,
+                        db_lookup,
+                        env_usermap,
+                        local_cache,
+                        full=intent.full,
+                    )
+                    _merge_section_stats(total, key, stats)
+
+                intent.cursor_position += 1
+                intent.step_count += 1
+                intent.rows_done = sum(
+                    section_rows[step] for step, _label in _STEPS[:intent.cursor_position]
+                )
+                intent.result = {"stats": asdict(total)}
+                progress.save("cursor_position", "step_count", "result")
+
+        backfilled = _backfill_customer_kam()
+
+        if backfilled:
+            total.notes.append(f"KAM backfill: {backfilled} customers updated from invoice history")
+
+    intent.section = ""
+    intent.pending_fact_days = []
+    intent.result = {"stats": asdict(total), "summary": total.as_message(), "kam_backfilled": backfilled}
+    intent.save(update_fields=["section", "pending_fact_days", "result", "updated_at"])
+
+    logger.info("Sync intent %s complete: %s", intent.token, total.as_message())
+    return total
@@ -0,0 +1,62 @@
+# FILE: apps/kam/signals.py
+# PURPOSE: Keep KamDailyFact in step with single-row edits (views, admin,
+#          forms). Bulk sheet-sync writes mark their days themselves in
+#          sheets_adapter._TabSyncState.commit.
+from __future__ import annotations
+
+import logging
+
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .analytics.facts import SOURCE_DAY_FIELDS, mark_days_dirty
+from .models import VisitActual
+
+logger = logging.getLogger(__name__)
+
+
+def _previous_day_value(sender, instance, field_name: str):
+    if instance._state.adding or instance.pk is None:
+        return None
+    return sender.objects.filter(pk=instance.pk).values_list(field_name, flat=True).first()
+
+
+def _remember_previous_day(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    try:
+        instance._kam_fact_previous_day = _previous_day_value(sender, instance, SOURCE_DAY_FIELDS[sender])
+    except Exception:
+        logger.exception("KAM daily facts: previous day lookup failed for %s %s", sender.__name__, instance.pk)
+
+
+def _mark_saved_day(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_days_dirty([
+        getattr(instance, SOURCE_DAY_FIELDS[sender], None),
+        getattr(instance, "_kam_fact_previous_day", None),
+    ])
+
+
+def _mark_deleted_day(sender, instance, **kwargs):
+    mark_days_dirty([getattr(instance, SOURCE_DAY_FIELDS[sender], None)])
+
+
+def _mark_actual_day(sender, instance: VisitActual, raw=False, **kwargs):
+    """A visit actual counts on its plan's visit_date."""
+    if raw:
+        return
+    try:
+        mark_days_dirty([instance.plan.visit_date])
+    except Exception:
+        logger.exception("KAM daily facts: plan lookup failed for VisitActual %s", instance.pk)
+
+
+for _model in SOURCE_DAY_FIELDS:
+    _uid = f"kam_daily_facts_{_model.__name__}"
+    pre_save.connect(_remember_previous_day, sender=_model, dispatch_uid=f"{_uid}_pre_save")
+    post_save.connect(_mark_saved_day, sender=_model, dispatch_uid=f"{_uid}_post_save")
+    post_delete.connect(_mark_deleted_day, sender=_model, dispatch_uid=f"{_uid}_post_delete")
+
+post_save.connect(_mark_actual_day, sender=VisitActual, dispatch_uid="kam_daily_facts_VisitActual_post_save")
+post_delete.connect(_mark_actual_day, sender=VisitActual, dispatch_uid="kam_daily_facts_VisitActual_post_delete")
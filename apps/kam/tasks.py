@@ -1,12 +1,14 @@
 # FILE: apps/kam/tasks.py
 # PURPOSE:
-#   1. Celery tasks for automatic Google Sheet -> PostgreSQL sync.
+#   1. Celery tasks for automatic Google Sheet -> PostgreSQL sync, and for
+#      manager-triggered syncs tracked on SyncIntent.
 #   2. Weekly consolidated KAM Performance Report email.
 #   3. Optional monthly/manual KAM Performance Report tasks.
 #
 # PRODUCTION NOTES:
 #   - Reuses existing sync service: apps.kam.sheets.run_sync_now
-#   - Reuses existing analytics service: apps.kam.analytics.services.build_kam_performance_report
+#   - Reuses existing analytics service: apps.kam.analytics.services.build_kam_performance_reports
+#     (all KAMs in one batch; build_kam_performance_report per KAM as fallback)
 #   - Reuses existing email service: apps.kam.email.send_monthly_kam_performance_report_email
 #   - Does not create duplicate KPI calculations.
 #   - Does not create duplicate scheduler architecture.
@@ -445,13 +447,20 @@ def _build_reports_for_kams(*, start_dt, end_dt) -> tuple[list[dict], list[dict]
     """
     Build existing performance reports for all active KAMs in the period.
 
+    All KAMs are built together by build_kam_performance_reports(); if that
+    batch fails, each KAM is retried on its own so one bad KAM only lands in
+    failed_kams.
+
     Returns:
     - reports
     - failed_kams
     """
     from django.contrib.auth import get_user_model
 
-    from apps.kam.analytics.services import build_kam_performance_report
+    from apps.kam.analytics.services import (
+        build_kam_performance_report,
+        build_kam_performance_reports,
+    )
 
     User = get_user_model()
 
@@ -469,10 +478,30 @@ def _build_reports_for_kams(*, start_dt, end_dt) -> tuple[list[dict], list[dict]
         .order_by("first_name", "last_name", "username")
     )
 
+    kams = list(kams)
+
     reports: list[dict] = []
     failed_kams: list[dict] = []
 
+    try:
+        batched = build_kam_performance_reports(
+            kam_ids=[kam.id for kam in kams],
+            start_dt=start_dt,
+            end_dt=end_dt,
+        )
+    except Exception:
+        logger.exception(
+            "Batched KAM report build failed; falling back to per-KAM reports. kams=%s",
+            len(kams),
+        )
+        batched = {}
+
     for kam in kams:
+        report = batched.get(kam.id)
+        if report is not None:
+            reports.append(report)
+            continue
+
         try:
             report = build_kam_performance_report(
                 kam_id=kam.id,
@@ -517,6 +546,7 @@ def sync_google_sheet_to_db(self):
 
     Error handling:
     - GoogleCredentialError: no retry useful; credentials need manual fix.
+    - RateLimited: shared Sheets quota used up; retry after its countdown.
     - RuntimeError: retry because env/config may be transient during deployment.
     - Any other exception: retry with Celery retry policy.
     """
@@ -535,6 +565,8 @@ def sync_google_sheet_to_db(self):
         class GoogleCredentialError(Exception):  # type: ignore
             pass
 
+    from apps.common.rate_limit import RateLimited
+
     logger.info("KAM periodic sync starting")
 
     try:
@@ -562,6 +594,10 @@ def sync_google_sheet_to_db(self):
             "error": str(exc),
         }
 
+    except RateLimited as exc:
+        logger.info("KAM sync deferred: %s", exc)
+        raise self.retry(exc=exc, countdown=exc.retry_after)
+
     except RuntimeError as exc:
         logger.error("KAM sync: config/runtime error: %s", exc)
         raise self.retry(exc=exc)
@@ -589,6 +625,7 @@ def sync_single_section(self, section_key: str):
     - enquiry_f
     - overdues
     """
+    from apps.common.rate_limit import RateLimited
     from apps.kam import sheets_adapter
 
     try:
@@ -618,7 +655,11 @@ def sync_single_section(self, section_key: str):
 
     try:
         sheet_id = sheets_adapter._require_env("KAM_SALES_SHEET_ID")
-        service = sheets_adapter.build_sheets_service()
+        service = sheets_adapter.prefetch_service(
+            sheets_adapter.build_sheets_service(),
+            sheet_id,
+            {section_key: True},
+        )
         tab_mapping = sheets_adapter._load_kam_names_tab(service, sheet_id)
         db_lookup = sheets_adapter._build_user_lookup()
         env_usermap = sheets_adapter._load_env_usermap()
@@ -632,14 +673,15 @@ def sync_single_section(self, section_key: str):
                 "error": f"No sync function for {section_key}",
             }
 
-        stats = sync_fn(
-            service,
-            sheet_id,
-            tab_mapping,
-            db_lookup,
-            env_usermap,
-            local_cache,
-        )
+        with sheets_adapter.sync_run_scope():
+            stats = sync_fn(
+                service,
+                sheet_id,
+                tab_mapping,
+                db_lookup,
+                env_usermap,
+                local_cache,
+            )
 
         logger.info(
             "KAM section sync complete. section=%s summary=%s",
@@ -665,11 +707,178 @@ def sync_single_section(self, section_key: str):
             "error": str(exc),
         }
 
+    except RateLimited as exc:
+        logger.info("KAM section sync deferred. section=%s: %s", section_key, exc)
+        raise self.retry(exc=exc, countdown=exc.retry_after)
+
     except Exception as exc:
         logger.exception("Error in KAM section sync. section=%s", section_key)
         raise self.retry(exc=exc)
 
 
+# ---------------------------------------------------------------------------
+# Manual sync in the background (SyncIntent)
+# ---------------------------------------------------------------------------
+@shared_task(
+    name="apps.kam.tasks.run_kam_sync_intent",
+    bind=True,
+    soft_time_limit=600,
+    time_limit=720,
+    acks_late=True,
+    reject_on_worker_lost=True,
+)
+def run_kam_sync_intent(self, token: str):
+    """
+    Run or resume the manual sync recorded on SyncIntent(token).
+
+    Each attempt works for KAM_SYNC_TASK_BUDGET seconds (well inside the soft
+    time limit), then stops between rows and re-queues itself; the next
+    attempt resumes from the intent's cursor and the tab row checkpoints.
+    An attempt refused by the shared Sheets quota re-queues itself with the
+    limiter's countdown. A per-intent cache lock keeps a redelivered message from running next
+    to a live attempt.
+    """
+    import os
+    import time
+    import uuid
+
+    from django.core.cache import cache
+    from django.utils import timezone
+
+    from apps.common.rate_limit import RateLimited
+    from apps.kam.models import SyncIntent
+    from apps.kam.sheets_adapter import SyncDeferred, run_sync_intent
+
+    lock_key = f"kam:sync_intent:{token}:lock"
+    lock_token = uuid.uuid4().hex
+
+    if not cache.add(lock_key, lock_token, timeout=720):
+        logger.info("KAM sync intent %s already running; skipped.", token)
+        return {"status": "busy", "token": token}
+
+    deferred = False
+    countdown = 0.0
+
+    try:
+        intent = SyncIntent.objects.filter(token=token).first()
+
+        if intent is None or intent.status == SyncIntent.STATUS_SUCCESS:
+            return {"status": "skipped", "token": token}
+
+        now = timezone.now()
+        intent.status = SyncIntent.STATUS_RUNNING
+        intent.attempts += 1
+        intent.last_error = ""
+        intent.started_at = intent.started_at or now
+        intent.heartbeat_at = now
+        intent.save(
+            update_fields=["status", "attempts", "last_error", "started_at", "heartbeat_at", "updated_at"]
+        )
+
+        budget = float(os.getenv("KAM_SYNC_TASK_BUDGET") or 480)
+
+        try:
+            stats = run_sync_intent(intent, deadline=time.monotonic() + budget)
+        except SyncDeferred as exc:
+            logger.info("KAM sync intent %s deferred: %s", token, exc)
+            intent.status = SyncIntent.STATUS_PENDING
+            intent.save(update_fields=["status", "updated_at"])
+            deferred = True
+            return {"status": "deferred", "token": token}
+        except RateLimited as exc:
+            logger.info("KAM sync intent %s waiting for Sheets quota: %s", token, exc)
+            intent.status = SyncIntent.STATUS_PENDING
+            intent.save(update_fields=["status", "updated_at"])
+            deferred = True
+            countdown = exc.retry_after
+            return {"status": "deferred", "token": token}
+        except Exception as exc:
+            logger.exception("KAM sync intent %s failed", token)
+            intent.status = SyncIntent.STATUS_ERROR
+            intent.last_error = str(exc)
+            intent.finished_at = timezone.now()
+            intent.save(update_fields=["status", "last_error", "finished_at", "updated_at"])
+            return {"status": "error", "token": token, "error": str(exc)}
+
+        intent.status = SyncIntent.STATUS_SUCCESS
+        intent.finished_at = timezone.now()
+        intent.save(update_fields=["status", "finished_at", "updated_at"])
+        return {"status": "ok", "token": token, "summary": stats.as_message()}
+
+    finally:
+        if cache.get(lock_key) == lock_token:
+            cache.delete(lock_key)
+
+        if deferred:
+            run_kam_sync_intent.apply_async(args=[token], countdown=countdown)
+
+
+# ---------------------------------------------------------------------------
+# KAM daily facts safety net
+# ---------------------------------------------------------------------------
+@shared_task(
+    name="apps.kam.tasks.rebuild_recent_kam_daily_facts",
+    bind=True,
+    soft_time_limit=600,
+    time_limit=720,
+)
+def rebuild_recent_kam_daily_facts(self, days: int | None = None):
+    """
+    Nightly: mark the trailing KAM_DAILY_FACTS_RECONCILE_DAYS of KamDailyFact
+    for rebuild and queue a drain of every outstanding mark. Sync and
+    signals keep it current; this catches writes that bypass both
+    (queryset.update(), raw SQL, restores).
+    """
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from apps.kam.analytics.facts import RECONCILE_DAYS, mark_days_dirty, queue_dirty_refresh
+
+    days = max(1, int(days or RECONCILE_DAYS))
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    mark_days_dirty(start + timedelta(days=i) for i in range(days))
+    # Also drains marks left by earlier runs, however old.
+    queue_dirty_refresh()
+
+    return {"status": "queued", "from": start.isoformat(), "to": end.isoformat()}
+
+
+@shared_task(
+    name="apps.kam.tasks.refresh_dirty_kam_daily_facts",
+    bind=True,
+    max_retries=None,
+    default_retry_delay=30,
+    soft_time_limit=600,
+    time_limit=720,
+)
+def refresh_dirty_kam_daily_facts(self):
+    """
+    Rebuild the KamDailyFact days marked by mark_days_dirty, one batch per
+    run. Retries while another refresh holds the lock (marks stay in place)
+    and re-queues itself while marks remain.
+    """
+    from apps.kam.analytics.facts import (
+        KamFactsRefreshBusy,
+        clear_refresh_queued,
+        queue_dirty_refresh,
+        refresh_dirty_days,
+    )
+
+    clear_refresh_queued()
+
+    try:
+        rows, remaining = refresh_dirty_days()
+    except KamFactsRefreshBusy:
+        raise self.retry(countdown=30)
+
+    if remaining:
+        queue_dirty_refresh()
+
+    return {"status": "ok", "rows": rows, "remaining": remaining}
+
+
 # ---------------------------------------------------------------------------
 # Weekly consolidated KAM Performance Report email
 # ---------------------------------------------------------------------------
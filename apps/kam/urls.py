@@ -383,6 +383,12 @@ urlpatterns = [
         name="sync_step",
     ),
 
+    path(
+        "sync/status/",
+        views.sync_status,
+        name="sync_status",
+    ),
+
     # ──────────────────────────────────────────────────────────────────
     # Collection Actual and Report
     # ──────────────────────────────────────────────────────────────────
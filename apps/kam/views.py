@@ -1,8 +1,6 @@
 # FILE: apps/kam/views.py
 from __future__ import annotations
 
-import csv
-import io
 import logging
 import math
 from datetime import date
@@ -35,7 +33,15 @@ from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
+from apps.kam.analytics.facts import (
+    empty_totals as empty_fact_totals,
+    fact_buckets,
+    fact_totals,
+    fact_totals_by_kam,
+)
+from apps.common.exports import csv_response, xlsx_response
 from apps.kam.analytics.services import build_kam_performance_report
+from apps.kam.identity import customer_identity_key
 
 # FIX 5 — explicit login_url on all login_required decorators
 from django.contrib.auth.decorators import login_required as _django_login_required
@@ -1205,52 +1211,9 @@ def _customer360_identity_key(name: str) -> str:
     - AAM Forge Pvt. Ltd. == AAM FORGE PRIVATE LIMITED
     - AKAR AUTO INDUSTRIES LIMITED == AKAR AUTO INDUSTRIES PVT LTD
 
-    Does not modify DB.
-    Does not change display name.
-    """
-    import re
-    import unicodedata
-
-    text = unicodedata.normalize("NFKD", str(name or ""))
-    text = text.encode("ascii", "ignore").decode()
-    text = text.upper()
-
-    replacements = {
-        "&": " AND ",
-        ".": " ",
-        ",": " ",
-        "-": " ",
-        "_": " ",
-        "/": " ",
-        "\\": " ",
-        "(": " ",
-        ")": " ",
-        "PRIVATE": "PVT",
-        "LIMITED": "LTD",
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
-
-    tokens = [token.strip() for token in text.split() if token.strip()]
-
-    removable_suffixes = {
-        "PVT",
-        "LTD",
-        "PRIVATE",
-        "LIMITED",
-        "LLP",
-        "LLC",
-        "INC",
-        "CO",
-        "COMPANY",
-        "CORP",
-        "CORPORATION",
-    }
-
-    tokens = [token for token in tokens if token not in removable_suffixes]
-
-    return re.sub(r"[^A-Z0-9]", "", "".join(tokens))
+    Same key as Customer.identity_key (apps/kam/identity.py).
+    """
+    return customer_identity_key(name)
 
 
 def _customer360_alias_customer_ids(customer: Customer, accessible_qs=None) -> List[int]:
@@ -1259,53 +1222,23 @@ def _customer360_alias_customer_ids(customer: Customer, accessible_qs=None) -> L
 
     Fixes:
     - Existing duplicate customer rows caused by sheet name variations.
-    - Avoids .only() conflict when accessible_qs already has select_related().
+    - Indexed equality match on Customer.identity_key (no icontains scan).
     - Does not modify DB.
     - Does not change display name.
     """
     if not customer:
         return []
 
-    target_key = _customer360_identity_key(customer.name)
+    target_key = customer.identity_key or _customer360_identity_key(customer.name)
 
     if not target_key:
         return [customer.id]
 
     base_qs = accessible_qs if accessible_qs is not None else Customer.objects.all()
 
-    raw_name = str(customer.name or "").strip()
-
-    first_token = ""
-
-    for token in (
-        raw_name
-        .replace(".", " ")
-        .replace(",", " ")
-        .replace("-", " ")
-        .replace("/", " ")
-        .replace("(", " ")
-        .replace(")", " ")
-        .split()
-    ):
-        token = token.strip()
-
-        if token:
-            first_token = token
-            break
-
-    if first_token:
-        candidate_qs = base_qs.filter(name__icontains=first_token)
-    else:
-        candidate_qs = base_qs.filter(id=customer.id)
-
-    alias_ids = []
-
-    # IMPORTANT:
-    # Use values("id", "name") instead of only("id", "name").
-    # .only() conflicts with select_related("kam", "primary_kam") on base_qs.
-    for candidate in candidate_qs.values("id", "name"):
-        if _customer360_identity_key(candidate.get("name")) == target_key:
-            alias_ids.append(candidate.get("id"))
+    # values_list() rather than only(): .only() conflicts with
+    # select_related("kam", "primary_kam") on base_qs.
+    alias_ids = list(base_qs.filter(identity_key=target_key).values_list("id", flat=True))
 
     if customer.id not in alias_ids:
         alias_ids.append(customer.id)
@@ -4071,114 +4004,28 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     )
     inv_qs = _sales_converted_qs(inv_qs)
 
-    visit_plan_qs = (
-        VisitPlan.objects
-        .select_related("kam", "customer", "batch")
-        .filter(
-            visit_date__gte=start_date,
-            visit_date__lt=end_date,
-        )
-    )
-    visit_act_qs = (
-        VisitActual.objects
-        .select_related("plan", "plan__kam", "plan__customer")
-        .filter(
-            plan__visit_date__gte=start_date,
-            plan__visit_date__lt=end_date,
-        )
-    )
-    call_qs = (
-        CallLog.objects
-        .select_related("kam", "customer")
-        .filter(
-            call_datetime__gte=start_dt,
-            call_datetime__lt=end_dt,
-        )
-    )
-    lead_qs = (
-        LeadFact.objects
-        .select_related("kam", "customer")
-        .filter(
-            doe__gte=start_date,
-            doe__lt=end_date,
-        )
-    )
-    coll_qs = (
-        CollectionTxn.objects
-        .select_related("kam", "customer")
-        .filter(
-            txn_datetime__gte=start_dt,
-            txn_datetime__lt=end_dt,
-        )
-    )
-
-    visit_plan_qs = _filter_qs_by_kam_scope(
-        visit_plan_qs,
-        request.user,
-        scope_kam_id,
-        "kam_id",
-    )
-    visit_act_qs = _filter_qs_by_kam_scope(
-        visit_act_qs,
-        request.user,
-        scope_kam_id,
-        "plan__kam_id",
-    )
-    call_qs = _filter_qs_by_kam_scope(
-        call_qs,
-        request.user,
-        scope_kam_id,
-        "kam_id",
-    )
-    lead_qs = _filter_qs_by_kam_scope(
-        lead_qs,
-        request.user,
-        scope_kam_id,
-        "kam_id",
-    )
-    coll_qs = _filter_qs_by_kam_scope(
-        coll_qs,
-        request.user,
-        scope_kam_id,
-        "kam_id",
-    )
+    # Additive figures roll up from the per-KAM daily fact table.
+    scope_kam_ids = _scoped_kam_ids(request.user, scope_kam_id)
+    facts = fact_totals(scope_kam_ids, start_date, end_date)
 
-    sales_mt = _safe_decimal(
-        inv_qs.aggregate(mt=Sum("qty_mt")).get("mt")
-    )
+    sales_mt = _safe_decimal(facts["sales_mt"])
 
-    visits_planned = visit_plan_qs.count()
-    visits_actual = visit_act_qs.count()
-    visits_successful = visit_act_qs.filter(successful=True).count()
+    visits_planned = facts["visits_planned"]
+    visits_actual = facts["visits_actual"]
+    visits_successful = facts["visits_successful"]
 
-    calls_total = call_qs.count()
-    calls_successful = call_qs.filter(
-        outcome__isnull=False,
-    ).exclude(
-        outcome="",
-    ).count()
+    calls_total = facts["calls"]
+    calls_successful = facts["calls_with_outcome"]
 
-    won_status_q = _lead_won_q()
+    # "won" on the dashboard is _lead_won_q(): WON / CONVERTED / ORDER CONVERTED.
+    leads_total_mt = _safe_decimal(facts["leads_mt"])
+    leads_won_mt = _safe_decimal(facts["leads_converted_mt"])
 
-    leads_agg = lead_qs.aggregate(
-        total_mt=Sum("qty_mt"),
-        won_mt=Sum("qty_mt", filter=won_status_q),
-    )
-    leads_total_mt = _safe_decimal(leads_agg.get("total_mt"))
-    leads_won_mt = _safe_decimal(leads_agg.get("won_mt"))
-
-    leads_total_count = lead_qs.count()
-    leads_converted_count = lead_qs.filter(won_status_q).count()
-    leads_converted_value = _safe_decimal(
-        lead_qs
-        .filter(won_status_q)
-        .aggregate(v=Sum("qty_mt"))
-        .get("v")
-    )
+    leads_total_count = facts["leads_count"]
+    leads_converted_count = facts["leads_converted_count"]
+    leads_converted_value = leads_won_mt
 
-    collections_actual = _safe_decimal(
-        coll_qs.aggregate(total_amt=Sum("amount")).get("total_amt")
-    )
+    collections_actual = _safe_decimal(facts["collections_amount"])
 
     if scope_kam_id is not None:
         customer_ids_for_scope = list(
@@ -4356,63 +4203,26 @@ def dashboard(request: HttpRequest) -> HttpResponse:
 
     trend_rows: List[Dict] = []
     anchor_end = _last_completed_ms_week_end(timezone.now())
+    trend_weeks = []
 
     for k in (3, 2, 1, 0):
         end_i = anchor_end - timezone.timedelta(days=7 * k)
         start_i = end_i - timezone.timedelta(days=7)
         _a, _b, pid_i = _ms_week_bounds(start_i)
+        trend_weeks.append((pid_i, start_i.date(), end_i.date()))
 
-        inv_i = _filter_qs_by_kam_scope(
-            InvoiceFact.objects.filter(
-                invoice_date__gte=start_i.date(),
-                invoice_date__lt=end_i.date(),
-            ),
-            request.user,
-            scope_kam_id,
-            "kam_id",
-        )
-        inv_i = _sales_converted_qs(inv_i)
-
-        vis_i = _filter_qs_by_kam_scope(
-            VisitPlan.objects.filter(
-                visit_date__gte=start_i.date(),
-                visit_date__lt=end_i.date(),
-            ),
-            request.user,
-            scope_kam_id,
-            "kam_id",
-        )
-
-        calls_i = _filter_qs_by_kam_scope(
-            CallLog.objects.filter(
-                call_datetime__gte=start_i,
-                call_datetime__lt=end_i,
-            ),
-            request.user,
-            scope_kam_id,
-            "kam_id",
-        )
-
-        coll_i = _filter_qs_by_kam_scope(
-            CollectionTxn.objects.filter(
-                txn_datetime__gte=start_i,
-                txn_datetime__lt=end_i,
-            ),
-            request.user,
-            scope_kam_id,
-            "kam_id",
-        )
+    trend_totals = fact_buckets(
+        scope_kam_ids,
+        [(week_start, week_end) for _pid, week_start, week_end in trend_weeks],
+    )
 
+    for (pid_i, _start, _end), totals in zip(trend_weeks, trend_totals):
         trend_rows.append({
             "week": pid_i,
-            "sales_mt": _safe_decimal(
-                inv_i.aggregate(mt=Sum("qty_mt")).get("mt")
-            ),
-            "visits": vis_i.count(),
-            "calls": calls_i.count(),
-            "collections": _safe_decimal(
-                coll_i.aggregate(a=Sum("amount")).get("a")
-            ),
+            "sales_mt": _safe_decimal(totals["sales_mt"]),
+            "visits": totals["visits_planned"],
+            "calls": totals["calls"],
+            "collections": _safe_decimal(totals["collections_amount"]),
         })
 
     kpi = {
@@ -4606,37 +4416,31 @@ def manager_dashboard(request: HttpRequest) -> HttpResponse:
     else:
         kams = User.objects.filter(is_active=True, id__in=kam_ids).order_by("username")
 
-    for k in kams:
-        v_actual_qs = VisitActual.objects.select_related("plan").filter(
-            plan__kam=k,
+    kams = list(kams)
+    kam_facts = fact_totals_by_kam(
+        [k.id for k in kams],
+        today_start.date(),
+        tomorrow.date(),
+    )
+
+    complete_visits_by_kam: Dict[int, int] = {}
+    for actual in (
+        VisitActual.objects.select_related("plan").filter(
+            plan__kam_id__in=[k.id for k in kams],
             plan__visit_date__gte=today_start.date(),
             plan__visit_date__lt=tomorrow.date(),
         )
+    ):
+        if _post_meeting_details_complete(actual):
+            complete_visits_by_kam[actual.plan.kam_id] = complete_visits_by_kam.get(actual.plan.kam_id, 0) + 1
 
-        complete_visit_count = sum(
-            1
-            for actual in v_actual_qs
-            if _post_meeting_details_complete(actual)
-        )
-
-        c_count = CallLog.objects.filter(
-            kam=k,
-            call_datetime__gte=today_start,
-            call_datetime__lt=tomorrow,
-        ).count()
-
-        l_count = LeadFact.objects.filter(
-            kam=k,
-            doe=today_start.date(),
-        ).count()
+    for k in kams:
+        facts = kam_facts.get(k.id) or empty_fact_totals()
 
-        coll_amt = _safe_decimal(
-            CollectionTxn.objects.filter(
-                kam=k,
-                txn_datetime__gte=today_start,
-                txn_datetime__lt=tomorrow,
-            ).aggregate(a=Sum("amount")).get("a")
-        )
+        complete_visit_count = complete_visits_by_kam.get(k.id, 0)
+        c_count = facts["calls"]
+        l_count = facts["leads_count"]
+        coll_amt = _safe_decimal(facts["collections_amount"])
 
         if complete_visit_count or c_count or l_count or coll_amt:
             kam_rows.append(
@@ -4697,20 +4501,25 @@ def manager_kpis(request: HttpRequest) -> HttpResponse:
         return None
 
     latest_snap_date = OverdueSnapshot.objects.order_by("-snapshot_date").values_list("snapshot_date", flat=True).first()
+    kams = list(kams)
+    kam_facts = fact_totals_by_kam([k.id for k in kams], start_dt, end_dt)
     rows: List[Dict] = []
     for kam in kams:
-        inv_qs = InvoiceFact.objects.filter(kam=kam, invoice_date__gte=start_dt.date(), invoice_date__lt=end_dt.date())
-        inv_qs = _preferred_inv_qs(inv_qs)
-        sales_mt = _safe_decimal(inv_qs.aggregate(mt=Sum("qty_mt")).get("mt"))
-        visits_qs = VisitActual.objects.filter(plan__kam=kam, plan__visit_date__gte=start_dt.date(), plan__visit_date__lt=end_dt.date())
-        visits_actual = visits_qs.count()
-        visits_successful = visits_qs.filter(successful=True).count()
+        facts = kam_facts.get(kam.id) or empty_fact_totals()
+        # Same preference as _preferred_inv_qs: Sales (F), else Sheet1, else any tab.
+        if facts["sales_invoices"]:
+            sales_mt = _safe_decimal(facts["sales_mt"])
+        elif facts["sheet1_invoices"]:
+            sales_mt = _safe_decimal(facts["sheet1_mt"])
+        else:
+            sales_mt = _safe_decimal(facts["invoice_mt"])
+        visits_actual = facts["visits_actual"]
+        visits_successful = facts["visits_successful"]
         visit_success_pct = _pct(Decimal(visits_successful), Decimal(visits_actual)) if visits_actual else None
-        calls = CallLog.objects.filter(kam=kam, call_datetime__gte=start_dt, call_datetime__lt=end_dt).count()
-        collections_actual = _safe_decimal(CollectionTxn.objects.filter(kam=kam, txn_datetime__gte=start_dt, txn_datetime__lt=end_dt).aggregate(a=Sum("amount")).get("a"))
-        leads_agg = LeadFact.objects.filter(kam=kam, doe__gte=start_dt.date(), doe__lt=end_dt.date()).aggregate(total_mt=Sum("qty_mt"), won_mt=Sum("qty_mt", filter=Q(status="WON")))
-        leads_total_mt = _safe_decimal(leads_agg.get("total_mt"))
-        leads_won_mt = _safe_decimal(leads_agg.get("won_mt"))
+        calls = facts["calls"]
+        collections_actual = _safe_decimal(facts["collections_amount"])
+        leads_total_mt = _safe_decimal(facts["leads_mt"])
+        leads_won_mt = _safe_decimal(facts["leads_won_mt"])
         lead_conv_pct = _pct(leads_won_mt, leads_total_mt) if leads_total_mt else None
         credit_limit_sum = _safe_decimal(Customer.objects.filter(Q(kam=kam) | Q(primary_kam=kam)).aggregate(s=Sum("credit_limit")).get("s"))
         exposure_sum = overdue_sum = Decimal(0)
@@ -8840,46 +8649,20 @@ def export_kpi_csv(request: HttpRequest) -> HttpResponse:
 
     filename_period = f"{start_dt.date()}_to_{(end_dt - timezone.timedelta(days=1)).date()}"
 
-    if export_format in {"xlsx", "excel"}:
-        try:
-            from openpyxl import Workbook
-        except Exception:
-            logger.exception("openpyxl is not installed. Excel export failed.")
-            return HttpResponse(
-                "Excel export requires openpyxl to be installed.",
-                status=500,
-                content_type="text/plain",
-            )
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "KAM Performance"
-
-        for row in rows:
-            ws.append(row)
-
-        for column_cells in ws.columns:
-            max_length = 0
-            col_letter = column_cells[0].column_letter
-
-            for cell in column_cells:
-                value = "" if cell.value is None else str(cell.value)
-                max_length = max(max_length, len(value))
+    header, body = rows[0], rows[1:]
 
-            ws.column_dimensions[col_letter].width = min(max_length + 2, 36)
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-
-        response = HttpResponse(
-            buffer.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = (
-            f'attachment; filename="kam_performance_{filename_period}.xlsx"'
+    if export_format in {"xlsx", "excel"}:
+        widths = [
+            min(max(len("" if value is None else str(value)) for value in column) + 2, 36)
+            for column in zip(*rows)
+        ]
+        return xlsx_response(
+            f"kam_performance_{filename_period}.xlsx",
+            header,
+            body,
+            sheet_title="KAM Performance",
+            column_widths=widths,
         )
-        return response
 
     if export_format == "pdf":
         html = render_to_string(
@@ -8956,17 +8739,7 @@ def export_kpi_csv(request: HttpRequest) -> HttpResponse:
             )
             return response
 
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-
-    for row in rows:
-        writer.writerow(row)
-
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = (
-        f'attachment; filename="kam_performance_{filename_period}.csv"'
-    )
-    return response
+    return csv_response(f"kam_performance_{filename_period}.csv", header, body)
 
 # =====================================================================
 # Collections Plan
@@ -9833,23 +9606,28 @@ def direct_batch_reject(request: HttpRequest, token: str) -> HttpResponse:
 # =====================================================================
 # Sync endpoints
 # =====================================================================
+def _sync_started(request: HttpRequest, intent: SyncIntent) -> HttpResponse:
+    if _wants_json(request):
+        return JsonResponse({"ok": True, "result": sheets.sync_intent_status(intent)}, status=202)
+    messages.success(
+        request,
+        f"Sync running in the background (token={intent.token}). "
+        "Figures update as each section finishes.",
+    )
+    return redirect(reverse("kam:dashboard"))
+
+
 @login_required(login_url="/accounts/login/")
 @require_kam_code("kam_sync_now")
 def sync_now(request: HttpRequest) -> HttpResponse:
     if not _is_manager(request.user):
         return HttpResponseForbidden("403 Forbidden: Manager access required.")
     try:
-        stats = sheets.run_sync_now() or {}
-        summary = stats.get("summary")
-        if not summary:
-            seen = stats.get("records_seen")
-            created = stats.get("created")
-            updated = stats.get("updated")
-            summary = f"Seen={seen} Created={created} Updated={updated}" if any(v is not None for v in (seen, created, updated)) else "Sync complete."
-        messages.success(request, f"Sync complete. {summary}")
+        intent = sheets.start_background_sync(request.user)
     except Exception as e:
         messages.error(request, f"Sync failed: {e}")
-    return redirect(reverse("kam:dashboard"))
+        return redirect(reverse("kam:dashboard"))
+    return _sync_started(request, intent)
 
 
 @login_required(login_url="/accounts/login/")
@@ -9857,10 +9635,8 @@ def sync_now(request: HttpRequest) -> HttpResponse:
 def sync_trigger(request: HttpRequest) -> HttpResponse:
     if not _is_manager(request.user):
         return HttpResponseForbidden("403 Forbidden: Manager access required.")
-    token = timezone.now().strftime("%Y%m%d%H%M%S") + f"_{request.user.id}"
-    intent = SyncIntent.objects.create(token=token, created_by=request.user, scope=SyncIntent.SCOPE_TEAM)
-    messages.success(request, f"Sync triggered (token={intent.token}).")
-    return redirect(reverse("kam:dashboard"))
+    intent = sheets.start_background_sync(request.user)
+    return _sync_started(request, intent)
 
 
 @login_required(login_url="/accounts/login/")
@@ -9872,42 +9648,37 @@ def sync_step(request: HttpRequest) -> HttpResponse:
 
     if request.method == "POST" and not token:
         try:
-            stats = sheets.run_sync_now() or {}
-            summary = stats.get("summary")
-            if not summary:
-                seen = stats.get("records_seen")
-                created = stats.get("created")
-                updated = stats.get("updated")
-                summary = f"Seen={seen} Created={created} Updated={updated}" if any(v is not None for v in (seen, created, updated)) else "Sync complete."
-            messages.success(request, f"Sync complete. {summary}")
+            intent = sheets.start_background_sync(request.user)
         except Exception as e:
             messages.error(request, f"Sync failed: {e}")
-        return redirect(reverse("kam:dashboard"))
+            return redirect(reverse("kam:dashboard"))
+        return _sync_started(request, intent)
 
     if not token:
         return JsonResponse({"ok": False, "error": "token missing"}, status=400)
 
     intent = get_object_or_404(SyncIntent, token=token)
-    try:
-        intent.status = SyncIntent.STATUS_RUNNING
-        intent.step_count = int(intent.step_count or 0) + 1
-        intent.last_error = ""
-        intent.save(update_fields=["status", "step_count", "last_error", "updated_at"])
-        try:
-            result = sheets.step_sync(intent)
-        except TypeError:
-            result = sheets.step_sync(intent=intent)
-        if not isinstance(result, dict):
-            raise RuntimeError("sheets.step_sync must return a dict")
-        done = bool(result.get("done"))
-        intent.status = SyncIntent.STATUS_SUCCESS if done else SyncIntent.STATUS_PENDING
-        intent.save(update_fields=["status", "updated_at"])
-        return JsonResponse({"ok": True, "result": result})
-    except Exception as e:
-        intent.status = SyncIntent.STATUS_ERROR
-        intent.last_error = str(e)
-        intent.save(update_fields=["status", "last_error", "updated_at"])
-        return JsonResponse({"ok": False, "error": str(e)}, status=500)
+    sheets.resume_stale_sync(intent)
+    return JsonResponse({"ok": True, "result": sheets.sync_intent_status(intent)})
+
+
+@login_required(login_url="/accounts/login/")
+@require_any_kam_code("kam_sync_now", "kam_sync_trigger", "kam_sync_step")
+def sync_status(request: HttpRequest) -> HttpResponse:
+    """Polling endpoint for a background sync; the latest one without ?token=."""
+    if not _is_manager(request.user):
+        return HttpResponseForbidden("403 Forbidden: Manager access required.")
+    token = (request.GET.get("token") or "").strip()
+
+    if token:
+        intent = get_object_or_404(SyncIntent, token=token)
+    else:
+        intent = SyncIntent.objects.filter(started_at__isnull=False).order_by("-created_at").first()
+        if intent is None:
+            return JsonResponse({"ok": False, "error": "no sync has run yet"}, status=404)
+
+    sheets.resume_stale_sync(intent)
+    return JsonResponse({"ok": True, "result": sheets.sync_intent_status(intent)})
 
 # =====================================================================
 # URL BACKWARD-COMPATIBILITY FIXES
@@ -59,6 +59,16 @@ def _normalize_dates(dates: Iterable[_date]) -> set[_date]:
     return {d for d in (dates or []) if isinstance(d, _date)}
 
 
+def _invalidate_dashboards(employee_id: int) -> None:
+    # Queryset updates bypass the task signals that normally do this.
+    try:
+        from dashboard.payload_cache import invalidate_user_dashboards_on_commit
+
+        invalidate_user_dashboards_on_commit([employee_id])
+    except Exception:
+        log.debug("Dashboard invalidation skipped for employee %s", employee_id, exc_info=True)
+
+
 # ---- Signal consumers (from leave app) ------------------------------------
 
 def _apply_block_for_dates(employee_id: int, dates: set[_date]) -> int:
@@ -98,6 +108,8 @@ def _apply_block_for_dates(employee_id: int, dates: set[_date]) -> int:
             except Exception:
                 log.exception("Leave block: update failed on %s", Model.__name__)
         # If the field does not exist, we don’t try to write. Dashboards must filter.
+    if total:
+        _invalidate_dashboards(employee_id)
     return total
 
 
@@ -124,6 +136,8 @@ def _clear_block_for_dates(employee_id: int, dates: set[_date]) -> int:
             total += int(updated)
         except Exception:
             log.exception("Leave unblock: update failed on %s", Model.__name__)
+    if total:
+        _invalidate_dashboards(employee_id)
     return total
 
 
@@ -55,6 +55,7 @@ class Command(BaseCommand):
         from apps.leave.utils import (
             get_leave_year_bounds,
             sync_employee_leave_balance,
+            sync_leave_balances_bulk,
         )
 
         year = options.get("year")
@@ -100,6 +101,13 @@ class Command(BaseCommand):
         total_ok = 0
         total_failed = 0
 
+        # Every user and leave year in one pass; per-user sync only if that fails.
+        try:
+            balances = sync_leave_balances_bulk(users, periods)
+        except Exception as e:
+            self.stdout.write(self.style.WARNING(f"Bulk recalculation failed ({e}); falling back to per-employee."))
+            balances = {}
+
         for leave_year_start, leave_year_end in periods:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -111,7 +119,9 @@ class Command(BaseCommand):
 
             for user in users:
                 try:
-                    balance = sync_employee_leave_balance(user, leave_year_start, leave_year_end)
+                    balance = balances.get((user.id, leave_year_start)) or sync_employee_leave_balance(
+                        user, leave_year_start, leave_year_end
+                    )
                     cf = getattr(balance, "carry_forward_adjustment", 0) or 0
                     cf_str = f"CF:{cf:+.0f}" if cf != 0 else "CF: 0"
                     self.stdout.write(
@@ -113,6 +113,17 @@ def _dedupe_emails_preserve_order(emails: List[str]) -> List[str]:
     return out
 
 
+def _invalidate_handover_dashboards(handovers) -> None:
+    # Queryset updates bypass the handover signals that normally do this;
+    # call before the update so the rows still match `handovers`.
+    try:
+        from dashboard.payload_cache import invalidate_handover_dashboards
+
+        invalidate_handover_dashboards(handovers)
+    except Exception:
+        logger.debug("Dashboard invalidation skipped for handover update", exc_info=True)
+
+
 # =============================================================================
 # APPROVER / CC CONFIGURATION
 # =============================================================================
@@ -900,7 +911,9 @@ class LeaveRequest(models.Model):
             self.decided_at = timezone.now()
             self.decision_comment = comment or self.decision_comment
 
-            LeaveHandover.objects.filter(leave_request=self).update(is_active=False)
+            handovers = LeaveHandover.objects.filter(leave_request=self)
+            _invalidate_handover_dashboards(handovers)
+            handovers.update(is_active=False)
             DelegationReminder.objects.filter(leave_handover__leave_request=self).update(is_active=False)
 
             self.save(
@@ -934,7 +947,9 @@ class LeaveRequest(models.Model):
             self.decided_at = timezone.now()
             self.decision_comment = comment or self.decision_comment or "Cancelled."
 
-            LeaveHandover.objects.filter(leave_request=self).update(is_active=False)
+            handovers = LeaveHandover.objects.filter(leave_request=self)
+            _invalidate_handover_dashboards(handovers)
+            handovers.update(is_active=False)
             DelegationReminder.objects.filter(leave_handover__leave_request=self).update(is_active=False)
 
             self.save(
@@ -1055,7 +1070,9 @@ class LeaveHandoverQuerySet(models.QuerySet):
         if not ids:
             return 0
 
-        updated = LeaveHandover.objects.filter(id__in=ids, is_active=True).update(is_active=False)
+        handovers = LeaveHandover.objects.filter(id__in=ids, is_active=True)
+        _invalidate_handover_dashboards(handovers)
+        updated = handovers.update(is_active=False)
 
         DelegationReminder.objects.filter(
             leave_handover_id__in=ids,
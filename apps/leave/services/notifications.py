@@ -11,12 +11,13 @@ from zoneinfo import ZoneInfo
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import signing
-from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import get_template
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import escape
 
+from apps.common.mail_pipeline import send_message
 from apps.leave.models import (
     LeaveRequest,
     LeaveDecisionAudit,
@@ -204,20 +205,20 @@ def _send(
         pass
 
     try:
-        with get_connection() as conn:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=txt,
-                from_email=from_email,
-                to=to_list,
-                cc=cc or None,
-                reply_to=reply_to or None,
-                connection=conn,
-            )
+        # Shared pooled connection: approver + CC fan-outs reuse one
+        # SMTP session instead of a handshake per email.
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=txt,
+            from_email=from_email,
+            to=to_list,
+            cc=cc or None,
+            reply_to=reply_to or None,
+        )
 
-            msg.attach_alternative(html, "text/html")
+        msg.attach_alternative(html, "text/html")
 
-            sent = msg.send(fail_silently=fail_silently)
+        sent = send_message(msg, fail_silently=fail_silently)
 
         if sent:
             logger.info(
@@ -17,7 +17,7 @@ from datetime import datetime                        # ← FIX: import datetime
 from typing import Optional
 from django.utils import timezone
 
-from apps.leave.models import LeaveHandover, LeaveStatus, DelegationReminder
+from apps.leave.models import LeaveHandover, LeaveStatus, DelegationReminder, _invalidate_handover_dashboards
 
 # Re-export actual implementations to satisfy legacy imports
 from .handover import apply_handover_for_leave, send_handover_email  # noqa: F401
@@ -50,7 +50,9 @@ def deactivate_expired_handovers(now_date: Optional[datetime] = None) -> int:  #
         if not ids:
             return 0
 
-        updated = LeaveHandover.objects.filter(id__in=ids, is_active=True).update(is_active=False)
+        handovers = LeaveHandover.objects.filter(id__in=ids, is_active=True)
+        _invalidate_handover_dashboards(handovers)
+        updated = handovers.update(is_active=False)
         DelegationReminder.objects.filter(leave_handover_id__in=ids, is_active=True).update(is_active=False)
 
         logger.info("Expired handovers deactivated: %s", updated)
@@ -0,0 +1,343 @@
+# apps/leave/services/task_skips.py
+"""
+Leave-window task blocking.
+
+Keeps ``is_skipped_due_to_leave`` on Checklist, Delegation, HelpTicket and FMS
+in line with an employee's active (PENDING / APPROVED) leaves.
+
+The set of tasks blocked by all of an employee's active leaves is expressed as
+one filter per model, so a re-sync is a fixed number of statements however
+many leaves or tasks are involved:
+
+- one query for the active leaves, one for their handover exclusions;
+- per model, one UPDATE that restores tasks no longer covered and one that
+  skips tasks newly covered.
+
+Rows already in the right state are not touched.
+
+Re-syncs triggered by leave changes run after commit on a Celery worker
+(queue_leave_task_skip_resync -> apps.leave.tasks.resync_leave_task_skips).
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from zoneinfo import ZoneInfo
+
+from django.apps import apps as django_apps
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.leave.models import LeaveRequest, LeaveStatus
+
+logger = logging.getLogger(__name__)
+
+IST = ZoneInfo("Asia/Kolkata")
+
+# Active leave statuses that should block/hide/skip tasks.
+ACTIVE_TASK_BLOCKING_STATUSES = {
+    LeaveStatus.PENDING,
+    LeaveStatus.APPROVED,
+}
+
+TASK_KEYS = ("checklist", "delegation", "help_ticket", "fms")
+
+# Help tickets in these states are never skipped.
+CLOSED_HELP_TICKET_STATUSES = ["Closed", "COMPLETED", "Completed", "Done"]
+
+__all__ = [
+    "ACTIVE_TASK_BLOCKING_STATUSES",
+    "leave_window",
+    "blocked_task_filters",
+    "apply_leave_task_skips",
+    "restore_leave_task_skips",
+    "sync_employee_leave_task_skips",
+    "queue_leave_task_skip_resync",
+]
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {key: 0 for key in TASK_KEYS}
+
+
+def _task_models() -> Dict[str, object]:
+    return {
+        "checklist": django_apps.get_model("tasks", "Checklist"),
+        "delegation": django_apps.get_model("tasks", "Delegation"),
+        "help_ticket": django_apps.get_model("tasks", "HelpTicket"),
+        "fms": django_apps.get_model("tasks", "FMS"),
+    }
+
+
+# -------------------------------------------------------------------------
+# Leave windows
+# -------------------------------------------------------------------------
+def leave_window(leave: LeaveRequest):
+    """
+    Return the normalized IST leave window:
+    (start_ist, end_ist, start_date, end_date, is_half_day), or None when
+    start_at / end_at is missing.
+    """
+    start_at = getattr(leave, "start_at", None)
+    end_at = getattr(leave, "end_at", None)
+
+    if not start_at or not end_at:
+        return None
+
+    start_ist = timezone.localtime(start_at, IST)
+    end_ist = timezone.localtime(end_at, IST)
+
+    if end_ist < start_ist:
+        start_ist, end_ist = end_ist, start_ist
+
+    start_date = getattr(leave, "start_date", None) or start_ist.date()
+    end_date = getattr(leave, "end_date", None) or end_ist.date()
+
+    if end_date < start_date:
+        start_date, end_date = end_date, start_date
+
+    return start_ist, end_ist, start_date, end_date, bool(getattr(leave, "is_half_day", False))
+
+
+def _window_q(key: str, window) -> Optional[Q]:
+    start_ist, end_ist, start_date, end_date, is_half_day = window
+
+    if key == "fms":
+        # FMS planned_date is a DateField: no half-day precision, so FMS is
+        # only skipped for full-day leave.
+        if is_half_day:
+            return None
+        return Q(planned_date__gte=start_date, planned_date__lte=end_date)
+
+    if is_half_day:
+        return Q(planned_date__gte=start_ist, planned_date__lt=end_ist)
+
+    return Q(planned_date__date__gte=start_date, planned_date__date__lte=end_date)
+
+
+_BASE_FILTERS = {
+    "checklist": Q(status="Pending"),
+    "delegation": Q(status="Pending"),
+    "help_ticket": ~Q(status__in=CLOSED_HELP_TICKET_STATUSES),
+    "fms": Q(),
+}
+
+
+def _handover_exclusions(leave_ids: List[int]) -> Dict[Tuple[int, str], Set[int]]:
+    """
+    Task IDs handed over during each leave; those stay with the delegate and
+    are not skipped for the original assignee.
+    """
+    exclusions: Dict[Tuple[int, str], Set[int]] = {}
+
+    if not leave_ids:
+        return exclusions
+
+    try:
+        from apps.leave.models import LeaveHandover
+
+        rows = (
+            LeaveHandover.objects
+            .filter(leave_request_id__in=leave_ids, is_active=True)
+            .values_list("leave_request_id", "task_type", "original_task_id")
+        )
+
+        for leave_id, task_type, task_id in rows:
+            key = str(task_type or "").strip().lower()
+            exclusions.setdefault((leave_id, key), set()).add(task_id)
+
+    except Exception:
+        logger.exception("Could not resolve handover exclusions for leaves %s", leave_ids)
+
+    return exclusions
+
+
+def blocked_task_filters(
+    leaves: Iterable[LeaveRequest],
+    *,
+    exclude_handover: bool = True,
+) -> Dict[str, Optional[Q]]:
+    """
+    Per task model key, the filter matching every task the given leaves
+    block (None when they block nothing). Inactive leaves are ignored.
+    """
+    leaves = [
+        leave for leave in leaves
+        if getattr(leave, "status", None) in ACTIVE_TASK_BLOCKING_STATUSES
+    ]
+    exclusions = _handover_exclusions([leave.pk for leave in leaves if leave.pk]) if exclude_handover else {}
+
+    windows: Dict[str, Q] = {}
+
+    for leave in leaves:
+        window = leave_window(leave)
+
+        if not window:
+            logger.warning(
+                "Task auto-skip ignored for leave %s because start_at/end_at is missing.",
+                getattr(leave, "id", None),
+            )
+            continue
+
+        for key in TASK_KEYS:
+            window_q = _window_q(key, window)
+
+            if window_q is None:
+                continue
+
+            excluded = exclusions.get((leave.pk, key))
+            if excluded:
+                window_q &= ~Q(id__in=sorted(excluded))
+
+            windows[key] = windows[key] | window_q if key in windows else window_q
+
+    return {
+        key: (_BASE_FILTERS[key] & windows[key]) if key in windows else None
+        for key in TASK_KEYS
+    }
+
+
+# -------------------------------------------------------------------------
+# Apply / restore
+# -------------------------------------------------------------------------
+def _invalidate_dashboards(employee_id: int) -> None:
+    # Queryset updates bypass the task signals that normally do this.
+    try:
+        from dashboard.payload_cache import invalidate_user_dashboards
+
+        invalidate_user_dashboards([employee_id])
+    except Exception:
+        logger.debug("Dashboard invalidation skipped for employee %s", employee_id, exc_info=True)
+
+
+def apply_leave_task_skips(leave: LeaveRequest, *, exclude_handover: bool = True) -> Dict[str, int]:
+    """
+    Skip tasks inside one active leave (e.g. right after it is applied).
+    Returns per-model counts of newly skipped tasks.
+    """
+    counts = _empty_counts()
+    employee_id = getattr(leave, "employee_id", None)
+
+    if not employee_id or getattr(leave, "status", None) not in ACTIVE_TASK_BLOCKING_STATUSES:
+        return counts
+
+    filters = blocked_task_filters([leave], exclude_handover=exclude_handover)
+
+    for key, model in _task_models().items():
+        if filters[key] is not None:
+            counts[key] = int(
+                model.objects
+                .filter(assign_to_id=employee_id, is_skipped_due_to_leave=False)
+                .filter(filters[key])
+                .update(is_skipped_due_to_leave=True)
+            )
+
+    if any(counts.values()):
+        _invalidate_dashboards(employee_id)
+
+    return counts
+
+
+def restore_leave_task_skips(employee_id: int) -> Dict[str, int]:
+    """Un-skip every task skipped because of leave for one employee."""
+    counts = _empty_counts()
+
+    if not employee_id:
+        return counts
+
+    for key, model in _task_models().items():
+        counts[key] = int(
+            model.objects
+            .filter(assign_to_id=employee_id, is_skipped_due_to_leave=True)
+            .update(is_skipped_due_to_leave=False)
+        )
+
+    if any(counts.values()):
+        _invalidate_dashboards(employee_id)
+
+    return counts
+
+
+@transaction.atomic
+def sync_employee_leave_task_skips(
+    employee_id: int,
+    *,
+    exclude_handover: bool = True,
+) -> Dict[str, object]:
+    """
+    Bring one employee's task skip flags in line with their active leaves.
+
+    Handles leave apply, approval, rejection, deletion, date changes and
+    overlapping leaves alike. Returns the active leave IDs and per-model
+    counts of the flags changed: "unskipped" (no longer covered by any
+    active leave) and "newly_skipped" (covered but not yet skipped). Tasks
+    already in the right state are in neither count.
+    """
+    result: Dict[str, object] = {
+        "unskipped": _empty_counts(),
+        "newly_skipped": _empty_counts(),
+        "active_leave_ids": [],
+    }
+
+    if not employee_id:
+        return result
+
+    active_leaves = list(
+        LeaveRequest.objects
+        .filter(employee_id=employee_id, status__in=ACTIVE_TASK_BLOCKING_STATUSES)
+        .only("id", "employee_id", "status", "start_at", "end_at", "start_date", "end_date", "is_half_day")
+        .order_by("start_at", "id")
+    )
+    filters = blocked_task_filters(active_leaves, exclude_handover=exclude_handover)
+
+    for key, model in _task_models().items():
+        tasks = model.objects.filter(assign_to_id=employee_id)
+        blocked = filters[key]
+
+        if blocked is None:
+            result["unskipped"][key] = int(
+                tasks.filter(is_skipped_due_to_leave=True).update(is_skipped_due_to_leave=False)
+            )
+            continue
+
+        result["unskipped"][key] = int(
+            tasks.filter(is_skipped_due_to_leave=True).exclude(blocked).update(is_skipped_due_to_leave=False)
+        )
+        result["newly_skipped"][key] = int(
+            tasks.filter(is_skipped_due_to_leave=False).filter(blocked).update(is_skipped_due_to_leave=True)
+        )
+
+    result["active_leave_ids"] = [leave.id for leave in active_leaves]
+
+    if any(result["unskipped"].values()) or any(result["newly_skipped"].values()):
+        transaction.on_commit(lambda: _invalidate_dashboards(employee_id))
+
+    logger.info("Re-synced leave task skips for employee %s result=%s.", employee_id, result)
+    return result
+
+
+def queue_leave_task_skip_resync(employee_id: int, *, reason: str = "", leave_id=None) -> None:
+    """
+    Re-sync employee_id's task skips on a worker once the current
+    transaction commits (inline if the task cannot be queued).
+    """
+    if not employee_id:
+        return
+
+    def _send():
+        try:
+            from apps.leave.tasks import resync_leave_task_skips
+
+            resync_leave_task_skips.delay(employee_id, reason=reason, leave_id=leave_id)
+        except Exception:
+            logger.exception(
+                "Could not queue leave task skip re-sync reason=%s leave=%s employee=%s; running inline.",
+                reason,
+                leave_id,
+                employee_id,
+            )
+            sync_employee_leave_task_skips(employee_id)
+
+    transaction.on_commit(_send)
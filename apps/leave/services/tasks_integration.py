@@ -40,6 +40,7 @@ from typing import Optional
 import logging
 from django.apps import apps
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.conf import settings
 
@@ -154,15 +155,6 @@ def _is_datetime_field(model, field_name: str) -> bool:
         return False
 
 
-def _mode_value(obj) -> str:
-    """Return mode string if present (Daily/Weekly/Monthly/Yearly), else ''."""
-    for attr in ("mode", "recurring_mode", "frequency_mode"):
-        v = getattr(obj, attr, None)
-        if v:
-            return str(v)
-    return ""
-
-
 def _assignee_filter_kwargs(model, user_id: int) -> dict:
     """Return a filter dict to match 'assigned to' user across naming variants."""
     names = ["assign_to_id", "assignee_id", "user_id", "owner_id"]
@@ -176,39 +168,47 @@ def _assignee_filter_kwargs(model, user_id: int) -> dict:
     return {}
 
 
-def _set_status_skipped(obj) -> bool:
+def _mode_field(model) -> Optional[str]:
+    """Field holding the recurrence mode (Daily/Weekly/Monthly/Yearly), if any."""
+    names = {f.name for f in model._meta.concrete_fields}
+    for name in ("mode", "recurring_mode", "frequency_mode"):
+        if name in names:
+            return name
+    return None
+
+
+def _skipped_update_values(model) -> dict:
     """
-    Best-effort: mark an object as 'skipped'.
-    Try status='Skipped' if available, else boolean flags like is_skipped/skipped.
-    Returns True if something was updated.
+    Field values that mark a row of `model` as 'skipped': status='Skipped' if
+    the status field allows it, plus boolean flags like is_skipped/skipped.
+    Empty if the model has no way to express it.
     """
+    fields = {f.name: f for f in model._meta.concrete_fields}
+    values: dict = {}
+
+    status = fields.get("status")
+    if status is not None:
+        allowed = {str(c[0]).lower(): c[0] for c in (status.choices or [])}
+        if not status.choices or "skipped" in allowed:
+            values["status"] = allowed.get("skipped", "Skipped")
+
+    for flag in ("is_skipped", "skipped"):
+        if flag in fields:
+            values[flag] = True
+
+    if values and "updated_at" in fields:
+        values["updated_at"] = timezone.now()
+    return values
+
+
+def _invalidate_dashboards(user_id) -> None:
+    # Queryset updates bypass the task post_save receivers that normally do this.
     try:
-        updated_fields: list[str] = []
-        if hasattr(obj, "status"):
-            try:
-                choices = getattr(getattr(obj, "_meta", None).get_field("status"), "choices", None)
-                allowed = {str(c[0]).lower(): c[0] for c in (choices or [])}
-                if not choices or "skipped" in allowed:
-                    obj.status = allowed.get("skipped", "Skipped")
-                    updated_fields.append("status")
-            except Exception:
-                obj.status = "Skipped"
-                updated_fields.append("status")
-
-        for flag in ("is_skipped", "skipped"):
-            if hasattr(obj, flag):
-                setattr(obj, flag, True)
-                updated_fields.append(flag)
-
-        if updated_fields:
-            obj.save(
-                update_fields=list(set(updated_fields))
-                + (["updated_at"] if hasattr(obj, "updated_at") else [])
-            )
-            return True
+        from dashboard.payload_cache import invalidate_user_dashboards
+
+        invalidate_user_dashboards([user_id])
     except Exception:
-        logger.exception("Failed to mark object as skipped: %r", obj)
-    return False
+        logger.debug("Dashboard invalidation skipped for user %s", user_id, exc_info=True)
 
 
 # ---- Working-day helper ------------------------------------------------------
@@ -252,6 +252,7 @@ def next_working_day(dt: datetime) -> datetime:
 # ---- Leave checks ------------------------------------------------------------
 
 from apps.leave.models import LeaveRequest, LeaveStatus  # noqa: E402
+from apps.tasks.recurrence_utils import pin_7pm_ist  # noqa: E402
 
 
 def is_user_on_leave_at_instant(user, when_dt: datetime) -> bool:
@@ -355,59 +356,56 @@ def apply_leave_to_tasks(leave) -> None:
             return
 
         qs = Checklist.objects.filter(**assign_filter).filter(**filters_range)
-        total = qs.count()
-        if total == 0:
-            logger.info(
-                "Task integration: no tasks in window %s..%s for user id=%s",
-                start_date, end_date, leave.employee_id
-            )
-            return
-
-        logger.info("Task integration: processing %s task(s) for leave id=%s", total, getattr(leave, "id", None))
+        mode_field = _mode_field(Checklist)
+        daily = Q(**{f"{mode_field}__iexact": "daily"}) if mode_field else Q(pk__in=[])
+        has_updated_at = "updated_at" in {f.name for f in Checklist._meta.concrete_fields}
         ten_am = time(10, 0)
 
         with transaction.atomic():
-            for obj in qs.select_for_update():
-                mode = (_mode_value(obj) or "").strip().lower()
-
-                # Daily-mode → Mark skipped
-                if mode == "daily":
-                    if _set_status_skipped(obj):
-                        logger.debug("Marked Daily task as skipped (id=%s)", getattr(obj, "id", None))
-                    else:
-                        logger.debug("Could not mark skipped; leaving as-is (id=%s)", getattr(obj, "id", None))
-                    continue
-
-                # Non-daily → reschedule to next working day @ 10:00 IST
+            # Daily-mode → mark skipped, one UPDATE for the whole window
+            skip_values = _skipped_update_values(Checklist)
+            skipped = qs.filter(daily).update(**skip_values) if skip_values else 0
+
+            # Non-daily → reschedule to next working day @ 10:00 IST; one
+            # UPDATE per distinct planned day, since the target depends only on it.
+            others = qs.exclude(daily)
+            day_lookup = f"{pd_field}__date" if is_dt_pd else pd_field
+            planned_days = sorted(set(others.values_list(day_lookup, flat=True)))
+            rescheduled = 0
+
+            for day in planned_days:
                 try:
-                    value = getattr(obj, pd_field)
-                    if value is None:
-                        current_pd = start_at
-                    else:
-                        current_pd = _aware(value) if is_dt_pd else _aware(datetime.combine(value, time(0, 0)))
-
-                    new_dt = next_working_day(current_pd)
+                    new_dt = next_working_day(_aware(datetime.combine(day, time(0, 0))))
                     new_dt = new_dt.astimezone(IST or timezone.get_current_timezone()).replace(
                         hour=ten_am.hour, minute=ten_am.minute, second=0, microsecond=0
                     )
+                    # Checklist.save() pins planned datetimes to 19:00 IST; the
+                    # queryset update bypasses it, so pin the same way here.
+                    target = pin_7pm_ist(new_dt) if is_dt_pd else new_dt.date()
 
-                    if is_dt_pd:
-                        setattr(obj, pd_field, new_dt)
-                        obj.save(update_fields=[pd_field] + (["updated_at"] if hasattr(obj, "updated_at") else []))
-                    else:
-                        setattr(obj, pd_field, new_dt.date())
-                        obj.save(update_fields=[pd_field] + (["updated_at"] if hasattr(obj, "updated_at") else []))
-
-                    logger.debug(
-                        "Rescheduled %s task id=%s to %s",
-                        (mode or "non-daily").title(),
-                        getattr(obj, "id", None),
-                        new_dt.isoformat(),
-                    )
+                    # Checklist.clean() rejects planned instants inside a leave
+                    # window; the whole group shares one target, so check it once.
+                    if is_user_on_leave_at_instant(leave.employee, target if is_dt_pd else new_dt):
+                        logger.info("Not rescheduling tasks planned on %s: %s is still on leave", day, target)
+                        continue
+
+                    values = {pd_field: target}
+                    if has_updated_at:
+                        values["updated_at"] = timezone.now()
+
+                    rescheduled += others.filter(**{day_lookup: day}).update(**values)
                 except Exception:
-                    logger.exception("Failed to reschedule task id=%s", getattr(obj, "id", None))
+                    logger.exception("Failed to reschedule tasks planned on %s", day)
+
+            if skipped or rescheduled:
+                transaction.on_commit(lambda: _invalidate_dashboards(leave.employee_id))
 
-        logger.info("Task integration: done for leave id=%s", getattr(leave, "id", None))
+        logger.info(
+            "Task integration: leave id=%s skipped=%s rescheduled=%s",
+            getattr(leave, "id", None),
+            skipped,
+            rescheduled,
+        )
 
     except Exception:
         logger.exception("Task integration encountered an error (leave id=%s)", getattr(leave, "id", None))
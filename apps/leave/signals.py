@@ -16,30 +16,23 @@ from __future__ import annotations
 
 import logging
 from datetime import date
-from typing import Dict, List
+from typing import List
 
 from zoneinfo import ZoneInfo
 
-from django.apps import apps as django_apps
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q
 from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 
 from .models import ApproverMapping, LeaveRequest, LeaveStatus
+from .services.task_skips import ACTIVE_TASK_BLOCKING_STATUSES, queue_leave_task_skip_resync  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
 IST = ZoneInfo("Asia/Kolkata")
 
-# Active leave statuses that should block/hide/skip tasks.
-ACTIVE_TASK_BLOCKING_STATUSES = {
-    LeaveStatus.PENDING,
-    LeaveStatus.APPROVED,
-}
-
 # Re-entrancy guard.
 # This prevents receivers from being bound more than once.
 if not hasattr(logging, "_leave_signals_bound"):
@@ -86,36 +79,6 @@ def _ist_dates_covered(lr: LeaveRequest) -> List[date]:
         return out
 
 
-def _leave_window_ist(lr: LeaveRequest):
-    """
-    Return normalized leave window in IST.
-
-    Returns:
-    start_ist, end_ist, start_date, end_date, is_half_day
-    """
-    start_at = getattr(lr, "start_at", None)
-    end_at = getattr(lr, "end_at", None)
-
-    if not start_at or not end_at:
-        return None
-
-    start_ist = timezone.localtime(start_at, IST)
-    end_ist = timezone.localtime(end_at, IST)
-
-    if end_ist < start_ist:
-        start_ist, end_ist = end_ist, start_ist
-
-    start_date = getattr(lr, "start_date", None) or start_ist.date()
-    end_date = getattr(lr, "end_date", None) or end_ist.date()
-
-    if end_date < start_date:
-        start_date, end_date = end_date, start_date
-
-    is_half_day = bool(getattr(lr, "is_half_day", False))
-
-    return start_ist, end_ist, start_date, end_date, is_half_day
-
-
 # -------------------------------------------------------------------------
 # Email helpers
 # -------------------------------------------------------------------------
@@ -285,364 +248,8 @@ def _safe_send_handover_emails_and_create_reminders(leave: LeaveRequest) -> None
 
 
 # -------------------------------------------------------------------------
-# Task skip helpers
+# Task skip re-sync
 # -------------------------------------------------------------------------
-def _get_task_models():
-    """
-    Load task models safely.
-
-    Existing production models expected:
-    - apps.tasks.Checklist
-    - apps.tasks.Delegation
-    - apps.tasks.HelpTicket
-    - apps.tasks.FMS
-    """
-    Checklist = django_apps.get_model("tasks", "Checklist")
-    Delegation = django_apps.get_model("tasks", "Delegation")
-    HelpTicket = django_apps.get_model("tasks", "HelpTicket")
-    FMS = django_apps.get_model("tasks", "FMS")
-
-    return Checklist, Delegation, HelpTicket, FMS
-
-
-def _normalize_handover_task_type(value) -> str:
-    """
-    Normalize handover task type.
-
-    Example:
-    'CHECKLIST' -> 'checklist'
-    'checklist' -> 'checklist'
-    """
-    return str(value or "").strip().lower()
-
-
-def _handover_exclusion_ids_for_leave(leave: LeaveRequest) -> Dict[str, List[int]]:
-    """
-    Return task IDs that should not be skipped because they were handed over.
-
-    Simple meaning:
-    If a task was delegated to another person during leave,
-    do not hide/skip that task for the original assignee.
-    """
-    exclude_ids: Dict[str, List[int]] = {
-        "checklist": [],
-        "delegation": [],
-        "help_ticket": [],
-    }
-
-    try:
-        from .models import LeaveHandover
-
-        handovers = (
-            LeaveHandover.objects
-            .filter(leave_request=leave, is_active=True)
-            .only("task_type", "original_task_id")
-        )
-
-        for ho in handovers:
-            task_type = _normalize_handover_task_type(getattr(ho, "task_type", ""))
-
-            if task_type in exclude_ids:
-                exclude_ids[task_type].append(ho.original_task_id)
-
-    except Exception:
-        logger.exception(
-            "Could not resolve handover exclusions for leave %s",
-            getattr(leave, "id", None),
-        )
-
-    return exclude_ids
-
-
-def _restore_leave_skips_for_employee_id(employee_id: int) -> Dict[str, int]:
-    """
-    Restore all tasks previously skipped because of leave.
-
-    Simple meaning:
-    Bring back tasks before recalculating current leave periods.
-    """
-    counts = {
-        "checklist": 0,
-        "delegation": 0,
-        "help_ticket": 0,
-        "fms": 0,
-    }
-
-    if not employee_id:
-        return counts
-
-    try:
-        Checklist, Delegation, HelpTicket, FMS = _get_task_models()
-
-        counts["checklist"] = int(
-            Checklist.objects
-            .filter(assign_to_id=employee_id, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["delegation"] = int(
-            Delegation.objects
-            .filter(assign_to_id=employee_id, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["help_ticket"] = int(
-            HelpTicket.objects
-            .filter(assign_to_id=employee_id, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["fms"] = int(
-            FMS.objects
-            .filter(assign_to_id=employee_id, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        logger.info(
-            "Restored leave-skipped tasks for employee %s counts=%s.",
-            employee_id,
-            counts,
-        )
-
-    except Exception:
-        logger.exception(
-            "Failed to restore leave-skipped tasks for employee %s.",
-            employee_id,
-        )
-
-    return counts
-
-
-def _apply_task_skips_for_leave(leave: LeaveRequest, *, exclude_handover: bool = True) -> Dict[str, int]:
-    """
-    Apply task skips for one active leave.
-
-    Active means:
-    - PENDING
-    - APPROVED
-
-    Inactive means:
-    - REJECTED
-    - CANCELLED if your project has it
-    - Deleted leave
-    """
-    counts = {
-        "checklist": 0,
-        "delegation": 0,
-        "help_ticket": 0,
-        "fms": 0,
-    }
-
-    try:
-        leave_status = getattr(leave, "status", None)
-
-        if leave_status not in ACTIVE_TASK_BLOCKING_STATUSES:
-            logger.info(
-                "Task auto-skip ignored for leave %s because status=%s is not active.",
-                getattr(leave, "id", None),
-                leave_status,
-            )
-            return counts
-
-        if not getattr(leave, "employee_id", None):
-            logger.warning(
-                "Task auto-skip ignored for leave %s because employee_id is missing.",
-                getattr(leave, "id", None),
-            )
-            return counts
-
-        window = _leave_window_ist(leave)
-
-        if not window:
-            logger.warning(
-                "Task auto-skip ignored for leave %s because start_at/end_at is missing.",
-                getattr(leave, "id", None),
-            )
-            return counts
-
-        start_ist, end_ist, start_date, end_date, is_half_day = window
-
-        Checklist, Delegation, HelpTicket, FMS = _get_task_models()
-
-        exclude_ids = {
-            "checklist": [],
-            "delegation": [],
-            "help_ticket": [],
-        }
-
-        if exclude_handover:
-            exclude_ids = _handover_exclusion_ids_for_leave(leave)
-
-        if is_half_day:
-            datetime_window = Q(planned_date__gte=start_ist) & Q(planned_date__lt=end_ist)
-        else:
-            datetime_window = Q(planned_date__date__gte=start_date) & Q(planned_date__date__lte=end_date)
-
-        checklist_qs = (
-            Checklist.objects
-            .filter(
-                assign_to_id=leave.employee_id,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            )
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["checklist"]:
-            checklist_qs = checklist_qs.exclude(id__in=exclude_ids["checklist"])
-
-        counts["checklist"] = int(
-            checklist_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        delegation_qs = (
-            Delegation.objects
-            .filter(
-                assign_to_id=leave.employee_id,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            )
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["delegation"]:
-            delegation_qs = delegation_qs.exclude(id__in=exclude_ids["delegation"])
-
-        counts["delegation"] = int(
-            delegation_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        help_ticket_qs = (
-            HelpTicket.objects
-            .filter(
-                assign_to_id=leave.employee_id,
-                is_skipped_due_to_leave=False,
-            )
-            .exclude(status__in=["Closed", "COMPLETED", "Completed", "Done"])
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["help_ticket"]:
-            help_ticket_qs = help_ticket_qs.exclude(id__in=exclude_ids["help_ticket"])
-
-        counts["help_ticket"] = int(
-            help_ticket_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        # FMS planned_date is DateField in your existing logic.
-        # DateField cannot support exact half-day time windows.
-        # So FMS is skipped only for full-day leave.
-        if not is_half_day:
-            counts["fms"] = int(
-                FMS.objects
-                .filter(
-                    assign_to_id=leave.employee_id,
-                    planned_date__gte=start_date,
-                    planned_date__lte=end_date,
-                    is_skipped_due_to_leave=False,
-                )
-                .update(is_skipped_due_to_leave=True)
-            )
-
-        logger.info(
-            "Task auto-skip applied for leave %s employee=%s status=%s half_day=%s counts=%s.",
-            getattr(leave, "id", None),
-            getattr(leave, "employee_id", None),
-            leave_status,
-            is_half_day,
-            counts,
-        )
-
-    except Exception:
-        logger.exception(
-            "Task auto-skip failed for leave %s.",
-            getattr(leave, "id", None),
-        )
-
-    return counts
-
-
-def _resync_leave_task_skips_for_employee_id(
-    employee_id: int,
-    *,
-    exclude_handover: bool = True,
-) -> Dict[str, object]:
-    """
-    Recalculate leave-based task skipping for one employee.
-
-    Simple explanation:
-    1. First bring back all tasks skipped because of leave.
-    2. Then check all active leaves.
-    3. Then skip tasks again for those active leave periods.
-
-    This handles:
-    - leave apply
-    - manager approval
-    - manager rejection
-    - user delete
-    - admin delete
-    - leave date change
-    - overlapping leaves
-    """
-    result: Dict[str, object] = {
-        "restored": {
-            "checklist": 0,
-            "delegation": 0,
-            "help_ticket": 0,
-            "fms": 0,
-        },
-        "applied": {},
-        "active_leave_ids": [],
-    }
-
-    if not employee_id:
-        return result
-
-    try:
-        restored_counts = _restore_leave_skips_for_employee_id(employee_id)
-        result["restored"] = restored_counts
-
-        active_leaves = (
-            LeaveRequest.objects
-            .filter(
-                employee_id=employee_id,
-                status__in=ACTIVE_TASK_BLOCKING_STATUSES,
-            )
-            .select_related("employee")
-            .order_by("start_at", "id")
-        )
-
-        applied = {}
-        active_leave_ids = []
-
-        for active_leave in active_leaves:
-            skip_counts = _apply_task_skips_for_leave(
-                active_leave,
-                exclude_handover=exclude_handover,
-            )
-
-            applied[active_leave.id] = skip_counts
-            active_leave_ids.append(active_leave.id)
-
-        result["applied"] = applied
-        result["active_leave_ids"] = active_leave_ids
-
-        logger.info(
-            "Re-synced leave task skips for employee %s active_leave_ids=%s result=%s.",
-            employee_id,
-            active_leave_ids,
-            result,
-        )
-
-    except Exception:
-        logger.exception(
-            "Failed to re-sync leave task skips for employee %s.",
-            employee_id,
-        )
-
-    return result
-
-
 def _resync_leave_task_skips_after_commit(
     *,
     employee_id: int,
@@ -650,37 +257,20 @@ def _resync_leave_task_skips_after_commit(
     leave_id=None,
 ) -> None:
     """
-    Schedule task skip re-sync after database commit.
+    Re-sync the employee's task skips on a worker after database commit
+    (see apps.leave.services.task_skips).
 
     This avoids changing tasks before the leave save/delete is safely committed.
     """
-    if not employee_id:
-        return
-
-    def _after_commit():
-        result = _resync_leave_task_skips_for_employee_id(
-            employee_id,
-            exclude_handover=True,
-        )
-
-        logger.info(
-            "Leave task skip re-sync completed reason=%s leave=%s employee=%s result=%s.",
-            reason,
-            leave_id,
-            employee_id,
-            result,
-        )
-
     try:
-        transaction.on_commit(_after_commit)
+        queue_leave_task_skip_resync(employee_id, reason=reason, leave_id=leave_id)
     except Exception:
         logger.exception(
-            "transaction.on_commit failed for leave task skip re-sync reason=%s leave=%s employee=%s.",
+            "Could not schedule leave task skip re-sync reason=%s leave=%s employee=%s.",
             reason,
             leave_id,
             employee_id,
         )
-        _after_commit()
 
 
 # -------------------------------------------------------------------------
@@ -85,6 +85,30 @@ def cleanup_expired_handovers(self):
         raise self.retry(exc=exc, countdown=300)
 
 
+@shared_task(bind=True, max_retries=3, name="leave.resync_leave_task_skips")
+def resync_leave_task_skips(self, employee_id: int, reason: str = "", leave_id: Optional[int] = None):
+    """
+    Bring one employee's leave-skipped tasks in line with their active leaves.
+    Queued after commit by apps.leave.services.task_skips.queue_leave_task_skip_resync.
+    """
+    try:
+        from .services.task_skips import sync_employee_leave_task_skips
+
+        result = sync_employee_leave_task_skips(employee_id, exclude_handover=True)
+        logger.info(
+            "Leave task skip re-sync completed reason=%s leave=%s employee=%s result=%s.",
+            reason,
+            leave_id,
+            employee_id,
+            result,
+        )
+        return {"unskipped": result["unskipped"], "newly_skipped": result["newly_skipped"]}
+
+    except Exception as exc:
+        logger.error("Error re-syncing leave task skips for employee %s: %s", employee_id, exc)
+        raise self.retry(exc=exc, countdown=30 * (2 ** self.request.retries))
+
+
 @shared_task(bind=True, max_retries=3, name="leave.send_leave_emails_async")
 def send_leave_emails_async(self, leave_id: int):
     """Send the leave request using Employee-page routing only.
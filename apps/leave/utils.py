@@ -21,11 +21,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, DateField, DurationField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Greatest, Least
 from django.utils import timezone
 
 from .models import EmployeeLeaveBalance, LeaveRequest, LeaveStatus
@@ -651,6 +652,36 @@ def calculate_leave_balance_for_period(
     )
 
 
+_COMPUTED_BALANCE_FIELDS = [
+    "total_paid_leaves",
+    "paid_leaves_taken",
+    "unpaid_leaves",
+    "remaining_paid_leaves",
+]
+
+_NEW_BALANCE_DEFAULTS = {
+    "total_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
+    "paid_leaves_taken": Decimal("0.0"),
+    "unpaid_leaves": Decimal("0.0"),
+    "remaining_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
+    "carry_forward_adjustment": Decimal("0.0"),
+    "opening_adjustment": Decimal("0.0"),
+}
+
+
+def _apply_deductible_days(balance: EmployeeLeaveBalance, total_used: Decimal) -> None:
+    """Set the computed fields of balance from deductible days; adjustments are read, never written."""
+    carry_forward = balance.carry_forward_adjustment or Decimal("0.0")
+    opening = balance.opening_adjustment or Decimal("0.0")
+    effective_quota = max(ANNUAL_PAID_LEAVE_QUOTA + carry_forward + opening, Decimal("0.0"))
+    paid_used = min(total_used, effective_quota)
+
+    balance.total_paid_leaves = effective_quota
+    balance.paid_leaves_taken = paid_used
+    balance.unpaid_leaves = max(total_used - effective_quota, Decimal("0.0"))
+    balance.remaining_paid_leaves = max(effective_quota - paid_used, Decimal("0.0"))
+
+
 @transaction.atomic
 def sync_employee_leave_balance(
     employee,
@@ -662,14 +693,7 @@ def sync_employee_leave_balance(
         employee=employee,
         leave_year_start=leave_year_start,
         leave_year_end=leave_year_end,
-        defaults={
-            "total_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
-            "paid_leaves_taken": Decimal("0.0"),
-            "unpaid_leaves": Decimal("0.0"),
-            "remaining_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
-            "carry_forward_adjustment": Decimal("0.0"),
-            "opening_adjustment": Decimal("0.0"),
-        },
+        defaults=dict(_NEW_BALANCE_DEFAULTS),
     )
 
     total_used = calculate_current_deductible_days_for_period(
@@ -677,21 +701,8 @@ def sync_employee_leave_balance(
         leave_year_start=leave_year_start,
         leave_year_end=leave_year_end,
     )
-    carry_forward = balance.carry_forward_adjustment or Decimal("0.0")
-    opening = balance.opening_adjustment or Decimal("0.0")
-    effective_quota = max(ANNUAL_PAID_LEAVE_QUOTA + carry_forward + opening, Decimal("0.0"))
-    paid_used = min(total_used, effective_quota)
-    unpaid = max(total_used - effective_quota, Decimal("0.0"))
-    available = max(effective_quota - paid_used, Decimal("0.0"))
-
-    balance.total_paid_leaves = effective_quota
-    balance.paid_leaves_taken = paid_used
-    balance.unpaid_leaves = unpaid
-    balance.remaining_paid_leaves = available
-    balance.save(update_fields=[
-        "total_paid_leaves", "paid_leaves_taken", "unpaid_leaves",
-        "remaining_paid_leaves", "updated_at",
-    ])
+    _apply_deductible_days(balance, total_used)
+    balance.save(update_fields=[*_COMPUTED_BALANCE_FIELDS, "updated_at"])
     return balance
 
 
@@ -786,6 +797,8 @@ def get_admin_leave_balance_rows(
     """
     Return stored leave balance rows for admin / manager views.
     Does not recalculate finalized balances from LeaveRequest.
+    Missing rows are created in bulk, so the query count does not grow
+    with headcount.
     """
     if users is None:
         users = User.objects.filter(is_active=True).order_by(
@@ -794,28 +807,175 @@ def get_admin_leave_balance_rows(
             "username",
         )
 
-    leave_year_start, leave_year_end = get_leave_year_bounds(target_date)
+    users = list(users)
+    period = get_leave_year_bounds(target_date)
+    balances = _ensure_balance_rows([user.pk for user in users], [period])
 
     rows: List[EmployeeLeaveBalance] = []
 
     for user in users:
-        balance, _created = EmployeeLeaveBalance.objects.get_or_create(
-            employee=user,
-            leave_year_start=leave_year_start,
-            leave_year_end=leave_year_end,
-            defaults={
-                "total_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
-                "paid_leaves_taken": Decimal("0.0"),
-                "unpaid_leaves": Decimal("0.0"),
-                "remaining_paid_leaves": ANNUAL_PAID_LEAVE_QUOTA,
-                "carry_forward_adjustment": Decimal("0.0"),
-            },
-        )
+        balance = balances[(user.pk, period[0])]
+        balance.employee = user
         rows.append(balance)
 
     return rows
 
 
+# =============================================================================
+# BULK BALANCE CALCULATION
+#
+# Set-based equivalents of the per-employee helpers above, for recalculating
+# every employee at once (management command, admin page, year-end close).
+# Deductible days for all employees and leave years come from one aggregate
+# query; balance rows are written with bulk_create / bulk_update.
+# =============================================================================
+
+BalanceKey = Tuple[int, date]
+
+
+def _employee_ids(employees) -> List[int]:
+    if employees is None:
+        return list(User.objects.filter(is_active=True).values_list("pk", flat=True))
+
+    return [getattr(employee, "pk", employee) for employee in employees]
+
+
+def _period_overlap(period_start: date, period_end: date) -> Q:
+    return Q(start_date__lte=period_end, end_date__gte=period_start)
+
+
+def calculate_deductible_days_bulk(
+    employee_ids: Iterable[int],
+    periods: Iterable[Tuple[date, date]],
+) -> Dict[BalanceKey, Decimal]:
+    """
+    calculate_current_deductible_days_for_period for many employees and
+    leave years in one query. Full-day leaves are clipped to each leave year
+    in SQL; half-day leaves count 0.5 each.
+
+    Returns {(employee_id, leave_year_start): days}; employees without
+    deductible leave are absent.
+    """
+    employee_ids = list(employee_ids)
+    periods = list(periods)
+
+    if not employee_ids or not periods:
+        return {}
+
+    annotations = {}
+    any_period = Q()
+
+    for idx, (period_start, period_end) in enumerate(periods):
+        overlap = _period_overlap(period_start, period_end)
+        full_day = overlap & Q(is_half_day=False, start_date__lte=F("end_date"))
+        clipped = ExpressionWrapper(
+            Least(F("end_date"), Value(period_end), output_field=DateField())
+            - Greatest(F("start_date"), Value(period_start), output_field=DateField()),
+            output_field=DurationField(),
+        )
+        annotations[f"half_{idx}"] = Count("pk", filter=overlap & Q(is_half_day=True))
+        annotations[f"full_{idx}"] = Count("pk", filter=full_day)
+        annotations[f"span_{idx}"] = Sum(clipped, filter=full_day)
+        any_period |= overlap
+
+    rows = (
+        LeaveRequest.objects
+        .filter(any_period, employee_id__in=employee_ids, status__in=ACTIVE_LEAVE_STATUSES)
+        .order_by()
+        .values("employee_id")
+        .annotate(**annotations)
+    )
+
+    days: Dict[BalanceKey, Decimal] = {}
+
+    for row in rows:
+        for idx, (period_start, _period_end) in enumerate(periods):
+            span = row[f"span_{idx}"]
+            total = (
+                Decimal("0.5") * row[f"half_{idx}"]
+                + row[f"full_{idx}"]
+                + (span.days if span else 0)
+            )
+            if total:
+                days[(row["employee_id"], period_start)] = total
+
+    return days
+
+
+def _ensure_balance_rows(
+    employee_ids: List[int],
+    periods: List[Tuple[date, date]],
+    *,
+    lock: bool = False,
+) -> Dict[BalanceKey, EmployeeLeaveBalance]:
+    """Fetch (and bulk-create any missing) yearly balance rows for every employee × period."""
+    if not employee_ids or not periods:
+        return {}
+
+    qs = EmployeeLeaveBalance.objects.filter(employee_id__in=employee_ids)
+    period_q = Q()
+    for period_start, period_end in periods:
+        period_q |= Q(leave_year_start=period_start, leave_year_end=period_end)
+    qs = qs.filter(period_q)
+    if lock:
+        qs = qs.select_for_update()
+
+    balances = {(row.employee_id, row.leave_year_start): row for row in qs}
+    missing = [
+        EmployeeLeaveBalance(
+            employee_id=employee_id,
+            leave_year_start=period_start,
+            leave_year_end=period_end,
+            **_NEW_BALANCE_DEFAULTS,
+        )
+        for period_start, period_end in periods
+        for employee_id in employee_ids
+        if (employee_id, period_start) not in balances
+    ]
+
+    if missing:
+        # ignore_conflicts: a concurrent get_or_create may win the insert;
+        # re-read so every row carries its pk and stored adjustments.
+        EmployeeLeaveBalance.objects.bulk_create(missing, ignore_conflicts=True)
+        balances = {(row.employee_id, row.leave_year_start): row for row in qs.all()}
+
+    return balances
+
+
+@transaction.atomic
+def sync_leave_balances_bulk(
+    employees=None,
+    periods: Optional[Iterable[Tuple[date, date]]] = None,
+) -> Dict[BalanceKey, EmployeeLeaveBalance]:
+    """
+    sync_employee_leave_balance for many employees (default: all active)
+    and leave years (default: the current one) in a fixed number of queries.
+
+    Returns {(employee_id, leave_year_start): balance}.
+    """
+    employee_ids = _employee_ids(employees)
+    periods = list(periods or [get_leave_year_bounds()])
+
+    balances = _ensure_balance_rows(employee_ids, periods, lock=True)
+    used = calculate_deductible_days_bulk(employee_ids, periods)
+
+    now = timezone.now()
+    changed: List[EmployeeLeaveBalance] = []
+
+    for key, balance in balances.items():
+        before = [getattr(balance, name) for name in _COMPUTED_BALANCE_FIELDS]
+        _apply_deductible_days(balance, used.get(key, Decimal("0.0")))
+
+        if [getattr(balance, name) for name in _COMPUTED_BALANCE_FIELDS] != before:
+            balance.updated_at = now
+            changed.append(balance)
+
+    if changed:
+        EmployeeLeaveBalance.objects.bulk_update(changed, [*_COMPUTED_BALANCE_FIELDS, "updated_at"])
+
+    return balances
+
+
 # =============================================================================
 # VALIDATION / REPORTING HELPERS
 # =============================================================================
@@ -1012,9 +1172,9 @@ def is_holiday(check_date: date) -> bool:
     Return True if the given date is configured as a holiday.
     """
     try:
-        from apps.settings.models import Holiday
+        from apps.settings.holiday_calendar import get_holiday_calendar
 
-        return Holiday.objects.filter(date=check_date).exists()
+        return get_holiday_calendar(check_date).is_holiday(check_date)
 
     except Exception:
         return False
@@ -1068,14 +1228,8 @@ def should_skip_task_generation(
     3. Employee on leave
     4. Otherwise generate tasks
     """
-    try:
-        from apps.settings.models import Holiday
-
-        if Holiday.objects.filter(date=check_date).exists():
-            return True, "holiday"
-
-    except Exception:
-        pass
+    if is_holiday(check_date):
+        return True, "holiday"
 
     if check_date.weekday() == 6:
         return True, "sunday"
@@ -1111,19 +1265,46 @@ def get_employees_on_leave_for_date(check_date: date) -> list:
     except Exception:
         return []
 
-@transaction.atomic
 def create_next_year_carry_forward(employee, closing_year_start: date, closing_year_end: date) -> EmployeeLeaveBalance:
     """Close one FY and apply its final available/overused amount to the next FY."""
-    closing = sync_employee_leave_balance(employee, closing_year_start, closing_year_end)
-    net = closing.remaining_paid_leaves - closing.unpaid_leaves
+    return create_next_year_carry_forwards([employee], closing_year_start, closing_year_end)[employee.pk]
+
+
+@transaction.atomic
+def create_next_year_carry_forwards(
+    employees,
+    closing_year_start: date,
+    closing_year_end: date,
+) -> Dict[int, EmployeeLeaveBalance]:
+    """
+    create_next_year_carry_forward for many employees (None = all active):
+    recalculate the closing FY in bulk, then write every next-FY
+    carry_forward_adjustment and recalculated balance in one bulk update.
+    Returns {employee_id: next-FY row}.
+    """
+    employee_ids = _employee_ids(employees)
+    closing = sync_leave_balances_bulk(employee_ids, [(closing_year_start, closing_year_end)])
+
     next_start = closing_year_end + timedelta(days=1)
     next_end = date(next_start.year + 1, 3, 31)
-    next_balance, _ = EmployeeLeaveBalance.objects.select_for_update().get_or_create(
-        employee=employee,
-        leave_year_start=next_start,
-        leave_year_end=next_end,
-        defaults={"carry_forward_adjustment": net, "opening_adjustment": Decimal("0.0")},
-    )
-    next_balance.carry_forward_adjustment = net
-    next_balance.save(update_fields=["carry_forward_adjustment", "updated_at"])
-    return sync_employee_leave_balance(employee, next_start, next_end)
\ No newline at end of file
+    next_rows = _ensure_balance_rows(employee_ids, [(next_start, next_end)], lock=True)
+    next_used = calculate_deductible_days_bulk(employee_ids, [(next_start, next_end)])
+
+    now = timezone.now()
+    result: Dict[int, EmployeeLeaveBalance] = {}
+
+    for employee_id in employee_ids:
+        closed = closing[(employee_id, closing_year_start)]
+        next_balance = next_rows[(employee_id, next_start)]
+        next_balance.carry_forward_adjustment = closed.remaining_paid_leaves - closed.unpaid_leaves
+        _apply_deductible_days(next_balance, next_used.get((employee_id, next_start), Decimal("0.0")))
+        next_balance.updated_at = now
+        result[employee_id] = next_balance
+
+    if result:
+        EmployeeLeaveBalance.objects.bulk_update(
+            list(result.values()),
+            ["carry_forward_adjustment", *_COMPUTED_BALANCE_FIELDS, "updated_at"],
+        )
+
+    return result
@@ -33,12 +33,9 @@ def is_sunday(check_date: date) -> bool:
 def is_holiday_date(check_date: date) -> bool:
     """Return True if the date is a configured admin holiday."""
     try:
-        from apps.settings.models import Holiday
+        from apps.settings.holiday_calendar import get_holiday_calendar
 
-        try:
-            return bool(Holiday.is_holiday(check_date))
-        except Exception:
-            return Holiday.objects.filter(date=check_date).exists()
+        return get_holiday_calendar(check_date).is_holiday(check_date)
 
     except Exception:
         return False
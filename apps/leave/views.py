@@ -16,7 +16,7 @@ from django.contrib.auth.decorators import login_required
 from django.core import signing
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.db import transaction
-from django.db.models import ManyToManyField, Q
+from django.db.models import ManyToManyField
 from django.db.utils import OperationalError
 from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
@@ -36,11 +36,13 @@ from .models import (
     LeaveRequest,
     LeaveStatus,
     LeaveType,
+    _invalidate_handover_dashboards,
 )
 from .utils import (
     get_admin_leave_balance_rows,
     get_employee_leave_balance_summary,
 )
+from .services.task_skips import apply_leave_task_skips, queue_leave_task_skip_resync
 
 try:
     from .services.notifications import (
@@ -243,281 +245,42 @@ def _auto_skip_tasks_for_leave(leave: LeaveRequest, *, exclude_handover: bool =
     - Never hard-delete tasks.
     - Only set is_skipped_due_to_leave=True.
     """
-    counts = {"checklist": 0, "delegation": 0, "help_ticket": 0, "fms": 0}
-
     try:
-        leave_status = getattr(leave, "status", None)
-
-        if leave_status not in ACTIVE_DEDUCTION_STATUSES:
-            logger.info(
-                "Auto-skip ignored for leave %s because status=%s is not active.",
-                getattr(leave, "id", None),
-                leave_status,
-            )
-            return counts
-
-        if not getattr(leave, "employee_id", None):
-            logger.warning(
-                "Auto-skip ignored for leave %s because employee_id is missing.",
-                getattr(leave, "id", None),
-            )
-            return counts
-
-        start_at = getattr(leave, "start_at", None)
-        end_at = getattr(leave, "end_at", None)
-
-        if not (start_at and end_at):
-            logger.warning(
-                "Auto-skip ignored for leave %s because start_at/end_at missing.",
-                getattr(leave, "id", None),
-            )
-            return counts
-
-        start_ist = timezone.localtime(start_at, IST)
-        end_ist = timezone.localtime(end_at, IST)
-
-        if end_ist < start_ist:
-            start_ist, end_ist = end_ist, start_ist
-
-        start_date = getattr(leave, "start_date", None) or start_ist.date()
-        end_date = getattr(leave, "end_date", None) or end_ist.date()
-
-        if end_date < start_date:
-            start_date, end_date = end_date, start_date
-
-        is_half_day = bool(getattr(leave, "is_half_day", False))
-
-        from apps.tasks.models import Checklist, Delegation, FMS, HelpTicket
-
-        exclude_ids = {"checklist": [], "delegation": [], "help_ticket": []}
-
-        if exclude_handover:
-            try:
-                handovers = (
-                    LeaveHandover.objects
-                    .filter(leave_request=leave, is_active=True)
-                    .only("task_type", "original_task_id")
-                )
-
-                for ho in handovers:
-                    task_type = str(getattr(ho, "task_type", "") or "")
-                    if task_type in exclude_ids:
-                        exclude_ids[task_type].append(ho.original_task_id)
-
-            except Exception:
-                logger.exception(
-                    "Could not resolve handover exclusions for leave %s.",
-                    getattr(leave, "id", None),
-                )
-
-        if is_half_day:
-            datetime_window = Q(planned_date__gte=start_ist) & Q(planned_date__lt=end_ist)
-        else:
-            datetime_window = Q(planned_date__date__gte=start_date) & Q(planned_date__date__lte=end_date)
-
-        checklist_qs = (
-            Checklist.objects
-            .filter(
-                assign_to=leave.employee,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            )
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["checklist"]:
-            checklist_qs = checklist_qs.exclude(id__in=exclude_ids["checklist"])
-
-        counts["checklist"] = int(
-            checklist_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        delegation_qs = (
-            Delegation.objects
-            .filter(
-                assign_to=leave.employee,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            )
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["delegation"]:
-            delegation_qs = delegation_qs.exclude(id__in=exclude_ids["delegation"])
-
-        counts["delegation"] = int(
-            delegation_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        help_ticket_qs = (
-            HelpTicket.objects
-            .filter(
-                assign_to=leave.employee,
-                is_skipped_due_to_leave=False,
-            )
-            .exclude(status__in=["Closed", "COMPLETED", "Completed", "Done"])
-            .filter(datetime_window)
-        )
-
-        if exclude_ids["help_ticket"]:
-            help_ticket_qs = help_ticket_qs.exclude(id__in=exclude_ids["help_ticket"])
-
-        counts["help_ticket"] = int(
-            help_ticket_qs.update(is_skipped_due_to_leave=True)
-        )
-
-        try:
-            if not is_half_day:
-                counts["fms"] = int(
-                    FMS.objects
-                    .filter(
-                        assign_to=leave.employee,
-                        planned_date__gte=start_date,
-                        planned_date__lte=end_date,
-                        is_skipped_due_to_leave=False,
-                    )
-                    .update(is_skipped_due_to_leave=True)
-                )
-        except Exception:
-            logger.exception(
-                "FMS auto-skip failed for leave %s.",
-                getattr(leave, "id", None),
-            )
-
+        counts = apply_leave_task_skips(leave, exclude_handover=exclude_handover)
         logger.info(
-            "Auto-skip applied for leave %s status=%s half_day=%s counts=%s.",
+            "Auto-skip applied for leave %s status=%s counts=%s.",
             getattr(leave, "id", None),
-            leave_status,
-            is_half_day,
+            getattr(leave, "status", None),
             counts,
         )
-
+        return counts
     except Exception:
         logger.exception(
             "Auto-skip failed for leave %s.",
             getattr(leave, "id", None),
         )
-
-    return counts
-
-def _restore_leave_skips_for_employee(employee) -> Dict[str, int]:
-    """
-    Restore tasks previously skipped due to leave for one employee.
-
-    Simple meaning:
-    - Set is_skipped_due_to_leave=False
-    - Only for this employee
-    - This prepares system for fresh recalculation
-    """
-    counts = {"checklist": 0, "delegation": 0, "help_ticket": 0, "fms": 0}
-
-    try:
-        if not employee:
-            return counts
-
-        from apps.tasks.models import Checklist, Delegation, FMS, HelpTicket
-
-        counts["checklist"] = int(
-            Checklist.objects
-            .filter(assign_to=employee, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["delegation"] = int(
-            Delegation.objects
-            .filter(assign_to=employee, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["help_ticket"] = int(
-            HelpTicket.objects
-            .filter(assign_to=employee, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        counts["fms"] = int(
-            FMS.objects
-            .filter(assign_to=employee, is_skipped_due_to_leave=True)
-            .update(is_skipped_due_to_leave=False)
-        )
-
-        logger.info(
-            "Restored leave-skipped tasks for employee %s counts=%s.",
-            getattr(employee, "id", None),
-            counts,
-        )
-
-    except Exception:
-        logger.exception(
-            "Failed to restore leave-skipped tasks for employee %s.",
-            getattr(employee, "id", None),
-        )
-
-    return counts
+        return {"checklist": 0, "delegation": 0, "help_ticket": 0, "fms": 0}
 
 
 def _resync_leave_task_skips_for_employee(employee, *, exclude_handover: bool = True) -> Dict[str, object]:
     """
     Recalculate leave-based task skipping for one employee.
 
-    Simple meaning:
-    Step 1: Bring back all tasks skipped because of leave.
-    Step 2: Look at current active leaves.
-    Step 3: Skip tasks again for active leave periods.
-
-    Active leaves:
-    - PENDING
-    - APPROVED
-
-    Inactive leaves:
-    - REJECTED
-    - deleted
+    The re-sync runs on a worker after commit (see
+    apps.leave.services.task_skips); this only queues it.
     """
-    result = {
-        "restored": {"checklist": 0, "delegation": 0, "help_ticket": 0, "fms": 0},
-        "applied": {},
-        "active_leave_ids": [],
-    }
+    employee_id = getattr(employee, "id", None)
 
     try:
-        if not employee:
-            return result
-
-        restored_counts = _restore_leave_skips_for_employee(employee)
-        result["restored"] = restored_counts
-
-        active_leaves = (
-            LeaveRequest.objects
-            .filter(
-                employee=employee,
-                status__in=ACTIVE_DEDUCTION_STATUSES,
-            )
-            .select_related("employee")
-            .order_by("start_at", "id")
-        )
-
-        for active_leave in active_leaves:
-            skip_counts = _auto_skip_tasks_for_leave(
-                active_leave,
-                exclude_handover=exclude_handover,
-            )
-            result["applied"][active_leave.id] = skip_counts
-            result["active_leave_ids"].append(active_leave.id)
-
-        logger.info(
-            "Re-synced leave task skips for employee %s active_leave_ids=%s result=%s.",
-            getattr(employee, "id", None),
-            result["active_leave_ids"],
-            result,
-        )
-
+        queue_leave_task_skip_resync(employee_id, reason="leave_view")
     except Exception:
         logger.exception(
-            "Failed to re-sync leave task skips for employee %s.",
-            getattr(employee, "id", None),
+            "Failed to queue leave task skip re-sync for employee %s.",
+            employee_id,
         )
+        return {"queued": False, "employee_id": employee_id}
 
-    return result
+    return {"queued": True, "employee_id": employee_id}
 
 def _datespan_ist(start_dt, end_dt) -> List[date]:
     if not (start_dt and end_dt):
@@ -863,6 +626,7 @@ def apply_leave(request: HttpRequest) -> HttpResponse:
 
                                 if handovers:
                                     handovers_created = LeaveHandover.objects.bulk_create(handovers, ignore_conflicts=True)
+                                    _invalidate_handover_dashboards(LeaveHandover.objects.filter(leave_request=lr))
 
                             skip_counts = _auto_skip_tasks_for_leave(lr, exclude_handover=True)
                             logger.info(
@@ -0,0 +1,414 @@
+# FILE: apps/reimbursement/analytics.py
+# PURPOSE: Shared query layer for the reimbursement analytics dashboard.
+#
+# Every analytics endpoint works on the same bill-wise scope (INCLUDED lines
+# filtered by bill status, employees, line ids, expense date and category).
+# This module builds that scope once and computes each result set with a
+# single grouped / conditional-aggregation query:
+#
+#   line_summary       total, highest, lowest, bill count     (1 query)
+#   realtime_counters  request-level + line-level counters    (2 queries)
+#   employee_totals    per-employee totals / counts           (1 query)
+#   employee_top_categories                                   (1 query)
+#   category_totals, timeseries                               (1 query each)
+#
+# Results are cached per filter fingerprint for ANALYTICS_CACHE_TTL seconds.
+# Cache keys carry a generation number that signals.py bumps (on commit)
+# whenever a request or bill line is saved or deleted, so the dashboard's
+# parallel fetches share one scan and never outlive a status change.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, Max, Min, Q, Sum, Value as V
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth
+from django.utils import timezone
+
+from .models import ReimbursementLine, ReimbursementRequest
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_CACHE_TTL = int(getattr(settings, "REIMBURSEMENT_ANALYTICS_CACHE_TTL", 60))
+
+_GENERATION_KEY = "reimb.analytics.generation"
+_KEY_PREFIX = "reimb.analytics"
+
+# A reusable "decimal zero" with explicit output_field so Coalesce/Sum remain DecimalField
+DEC0 = V(Decimal("0"), output_field=DecimalField(max_digits=18, decimal_places=2))
+
+
+def d(val: str | int | float | Decimal | None) -> Decimal:
+    """Safe decimal ctor (e.g., d(0), d('100.50'))."""
+    try:
+        return Decimal(str(val if val is not None else 0))
+    except Exception:
+        return Decimal("0")
+
+
+# ---------------------------------------------------------------------
+# Filters + bill-wise scope
+# ---------------------------------------------------------------------
+
+@dataclass
+class Filters:
+    """
+    Filter set:
+      - employees: CSV of user IDs (used to scope analytics)
+      - status: approved_and_paid | approved_only | paid_only   ← applied to BILL STATUS
+      - line_ids: CSV of ReimbursementLine PKs (drives bill-wise scoping)
+      - from_date / to_date: YYYY-MM-DD (inclusive range on expense date)
+      - preset: this_month | last_month | last_90_days | ytd | fytd (ignored if from/to supplied)
+      - granularity: day | month (affects timeseries endpoint only)
+      - categories: CSV of category keys (travel, meal, yard, office, other)
+    """
+    employee_ids: List[int]
+    status_mode: str
+    line_ids: List[int]
+    from_date: Optional[date]
+    to_date: Optional[date]
+    preset: Optional[str]
+    granularity: str
+    categories: List[str]
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of everything that changes the line scope.
+        `preset` is already resolved into from/to and `granularity` only
+        matters to the timeseries, which adds it to its own key.
+        """
+        payload = json.dumps(
+            [
+                sorted(set(self.employee_ids)),
+                self.status_mode,
+                sorted(set(self.line_ids)),
+                self.from_date.isoformat() if self.from_date else None,
+                self.to_date.isoformat() if self.to_date else None,
+                sorted(set(self.categories)),
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _status_q(status_mode: str) -> Q:
+    """
+    Status filter applied to *bill* status, per client requirement.
+    - approved_only      -> FINANCE_APPROVED
+    - paid_only          -> PAID
+    - approved_and_paid  -> FINANCE_APPROVED or PAID
+    """
+    BS = ReimbursementLine.BillStatus
+    if status_mode == "approved_only":
+        return Q(bill_status=BS.FINANCE_APPROVED)
+    if status_mode == "paid_only":
+        return Q(bill_status=BS.PAID)
+    # approved_and_paid (default)
+    return Q(bill_status__in=[BS.FINANCE_APPROVED, BS.PAID])
+
+
+def _scope_lines_qs(f: Filters):
+    """
+    Filtered INCLUDED lines without joins beyond what the filters need;
+    the base for every aggregate below.
+    """
+    qs = ReimbursementLine.objects.filter(status=ReimbursementLine.Status.INCLUDED).filter(
+        _status_q(f.status_mode)
+    )
+
+    if f.employee_ids:
+        qs = qs.filter(request__created_by_id__in=f.employee_ids)
+
+    # Bill-wise filter must affect analytics
+    if f.line_ids:
+        qs = qs.filter(id__in=f.line_ids)
+
+    # Time window on expense date (date-range)
+    if f.from_date:
+        qs = qs.filter(expense_item__date__gte=f.from_date)
+    if f.to_date:
+        qs = qs.filter(expense_item__date__lte=f.to_date)
+
+    # Optional category filter
+    if f.categories:
+        qs = qs.filter(expense_item__category__in=f.categories)
+
+    return qs
+
+
+def base_lines_qs(f: Filters):
+    """
+    Start from ReimbursementLine to keep category fidelity and BILL-wise analytics.
+    Only INCLUDED lines, joined to request & expense item (for row listings).
+    """
+    return _scope_lines_qs(f).select_related("request", "expense_item", "request__created_by")
+
+
+def request_qs_scoped_by_lines(f: Filters):
+    """
+    Requests that contain at least one line in the current scope
+    (an id__in subquery; no rows are pulled into Python).
+    """
+    req_ids = _scope_lines_qs(f).values("request_id")
+    return ReimbursementRequest.objects.filter(id__in=req_ids)
+
+
+# ---------------------------------------------------------------------
+# Cache (per filter fingerprint, generation-invalidated)
+# ---------------------------------------------------------------------
+
+def _generation() -> int:
+    try:
+        gen = cache.get(_GENERATION_KEY)
+        if gen is None:
+            cache.add(_GENERATION_KEY, 1, timeout=None)
+            gen = cache.get(_GENERATION_KEY, 1)
+        return int(gen)
+    except Exception:
+        logger.debug("Analytics cache generation unavailable", exc_info=True)
+        return 0
+
+
+def invalidate_analytics_cache() -> None:
+    """
+    Retire every cached analytics result by bumping the generation.
+    Called from signals.py on commit of any request / bill line change.
+    """
+    try:
+        cache.incr(_GENERATION_KEY)
+    except ValueError:
+        # Key missing (evicted / first run): start a fresh generation.
+        cache.set(_GENERATION_KEY, 2, timeout=None)
+    except Exception:
+        logger.debug("Analytics cache invalidation failed", exc_info=True)
+
+
+def _cached(kind: str, f: Filters, compute: Callable[[], object], *extra) -> object:
+    if ANALYTICS_CACHE_TTL <= 0:
+        return compute()
+
+    parts = [_KEY_PREFIX, str(_generation()), kind, f.fingerprint(), *(str(x) for x in extra)]
+    key = ".".join(parts)
+    try:
+        hit = cache.get(key)
+    except Exception:
+        hit = None
+    if hit is not None:
+        return hit
+
+    value = compute()
+    try:
+        cache.set(key, value, timeout=ANALYTICS_CACHE_TTL)
+    except Exception:
+        logger.debug("Analytics cache set failed for %s", kind, exc_info=True)
+    return value
+
+
+# ---------------------------------------------------------------------
+# Aggregates
+# ---------------------------------------------------------------------
+
+def _display_name(uid, first_name, last_name, username) -> str:
+    full = f"{(first_name or '').strip()} {(last_name or '').strip()}".strip()
+    return full or (username or "").strip() or f"User #{uid}"
+
+
+def line_summary(f: Filters) -> Dict[str, float | int]:
+    """Total spend, highest / lowest single bill and bill count in one query."""
+    def compute():
+        agg = _scope_lines_qs(f).aggregate(
+            total=Coalesce(Sum("amount"), DEC0),
+            hi=Max("amount"),
+            lo=Min("amount"),
+            bills=Count("id"),
+        )
+        return {
+            "total_spend": float(d(agg["total"])),
+            "highest_bill": float(d(agg["hi"])) if agg["hi"] is not None else 0.0,
+            "lowest_bill": float(d(agg["lo"])) if agg["lo"] is not None else 0.0,
+            "bill_count": int(agg["bills"] or 0),
+        }
+
+    return _cached("summary", f, compute)
+
+
+def realtime_counters(f: Filters) -> Dict[str, object]:
+    """
+    Scope sizes and status counters: one conditional aggregate over the
+    scoped requests and one over the scoped lines.
+    """
+    today = timezone.localdate()
+
+    def compute():
+        RS = ReimbursementRequest.Status
+        BS = ReimbursementLine.BillStatus
+
+        req = request_qs_scoped_by_lines(f).aggregate(
+            scope=Count("id"),
+            finance_pending=Count("id", filter=Q(status=RS.PENDING_FINANCE_VERIFY)),
+            manager_pending=Count("id", filter=Q(status=RS.PENDING_MANAGER)),
+            management_pending=Count("id", filter=Q(status=RS.PENDING_MANAGEMENT)),
+            approved=Count("id", filter=Q(status=RS.APPROVED)),
+            paid=Count("id", filter=Q(status=RS.PAID)),
+            submitted_today=Count("id", filter=Q(submitted_at__date=today)),
+        )
+        lines = _scope_lines_qs(f).aggregate(
+            scope=Count("id"),
+            resubmitted=Count("id", filter=Q(bill_status=BS.EMPLOYEE_RESUBMITTED)),
+            finance_approved=Count("id", filter=Q(bill_status=BS.FINANCE_APPROVED)),
+        )
+        return {
+            "scope": {
+                "request_ids": req["scope"],
+                "line_count": lines["scope"],
+            },
+            "counts": {
+                "finance_pending_requests": req["finance_pending"],
+                "manager_pending_requests": req["manager_pending"],
+                "management_pending_requests": req["management_pending"],
+                "approved_requests": req["approved"],
+                "paid_requests": req["paid"],
+                "resubmitted_bills": lines["resubmitted"],
+                "finance_approved_bills": lines["finance_approved"],
+                "submitted_today": req["submitted_today"],
+            },
+        }
+
+    # `submitted_today` rolls over at midnight, so the day is part of the key.
+    return _cached("realtime", f, compute, today.isoformat())
+
+
+def employee_totals(f: Filters) -> List[Dict[str, object]]:
+    """
+    Per-employee spend rows ordered by total desc, then name:
+    {employee_id, employee_name, total, bill_count, request_count}.
+    """
+    def compute():
+        rows = (
+            _scope_lines_qs(f)
+            .values(
+                "request__created_by_id",
+                "request__created_by__first_name",
+                "request__created_by__last_name",
+                "request__created_by__username",
+            )
+            .annotate(
+                total=Coalesce(Sum("amount"), DEC0),
+                bill_count=Count("id"),
+                request_count=Count("request_id", distinct=True),
+            )
+            .order_by()
+        )
+        out = []
+        for r in rows:
+            uid = r["request__created_by_id"]
+            out.append({
+                "employee_id": uid,
+                "employee_name": _display_name(
+                    uid,
+                    r["request__created_by__first_name"],
+                    r["request__created_by__last_name"],
+                    r["request__created_by__username"],
+                ),
+                "total": float(d(r["total"])),
+                "bill_count": int(r["bill_count"] or 0),
+                "request_count": int(r["request_count"] or 0),
+            })
+        out.sort(key=lambda x: (-x["total"], x["employee_name"]))
+        return out
+
+    return _cached("employees", f, compute)
+
+
+def employee_top_categories(f: Filters) -> Dict[int, str]:
+    """Most used category key per employee (by amount; ties -> higher count)."""
+    def compute():
+        rows = (
+            _scope_lines_qs(f)
+            .values("request__created_by_id", "expense_item__category")
+            .annotate(amt=Coalesce(Sum("amount"), DEC0), cnt=Count("id"))
+            .order_by()
+        )
+        best: Dict[int, tuple] = {}  # uid -> (key, amt, cnt)
+        for r in rows:
+            uid = r["request__created_by_id"]
+            amt = float(d(r["amt"]))
+            cnt = int(r["cnt"] or 0)
+            cur = best.get(uid)
+            if cur is None or amt > cur[1] or (amt == cur[1] and cnt > cur[2]):
+                best[uid] = (r["expense_item__category"], amt, cnt)
+        return {uid: info[0] for uid, info in best.items()}
+
+    return _cached("employee_categories", f, compute)
+
+
+def category_totals(f: Filters) -> List[Dict[str, object]]:
+    """[{key, total, count}] ordered by total desc, then key."""
+    def compute():
+        rows = (
+            _scope_lines_qs(f)
+            .values("expense_item__category")
+            .annotate(total=Coalesce(Sum("amount"), DEC0), count=Count("id"))
+            .order_by("-total", "expense_item__category")
+        )
+        return [
+            {
+                "key": r["expense_item__category"] or "",
+                "total": d(r["total"]),
+                "count": int(r["count"] or 0),
+            }
+            for r in rows
+        ]
+
+    return _cached("categories", f, compute)
+
+
+def timeseries(f: Filters) -> List[Dict[str, object]]:
+    """[{period, total}] over expense date, bucketed by f.granularity."""
+    def compute():
+        if f.granularity == "month":
+            trunc, fmt = TruncMonth("expense_item__date"), "%Y-%m-01"
+        else:
+            trunc, fmt = TruncDay("expense_item__date"), "%Y-%m-%d"
+
+        rows = (
+            _scope_lines_qs(f)
+            .annotate(period=trunc)
+            .values("period")
+            .annotate(total=Coalesce(Sum("amount"), DEC0))
+            .order_by("period")
+        )
+        return [
+            {
+                "period": r["period"].strftime(fmt) if r["period"] else None,
+                "total": float(d(r["total"])),
+            }
+            for r in rows
+        ]
+
+    return _cached("timeseries", f, compute, f.granularity)
+
+
+__all__ = [
+    "ANALYTICS_CACHE_TTL",
+    "DEC0",
+    "Filters",
+    "base_lines_qs",
+    "category_totals",
+    "d",
+    "employee_top_categories",
+    "employee_totals",
+    "invalidate_analytics_cache",
+    "line_summary",
+    "realtime_counters",
+    "request_qs_scoped_by_lines",
+    "timeseries",
+]
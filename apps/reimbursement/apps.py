@@ -7,3 +7,10 @@ class ReimbursementConfig(AppConfig):
 
     def ready(self):
         from . import signals  # noqa: F401
+
+        # Receipts / bank documents: content-addressed storage + background variants.
+        from apps.common.attachments import register_attachment_fields
+        from .models import ExpenseItem, ReimbursementLine
+
+        register_attachment_fields(ExpenseItem, "receipt_file", "bank_attachment")
+        register_attachment_fields(ReimbursementLine, "receipt_file", "bank_attachment")
@@ -9,15 +9,19 @@ import os
 import random
 import threading
 import time
+from bisect import bisect_left
 from datetime import date, datetime, timezone
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F, Q
 from django.urls import NoReverseMatch, reverse
+from django.utils import timezone as dj_timezone
 
-from apps.reimbursement.models import ReimbursementLine
+from apps.common.rate_limit import RateLimited, take_sheets_quota
+from apps.reimbursement.models import ReimbursementLine, SheetSyncOutbox
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,8 @@ __all__ = [
     "TAB_SCHEMA",
     "ensure_spreadsheet_structure",
     "sync_request",
+    "enqueue_request_sync",
+    "flush_sync_outbox",
     "build_row",
     "build_rows",
     "reset_main_data",
@@ -54,13 +60,6 @@ STRUCTURE_TTL_SECONDS = int(
     getattr(settings, "REIMBURSEMENT_SHEETS_STRUCTURE_TTL_SECONDS", 600)
 )
 
-READS_PER_MINUTE_BUDGET = int(
-    getattr(settings, "REIMBURSEMENT_SHEETS_READS_PER_MINUTE", 48)
-)
-
-WRITES_PER_MINUTE_BUDGET = int(
-    getattr(settings, "REIMBURSEMENT_SHEETS_WRITES_PER_MINUTE", 30)
-)
 
 HEADER = [
     "RowKey",
@@ -104,12 +103,6 @@ SCHEMA_HEADER = [
 _WARNED_MISSING_GOOGLE = False
 _WARNED_MISSING_CREDS = False
 
-_rw_lock = threading.Lock()
-_read_next_refill = time.monotonic()
-_write_next_refill = time.monotonic()
-_read_tokens = READS_PER_MINUTE_BUDGET
-_write_tokens = WRITES_PER_MINUTE_BUDGET
-
 _meta_lock = threading.Lock()
 _meta_cache: Dict[str, Any] = {}
 
@@ -367,33 +360,12 @@ def _svc_drive():
 
 
 def _consume_tokens(kind: str, n: int = 1) -> None:
-    global _read_tokens, _write_tokens, _read_next_refill, _write_next_refill
-
-    with _rw_lock:
-        now = time.monotonic()
-
-        if now >= _read_next_refill:
-            _read_tokens = READS_PER_MINUTE_BUDGET
-            _read_next_refill = now + 60.0
-
-        if now >= _write_next_refill:
-            _write_tokens = WRITES_PER_MINUTE_BUDGET
-            _write_next_refill = now + 60.0
-
-        if kind == "read":
-            if _read_tokens < n:
-                time.sleep(max(0.05, _read_next_refill - now + 0.01))
-                _read_tokens = READS_PER_MINUTE_BUDGET
-                _read_next_refill = time.monotonic() + 60.0
-            _read_tokens = max(0, _read_tokens - n)
-            return
-
-        if _write_tokens < n:
-            time.sleep(max(0.05, _write_next_refill - now + 0.01))
-            _write_tokens = WRITES_PER_MINUTE_BUDGET
-            _write_next_refill = time.monotonic() + 60.0
-
-        _write_tokens = max(0, _write_tokens - n)
+    """
+    Take n tokens from the project-wide Sheets read/write budget shared by
+    every integration. Raises RateLimited when the budget is exhausted; the
+    outbox flush leaves its rows queued and the task retries later.
+    """
+    take_sheets_quota(kind, n)
 
 
 def _with_backoff(label: str, kind: str, fn: Callable[[], Any]) -> Any:
@@ -1188,28 +1160,6 @@ def _delete_sheet_rows(row_numbers: List[int]) -> None:
     _meta_cache.clear()
 
 
-def _delete_stale_or_duplicate_rows_for_request(
-    req_id: int,
-    keep_rowkeys: set[str],
-) -> None:
-    prefix = f"{req_id}-"
-    scanned = _scan_rowkeys()
-    rows_to_delete: List[int] = []
-
-    for rowkey, row_numbers in scanned.items():
-        if not rowkey.startswith(prefix):
-            continue
-
-        if rowkey not in keep_rowkeys:
-            rows_to_delete.extend(row_numbers)
-            continue
-
-        if len(row_numbers) > 1:
-            rows_to_delete.extend(row_numbers[1:])
-
-    _delete_sheet_rows(rows_to_delete)
-
-
 def _delete_rows_not_in_db(valid_rowkeys: set[str]) -> None:
     scanned = _scan_rowkeys()
     rows_to_delete: List[int] = []
@@ -1241,13 +1191,17 @@ def _parse_updated_range_start_row(resp: dict) -> int:
         return 0
 
 
-def _upsert_rows_batch(rows: List[List[Any]]) -> Dict[str, int]:
+def _upsert_rows_batch(
+    rows: List[List[Any]],
+    idx: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
     written_map: Dict[str, int] = {}
 
     if not rows:
         return written_map
 
-    idx = _index_by_rowkey()
+    if idx is None:
+        idx = _index_by_rowkey()
     end_col = _header_end_col()
 
     update_blocks: List[Dict[str, Any]] = []
@@ -1290,7 +1244,7 @@ def _upsert_rows_batch(rows: List[List[Any]]) -> Dict[str, int]:
     return written_map
 
 
-def append_changelog(
+def _changelog_row(
     event: str,
     rowkey: str,
     old: str,
@@ -1299,149 +1253,322 @@ def append_changelog(
     actor: str = "",
     result: str = "ok",
     err: str = "",
-) -> None:
+) -> List[Any]:
+    return [
+        _iso(datetime.now(timezone.utc)),
+        event,
+        rowkey,
+        old or "",
+        new or "",
+        rownum,
+        actor or "",
+        f"{result}: {err}" if err else result,
+    ]
+
+
+def _append_changelog_rows(rows: List[List[Any]]) -> None:
+    if not rows:
+        return
+
     try:
-        _values_append(
-            f"{TAB_CHANGELOG}!A:H",
-            [
-                [
-                    _iso(datetime.now(timezone.utc)),
-                    event,
-                    rowkey,
-                    old or "",
-                    new or "",
-                    rownum,
-                    actor or "",
-                    f"{result}: {err}" if err else result,
-                ]
-            ],
-            user_entered=False,
-        )
+        _values_append(f"{TAB_CHANGELOG}!A:H", rows, user_entered=False)
     except Exception as exc:
         logger.info("Changelog append skipped: %s", exc)
 
 
-def _sync_request_impl(req_id: int) -> None:
-    if not _google_available():
-        return
+def append_changelog(
+    event: str,
+    rowkey: str,
+    old: str,
+    new: str,
+    rownum: int,
+    actor: str = "",
+    result: str = "ok",
+    err: str = "",
+) -> None:
+    _append_changelog_rows(
+        [_changelog_row(event, rowkey, old, new, rownum, actor, result, err)]
+    )
+
+
+def _shift_index_after_delete(
+    scanned: Dict[str, List[int]],
+    deleted: List[int],
+) -> Dict[str, int]:
+    """
+    First row number per rowkey after `deleted` rows are removed, computed
+    locally so the sheet does not have to be scanned a second time.
+    """
+    gone = sorted(set(deleted))
+    gone_set = set(gone)
+    idx: Dict[str, int] = {}
+
+    for rowkey, row_numbers in scanned.items():
+        for rn in row_numbers:
+            if rn in gone_set:
+                continue
+            idx[rowkey] = rn - bisect_left(gone, rn)
+            break
+
+    return idx
+
+
+def _sync_requests_batch(req_ids: List[int]) -> Dict[int, str]:
+    """
+    Bring the sheet rows of several requests in line with the DB.
+
+    Sheet cost per batch, regardless of its size: one read of column A:B,
+    at most one row-delete batchUpdate, one values.batchUpdate, one append
+    and one changelog append. Requests that no longer exist have their
+    rows removed.
 
+    Returns {req_id: error} for requests whose rows could not be built
+    (nothing is written for those). Sheets API errors propagate.
+    """
     from apps.reimbursement.models import ReimbursementRequest
 
+    req_ids = sorted({int(r) for r in req_ids if r})
+    failed: Dict[int, str] = {}
+
+    if not req_ids:
+        return failed
+
     ensure_spreadsheet_structure()
 
-    try:
-        req = (
-            ReimbursementRequest.objects
-            .select_related(
-                "created_by",
-                "manager",
-                "management",
-                "verified_by",
-            )
-            .prefetch_related("lines__expense_item")
-            .get(pk=req_id)
+    requests = (
+        ReimbursementRequest.objects
+        .select_related(
+            "created_by",
+            "manager",
+            "management",
+            "verified_by",
         )
-    except ReimbursementRequest.DoesNotExist:
+        .prefetch_related("lines__expense_item")
+        .filter(pk__in=req_ids)
+    )
+
+    rows: List[List[Any]] = []
+    status_by_req: Dict[int, str] = {}
+    keep_by_req: Dict[int, set] = {req_id: set() for req_id in req_ids}
+
+    for req in requests:
         try:
-            _delete_stale_or_duplicate_rows_for_request(
-                req_id=req_id,
-                keep_rowkeys=set(),
-            )
+            req_rows = build_rows(req)
         except Exception as exc:
-            logger.exception(
-                "Google Sheets stale cleanup failed for deleted req=%s: %s",
-                req_id,
-                exc,
-            )
-        return
-    except Exception as exc:
-        logger.exception(
-            "Failed to load reimbursement request %s for sheet sync: %s",
-            req_id,
-            exc,
-        )
-        return
+            logger.exception("Failed to build sheet rows for req=%s: %s", req.pk, exc)
+            failed[req.pk] = str(exc)
+            keep_by_req.pop(req.pk, None)
+            continue
 
-    rows = build_rows(req)
-    keep_rowkeys = {str(row[0]) for row in rows}
+        rows.extend(req_rows)
+        status_by_req[req.pk] = getattr(req, "status", "") or ""
+        keep_by_req[req.pk] = {str(row[0]) for row in req_rows}
 
-    try:
-        _delete_stale_or_duplicate_rows_for_request(
-            req_id=req_id,
-            keep_rowkeys=keep_rowkeys,
-        )
-    except Exception as exc:
-        logger.exception(
-            "Google Sheets stale/duplicate cleanup failed for req=%s: %s",
-            req_id,
-            exc,
-        )
+    scanned = _scan_rowkeys()
+    rows_to_delete: List[int] = []
 
-    try:
-        written = _upsert_rows_batch(rows)
-    except Exception as exc:
-        logger.exception(
-            "Google Sheets upsert failed for req=%s: %s",
-            req_id,
-            exc,
-        )
-        written = {}
+    for rowkey, row_numbers in scanned.items():
+        try:
+            owner = int(rowkey.split("-", 1)[0])
+        except ValueError:
+            continue
+
+        keep = keep_by_req.get(owner)
+        if keep is None:
+            continue
+
+        if rowkey not in keep:
+            rows_to_delete.extend(row_numbers)
+        elif len(row_numbers) > 1:
+            rows_to_delete.extend(row_numbers[1:])
+
+    _delete_sheet_rows(rows_to_delete)
 
-    prev_status = getattr(req, "status", "") or ""
+    written = _upsert_rows_batch(rows, idx=_shift_index_after_delete(scanned, rows_to_delete))
 
+    changelog: List[List[Any]] = []
     for row in rows:
         rowkey = str(row[0])
-        rownum = int(written.get(rowkey, 0))
+        status = status_by_req.get(int(rowkey.split("-", 1)[0]), "")
+        changelog.append(
+            _changelog_row("upsert", rowkey, status, status, int(written.get(rowkey, 0)))
+        )
+    _append_changelog_rows(changelog)
 
-        try:
-            append_changelog(
-                "upsert",
-                rowkey,
-                prev_status,
-                req.status,
-                rownum,
-                "",
-                "ok",
-            )
-        except Exception:
-            pass
+    return failed
 
 
-def sync_request(req) -> None:
-    if req is None:
+# ---------------------------------------------------------------------------
+# Sync outbox
+#
+# Saves enqueue the request id in SheetSyncOutbox (one row per request, so
+# bursts of saves coalesce). A Celery task drains the outbox in batches via
+# _sync_requests_batch; rows are deleted only if they were not re-enqueued
+# while the batch was being written, so no update is ever dropped.
+# ---------------------------------------------------------------------------
+
+OUTBOX_BATCH_SIZE = int(getattr(settings, "REIMBURSEMENT_SHEETS_OUTBOX_BATCH_SIZE", 50))
+OUTBOX_FLUSH_DELAY_SECONDS = int(
+    getattr(settings, "REIMBURSEMENT_SHEETS_OUTBOX_FLUSH_DELAY", 10)
+)
+OUTBOX_MAX_ATTEMPTS = int(getattr(settings, "REIMBURSEMENT_SHEETS_OUTBOX_MAX_ATTEMPTS", 10))
+
+_OUTBOX_FLUSH_LOCK_KEY = "reimb.sheets.outbox.flush.lock"
+_OUTBOX_FLUSH_LOCK_TTL = 10 * 60
+_OUTBOX_SCHEDULED_KEY = "reimb.sheets.outbox.flush.scheduled"
+
+
+def _schedule_outbox_flush() -> None:
+    """Ask Celery for one flush shortly; concurrent callers share it."""
+    if not cache.add(_OUTBOX_SCHEDULED_KEY, True, timeout=OUTBOX_FLUSH_DELAY_SECONDS):
         return
 
     try:
-        req_id = int(getattr(req, "id", 0)) or 0
+        from apps.reimbursement.tasks import flush_reimbursement_sheet_outbox
+
+        flush_reimbursement_sheet_outbox.apply_async(countdown=OUTBOX_FLUSH_DELAY_SECONDS)
+    except Exception as exc:
+        # The periodic beat flush still drains the outbox.
+        logger.info("Reimbursement sheet flush not scheduled (%s); beat will pick it up.", exc)
+
+
+def enqueue_request_sync(req_ids) -> int:
+    """
+    Mark request id(s) as needing a sheet sync. Cheap and idempotent: an id
+    that is already queued only has its enqueued_at bumped.
+    """
+    if isinstance(req_ids, int):
+        req_ids = [req_ids]
+
+    ids = sorted({int(r) for r in req_ids if r})
+    if not ids:
+        return 0
+
+    # Bump then insert-if-missing: a row acked by a concurrent flush between
+    # the two statements is simply re-created.
+    now = dj_timezone.now()
+    # A fresh change also earns a request that had given up new attempts.
+    SheetSyncOutbox.objects.filter(request_id__in=ids).update(
+        enqueued_at=now, attempts=0, last_error=""
+    )
+    SheetSyncOutbox.objects.bulk_create(
+        [SheetSyncOutbox(request_id=r, enqueued_at=now) for r in ids],
+        ignore_conflicts=True,
+    )
+
+    try:
+        transaction.on_commit(_schedule_outbox_flush)
     except Exception:
-        req_id = 0
+        _schedule_outbox_flush()
 
-    if not req_id:
+    return len(ids)
+
+
+def _ack_outbox(picked: Dict[int, Any]) -> None:
+    """Delete outbox rows that were not re-enqueued after being picked."""
+    if not picked:
         return
 
+    match = Q()
+    for req_id, stamp in picked.items():
+        match |= Q(request_id=req_id, enqueued_at=stamp)
+    SheetSyncOutbox.objects.filter(match).delete()
+
+
+def _record_outbox_failure(req_id: int, error: str) -> None:
+    SheetSyncOutbox.objects.filter(request_id=req_id).update(
+        attempts=F("attempts") + 1,
+        last_error=(error or "")[:2000],
+    )
+
+
+def flush_sync_outbox(limit: Optional[int] = None, max_batches: Optional[int] = None) -> Dict[str, int]:
+    """
+    Drain the outbox in batches of `limit` (default OUTBOX_BATCH_SIZE).
+
+    If a batch fails as a whole, its ids are retried one by one so a single
+    bad request cannot block the rest; failures bump `attempts` and are
+    skipped once they reach OUTBOX_MAX_ATTEMPTS. RateLimited propagates
+    with the current batch still queued.
+    """
+    stats = {"synced": 0, "failed": 0, "batches": 0}
+
     if not _google_available():
-        return
+        return stats
 
-    lock_key = f"reimb.sheets.sync.lock.{req_id}"
+    if not cache.add(_OUTBOX_FLUSH_LOCK_KEY, True, timeout=_OUTBOX_FLUSH_LOCK_TTL):
+        logger.info("Reimbursement sheet outbox flush already running.")
+        return stats
 
-    if not cache.add(lock_key, True, timeout=30):
-        return
+    batch_size = max(1, int(limit or OUTBOX_BATCH_SIZE))
+    # Rows failing within this run are not picked again until the next run.
+    tried: set = set()
 
-    def _kick():
-        try:
-            thread = threading.Thread(
-                target=_sync_request_impl,
-                args=(req_id,),
-                daemon=True,
+    try:
+        while max_batches is None or stats["batches"] < max_batches:
+            picked = dict(
+                SheetSyncOutbox.objects
+                .filter(attempts__lt=OUTBOX_MAX_ATTEMPTS)
+                .exclude(request_id__in=tried)
+                .order_by("enqueued_at")
+                .values_list("request_id", "enqueued_at")[:batch_size]
             )
-            thread.start()
-        except Exception:
-            cache.delete(lock_key)
+            if not picked:
+                break
+
+            stats["batches"] += 1
+            tried.update(picked)
+
+            try:
+                failed = _sync_requests_batch(list(picked))
+            except RateLimited:
+                # Quota, not data: leave the batch queued for the retry.
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Reimbursement sheet batch of %s failed (%s); retrying one by one.",
+                    len(picked),
+                    exc,
+                )
+                failed = {}
+                for req_id in picked:
+                    try:
+                        failed.update(_sync_requests_batch([req_id]))
+                    except RateLimited:
+                        raise
+                    except Exception as single_exc:
+                        failed[req_id] = str(single_exc)
+
+            for req_id, error in failed.items():
+                _record_outbox_failure(req_id, error)
+                logger.error("Reimbursement sheet sync failed for req=%s: %s", req_id, error)
+
+            done = {r: stamp for r, stamp in picked.items() if r not in failed}
+            _ack_outbox(done)
+            stats["synced"] += len(done)
+            stats["failed"] += len(failed)
+    finally:
+        cache.delete(_OUTBOX_FLUSH_LOCK_KEY)
+
+    if stats["batches"]:
+        logger.info("Reimbursement sheet outbox flushed: %s", stats)
+    return stats
+
+
+def sync_request(req) -> None:
+    """Queue a sheet sync for `req` (a request instance or id)."""
+    if req is None:
+        return
 
     try:
-        transaction.on_commit(_kick)
+        req_id = int(getattr(req, "id", req)) or 0
     except Exception:
-        _kick()
+        req_id = 0
+
+    if not req_id:
+        return
+
+    enqueue_request_sync(req_id)
 
 
 def reset_main_data() -> None:
@@ -3,21 +3,13 @@ from __future__ import annotations
 
 import sys
 import time
-from typing import Iterable, Optional
+from typing import Optional
 
 from django.core.management.base import BaseCommand, CommandParser
-from django.db.models import QuerySet
 
+from apps.common.rate_limit import RateLimited
 from apps.reimbursement.models import ReimbursementRequest
-from apps.reimbursement.integrations.sheets import sync_request
-
-
-def batched(qs: QuerySet, *, batch_size: int = 200) -> Iterable[list[ReimbursementRequest]]:
-    start = 0
-    total = qs.count()
-    while start < total:
-        yield list(qs[start : start + batch_size])
-        start += batch_size
+from apps.reimbursement.integrations.sheets import enqueue_request_sync, flush_sync_outbox
 
 
 class Command(BaseCommand):
@@ -55,30 +47,40 @@ class Command(BaseCommand):
             )
             sys.exit(2)
 
-        qs = (
-            ReimbursementRequest.objects
-            .select_related("created_by", "manager", "management", "verified_by")
-            .prefetch_related("lines__expense_item")
-            .order_by("id")
-        )
+        qs = ReimbursementRequest.objects.order_by("id")
         if id_gte is not None:
             qs = qs.filter(id__gte=id_gte)
         if id_lte is not None:
             qs = qs.filter(id__lte=id_lte)
 
-        total = qs.count()
+        ids = list(qs.values_list("id", flat=True))
+        total = len(ids)
         self.stdout.write(self.style.NOTICE(f"Syncing {total} requests... (idempotent)"))
 
+        # Queue everything, then drain the outbox here in sheet batches
+        # (one scan + one write per batch instead of per request).
         done = 0
-        for chunk in batched(qs, batch_size=batch_size):
-            for req in chunk:
-                try:
-                    sync_request(req)  # upsert: updates if exists, inserts otherwise
-                except Exception as e:
-                    self.stderr.write(self.style.WARNING(f"req={req.id} sync error: {e}"))
+        for start in range(0, total, batch_size):
+            chunk = ids[start : start + batch_size]
+            enqueue_request_sync(chunk)
+            stats = self._flush(limit=batch_size, max_batches=1)
+            if stats.get("failed"):
+                self.stderr.write(
+                    self.style.WARNING(f"{stats['failed']} request(s) failed; left in outbox for retry.")
+                )
             done += len(chunk)
             self.stdout.write(self.style.SUCCESS(f"Progress: {done}/{total}"))
             if sleep_s > 0:
                 time.sleep(sleep_s)
 
+        self._flush(limit=batch_size)
         self.stdout.write(self.style.SUCCESS("Backfill complete."))
+
+    def _flush(self, **kwargs) -> dict:
+        """flush_sync_outbox, waiting out the shared Sheets quota when it runs dry."""
+        while True:
+            try:
+                return flush_sync_outbox(**kwargs)
+            except RateLimited as exc:
+                self.stdout.write(self.style.WARNING(f"{exc}; waiting."))
+                time.sleep(exc.retry_after)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-16 18:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reimbursement', '0019_expenseitem_bank_attachment_expenseitem_bank_details_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SheetSyncOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('request_id', models.PositiveBigIntegerField(unique=True)),
+                ('enqueued_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'verbose_name': 'Sheet Sync Outbox Entry',
+                'verbose_name_plural': 'Sheet Sync Outbox',
+                'ordering': ['enqueued_at'],
+            },
+        ),
+    ]
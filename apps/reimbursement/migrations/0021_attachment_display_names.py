@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-16 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reimbursement', '0020_sheet_sync_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expenseitem',
+            name='bank_attachment_name',
+            field=models.CharField(blank=True, default='', help_text='File name as uploaded (the stored file is content-addressed).', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='expenseitem',
+            name='receipt_file_name',
+            field=models.CharField(blank=True, default='', help_text='File name as uploaded (the stored file is content-addressed).', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='reimbursementline',
+            name='bank_attachment_name',
+            field=models.CharField(blank=True, default='', help_text='File name as uploaded (the stored file is content-addressed).', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='reimbursementline',
+            name='receipt_file_name',
+            field=models.CharField(blank=True, default='', help_text='File name as uploaded (the stored file is content-addressed).', max_length=255),
+        ),
+    ]
@@ -359,6 +359,12 @@ class ExpenseItem(models.Model):
         upload_to=receipt_upload_path,
         validators=[validate_receipt_file],
     )
+    receipt_file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="File name as uploaded (the stored file is content-addressed).",
+    )
 
     bank_details = models.TextField(
         blank=True,
@@ -372,6 +378,12 @@ class ExpenseItem(models.Model):
         null=True,
         help_text="Optional bank details attachment uploaded by employee.",
     )
+    bank_attachment_name = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="File name as uploaded (the stored file is content-addressed).",
+    )
 
     status = models.CharField(
         max_length=16,
@@ -509,8 +521,10 @@ class ExpenseItem(models.Model):
                 amount=self.amount,
                 description=self.description,
                 receipt_file=self.receipt_file,
+                receipt_file_name=self.receipt_file_name,
                 bank_details=self.bank_details,
                 bank_attachment=self.bank_attachment,
+                bank_attachment_name=self.bank_attachment_name,
                 updated_at=timezone.now(),
             )
 
@@ -1251,6 +1265,12 @@ class ReimbursementLine(models.Model):
         blank=True,
         null=True,
     )
+    receipt_file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="File name as uploaded (the stored file is content-addressed).",
+    )
 
     bank_details = models.TextField(
         blank=True,
@@ -1264,6 +1284,12 @@ class ReimbursementLine(models.Model):
         null=True,
         help_text="Bank details attachment copied from the uploaded expense.",
     )
+    bank_attachment_name = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="File name as uploaded (the stored file is content-addressed).",
+    )
 
     status = models.CharField(
         max_length=16,
@@ -1366,6 +1392,7 @@ class ReimbursementLine(models.Model):
                 self.description = self.expense_item.description
             if not self.receipt_file:
                 self.receipt_file = self.expense_item.receipt_file
+                self.receipt_file_name = self.expense_item.receipt_file_name
             if not (self.bank_details or "").strip():
                 self.bank_details = getattr(self.expense_item, "bank_details", "") or ""
             if not self.bank_attachment and getattr(
@@ -1374,6 +1401,7 @@ class ReimbursementLine(models.Model):
                 None,
             ):
                 self.bank_attachment = self.expense_item.bank_attachment
+                self.bank_attachment_name = self.expense_item.bank_attachment_name
 
         if not updating_specific_fields:
             self.full_clean()
@@ -1523,9 +1551,11 @@ class ReimbursementLine(models.Model):
 
             if getattr(exp, "receipt_file", None):
                 self.receipt_file = exp.receipt_file
+                self.receipt_file_name = exp.receipt_file_name
 
             if getattr(exp, "bank_attachment", None):
                 self.bank_attachment = exp.bank_attachment
+                self.bank_attachment_name = exp.bank_attachment_name
 
         self.bill_status = self.BillStatus.EMPLOYEE_RESUBMITTED
         self.last_modified_by = actor if isinstance(actor, models.Model) else None
@@ -1540,10 +1570,10 @@ class ReimbursementLine(models.Model):
         ]
 
         if exp and getattr(exp, "receipt_file", None):
-            update_fields.append("receipt_file")
+            update_fields.extend(["receipt_file", "receipt_file_name"])
 
         if exp and getattr(exp, "bank_attachment", None):
-            update_fields.append("bank_attachment")
+            update_fields.extend(["bank_attachment", "bank_attachment_name"])
 
         self.save(update_fields=update_fields)
 
@@ -1780,6 +1810,34 @@ class ReimbursementLog(models.Model):
         return obj
 
 
+# ---------------------------------------------------------------------------
+# Google Sheets sync outbox
+# ---------------------------------------------------------------------------
+
+
+class SheetSyncOutbox(models.Model):
+    """
+    Durable queue of reimbursement requests whose Google Sheet rows are stale.
+
+    One row per request (request_id is unique), so repeated saves coalesce.
+    Not a FK: a deleted request still needs its sheet rows removed. Rows are
+    drained in batches by integrations.sheets.flush_sync_outbox().
+    """
+
+    request_id = models.PositiveBigIntegerField(unique=True)
+    enqueued_at = models.DateTimeField(default=timezone.now, db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ["enqueued_at"]
+        verbose_name = "Sheet Sync Outbox Entry"
+        verbose_name_plural = "Sheet Sync Outbox"
+
+    def __str__(self) -> str:
+        return f"SheetSyncOutbox req={self.request_id} attempts={self.attempts}"
+
+
 # ---------------------------------------------------------------------------
 # LEGACY SIMPLE MODEL
 # ---------------------------------------------------------------------------
@@ -10,12 +10,13 @@ from urllib.parse import urlencode, urljoin
 
 from django.conf import settings
 from django.core import signing
-from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail import EmailMultiAlternatives
 from django.db.models import Sum
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import escape
 
+from apps.common.mail_pipeline import send_message
 from apps.reimbursement.models import (
     ReimbursementApproverMapping,
     ReimbursementLine,
@@ -317,30 +318,29 @@ def _send(
     fail_silently = False
 
     try:
-        with get_connection() as conn:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=txt,
-                from_email=from_email,
-                to=to_list or None,
-                cc=cc_list or None,
-                bcc=bcc_list or None,
-                reply_to=reply_to_list or None,
-                connection=conn,
-                headers=extra_headers or None,
-            )
-            msg.attach_alternative(html, "text/html")
-
-            for f in attachments or []:
-                try:
-                    if hasattr(f, "path"):
-                        msg.attach_file(f.path)
-                    elif isinstance(f, tuple) and len(f) in (2, 3):
-                        msg.attach(*f)
-                except Exception:
-                    logger.exception("Failed to attach file %r to email", getattr(f, "name", f))
-
-            sent = msg.send(fail_silently=fail_silently)
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=txt,
+            from_email=from_email,
+            to=to_list or None,
+            cc=cc_list or None,
+            bcc=bcc_list or None,
+            reply_to=reply_to_list or None,
+            headers=extra_headers or None,
+        )
+        msg.attach_alternative(html, "text/html")
+
+        for f in attachments or []:
+            try:
+                if hasattr(f, "path"):
+                    msg.attach_file(f.path)
+                elif isinstance(f, tuple) and len(f) in (2, 3):
+                    msg.attach(*f)
+            except Exception:
+                logger.exception("Failed to attach file %r to email", getattr(f, "name", f))
+
+        # Pooled connection shared with the other reimbursement notices.
+        sent = send_message(msg, fail_silently=fail_silently)
 
         if sent:
             logger.info("Reimbursement email sent OK: to=%s cc=%s subject=%r", to_list, cc_list, subject)
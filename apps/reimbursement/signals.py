@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 
-from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
@@ -13,45 +12,40 @@ from .models import ReimbursementRequest, ReimbursementLine
 
 logger = logging.getLogger(__name__)
 
-# Debounce window per request for Sheets sync (seconds)
-SYNC_DEBOUNCE_SECONDS = 15
 
+def _enqueue_sheet_sync(req_id) -> None:
+    try:
+        from .integrations.sheets import enqueue_request_sync  # lazy import
+
+        enqueue_request_sync(req_id)
+    except Exception:
+        logger.exception("Sheets sync enqueue failed for ReimbursementRequest %s", req_id)
 
-def _should_sync_req(req_id: int) -> bool:
-    """
-    Return True if we should perform a sync for this request id now,
-    and set a short-lived cache key to throttle subsequent calls.
-    """
-    key = f"reimb.req.sync.debounce.{req_id}"
-    if cache.get(key):
-        return False
-    cache.set(key, True, timeout=SYNC_DEBOUNCE_SECONDS)
-    return True
+
+def _invalidate_analytics_on_commit() -> None:
+    """Retire cached dashboard aggregates once the change is visible to readers."""
+    from .analytics import invalidate_analytics_cache  # lazy import
+
+    transaction.on_commit(invalidate_analytics_cache)
 
 
 @receiver(post_save, sender=ReimbursementRequest)
 def _sync_req_on_save(sender, instance: ReimbursementRequest, created, **kwargs):
     """
-    Side-effect: schedule export to Google Sheets with a debounce.
+    Side-effect: queue the request for export to Google Sheets.
+    The outbox row is written in the same transaction, so a rollback leaves
+    nothing queued and repeated saves collapse into one sheet update.
     No status changes here.
     """
-    def _do():
-        try:
-            if not _should_sync_req(instance.pk):
-                return
-            from .integrations.sheets import sync_request  # lazy import
-            req = (
-                ReimbursementRequest.objects.select_related(
-                    "created_by", "manager", "management", "verified_by"
-                )
-                .prefetch_related("lines__expense_item")
-                .get(pk=instance.pk)
-            )
-            sync_request(req)
-        except Exception:
-            logger.exception("Sheets sync scheduling failed for ReimbursementRequest %s", instance.pk)
+    _enqueue_sheet_sync(instance.pk)
+    _invalidate_analytics_on_commit()
 
-    transaction.on_commit(_do)
+
+@receiver(post_delete, sender=ReimbursementRequest)
+def _sync_req_on_delete(sender, instance: ReimbursementRequest, **kwargs):
+    """Queue removal of the deleted request's rows from the sheet."""
+    _enqueue_sheet_sync(instance.pk)
+    _invalidate_analytics_on_commit()
 
 
 @receiver(post_save, sender=ReimbursementLine)
@@ -70,11 +64,10 @@ def _recalc_parent_on_line_change(sender, instance: ReimbursementLine, created,
     automatically whenever the parent ReimbursementRequest is saved (which recalc_total
     and apply_derived_status_from_bills both trigger via their own save() calls).
 
-    This handler is therefore intentionally left as a no-op for save events.
-    It is kept registered (rather than removed) to make the architecture explicit and
-    to act as a hook for future line-specific side-effects that must run post-commit.
+    The only line-level side-effect is retiring cached analytics aggregates
+    (bill status / amount changes move every dashboard counter).
     """
-    pass
+    _invalidate_analytics_on_commit()
 
 
 @receiver(post_delete, sender=ReimbursementLine)
@@ -88,6 +81,8 @@ def _recalc_parent_on_line_delete(sender, instance: ReimbursementLine, **kwargs)
     Sheets sync is triggered indirectly: recalc_total and apply_derived_status_from_bills
     both save the parent, which fires _sync_req_on_save.
     """
+    _invalidate_analytics_on_commit()
+
     def _do():
         try:
             req = ReimbursementRequest.objects.get(pk=instance.request_id)
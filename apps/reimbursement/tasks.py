@@ -9,6 +9,7 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import List, Tuple
 
+from celery import shared_task
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
 from django.db.models import Sum, Count
@@ -246,3 +247,20 @@ def send_monthly_admin_summary(target_month: date | None = None, dry_run: bool =
         logger.info("Monthly summary email sent for %s to %s (cc=%s).", month_label, to, cc)
     except Exception:
         logger.exception("Failed to send monthly summary email for %s", month_label)
+
+
+@shared_task(bind=True, soft_time_limit=5 * 60, time_limit=6 * 60)
+def flush_reimbursement_sheet_outbox(self, limit: int | None = None) -> dict:
+    """
+    Drain the Google Sheets sync outbox (scheduled on save and every minute
+    by beat as a safety net). Retried with a countdown when the shared
+    Sheets quota is used up.
+    """
+    from apps.common.rate_limit import RateLimited
+
+    from .integrations.sheets import flush_sync_outbox
+
+    try:
+        return flush_sync_outbox(limit=limit)
+    except RateLimited as exc:
+        raise self.retry(exc=exc, countdown=exc.retry_after)
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import os
-import csv
 import logging
 from uuid import uuid4
 from typing import Any, Dict, Iterable, Optional, Sequence, Set
@@ -25,7 +24,6 @@ from django.db.models import (
 )
 from django.db.models.deletion import ProtectedError
 from django.http import (
-    FileResponse,
     Http404,
     HttpResponseForbidden,
     HttpResponse,
@@ -46,6 +44,8 @@ from django.views.generic import (
 
 from django.core.exceptions import ValidationError as DjangoCoreValidationError
 
+from apps.common.attachments import attachment_response
+from apps.common.exports import export_response, keyset_rows, url_template
 from apps.users.mixins import PermissionRequiredMixin
 from apps.users.permissions import has_permission
 
@@ -62,6 +62,8 @@ from .forms import (
     FinanceReviewForm,
 )
 from .models import (
+    GST_TYPE_CHOICES,
+    REIMBURSEMENT_CATEGORY_CHOICES,
     ExpenseItem,
     ReimbursementRequest,
     ReimbursementLine,
@@ -363,6 +365,7 @@ class ExpenseItemUpdateView(LoginRequiredMixin, PermissionRequiredMixin, UpdateV
                 ],
             ).update(
                 receipt_file=self.object.receipt_file.name,
+                receipt_file_name=self.object.receipt_file_name,
                 updated_at=timezone.now(),
             )
 
@@ -556,6 +559,7 @@ class ReimbursementCreateView(LoginRequiredMixin, PermissionRequiredMixin, FormV
                 amount=item.amount,
                 description=item.description,
                 receipt_file=item.receipt_file,
+                receipt_file_name=item.receipt_file_name,
                 status=ReimbursementLine.Status.INCLUDED,
             )
             item.status = ExpenseItem.Status.SUBMITTED
@@ -892,6 +896,7 @@ class ReimbursementRequestUpdateView(
                 amount=item.amount,
                 description=item.description,
                 receipt_file=item.receipt_file,
+                receipt_file_name=item.receipt_file_name,
                 status=ReimbursementLine.Status.INCLUDED,
             )
             item.status = ExpenseItem.Status.SUBMITTED
@@ -2285,15 +2290,63 @@ class ReimbursementExportCSVView(
     template_name = "reimbursement/admin_export_dummy.html"  # not used
 
     def get(self, request, *args, **kwargs):
-        qs = ReimbursementLine.objects.select_related(
-            "request", "expense_item", "request__created_by"
-        ).order_by("request_id", "id")
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = (
-            'attachment; filename="reimbursements_export.csv"'
-        )
-        writer = csv.writer(response)
-        writer.writerow(
+        # values() projection + keyset pages, streamed: the full history no
+        # longer builds model instances or a whole file in memory.
+        receipt_url = url_template(request, "reimbursement:receipt_line")
+        categories = dict(REIMBURSEMENT_CATEGORY_CHOICES)
+        gst_types = dict(GST_TYPE_CHOICES)
+        lines = keyset_rows(
+            ReimbursementLine.objects.all(),
+            [
+                "id",
+                "request_id",
+                "request__status",
+                "request__submitted_at",
+                "request__total_amount",
+                "request__created_by__username",
+                "request__created_by__first_name",
+                "request__created_by__last_name",
+                "request__created_by__email",
+                "expense_item__date",
+                "expense_item__category",
+                "expense_item__gst_type",
+                "expense_item__vendor",
+                "description",
+                "amount",
+            ],
+            order_by=("request_id", "id"),
+        )
+
+        def _rows():
+            for line in lines:
+                full_name = (
+                    f"{line['request__created_by__first_name']} "
+                    f"{line['request__created_by__last_name']}"
+                ).strip()
+                submitted_at = line["request__submitted_at"]
+                expense_date = line["expense_item__date"]
+                category = line["expense_item__category"]
+                gst_type = line["expense_item__gst_type"]
+                yield [
+                    line["request_id"],
+                    full_name or line["request__created_by__username"],
+                    line["request__created_by__email"],
+                    line["request__status"],
+                    submitted_at.isoformat() if submitted_at else "",
+                    f"{line['request__total_amount']:.2f}",
+                    line["id"],
+                    expense_date.isoformat() if expense_date else "",
+                    categories.get(category, category),
+                    gst_types.get(gst_type, gst_type) if gst_type else "",
+                    line["expense_item__vendor"] or "",
+                    line["description"] or "",
+                    f"{line['amount']:.2f}",
+                    receipt_url.format(line["id"]),
+                ]
+
+        return export_response(
+            request,
+            "reimbursements_export",
             [
                 "request_id",
                 "employee_name",
@@ -2309,37 +2362,10 @@ class ReimbursementExportCSVView(
                 "description",
                 "amount",
                 "receipt_url",
-            ]
+            ],
+            _rows(),
+            sheet_title="Reimbursements",
         )
-        for line in qs:
-            req = line.request
-            expense = line.expense_item
-            receipt_url = request.build_absolute_uri(
-                reverse("reimbursement:receipt_line", args=[line.id])
-            )
-            writer.writerow(
-                [
-                    req.id,
-                    (req.created_by.get_full_name() or req.created_by.username),
-                    req.created_by.email,
-                    req.status,
-                    req.submitted_at.isoformat() if req.submitted_at else "",
-                    f"{req.total_amount:.2f}",
-                    line.id,
-                    expense.date.isoformat() if expense and expense.date else "",
-                    expense.get_category_display() if expense else "",
-                    (
-                        expense.get_gst_type_display()
-                        if expense and expense.gst_type
-                        else ""
-                    ),
-                    getattr(expense, "vendor", "") or "",
-                    (line.description or ""),
-                    f"{line.amount:.2f}",
-                    receipt_url,
-                ]
-            )
-        return response
 
 
 # ---------------------------------------------------------------------------
@@ -2347,6 +2373,11 @@ class ReimbursementExportCSVView(
 # ---------------------------------------------------------------------------
 
 
+def _serve_attachment(request, file_field, missing_message: str):
+    """Stream a stored receipt / bank document (see attachment_response)."""
+    return attachment_response(request, file_field, missing_message)
+
+
 @xframe_options_sameorigin
 def download_receipt(
     request,
@@ -2410,19 +2441,7 @@ def download_receipt(
     if not allowed:
         return HttpResponseForbidden("You are not allowed to view this receipt.")
 
-    storage = file_field.storage
-    name = file_field.name
-
-    if not name or not storage.exists(name):
-        raise Http404("Receipt file not found.")
-
-    filename = os.path.basename(name)
-
-    return FileResponse(
-        storage.open(name, "rb"),
-        as_attachment=False,
-        filename=filename,
-    )
+    return _serve_attachment(request, file_field, "Receipt file not found.")
 
 
 @xframe_options_sameorigin
@@ -2496,19 +2515,7 @@ def download_bank_document(
     if not allowed:
         return HttpResponseForbidden("You are not allowed to view this bank document.")
 
-    storage = file_field.storage
-    name = file_field.name
-
-    if not name or not storage.exists(name):
-        raise Http404("Bank document file not found.")
-
-    filename = os.path.basename(name)
-
-    return FileResponse(
-        storage.open(name, "rb"),
-        as_attachment=False,
-        filename=filename,
-    )
+    return _serve_attachment(request, file_field, "Bank document file not found.")
 
 
 # ---------------------------------------------------------------------------
@@ -1,52 +1,22 @@
 #E:\CLIENT PROJECT\employee management system bos\employee_management_system\apps\reimbursement\views_analytics.py
 from __future__ import annotations
 
-from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import (
-    Sum,
-    Count,
-    Q,
-    DecimalField,
-    Value as V,
-    Max,
-    Min,
-)
-from django.db.models.functions import Coalesce, TruncDay, TruncMonth
 from django.http import JsonResponse, HttpResponseForbidden, HttpResponseNotFound
 from django.utils import timezone
 from django.views.generic import TemplateView, View
 
-from .models import (
-    ReimbursementRequest,
-    ReimbursementLine,
-    REIMBURSEMENT_CATEGORY_CHOICES,
-)
+from . import analytics
+from .analytics import Filters, base_lines_qs as _base_lines_qs, d
+from .models import REIMBURSEMENT_CATEGORY_CHOICES
 from .views import _user_is_admin, _user_is_finance, _user_is_manager  # reuse existing helpers
 
 User = get_user_model()
 
-# ---------------------------------------------------------------------
-# Decimal helpers
-# ---------------------------------------------------------------------
-
-# A reusable "decimal zero" with explicit output_field so Coalesce/Sum remain DecimalField
-DEC0 = V(Decimal("0"), output_field=DecimalField(max_digits=18, decimal_places=2))
-
-
-def d(val: str | int | float | Decimal | None) -> Decimal:
-    """Safe decimal ctor (e.g., d(0), d('100.50'))."""
-    try:
-        return Decimal(str(val if val is not None else 0))
-    except Exception:
-        return Decimal("0")
-
-
 # ---------------------------------------------------------------------
 # Access control (role-aware)
 # ---------------------------------------------------------------------
@@ -63,28 +33,6 @@ def _user_can_view_analytics(user) -> bool:
 # Filters (date-range + bill-wise core)
 # ---------------------------------------------------------------------
 
-@dataclass
-class Filters:
-    """
-    Filter set:
-      - employees: CSV of user IDs (used to scope analytics)
-      - status: approved_and_paid | approved_only | paid_only   ← applied to BILL STATUS
-      - line_ids: CSV of ReimbursementLine PKs (drives bill-wise scoping)
-      - from_date / to_date: YYYY-MM-DD (inclusive range on expense date)
-      - preset: this_month | last_month | last_90_days | ytd | fytd (ignored if from/to supplied)
-      - granularity: day | month (affects timeseries endpoint only)
-      - categories: CSV of category keys (travel, meal, yard, office, other)
-    """
-    employee_ids: List[int]
-    status_mode: str
-    line_ids: List[int]
-    from_date: Optional[date]
-    to_date: Optional[date]
-    preset: Optional[str]
-    granularity: str
-    categories: List[str]
-
-
 _STATUS_MODES = {"approved_and_paid", "approved_only", "paid_only"}
 _VALID_PRESETS = {"this_month", "last_month", "last_90_days", "ytd", "fytd"}
 _VALID_GRANULARITY = {"day", "month"}
@@ -204,68 +152,6 @@ def _parse_filters(request) -> Filters:
     )
 
 
-# ---------------------------------------------------------------------
-# Base queryset (server-side) — BILL-WISE
-# ---------------------------------------------------------------------
-
-def _status_q(status_mode: str) -> Q:
-    """
-    Status filter applied to *bill* status, per client requirement.
-    - approved_only      -> FINANCE_APPROVED
-    - paid_only          -> PAID
-    - approved_and_paid  -> FINANCE_APPROVED or PAID
-    """
-    BS = ReimbursementLine.BillStatus
-    if status_mode == "approved_only":
-        return Q(bill_status=BS.FINANCE_APPROVED)
-    if status_mode == "paid_only":
-        return Q(bill_status=BS.PAID)
-    # approved_and_paid (default)
-    return Q(bill_status__in=[BS.FINANCE_APPROVED, BS.PAID])
-
-
-def _base_lines_qs(f: Filters):
-    """
-    Start from ReimbursementLine to keep category fidelity and BILL-wise analytics.
-    Only INCLUDED lines, joined to request & expense item.
-    """
-    qs = (
-        ReimbursementLine.objects.filter(status=ReimbursementLine.Status.INCLUDED)
-        .filter(_status_q(f.status_mode))
-        .select_related("request", "expense_item", "request__created_by")
-    )
-
-    if f.employee_ids:
-        qs = qs.filter(request__created_by_id__in=f.employee_ids)
-
-    # Bill-wise filter must affect analytics
-    if f.line_ids:
-        qs = qs.filter(id__in=f.line_ids)
-
-    # Time window on expense date (date-range)
-    if f.from_date:
-        qs = qs.filter(expense_item__date__gte=f.from_date)
-    if f.to_date:
-        qs = qs.filter(expense_item__date__lte=f.to_date)
-
-    # Optional category filter
-    if f.categories:
-        qs = qs.filter(expense_item__category__in=f.categories)
-
-    return qs
-
-
-def _request_qs_scoped_by_lines(f: Filters):
-    """
-    Derive request queryset *scoped by the filtered lines*:
-    - Take distinct request IDs from the current line scope
-    - Then operate request-level counts on that subset
-    """
-    line_qs = _base_lines_qs(f)
-    req_ids = line_qs.values_list("request_id", flat=True).distinct()
-    return ReimbursementRequest.objects.filter(id__in=req_ids)
-
-
 # ---------------------------------------------------------------------
 # Views
 # ---------------------------------------------------------------------
@@ -386,47 +272,20 @@ class AnalyticsSummaryAPI(LoginRequiredMixin, View):
             return JsonResponse({"detail": "forbidden"}, status=403)
 
         f = _parse_filters(request)
-        qs = _base_lines_qs(f)
 
-        # Total spend across filtered lines
-        total_spend = qs.aggregate(total=Coalesce(Sum("amount"), DEC0))["total"] or d(0)
-
-        # Highest/Lowest *single bill*
-        agg_hi = qs.aggregate(hi=Max("amount"))
-        agg_lo = qs.aggregate(lo=Min("amount"))
-        highest_bill = float(d(agg_hi.get("hi"))) if agg_hi.get("hi") is not None else 0.0
-        lowest_bill = float(d(agg_lo.get("lo"))) if agg_lo.get("lo") is not None else 0.0
+        # Total spend + highest/lowest *single bill* (one aggregate)
+        summary = analytics.line_summary(f)
 
         # Employee aggregates (within current filter) — bill-wise sum and bill counts
-        emp_rows = (
-            qs.values(
-                "request__created_by_id",
-                "request__created_by__first_name",
-                "request__created_by__last_name",
-                "request__created_by__username",
-            )
-            .annotate(
-                total=Coalesce(Sum("amount"), DEC0),
-                bill_count=Count("id"),
-            )
-            .order_by("-total")
-        )
-
-        employee_spend: List[Dict] = []
-        for r in emp_rows:
-            uid = r["request__created_by_id"]
-            fn = (r.get("request__created_by__first_name") or "").strip()
-            ln = (r.get("request__created_by__last_name") or "").strip()
-            uname = (r.get("request__created_by__username") or "").strip()
-            display = (f"{fn} {ln}".strip() or uname or f"User #{uid}")
-            employee_spend.append(
-                {
-                    "employee_id": uid,
-                    "employee_name": display,
-                    "total": float(d(r["total"])),
-                    "bill_count": int(r["bill_count"] or 0),
-                }
-            )
+        employee_spend: List[Dict] = [
+            {
+                "employee_id": r["employee_id"],
+                "employee_name": r["employee_name"],
+                "total": r["total"],
+                "bill_count": r["bill_count"],
+            }
+            for r in analytics.employee_totals(f)
+        ]
 
         # Highest/lowest spender based on employee totals
         highest_spender = None
@@ -436,9 +295,9 @@ class AnalyticsSummaryAPI(LoginRequiredMixin, View):
             lowest_spender = sorted(employee_spend, key=lambda x: (x["total"], x["employee_name"]))[0]
 
         data = {
-            "total_spend": float(d(total_spend)),
-            "highest_spend_bill": highest_bill,
-            "lowest_spend_bill": lowest_bill,
+            "total_spend": summary["total_spend"],
+            "highest_spend_bill": summary["highest_bill"],
+            "lowest_spend_bill": summary["lowest_bill"],
             "employee_wise_spend": employee_spend,
             "highest_spender": highest_spender,  # {"employee_id","employee_name","total","bill_count"} or None
             "lowest_spender": lowest_spender,    # {"employee_id","employee_name","total","bill_count"} or None
@@ -469,66 +328,28 @@ class AnalyticsEmployeeAPI(LoginRequiredMixin, View):
             return JsonResponse({"detail": "forbidden"}, status=403)
 
         f = _parse_filters(request)
-        qs = _base_lines_qs(f)
 
-        # Base aggregates per employee
-        base = (
-            qs.values(
-                "request__created_by_id",
-                "request__created_by__first_name",
-                "request__created_by__last_name",
-                "request__created_by__username",
-            )
-            .annotate(
-                total=Coalesce(Sum("amount"), DEC0),
-                bill_count=Count("id"),
-                request_count=Count("request_id", distinct=True),
-            )
-        )
+        # Base aggregates per employee + most used category (by amount, ties -> count)
+        top_categories = analytics.employee_top_categories(f)
 
         rows_map: Dict[int, dict] = {}
-        for r in base:
-            uid = r["request__created_by_id"]
-            fn = (r.get("request__created_by__first_name") or "").strip()
-            ln = (r.get("request__created_by__last_name") or "").strip()
-            uname = (r.get("request__created_by__username") or "").strip()
-            display = (f"{fn} {ln}".strip() or uname or f"User #{uid}")
+        for r in analytics.employee_totals(f):
+            uid = r["employee_id"]
+            key = top_categories.get(uid)
             rows_map[uid] = {
                 "employee_id": uid,
-                "employee_name": display,
-                "total": float(d(r["total"])),
+                "employee_name": r["employee_name"],
+                "total": r["total"],
 
                 # expose both; UI should show bill_count to keep bill-wise semantics visible
-                "bill_count": int(r["bill_count"] or 0),
-                "request_count": int(r["request_count"] or 0),
+                "bill_count": r["bill_count"],
+                "request_count": r["request_count"],
 
-                "top_category": "-",  # fill below
+                "top_category": (
+                    _CATEGORY_LABELS.get(key, (key or "").title()) if uid in top_categories else "-"
+                ),
             }
 
-        # Most used category per employee (by amount, break ties by count)
-        cat_rows = (
-            qs.values("request__created_by_id", "expense_item__category")
-              .annotate(
-                  amt=Coalesce(Sum("amount"), DEC0),
-                  cnt=Count("id"),
-              )
-        )
-
-        best: Dict[int, Tuple[str, float, int]] = {}  # uid -> (key, amt, cnt)
-        for r in cat_rows:
-            uid = r["request__created_by_id"]
-            key = r["expense_item__category"]
-            amt = float(d(r["amt"]))
-            cnt = int(r["cnt"] or 0)
-            cur = best.get(uid)
-            if cur is None or amt > cur[1] or (amt == cur[1] and cnt > cur[2]):
-                best[uid] = (key, amt, cnt)
-
-        for uid, info in best.items():
-            if uid in rows_map:
-                key = info[0]
-                rows_map[uid]["top_category"] = _CATEGORY_LABELS.get(key, (key or "").title())
-
         rows = sorted(rows_map.values(), key=lambda x: (-x["total"], x["employee_name"]))
         return JsonResponse({"rows": rows})
 
@@ -553,29 +374,7 @@ class AnalyticsTimeSeriesAPI(LoginRequiredMixin, View):
             return JsonResponse({"detail": "forbidden"}, status=403)
 
         f = _parse_filters(request)
-        qs = _base_lines_qs(f)
-
-        # Choose the truncate function by granularity
-        if f.granularity == "month":
-            trunc = TruncMonth("expense_item__date")
-            fmt = lambda dt: dt.strftime("%Y-%m-01") if dt else None
-        else:
-            trunc = TruncDay("expense_item__date")
-            fmt = lambda dt: dt.strftime("%Y-%m-%d") if dt else None
-
-        rows = (
-            qs.annotate(period=trunc)
-              .values("period")
-              .annotate(total=Coalesce(Sum("amount"), DEC0))
-              .order_by("period")
-        )
-
-        buckets = []
-        for r in rows:
-            buckets.append({
-                "period": fmt(r["period"]),
-                "total": float(d(r["total"])),
-            })
+        buckets = analytics.timeseries(f)
 
         data = {
             "granularity": f.granularity,
@@ -606,18 +405,12 @@ class AnalyticsCategoryAPI(LoginRequiredMixin, View):
             return JsonResponse({"detail": "forbidden"}, status=403)
 
         f = _parse_filters(request)
-        qs = _base_lines_qs(f)
-
-        aggs = (
-            qs.values("expense_item__category")
-              .annotate(total=Coalesce(Sum("amount"), DEC0), count=Count("id"))
-              .order_by("-total", "expense_item__category")
-        )
+        aggs = analytics.category_totals(f)
 
         rows = []
         grand = d(0)
         for r in aggs:
-            key = r["expense_item__category"]
+            key = r["key"]
             total = d(r["total"])
             rows.append({
                 "key": key or "",
@@ -660,45 +453,12 @@ class AnalyticsRealtimeNumbersAPI(LoginRequiredMixin, View):
 
         f = _parse_filters(request)
 
-        # Base, filtered by all bill-wise constraints
-        line_qs = _base_lines_qs(f)
-        req_qs = _request_qs_scoped_by_lines(f)
-
-        # Scope sizes
-        scope_request_count = req_qs.values_list("id", flat=True).count()
-        scope_line_count = line_qs.count()
-
-        # Request-level counts within scope (kept as-is; these are parent states)
-        counts = {
-            "finance_pending_requests": req_qs.filter(status=ReimbursementRequest.Status.PENDING_FINANCE_VERIFY).count(),
-            "manager_pending_requests": req_qs.filter(status=ReimbursementRequest.Status.PENDING_MANAGER).count(),
-            "management_pending_requests": req_qs.filter(status=ReimbursementRequest.Status.PENDING_MANAGEMENT).count(),
-            "approved_requests": req_qs.filter(status=ReimbursementRequest.Status.APPROVED).count(),
-            "paid_requests": req_qs.filter(status=ReimbursementRequest.Status.PAID).count(),
-        }
-
-        # Bill-level counts within scope
-        counts.update({
-            "resubmitted_bills": line_qs.filter(
-                bill_status=ReimbursementLine.BillStatus.EMPLOYEE_RESUBMITTED
-            ).count(),
-            "finance_approved_bills": line_qs.filter(
-                bill_status=ReimbursementLine.BillStatus.FINANCE_APPROVED
-            ).count(),
-        })
-
-        # "Submitted today" (by request submitted_at) inside scope
-        today = timezone.localdate()
-        counts["submitted_today"] = req_qs.filter(
-            submitted_at__date=today
-        ).count()
+        # Scope sizes + request-level and bill-level counters (one aggregate per level)
+        numbers = analytics.realtime_counters(f)
 
         data = {
-            "scope": {
-                "request_ids": scope_request_count,
-                "line_count": scope_line_count,
-            },
-            "counts": counts,
+            "scope": numbers["scope"],
+            "counts": numbers["counts"],
             "filters_applied": {
                 "employee_ids": f.employee_ids,
                 "status_mode": f.status_mode,
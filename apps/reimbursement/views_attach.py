@@ -69,7 +69,8 @@ class FinanceAttachReceiptView(LoginRequiredMixin, PermissionRequiredMixin, Temp
             has_exp_file = bool(getattr(exp, "receipt_file", None) and getattr(exp.receipt_file, "name", ""))
             if exp and not has_exp_file:
                 exp.receipt_file = line.receipt_file
-                exp.save(update_fields=["receipt_file", "updated_at"])
+                exp.receipt_file_name = line.receipt_file_name
+                exp.save(update_fields=["receipt_file", "receipt_file_name", "updated_at"])
         except Exception:
             # Keep going even if expense update fails
             pass
@@ -9,4 +9,5 @@ urlpatterns = [
     path("fms-tasks/",         views.list_fms_tasks,    name="fms_tasks"),
     path("weekly-mis-score/",  views.weekly_mis_score,  name="weekly_mis_score"),
     path("performance-score/", views.performance_score, name="performance_score"),
+    path("mis-report/excel/",  views.mis_report_excel,  name="mis_report_excel"),
 ]
\ No newline at end of file
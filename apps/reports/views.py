@@ -4,25 +4,34 @@ from datetime import date, datetime, time, timedelta
 from time import perf_counter
 from typing import Tuple
 import logging
-import csv
+from wsgiref.util import FileWrapper
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from django.core.paginator import Paginator
 from django.db import connection
-from django.db.models import Sum, F, Count, Q
-from django.http import HttpResponse
+from django.db.models import Count, Q
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.apps import apps
 
+from apps.common.exports import export_response
+
 from .forms_reports import PCReportFilterForm, WeeklyMISCommitmentForm
 from .models import WeeklyCommitment
 from apps.tasks.models import Checklist, Delegation
+from apps.tasks.services.scoring import (
+    AssigneeBacklog,
+    AssigneeScore,
+    backlog_by_assignee,
+    get_task_config,
+    window_scores,
+)
 
 User = get_user_model()
 logger = logging.getLogger("apps.reports")
@@ -376,16 +385,38 @@ def _void_checklist_for_report(obj, *, deleted_by=None) -> int:
     return 1
 
 
-def calculate_checklist_total_time(qs) -> int:
-    return sum(task.actual_duration_minutes or 0 for task in qs)
-
+# Scored models and whether leave-skipped rows are left out of their counts.
+_SCORED_TASK_MODELS = (("Checklist", True), ("Delegation", False))
 
-def calculate_delegation_total_time(qs) -> int:
-    return qs.aggregate(total=Sum("actual_duration_minutes"))["total"] or 0
 
-
-def calculate_assigned_total_time(qs) -> int:
-    return qs.aggregate(total=Sum("time_per_task_minutes"))["total"] or 0
+def _doer_window_scores(doer, start_dt, end_dt) -> dict[str, AssigneeScore]:
+    """{model_name: AssigneeScore} for one doer, one grouped query per model."""
+    out = {}
+    for model_name, exclude_skipped in _SCORED_TASK_MODELS:
+        scores = window_scores(
+            get_task_config(model_name),
+            start_dt=start_dt,
+            end_dt=end_dt,
+            assignee_ids=[doer.pk],
+            exclude_skipped=exclude_skipped,
+        )
+        out[model_name] = scores.get(doer.pk, AssigneeScore())
+    return out
+
+
+def _doer_backlog(doer, start_dt, end_dt) -> dict[str, AssigneeBacklog]:
+    """{model_name: AssigneeBacklog} (pending before / delayed within the window)."""
+    out = {}
+    for model_name, exclude_skipped in _SCORED_TASK_MODELS:
+        backlog = backlog_by_assignee(
+            get_task_config(model_name),
+            start_dt=start_dt,
+            end_dt=end_dt,
+            assignee_ids=[doer.pk],
+            exclude_skipped=exclude_skipped,
+        )
+        out[model_name] = backlog.get(doer.pk, AssigneeBacklog())
+    return out
 
 
 def minutes_to_hhmm(minutes: int) -> str:
@@ -925,40 +956,40 @@ def recurring_tasks_report(request):
             stuck_series += 1
 
     if request.GET.get("download") == "1":
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="recurring_tasks_report.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "Employee",
-            "Email",
-            "Task Name",
-            "Mode",
-            "Frequency",
-            "Group",
-            "Total",
-            "Completed",
-            "Pending",
-            "Deleted",
-            "Health",
-        ])
-
-        for row in series_rows:
-            writer.writerow([
-                row["employee_name"],
-                row["employee_email"],
-                row["task_name"],
-                row["mode"],
-                row["frequency_text"],
-                row["group_name"],
-                row["total"],
-                row["completed"],
-                row["pending"],
-                row["deleted"],
-                row["health"],
-            ])
-
-        return response
+        return export_response(
+            request,
+            "recurring_tasks_report",
+            [
+                "Employee",
+                "Email",
+                "Task Name",
+                "Mode",
+                "Frequency",
+                "Group",
+                "Total",
+                "Completed",
+                "Pending",
+                "Deleted",
+                "Health",
+            ],
+            (
+                [
+                    row["employee_name"],
+                    row["employee_email"],
+                    row["task_name"],
+                    row["mode"],
+                    row["frequency_text"],
+                    row["group_name"],
+                    row["total"],
+                    row["completed"],
+                    row["pending"],
+                    row["deleted"],
+                    row["health"],
+                ]
+                for row in series_rows
+            ),
+            sheet_title="Recurring Tasks",
+        )
 
     context = {
         "employees": visible_employees,
@@ -1111,124 +1142,32 @@ def weekly_mis_score(request):
 
             commitment_form = WeeklyMISCommitmentForm(initial=initial)
 
-        for Model, label in [(Checklist, "Checklist"), (Delegation, "Delegation")]:
-            if Model is Checklist:
-                planned = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_this,
-                    planned_date__lt=e_this,
-                    is_skipped_due_to_leave=False,
-                ).count()
-
-                planned_last = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_prev,
-                    planned_date__lt=e_prev,
-                    is_skipped_due_to_leave=False,
-                ).count()
-
-                completed = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_this,
-                    planned_date__lt=e_this,
-                    status="Completed",
-                    is_skipped_due_to_leave=False,
-                ).count()
-
-                completed_last = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_prev,
-                    planned_date__lt=e_prev,
-                    status="Completed",
-                    is_skipped_due_to_leave=False,
-                ).count()
-            else:
-                planned = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_this,
-                    planned_date__lt=e_this,
-                ).count()
-
-                planned_last = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_prev,
-                    planned_date__lt=e_prev,
-                ).count()
-
-                completed = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_this,
-                    planned_date__lt=e_this,
-                    status="Completed",
-                ).count()
-
-                completed_last = Model.objects.filter(
-                    assign_to=doer,
-                    planned_date__gte=s_prev,
-                    planned_date__lt=e_prev,
-                    status="Completed",
-                ).count()
+        this_week = _doer_window_scores(doer, s_this, e_this)
+        last_week = _doer_window_scores(doer, s_prev, e_prev)
 
+        for label in ("Checklist", "Delegation"):
+            cur, prev = this_week[label], last_week[label]
             rows.append({
                 "category": label,
-                "last_pct": percent_not_completed(planned_last, completed_last),
-                "planned": planned,
-                "completed": completed,
-                "percent": percent_not_completed(planned, completed),
+                "last_pct": percent_not_completed(prev.planned, prev.completed),
+                "planned": cur.planned,
+                "completed": cur.completed,
+                "percent": percent_not_completed(cur.planned, cur.completed),
             })
 
-        checklist_qs = Checklist.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-            is_skipped_due_to_leave=False,
-        ).select_related("assign_to")
-
-        delegation_qs = Delegation.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-        ).select_related("assign_to")
-
-        actual_checklist_minutes = calculate_checklist_total_time(checklist_qs)
-        actual_delegation_minutes = calculate_delegation_total_time(delegation_qs)
-        assigned_checklist_minutes = calculate_assigned_total_time(checklist_qs)
-        assigned_delegation_minutes = calculate_assigned_total_time(delegation_qs)
-
-        time_checklist = minutes_to_hhmm(assigned_checklist_minutes)
-        time_delegation = minutes_to_hhmm(assigned_delegation_minutes)
-        actual_time_checklist = minutes_to_hhmm(actual_checklist_minutes)
-        actual_time_delegation = minutes_to_hhmm(actual_delegation_minutes)
-        total_hours = minutes_to_hhmm(actual_checklist_minutes + actual_delegation_minutes)
-
-        checklist_planned = rows[0]["planned"]
-        checklist_completed = rows[0]["completed"]
-
-        checklist_ontime = Checklist.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-            status="Completed",
-            completed_at__lte=F("planned_date"),
-            is_skipped_due_to_leave=False,
-        ).count()
-
-        checklist_pct = percent_not_completed(checklist_planned, checklist_completed)
-        checklist_ontime_pct = percent_not_completed(checklist_planned, checklist_ontime)
-
-        delegation_planned = rows[1]["planned"]
-        delegation_completed = rows[1]["completed"]
-
-        delegation_ontime = Delegation.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-            status="Completed",
-            completed_at__lte=F("planned_date"),
-        ).count()
-
-        delegation_pct = percent_not_completed(delegation_planned, delegation_completed)
-        delegation_ontime_pct = percent_not_completed(delegation_planned, delegation_ontime)
+        checklist, delegation = this_week["Checklist"], this_week["Delegation"]
+
+        time_checklist = minutes_to_hhmm(checklist.assigned_minutes)
+        time_delegation = minutes_to_hhmm(delegation.assigned_minutes)
+        actual_time_checklist = minutes_to_hhmm(checklist.actual_minutes)
+        actual_time_delegation = minutes_to_hhmm(delegation.actual_minutes)
+        total_hours = minutes_to_hhmm(checklist.actual_minutes + delegation.actual_minutes)
+
+        checklist_pct = percent_not_completed(checklist.planned, checklist.completed)
+        checklist_ontime_pct = percent_not_completed(checklist.planned, checklist.on_time)
+
+        delegation_pct = percent_not_completed(delegation.planned, delegation.completed)
+        delegation_ontime_pct = percent_not_completed(delegation.planned, delegation.on_time)
 
         avg_scores = {
             "checklist": checklist_pct,
@@ -1239,33 +1178,11 @@ def weekly_mis_score(request):
             "average_ontime": round((checklist_ontime_pct + delegation_ontime_pct) / 2, 2),
         }
 
-        pending_checklist = Checklist.objects.filter(
-            assign_to=doer,
-            planned_date__lt=s_this,
-            status="Pending",
-            is_skipped_due_to_leave=False,
-        ).count()
-
-        pending_delegation = Delegation.objects.filter(
-            assign_to=doer,
-            planned_date__lt=s_this,
-            status="Pending",
-        ).count()
-
-        delayed_checklist = Checklist.objects.filter(
-            assign_to=doer,
-            completed_at__gte=s_this,
-            completed_at__lt=e_this,
-            completed_at__gt=F("planned_date"),
-            is_skipped_due_to_leave=False,
-        ).count()
-
-        delayed_delegation = Delegation.objects.filter(
-            assign_to=doer,
-            completed_at__gte=s_this,
-            completed_at__lt=e_this,
-            completed_at__gt=F("planned_date"),
-        ).count()
+        backlog = _doer_backlog(doer, s_this, e_this)
+        pending_checklist = backlog["Checklist"].pending_before
+        pending_delegation = backlog["Delegation"].pending_before
+        delayed_checklist = backlog["Checklist"].delayed
+        delayed_delegation = backlog["Delegation"].delayed
 
         full_name = (doer.get_full_name() or doer.username or "").upper()
 
@@ -1324,87 +1241,38 @@ def performance_score(request):
         week_start = frm
         s_this, e_this = span_bounds(frm, to)
 
-        checklist_qs = Checklist.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-            is_skipped_due_to_leave=False,
-        ).select_related("assign_to")
-
-        delegation_qs = Delegation.objects.filter(
-            assign_to=doer,
-            planned_date__gte=s_this,
-            planned_date__lt=e_this,
-        ).select_related("assign_to")
-
-        total_checklist_minutes = calculate_checklist_total_time(checklist_qs)
-        total_delegation_minutes = calculate_delegation_total_time(delegation_qs)
-        assigned_checklist_minutes = calculate_assigned_total_time(checklist_qs)
-        assigned_delegation_minutes = calculate_assigned_total_time(delegation_qs)
-
-        time_checklist = minutes_to_hhmm(assigned_checklist_minutes)
-        time_delegation = minutes_to_hhmm(assigned_delegation_minutes)
-        total_hours = minutes_to_hhmm(total_checklist_minutes + total_delegation_minutes)
-
-        p = checklist_qs.count()
-        completed = checklist_qs.filter(status="Completed").count()
-        score_not = percent_not_completed(p, completed)
-
-        on_time = checklist_qs.filter(
-            status="Completed",
-            completed_at__lte=F("planned_date"),
-        ).count()
-
-        score_on = percent_not_completed(p, on_time)
-
-        checklist_data = [
-            {
-                "task_type": "All work should be done",
-                "planned": p,
-                "completed": completed,
-                "pct": score_not,
-                "assigned_minutes": assigned_checklist_minutes,
-                "actual_minutes": total_checklist_minutes,
-            },
-            {
-                "task_type": "All work should be done on time",
-                "planned": p,
-                "completed": on_time,
-                "pct": score_on,
-                "assigned_minutes": assigned_checklist_minutes,
-                "actual_minutes": total_checklist_minutes,
-            },
-        ]
-
-        p2 = delegation_qs.count()
-        completed2 = delegation_qs.filter(status="Completed").count()
-        score2_not = percent_not_completed(p2, completed2)
-
-        on_time2 = delegation_qs.filter(
-            status="Completed",
-            completed_at__lte=F("planned_date"),
-        ).count()
-
-        score2_on = percent_not_completed(p2, on_time2)
-
-        delegation_data = [
-            {
-                "task_type": "All work should be done",
-                "planned": p2,
-                "completed": completed2,
-                "pct": score2_not,
-                "assigned_minutes": assigned_delegation_minutes,
-                "actual_minutes": total_delegation_minutes,
-            },
-            {
-                "task_type": "All work should be done on time",
-                "planned": p2,
-                "completed": on_time2,
-                "pct": score2_on,
-                "assigned_minutes": assigned_delegation_minutes,
-                "actual_minutes": total_delegation_minutes,
-            },
-        ]
+        this_week = _doer_window_scores(doer, s_this, e_this)
+        checklist, delegation = this_week["Checklist"], this_week["Delegation"]
+
+        time_checklist = minutes_to_hhmm(checklist.assigned_minutes)
+        time_delegation = minutes_to_hhmm(delegation.assigned_minutes)
+        total_hours = minutes_to_hhmm(checklist.actual_minutes + delegation.actual_minutes)
+
+        def _score_rows(score: AssigneeScore):
+            pct_done = percent_not_completed(score.planned, score.completed)
+            pct_on_time = percent_not_completed(score.planned, score.on_time)
+            rows = [
+                {
+                    "task_type": "All work should be done",
+                    "planned": score.planned,
+                    "completed": score.completed,
+                    "pct": pct_done,
+                    "assigned_minutes": score.assigned_minutes,
+                    "actual_minutes": score.actual_minutes,
+                },
+                {
+                    "task_type": "All work should be done on time",
+                    "planned": score.planned,
+                    "completed": score.on_time,
+                    "pct": pct_on_time,
+                    "assigned_minutes": score.assigned_minutes,
+                    "actual_minutes": score.actual_minutes,
+                },
+            ]
+            return rows, pct_done, pct_on_time
+
+        checklist_data, score_not, score_on = _score_rows(checklist)
+        delegation_data, score2_not, score2_on = _score_rows(delegation)
 
         summary = {
             "checklist_avg": score_not,
@@ -1415,33 +1283,11 @@ def performance_score(request):
             "overall_ontime": round((score_on + score2_on) / 2, 2),
         }
 
-        pending_checklist = Checklist.objects.filter(
-            assign_to=doer,
-            planned_date__lt=s_this,
-            status="Pending",
-            is_skipped_due_to_leave=False,
-        ).count()
-
-        pending_delegation = Delegation.objects.filter(
-            assign_to=doer,
-            planned_date__lt=s_this,
-            status="Pending",
-        ).count()
-
-        delayed_checklist = Checklist.objects.filter(
-            assign_to=doer,
-            completed_at__gte=s_this,
-            completed_at__lt=e_this,
-            completed_at__gt=F("planned_date"),
-            is_skipped_due_to_leave=False,
-        ).count()
-
-        delayed_delegation = Delegation.objects.filter(
-            assign_to=doer,
-            completed_at__gte=s_this,
-            completed_at__lt=e_this,
-            completed_at__gt=F("planned_date"),
-        ).count()
+        backlog = _doer_backlog(doer, s_this, e_this)
+        pending_checklist = backlog["Checklist"].pending_before
+        pending_delegation = backlog["Delegation"].pending_before
+        delayed_checklist = backlog["Checklist"].delayed
+        delayed_delegation = backlog["Delegation"].delayed
 
         full_name = (doer.get_full_name() or doer.username or "").upper()
 
@@ -1471,4 +1317,50 @@ def performance_score(request):
         "pending_delegation": pending_delegation,
         "delayed_checklist": delayed_checklist,
         "delayed_delegation": delayed_delegation,
-    })
\ No newline at end of file
+    })
+
+
+@login_required
+def mis_report_excel(request):
+    """
+    Download the weekly MIS (MDO) workbook that the Monday email attaches.
+
+    ?week=current|last picks the Mon-Sat week, ?date=YYYY-MM-DD anchors it
+    (default: today, IST). The file is built into a spooled temp file and
+    streamed in chunks.
+    """
+    if not _is_report_admin(request.user):
+        raise PermissionDenied
+
+    from apps.tasks.services.mis_report import (
+        MIS_EXCEL_CONTENT_TYPE,
+        build_mis_report_dataset,
+        build_mis_report_excel_file,
+        mis_report_excel_filename,
+    )
+
+    week_selector = (request.GET.get("week") or "current").strip().lower()
+    if week_selector not in {"current", "last"}:
+        week_selector = "current"
+
+    anchor_date = None
+    raw_date = (request.GET.get("date") or "").strip()
+    if raw_date:
+        try:
+            anchor_date = date.fromisoformat(raw_date)
+        except ValueError:
+            anchor_date = None
+
+    report = build_mis_report_dataset(anchor_date=anchor_date, week_selector=week_selector)
+    spool = build_mis_report_excel_file(report)
+
+    size = spool.seek(0, 2)
+    spool.seek(0)
+
+    response = StreamingHttpResponse(
+        FileWrapper(spool, 64 * 1024),
+        content_type=MIS_EXCEL_CONTENT_TYPE,
+    )
+    response["Content-Length"] = str(size)
+    response["Content-Disposition"] = f'attachment; filename="{mis_report_excel_filename(report)}"'
+    return response
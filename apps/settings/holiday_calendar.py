@@ -0,0 +1,291 @@
+# apps/settings/holiday_calendar.py
+#
+# Shared, cached holiday calendar.
+#
+# Every working-day check in the project (recurrence, dashboard, leave,
+# digests) used to run Holiday.objects.filter(date=d).exists() per date.
+# The Holiday table is tiny, so it is loaded once per year range into a
+# sorted tuple + set and reused:
+#
+#   - per process, re-validated against a shared token at most every
+#     HOLIDAY_CALENDAR_LOCAL_TTL seconds (default 60);
+#   - in the shared cache (Redis in production), keyed by that token;
+#   - the token is rotated on every Holiday save/delete (see models.py) and
+#     after bulk uploads, so all processes pick up changes.
+#
+# Working day = not Sunday and not a Holiday Master date.
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_KEY = "holiday_calendar:token"
+DATA_CACHE_TIMEOUT = 24 * 60 * 60
+LOCAL_TTL = int(getattr(settings, "HOLIDAY_CALENDAR_LOCAL_TTL", 60))
+
+# Years loaded around the requested date.
+YEARS_BACK = 1
+YEARS_AHEAD = 2
+
+SUNDAY = 6
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        converted = value.date()
+        return converted if isinstance(converted, date) else None
+    except Exception:
+        return None
+
+
+class HolidayCalendar:
+    """
+    Immutable holiday index for a span of years.
+
+    is_holiday / is_working_day are O(1); next_working_day,
+    working_days_between and holidays_between are O(log n).
+    """
+
+    def __init__(
+        self,
+        holidays: Iterable[Tuple[date, str]],
+        *,
+        start_year: int,
+        end_year: int,
+        token: str = "",
+    ):
+        names = dict(holidays)
+        self.start_year = start_year
+        self.end_year = end_year
+        self.token = token
+        self.names: Dict[date, str] = names
+        self.dates: Tuple[date, ...] = tuple(sorted(names))
+        self._date_set = frozenset(self.dates)
+        # Prefix counts of holidays that do NOT fall on a Sunday, so a range
+        # count never subtracts the same day twice.
+        prefix = [0]
+        for d in self.dates:
+            prefix.append(prefix[-1] + (0 if d.weekday() == SUNDAY else 1))
+        self._weekday_prefix = tuple(prefix)
+
+    def covers(self, d: date) -> bool:
+        return self.start_year <= d.year <= self.end_year
+
+    def is_holiday(self, d: date) -> bool:
+        return d in self._date_set
+
+    def holiday_name(self, d: date) -> str:
+        return self.names.get(d, "")
+
+    def is_working_day(self, d: date) -> bool:
+        return d.weekday() != SUNDAY and d not in self._date_set
+
+    def next_working_day(self, d: date) -> date:
+        """First working day on or after d."""
+        idx = bisect_left(self.dates, d)
+        while True:
+            if d.weekday() == SUNDAY:
+                d += timedelta(days=1)
+                continue
+            while idx < len(self.dates) and self.dates[idx] < d:
+                idx += 1
+            if idx < len(self.dates) and self.dates[idx] == d:
+                d += timedelta(days=1)
+                idx += 1
+                continue
+            return d
+
+    def holidays_between(self, start: date, end: date) -> Tuple[date, ...]:
+        """Holiday dates in [start, end]."""
+        return self.dates[bisect_left(self.dates, start):bisect_right(self.dates, end)]
+
+    def working_days_between(self, start: date, end: date) -> int:
+        """Number of working days in [start, end] (inclusive)."""
+        if end < start:
+            return 0
+        total_days = (end - start).days + 1
+        full_weeks, remainder = divmod(total_days, 7)
+        sundays = full_weeks
+        # Sunday falls inside the trailing partial week?
+        offset = (SUNDAY - start.weekday()) % 7
+        if offset < remainder:
+            sundays += 1
+        lo = bisect_left(self.dates, start)
+        hi = bisect_right(self.dates, end)
+        weekday_holidays = self._weekday_prefix[hi] - self._weekday_prefix[lo]
+        return total_days - sundays - weekday_holidays
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Loading / caching
+# ─────────────────────────────────────────────────────────────────────────────
+
+_lock = threading.Lock()
+_local: Dict[str, object] = {"calendar": None, "checked_at": 0.0}
+
+
+def _shared_token() -> str:
+    try:
+        token = cache.get(TOKEN_CACHE_KEY)
+        if not token:
+            token = uuid.uuid4().hex
+            cache.add(TOKEN_CACHE_KEY, token, None)
+            token = cache.get(TOKEN_CACHE_KEY) or token
+        return str(token)
+    except Exception:
+        logger.exception("Holiday calendar token read failed")
+        return ""
+
+
+def _load_rows(start_year: int, end_year: int):
+    from apps.settings.models import Holiday
+
+    return list(
+        Holiday.objects
+        .filter(date__gte=date(start_year, 1, 1), date__lte=date(end_year, 12, 31))
+        .values_list("date", "name")
+    )
+
+
+def _build(start_year: int, end_year: int, token: str) -> HolidayCalendar:
+    data_key = f"holiday_calendar:{token}:{start_year}:{end_year}"
+    rows = None
+
+    if token:
+        try:
+            rows = cache.get(data_key)
+        except Exception:
+            rows = None
+
+    if rows is None:
+        rows = _load_rows(start_year, end_year)
+        if token:
+            try:
+                cache.set(data_key, rows, DATA_CACHE_TIMEOUT)
+            except Exception:
+                logger.exception("Holiday calendar cache write failed")
+
+    return HolidayCalendar(rows, start_year=start_year, end_year=end_year, token=token)
+
+
+def get_holiday_calendar(for_date=None) -> HolidayCalendar:
+    """
+    Return a calendar covering for_date (default: today).
+
+    Never raises: if the Holiday table is unavailable an empty calendar is
+    returned (Sundays still count as off days) and nothing is cached.
+    """
+    target = _as_date(for_date) or date.today()
+    now = time.monotonic()
+
+    calendar = _local["calendar"]
+    if (
+        isinstance(calendar, HolidayCalendar)
+        and calendar.covers(target)
+        and now - float(_local["checked_at"]) < LOCAL_TTL
+    ):
+        return calendar
+
+    with _lock:
+        token = _shared_token()
+        calendar = _local["calendar"]
+
+        if (
+            isinstance(calendar, HolidayCalendar)
+            and calendar.covers(target)
+            and token
+            and calendar.token == token
+        ):
+            _local["checked_at"] = now
+            return calendar
+
+        start_year = target.year - YEARS_BACK
+        end_year = target.year + YEARS_AHEAD
+        if isinstance(calendar, HolidayCalendar) and calendar.token == token:
+            start_year = min(start_year, calendar.start_year)
+            end_year = max(end_year, calendar.end_year)
+
+        try:
+            calendar = _build(start_year, end_year, token)
+        except Exception:
+            logger.exception("Holiday calendar load failed; treating only Sundays as off days")
+            return HolidayCalendar((), start_year=start_year, end_year=end_year)
+
+        _local["calendar"] = calendar
+        _local["checked_at"] = now
+        return calendar
+
+
+def load_holiday_calendar(for_date=None) -> HolidayCalendar:
+    """
+    Calendar covering for_date read straight from the Holiday table,
+    bypassing both caches. For work that must see a change the moment it
+    commits (holiday reconciliation); everything else uses
+    get_holiday_calendar.
+    """
+    target = _as_date(for_date) or date.today()
+    start_year = target.year - YEARS_BACK
+    end_year = target.year + YEARS_AHEAD
+    return HolidayCalendar(_load_rows(start_year, end_year), start_year=start_year, end_year=end_year)
+
+
+def invalidate_holiday_calendar() -> None:
+    """Rotate the shared token and drop this process's copy."""
+    with _lock:
+        _local["calendar"] = None
+        _local["checked_at"] = 0.0
+    try:
+        cache.set(TOKEN_CACHE_KEY, uuid.uuid4().hex, None)
+    except Exception:
+        logger.exception("Holiday calendar invalidation failed")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Convenience wrappers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def is_holiday(value) -> bool:
+    d = _as_date(value)
+    return bool(d) and get_holiday_calendar(d).is_holiday(d)
+
+
+def is_working_day(value) -> bool:
+    d = _as_date(value)
+    if d is None:
+        return True
+    return get_holiday_calendar(d).is_working_day(d)
+
+
+def next_working_day(value) -> date:
+    d = _as_date(value)
+    return get_holiday_calendar(d).next_working_day(d)
+
+
+def working_days_between(start, end) -> int:
+    start_d, end_d = _as_date(start), _as_date(end)
+    calendar = get_holiday_calendar(start_d)
+    if not calendar.covers(end_d):
+        calendar = get_holiday_calendar(end_d)
+    return calendar.working_days_between(start_d, end_d)
+
+
+def holiday_name(value) -> str:
+    d = _as_date(value)
+    return get_holiday_calendar(d).holiday_name(d) if d else ""
@@ -4,10 +4,12 @@ from __future__ import annotations
 import logging
 from datetime import date as dt_date, datetime as dt_datetime
 
-from django.db import models
-from django.db.models.signals import post_delete, post_save
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from apps.settings.holiday_calendar import get_holiday_calendar, invalidate_holiday_calendar
+
 logger = logging.getLogger(__name__)
 
 
@@ -68,13 +70,14 @@ class Holiday(models.Model):
     def is_holiday(cls, d) -> bool:
         """
         Fast check to know if a given date is a holiday.
+        Served from the shared holiday calendar (no per-call query).
         Accepts a date/datetime or any object exposing .date().
         """
         try:
             normalized = cls.normalize_to_date(d)
             if normalized is None:
                 return False
-            return cls.objects.filter(date=normalized).exists()
+            return get_holiday_calendar(normalized).is_holiday(normalized)
         except Exception:
             logger.exception("Holiday.is_holiday check failed")
             return False
@@ -152,7 +155,7 @@ class SystemSetting(models.Model):
         verbose_name_plural = "System Settings"
 
 
-def _call_holiday_hook(*, action: str, holiday_date: dt_date) -> None:
+def _call_holiday_hook(*, action: str, holiday_date: dt_date, previous_date: dt_date | None = None) -> None:
     """
     Best-effort holiday reconciliation hook.
 
@@ -172,7 +175,11 @@ def _call_holiday_hook(*, action: str, holiday_date: dt_date) -> None:
         )
         return
 
-    func_name = "handle_holiday_added" if action == "added" else "handle_holiday_removed"
+    func_name = {
+        "added": "handle_holiday_added",
+        "removed": "handle_holiday_removed",
+        "moved": "handle_holiday_moved",
+    }[action]
     hook = getattr(auto_assign, func_name, None)
 
     if not callable(hook):
@@ -185,18 +192,52 @@ def _call_holiday_hook(*, action: str, holiday_date: dt_date) -> None:
         return
 
     try:
-        hook(holiday_date)
+        if action == "moved":
+            hook(previous_date, holiday_date)
+        else:
+            hook(holiday_date)
     except Exception:
         logger.exception("Holiday %s hook failed for %s", action, holiday_date)
 
 
+@receiver(pre_save, sender=Holiday)
+def _remember_holiday_date(sender, instance: Holiday, raw: bool = False, **kwargs):
+    """Keep the stored date so an edited date can be reconciled as a move."""
+    instance._previous_date = None
+    if instance.pk and not raw:
+        instance._previous_date = (
+            Holiday.objects.filter(pk=instance.pk).values_list("date", flat=True).first()
+        )
+
+
 @receiver(post_save, sender=Holiday)
 def _on_holiday_saved(sender, instance: Holiday, created: bool, **kwargs):
     """
     When a holiday is added/updated, notify task services if that hook exists.
     Never fail the save if downstream reconciliation is unavailable.
     """
-    _call_holiday_hook(action="added", holiday_date=instance.date)
+    # Rotate the token only once the change is visible to other
+    # processes; rotating earlier lets them cache the old rows under the
+    # new token for DATA_CACHE_TIMEOUT.
+    transaction.on_commit(invalidate_holiday_calendar)
+
+    previous_date = Holiday.normalize_to_date(getattr(instance, "_previous_date", None))
+    holiday_date = Holiday.normalize_to_date(instance.date)
+
+    if previous_date and previous_date != holiday_date:
+        _call_holiday_hook(action="moved", holiday_date=holiday_date, previous_date=previous_date)
+    else:
+        _call_holiday_hook(action="added", holiday_date=instance.date)
+
+
+def holidays_bulk_created(holiday_dates) -> None:
+    """
+    bulk_create skips post_save: refresh the calendar and reconcile each new
+    date as _on_holiday_saved would. Call inside the creating transaction.
+    """
+    transaction.on_commit(invalidate_holiday_calendar)
+    for holiday_date in sorted(set(holiday_dates)):
+        _call_holiday_hook(action="added", holiday_date=holiday_date)
 
 
 @receiver(post_delete, sender=Holiday)
@@ -205,4 +246,5 @@ def _on_holiday_deleted(sender, instance: Holiday, **kwargs):
     When a holiday is removed, notify task services if that hook exists.
     Never fail the delete if downstream reconciliation is unavailable.
     """
+    transaction.on_commit(invalidate_holiday_calendar)
     _call_holiday_hook(action="removed", holiday_date=instance.date)
\ No newline at end of file
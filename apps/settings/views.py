@@ -20,7 +20,7 @@ from django.contrib import messages
 from django.db import transaction
 from django.contrib.auth.decorators import login_required, user_passes_test
 
-from .models import AuthorizedNumber, Holiday, SystemSetting
+from .models import AuthorizedNumber, Holiday, SystemSetting, holidays_bulk_created
 from .forms import AuthorizedNumberForm, HolidayForm, HolidayUploadForm, SystemSettingsForm
 
 
@@ -132,6 +132,9 @@ def holiday_list(request):
                         created_objects = Holiday.objects.bulk_create(
                             to_create, ignore_conflicts=True   # ← FIX
                         )
+                        # bulk_create does not fire post_save: refresh the
+                        # calendar and reconcile tasks after commit.
+                        holidays_bulk_created(h.date for h in created_objects)
                     created_count = len(created_objects)
                     if created_count:
                         messages.success(request, f"{created_count} holiday(s) uploaded successfully.")
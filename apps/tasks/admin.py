@@ -12,6 +12,7 @@ from .models import (
     Delegation,
     FMS,
     HelpTicket,
+    HolidayShift,
 )
 
 
@@ -252,4 +253,20 @@ class HelpTicketAdmin(PermanentTaskDeleteAdminMixin, admin.ModelAdmin):
 class BulkUploadAdmin(admin.ModelAdmin):
     list_display = ("form_type", "uploaded_at")
     list_filter = ("form_type",)
-    ordering = ("-uploaded_at",)
\ No newline at end of file
+    ordering = ("-uploaded_at",)
+
+
+@admin.register(HolidayShift)
+class HolidayShiftAdmin(admin.ModelAdmin):
+    list_display = (
+        "holiday_date",
+        "kind",
+        "object_id",
+        "action",
+        "original_value",
+        "new_value",
+        "reverted_at",
+    )
+    list_filter = ("kind", "action", "holiday_date")
+    search_fields = ("object_id",)
+    ordering = ("-holiday_date", "-id")
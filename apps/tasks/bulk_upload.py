@@ -3,12 +3,13 @@ from __future__ import annotations
 
 import logging
 import re
-import time
 import unicodedata
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, time as dt_time
-from threading import Thread, Lock
+from threading import Thread
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -16,17 +17,21 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import connection, transaction, close_old_connections
 from django.db.models import Q
+from django.db.models.functions import Lower
 from django.urls import reverse
-from django.utils import timezone
 
-from .models import Checklist, Delegation
+from apps.settings.holiday_calendar import get_holiday_calendar
+from apps.tasks.utils.blocking import blocking_leaves_by_user, leaves_block_at
+
+from .models import Checklist, ChecklistRecurringSeries, Delegation
+from .services.checklist_series_creation import create_recurring_checklist
 from .utils import (
     send_checklist_assignment_to_user,
     send_delegation_assignment_to_user,
     send_admin_bulk_summary,
 )
 # ⬇️ Use the same utility the rest of the app now uses
-from .recurrence_utils import preserve_first_occurrence_time
+from .recurrence_utils import pin_7pm_ist_on_date, preserve_first_occurrence_time
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -209,7 +214,7 @@ def parse_excel_file_optimized(file) -> pd.DataFrame:
     raise ValueError("Unsupported file format. Please upload .xlsx, .xls, or .csv")
 
 
-def validate_and_prepare_excel_data(df: pd.DataFrame) -> Tuple[pd.DataFrame | None, List[str]]:
+def validate_and_prepare_excel_data(df: pd.DataFrame, task_type: str = "checklist") -> Tuple[pd.DataFrame | None, List[str]]:
     # Normalize headers
     df.columns = (
         df.columns.str.strip()
@@ -232,69 +237,15 @@ def validate_and_prepare_excel_data(df: pd.DataFrame) -> Tuple[pd.DataFrame | No
     if missing:
         return None, [f"Missing required columns: {', '.join(missing)}. Available: {', '.join(df.columns)}"]
 
-    # Drop empties
-    df = df.replace("", pd.NA).dropna(subset=["Task Name"])
-    df = df[df["Task Name"].astype(str).str.strip().astype(bool)]
+    # Drop empties (blank cells stay "", never NA)
+    df = df.fillna("").astype(str)
+    df = df[df["Task Name"].str.strip().astype(bool)]
     if len(df) == 0:
         return None, ["No valid rows found in the file"]
 
-    # Warm user cache for better performance
-    usernames = set()
-    for col in ["Assign To", "Assign PC", "Notify To", "Auditor"]:
-        if col in df.columns:
-            ser = df[col].astype(str).str.strip()
-            ser = ser[(ser != "") & ser.notna()]
-            usernames.update(ser.unique().tolist())
-    _user_cache.preload_usernames(list(usernames))
-
     return df, []
 
 
-# -----------------------------
-# User cache to speed up lookups
-# -----------------------------
-class _UserCache:
-    def __init__(self):
-        self._cache = {}
-        self._lock = Lock()
-
-    def get_user(self, username_or_email):
-        key = (username_or_email or "").strip()
-        if not key:
-            return None
-        with self._lock:
-            if key in self._cache:
-                return self._cache[key]
-        u = None
-        try:
-            u = User.objects.get(username=key, is_active=True)
-        except User.DoesNotExist:
-            try:
-                u = User.objects.get(email__iexact=key, is_active=True)
-            except User.DoesNotExist:
-                u = None
-        with self._lock:
-            self._cache[key] = u
-        return u
-
-    def preload_usernames(self, usernames):
-        if not usernames:
-            return
-        qs = User.objects.filter(is_active=True).filter(Q(username__in=usernames) | Q(email__in=usernames))
-        with self._lock:
-            for u in qs:
-                self._cache[u.username] = u
-                if u.email:
-                    self._cache[u.email] = u
-
-    def clear(self):
-        with self._lock:
-            self._cache.clear()
-
-
-_user_cache = _UserCache()
-
-
 # -----------------------------
 # DB helpers
 # -----------------------------
@@ -307,87 +258,6 @@ def _optimal_batch_size() -> int:
         return 250
 
 
-# -----------------------------
-# Core row -> model builders
-# -----------------------------
-def _build_checklist_from_row(row, assign_by_user):
-    task_name = _clean_str(row.get("Task Name"))
-    assign_to_username = _clean_str(row.get("Assign To"))
-    planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-    # Pin & normalize first occurrence per final rule helper
-    planned_dt = preserve_first_occurrence_time(planned_dt) if planned_dt else None
-
-    priority = (_clean_str(row.get("Priority")) or "Low").title()
-    if priority not in ["Low", "Medium", "High"]:
-        priority = "Low"
-
-    mode, frequency = parse_mode_frequency_from_row(row)
-    time_per_task = parse_int(row.get("Time per Task (minutes)"), default=0)
-    remind_before_days = parse_int(
-        row.get("Remind Before Days") or row.get("Reminder Before Days") or
-        row.get("Remind days") or row.get("Remind Before"), default=0
-    )
-    if remind_before_days < 0:
-        remind_before_days = 0
-
-    obj = Checklist(
-        assign_by=assign_by_user,
-        task_name=task_name,
-        message=_clean_str(row.get("Message")),
-        assign_to=_user_cache.get_user(assign_to_username),
-        planned_date=planned_dt,
-        priority=priority,
-        attachment_mandatory=False,
-        mode=mode,
-        frequency=frequency if mode else None,
-        time_per_task_minutes=time_per_task,
-        remind_before_days=remind_before_days,
-        assign_pc=_user_cache.get_user(_clean_str(row.get("Assign PC"))),
-        group_name=_clean_str(row.get("Group Name")),
-        notify_to=_user_cache.get_user(_clean_str(row.get("Notify To"))),
-        auditor=_user_cache.get_user(_clean_str(row.get("Auditor"))),
-        set_reminder=parse_bool(row.get("Set Reminder")),
-        reminder_mode=_SYN_MODE.get(_clean_str(row.get("Reminder Mode")).lower(),
-                                    _clean_str(row.get("Reminder Mode")).title()) if parse_bool(row.get("Set Reminder")) else None,
-        reminder_frequency=parse_int(row.get("Reminder Frequency"), default=1) if parse_bool(row.get("Set Reminder")) else None,
-        reminder_starting_time=_parse_time_flexible(row.get("Reminder Starting Time")) if parse_bool(row.get("Set Reminder")) else None,
-        checklist_auto_close=parse_bool(row.get("Checklist Auto Close")),
-        checklist_auto_close_days=parse_int(row.get("Checklist Auto Close Days"), default=0),
-        actual_duration_minutes=0,
-        status="Pending",
-    )
-    return obj
-
-
-def _build_delegation_from_row(row, assign_by_user):
-    task_name = _clean_str(row.get("Task Name"))
-    assign_to_username = _clean_str(row.get("Assign To"))
-    planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-    planned_dt = preserve_first_occurrence_time(planned_dt) if planned_dt else None
-
-    priority = (_clean_str(row.get("Priority")) or "Low").title()
-    if priority not in ["Low", "Medium", "High"]:
-        priority = "Low"
-
-    time_per_task = parse_int(row.get("Time per Task (minutes)"), default=0)
-
-    obj = Delegation(
-        assign_by=assign_by_user,
-        task_name=task_name,
-        assign_to=_user_cache.get_user(assign_to_username),
-        planned_date=planned_dt,
-        priority=priority,
-        attachment_mandatory=False,
-        # one-time only:
-        mode=None,
-        frequency=None,
-        time_per_task_minutes=time_per_task,
-        actual_duration_minutes=0,
-        status="Pending",
-    )
-    return obj
-
-
 def _parse_time_flexible(val):
     s = _clean_str(val)
     if not s:
@@ -405,39 +275,503 @@ def _parse_time_flexible(val):
 
 
 # -----------------------------
-# Public APIs
+# Vectorized preflight
 # -----------------------------
-def process_checklist_bulk_upload(file, assign_by_user, *, send_emails: bool = True):
+# The whole sheet is validated column-wise before anything is written:
+# dates, modes and frequencies are parsed with pandas string/datetime ops,
+# every user column is resolved in one query, holidays come from the cached
+# calendar and leaves are preloaded per assignee. Any row error rejects the
+# upload, so a sheet is either fully imported or not at all.
+
+_DATE_FORMATS = [
+    "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M",
+    "%d-%m-%Y %H:%M", "%d.%m.%Y %H:%M",
+    "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y",
+]
+_USER_COLUMNS = ["Assign To", "Assign PC", "Notify To", "Auditor"]
+_REMIND_COLUMNS = ["Remind Before Days", "Reminder Before Days", "Remind days", "Remind Before"]
+_TRUE_VALUES = {"1", "true", "yes", "y", "on"}
+_PRIORITIES = ["Low", "Medium", "High"]
+
+
+@dataclass(frozen=True)
+class RowError:
+    row: int
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.message}"
+
+
+@dataclass
+class PreflightReport:
+    task_type: str
+    total_rows: int
+    rows: List[dict] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def error_messages(self) -> List[str]:
+        return [str(e) for e in self.errors]
+
+    def as_dict(self) -> dict:
+        return {
+            "task_type": self.task_type,
+            "total_rows": self.total_rows,
+            "valid_rows": len(self.rows),
+            "error_count": len(self.errors),
+            "errors": [asdict(e) for e in self.errors],
+        }
+
+
+def _objects(values, index) -> pd.Series:
+    """Object Series that keeps Python values (dates, users, None) as-is."""
+    return pd.Series(list(values), index=index, dtype=object)
+
+
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column as cleaned strings ("" when the column or cell is missing)."""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return (
+        df[col].fillna("").astype(str)
+        .str.replace("\x96", "-", regex=False)
+        .str.replace("–", "-", regex=False)
+        .str.replace("—", "-", regex=False)
+        .str.normalize("NFKD")
+        .str.strip()
+    )
+
+
+def _ints(values: pd.Series, default: int) -> pd.Series:
+    """Column-wise parse_int()."""
+    digits = values.str.extract(r"(-?\d+)", expand=False)
+    return pd.to_numeric(digits, errors="coerce").fillna(default).astype(int)
+
+
+def _bools(values: pd.Series) -> pd.Series:
+    return values.str.lower().isin(_TRUE_VALUES)
+
+
+def _planned_dates(raw: pd.Series) -> pd.Series:
     """
-    Parse file → create Checklist tasks → optionally email.
-    NOTE: If SEND_RECUR_EMAILS_ONLY_AT_10AM is True, assignee emails are NOT sent here;
-          post_save signals will schedule them for ~10:00 IST on the planned date.
-    Returns: (created_objects, errors)
+    Column-wise parse_datetime_flexible() + preserve_first_occurrence_time():
+    the IST calendar date of each cell (None when unparseable).
+
+    Formats are tried in the same order as the per-cell parser; leftovers
+    that need pandas' free-form parser go through it once per unique value.
     """
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype="datetime64[ns]")
+    todo = raw != ""
+
+    for fmt in _DATE_FORMATS:
+        if not todo.any():
+            break
+        hit = pd.to_datetime(raw[todo], format=fmt, errors="coerce")
+        hit = hit[hit.notna()]
+        parsed.loc[hit.index] = hit
+        todo.loc[hit.index] = False
+
+    # Naive values are project time (IST): their date is the IST date.
+    days = _objects((None if pd.isna(ts) else ts.date() for ts in parsed), raw.index)
+
+    for value in raw[todo].unique():
+        dt = parse_datetime_flexible(value)
+        if dt:
+            days[todo & (raw == value)] = preserve_first_occurrence_time(dt).astimezone(IST).date()
+
+    return days
+
+
+def _modes_and_frequencies(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Column-wise parse_mode_frequency_from_row()."""
+    modes = pd.Series("", index=df.index, dtype=object)
+    freqs = pd.Series(0, index=df.index, dtype=int)
+
+    def _count(numbers: pd.Series) -> pd.Series:
+        return pd.to_numeric(numbers, errors="coerce").fillna(1).clip(lower=1).astype(int)
+
+    # 1) explicit Mode (+ Frequency)
+    raw_mode = _text(df, "Mode")
+    raw_freq = _text(df, "Frequency")
+    mode = raw_mode.str.lower().map(_SYN_MODE).fillna(raw_mode.str.title())
+    has_mode = (raw_mode != "") & mode.isin(RECURRING_MODES)
+
+    numeric = pd.to_numeric(raw_freq, errors="coerce")
+    numeric = np.trunc(numeric.where(np.isfinite(numeric))).clip(lower=1)
+    from_text = raw_freq.str.extract(_RECURRENCE_RE)
+    freq = numeric.where(numeric.notna(), _count(from_text[0]).where(from_text[1].notna()))
+    freq = freq.fillna(1).astype(int)
+
+    modes[has_mode] = mode[has_mode]
+    freqs[has_mode] = freq[has_mode]
+    open_rows = ~has_mode
+
+    # 2) free-text recurrence columns, first match wins
+    for key in ["Recurrence", "Repeat", "Frequency", "Every"]:
+        txt = _text(df, key)
+        candidates = open_rows & (txt != "")
+        if not candidates.any():
+            continue
+
+        found = txt.str.extract(_RECURRENCE_RE)
+        unit_mode = found[1].str.lower().map(_SYN_MODE)
+        hit = candidates & unit_mode.isin(RECURRING_MODES)
+        modes[hit] = unit_mode[hit]
+        freqs[hit] = _count(found[0])[hit]
+        open_rows &= ~hit
+
+        bare = txt.str.lower().map(_SYN_MODE)
+        hit = candidates & open_rows & bare.notna()
+        modes[hit] = bare[hit]
+        freqs[hit] = 1
+        open_rows &= ~hit
+
+    return modes, freqs
+
+
+def _resolve_users(keys) -> dict:
+    """
+    username-or-email -> active User (or None) for every key, in one query.
+    Username matches win; emails match case-insensitively (lowest pk).
+    """
+    keys = {k for k in keys if k}
+    if not keys:
+        return {}
+
+    lowered = {k.lower() for k in keys}
+    by_username, by_email = {}, {}
+    for user in (
+        User.objects.filter(is_active=True)
+        .annotate(_email_lower=Lower("email"))
+        .filter(Q(username__in=keys) | Q(_email_lower__in=lowered))
+        .order_by("pk")
+    ):
+        by_username[user.username] = user
+        if user.email:
+            by_email.setdefault(user.email.lower(), user)
+
+    return {k: by_username.get(k) or by_email.get(k.lower()) for k in keys}
+
+
+def _preflight_common(df: pd.DataFrame, task_type: str) -> Tuple[pd.DataFrame, PreflightReport, dict]:
+    """Checks shared by checklist and delegation uploads."""
+    report = PreflightReport(task_type=task_type, total_rows=len(df))
+    row_no = pd.Series(df.index, index=df.index) + 1
+
+    prepared = pd.DataFrame(index=df.index)
+    prepared["row_no"] = row_no
+    prepared["task_name"] = _text(df, "Task Name")
+    prepared["assign_to_key"] = _text(df, "Assign To")
+    prepared["planned_day"] = _planned_dates(_text(df, "Planned Date"))
+
+    priority = _text(df, "Priority").str.title()
+    prepared["priority"] = priority.where(priority.isin(_PRIORITIES), "Low")
+    prepared["time_per_task_minutes"] = _ints(_text(df, "Time per Task (minutes)"), 0)
+
+    user_keys = set()
+    for col in _USER_COLUMNS:
+        user_keys.update(_text(df, col).unique().tolist())
+    users = _resolve_users(user_keys)
+
+    prepared["assign_to"] = _objects(map(users.get, prepared["assign_to_key"]), df.index)
+
+    def _fail(mask: pd.Series, column: str, message) -> None:
+        for idx in mask[mask].index:
+            text = message(idx) if callable(message) else message
+            report.errors.append(RowError(row=int(row_no[idx]), column=column, message=text))
+        prepared.loc[mask, "_bad"] = True
+
+    prepared["_bad"] = False
+    _fail(prepared["task_name"] == "", "Task Name", "Missing 'Task Name'")
+
+    no_user_key = prepared["assign_to_key"] == ""
+    _fail(no_user_key, "Assign To", "Missing 'Assign To'")
+    _fail(
+        ~no_user_key & prepared["assign_to"].isna(),
+        "Assign To",
+        lambda i: f"User '{prepared.at[i, 'assign_to_key']}' not found or inactive",
+    )
+
+    no_day = prepared["planned_day"].isna()
+    _fail(no_day, "Planned Date", "Invalid or missing planned date")
+
+    days = prepared["planned_day"][~no_day]
+    working = {d: get_holiday_calendar(d).is_working_day(d) for d in days.unique()}
+    _fail(
+        ~no_day & ~prepared["planned_day"].map(lambda d: working.get(d, True)),
+        "Planned Date",
+        lambda i: f"Planned date {prepared.at[i, 'planned_day']} is Sunday/holiday. Task not created.",
+    )
+
+    pinned = {d: pin_7pm_ist_on_date(d) for d in days.unique()}
+    prepared["planned_date"] = _objects(map(pinned.get, prepared["planned_day"]), df.index)
+
+    # Leave: preload every blocking leave of the assignees once.
+    checkable = ~prepared["_bad"]
+    assignee_ids = {u.pk for u in prepared.loc[checkable, "assign_to"]}
+    if assignee_ids:
+        leaves = blocking_leaves_by_user(assignee_ids, min(prepared.loc[checkable, "planned_day"]))
+        on_leave = pd.Series(False, index=df.index)
+        for idx in checkable[checkable].index:
+            user_leaves = leaves.get(prepared.at[idx, "assign_to"].pk)
+            if user_leaves:
+                on_leave[idx] = leaves_block_at(user_leaves, prepared.at[idx, "planned_date"])
+        _fail(
+            on_leave,
+            "Assign To",
+            lambda i: f"Assigned person '{prepared.at[i, 'assign_to_key']}' is on leave during planned time. Task not created.",
+        )
+
+    return prepared, report, users
+
+
+def preflight_checklist_upload(df: pd.DataFrame) -> PreflightReport:
+    """
+    Validate a normalized checklist sheet (see validate_and_prepare_excel_data).
+
+    report.rows holds the prepared field values of every row; nothing is written.
+    """
+    prepared, report, users = _preflight_common(df, "checklist")
+
+    prepared["message"] = _text(df, "Message")
+    prepared["group_name"] = _text(df, "Group Name")
+    prepared["mode"], prepared["frequency"] = _modes_and_frequencies(df)
+
+    remind = pd.Series("", index=df.index, dtype=object)
+    for col in _REMIND_COLUMNS:
+        raw = _text(df, col)
+        remind = remind.where(remind != "", raw)
+    prepared["remind_before_days"] = _ints(remind, 0).clip(lower=0)
+
+    for col, field_name in (("Assign PC", "assign_pc"), ("Notify To", "notify_to"), ("Auditor", "auditor")):
+        prepared[field_name] = _objects(map(users.get, _text(df, col)), df.index)
+
+    set_reminder = _bools(_text(df, "Set Reminder"))
+    reminder_mode = _text(df, "Reminder Mode")
+    reminder_mode = reminder_mode.str.lower().map(_SYN_MODE).fillna(reminder_mode.str.title())
+    reminder_mode = reminder_mode.where(reminder_mode.isin(RECURRING_MODES), "Daily")
+    reminder_times = _text(df, "Reminder Starting Time")
+    reminder_frequency = _ints(_text(df, "Reminder Frequency"), 1).clip(lower=1)
+    prepared["set_reminder"] = set_reminder
+    prepared["reminder_mode"] = _objects(
+        (m if on else None for m, on in zip(reminder_mode, set_reminder)), df.index
+    )
+    prepared["reminder_frequency"] = _objects(
+        (int(f) if on else None for f, on in zip(reminder_frequency, set_reminder)), df.index
+    )
+    prepared["reminder_starting_time"] = _objects(
+        (_parse_time_flexible(t) if on else None for t, on in zip(reminder_times, set_reminder)), df.index
+    )
+    prepared["checklist_auto_close"] = _bools(_text(df, "Checklist Auto Close"))
+    prepared["checklist_auto_close_days"] = _ints(_text(df, "Checklist Auto Close Days"), 0).clip(lower=0)
+
+    # Recurring rows: the series master must not already exist (or repeat in the file).
+    recurring = ~prepared["_bad"] & (prepared["mode"] != "")
+    if recurring.any():
+        assignee_ids = {u.pk for u in prepared.loc[recurring, "assign_to"]}
+        seen = set(
+            ChecklistRecurringSeries.objects
+            .filter(assign_to_id__in=assignee_ids, is_active=True, is_deleted=False)
+            .values_list("assign_to_id", "task_name", "mode", "frequency", "group_name")
+        )
+        first_row = {}
+        for idx in recurring[recurring].index:
+            key = (
+                prepared.at[idx, "assign_to"].pk,
+                prepared.at[idx, "task_name"],
+                prepared.at[idx, "mode"],
+                int(prepared.at[idx, "frequency"]),
+                prepared.at[idx, "group_name"],
+            )
+            if key in seen:
+                message = (
+                    f"Recurring checklist duplicates row {first_row[key]} of this file."
+                    if key in first_row
+                    else "An active recurring checklist series with the same assignee, "
+                         "task name, mode, frequency and group already exists."
+                )
+                report.errors.append(RowError(row=int(prepared.at[idx, "row_no"]), column="Task Name", message=message))
+                prepared.at[idx, "_bad"] = True
+                continue
+            seen.add(key)
+            first_row[key] = int(prepared.at[idx, "row_no"])
+
+    report.errors.sort(key=lambda e: e.row)
+    report.rows = prepared[~prepared["_bad"]].drop(columns=["_bad", "assign_to_key", "planned_day"]).to_dict("records")
+    return report
+
+
+def preflight_delegation_upload(df: pd.DataFrame) -> PreflightReport:
+    """Validate a normalized delegation sheet; nothing is written."""
+    prepared, report, _users = _preflight_common(df, "delegation")
+    report.errors.sort(key=lambda e: e.row)
+    report.rows = prepared[~prepared["_bad"]].drop(columns=["_bad", "assign_to_key", "planned_day"]).to_dict("records")
+    return report
+
+
+def _rejected(report: PreflightReport) -> List[str]:
+    return [
+        f"Upload rejected: {len(report.errors)} row error(s) in {report.total_rows} row(s). "
+        "Nothing was saved; fix the rows below and upload again."
+    ] + report.error_messages()
+
+
+# -----------------------------
+# Writers (all-or-nothing)
+# -----------------------------
+def _invalidate_dashboards(tasks) -> None:
+    # bulk_create skips the task signals that normally do this.
+    try:
+        from dashboard.payload_cache import invalidate_user_dashboards_on_commit
+
+        invalidate_user_dashboards_on_commit(task.assign_to_id for task in tasks)
+    except Exception:
+        logger.debug("Dashboard invalidation skipped for bulk upload", exc_info=True)
+
+
+def _write_checklists(report: PreflightReport, assign_by_user) -> Tuple[List[Checklist], List[str]]:
+    one_time, created, errors = [], [], []
+
+    with transaction.atomic():
+        for row in report.rows:
+            common = {
+                "assign_by": assign_by_user,
+                "task_name": row["task_name"],
+                "message": row["message"],
+                "assign_to": row["assign_to"],
+                "planned_date": row["planned_date"],
+                "priority": row["priority"],
+                "attachment_mandatory": False,
+                "time_per_task_minutes": row["time_per_task_minutes"],
+                "remind_before_days": row["remind_before_days"],
+                "assign_pc": row["assign_pc"],
+                "group_name": row["group_name"],
+                "notify_to": row["notify_to"],
+                "auditor": row["auditor"],
+                "set_reminder": row["set_reminder"],
+                "reminder_mode": row["reminder_mode"],
+                "reminder_frequency": row["reminder_frequency"],
+                "reminder_starting_time": row["reminder_starting_time"],
+                "checklist_auto_close": row["checklist_auto_close"],
+                "checklist_auto_close_days": row["checklist_auto_close_days"],
+            }
+
+            if row["mode"] in RECURRING_MODES:
+                # Series masters only come from the approved creation path.
+                try:
+                    with transaction.atomic():
+                        _series, first_occurrence = create_recurring_checklist(
+                            mode=row["mode"],
+                            frequency=max(int(row["frequency"] or 1), 1),
+                            **common,
+                        )
+                    created.append(first_occurrence)
+                except Exception as exc:
+                    errors.append(f"Row {row['row_no']}: Could not create recurring checklist: {exc}")
+                continue
+
+            one_time.append(
+                Checklist(
+                    **common,
+                    mode=None,
+                    frequency=None,
+                    actual_duration_minutes=0,
+                    status="Pending",
+                )
+            )
+
+        if errors:
+            transaction.set_rollback(True)
+            return [], ["Upload rejected: nothing was saved."] + errors
+
+        if one_time:
+            created.extend(Checklist.objects.bulk_create(one_time, batch_size=_optimal_batch_size()))
+            _invalidate_dashboards(one_time)
+
+    return created, []
+
+
+def _write_delegations(report: PreflightReport, assign_by_user) -> Tuple[List[Delegation], List[str]]:
+    objs = [
+        Delegation(
+            assign_by=assign_by_user,
+            task_name=row["task_name"],
+            assign_to=row["assign_to"],
+            planned_date=row["planned_date"],
+            priority=row["priority"],
+            attachment_mandatory=False,
+            # one-time only:
+            mode=None,
+            frequency=None,
+            time_per_task_minutes=row["time_per_task_minutes"],
+            actual_duration_minutes=0,
+            status="Pending",
+        )
+        for row in report.rows
+    ]
+    with transaction.atomic():
+        created = Delegation.objects.bulk_create(objs, batch_size=_optimal_batch_size())
+        _invalidate_dashboards(created)
+        return created, []
+
+
+def _load_sheet(file, task_type: str) -> Tuple[pd.DataFrame | None, List[str]]:
     try:
         df = parse_excel_file_optimized(file)
     except Exception as e:
-        return [], [f"Error reading file: {e}. Please upload .xlsx, .xls or .csv"]
+        return None, [f"Error reading file: {e}. Please upload .xlsx, .xls or .csv"]
+    return validate_and_prepare_excel_data(df, task_type)
+
 
-    df, v_errors = validate_and_prepare_excel_data(df)
-    if v_errors:
-        return [], v_errors
+def import_checklist_upload(file, assign_by_user) -> Tuple[List[Checklist], List[str]]:
+    """
+    Parse → preflight → write checklist rows. No emails.
+    Returns (created_objects, errors); errors means nothing was written.
+    """
+    df, errors = _load_sheet(file, "checklist")
+    if errors:
+        return [], errors
 
-    created: List[Checklist] = []
-    errors: List[str] = []
-    _user_cache.clear()
+    report = preflight_checklist_upload(df)
+    if not report.ok:
+        return [], _rejected(report)
 
-    total = len(df)
-    bs = _optimal_batch_size()
+    return _write_checklists(report, assign_by_user)
 
-    for start_idx in range(0, total, bs):
-        end_idx = min(start_idx + bs, total)
-        batch_df = df.iloc[start_idx:end_idx]
-        objs, batch_errors = _create_checklist_batch(batch_df, assign_by_user)
-        created.extend(objs)
-        errors.extend(batch_errors)
-        if connection.vendor == "sqlite":
-            time.sleep(0.01)  # allow locks to settle
+
+def import_delegation_upload(file, assign_by_user) -> Tuple[List[Delegation], List[str]]:
+    """
+    Parse → preflight → write delegation rows. No emails.
+    Returns (created_objects, errors); errors means nothing was written.
+    """
+    df, errors = _load_sheet(file, "delegation")
+    if errors:
+        return [], errors
+
+    report = preflight_delegation_upload(df)
+    if not report.ok:
+        return [], _rejected(report)
+
+    return _write_delegations(report, assign_by_user)
+
+
+# -----------------------------
+# Public APIs
+# -----------------------------
+def process_checklist_bulk_upload(file, assign_by_user, *, send_emails: bool = True):
+    """
+    Parse file → create Checklist tasks → optionally email.
+    NOTE: If SEND_RECUR_EMAILS_ONLY_AT_10AM is True, assignee emails are NOT sent here;
+          post_save signals will schedule them for ~10:00 IST on the planned date.
+    Returns: (created_objects, errors)
+    """
+    created, errors = import_checklist_upload(file, assign_by_user)
 
     # Email behavior:
     # - If 10AM gating is ON, rely on signals; don't send immediately here.
@@ -461,30 +795,7 @@ def process_delegation_bulk_upload(file, assign_by_user, *, send_emails: bool =
     NOTE: If SEND_RECUR_EMAILS_ONLY_AT_10AM is True, post_save signals will schedule the assignee email at ~10:00 IST.
     Returns: (created_objects, errors)
     """
-    try:
-        df = parse_excel_file_optimized(file)
-    except Exception as e:
-        return [], [f"Error reading file: {e}. Please upload .xlsx, .xls or .csv"]
-
-    df, v_errors = validate_and_prepare_excel_data(df)
-    if v_errors:
-        return [], v_errors
-
-    created: List[Delegation] = []
-    errors: List[str] = []
-    _user_cache.clear()
-
-    total = len(df)
-    bs = _optimal_batch_size()
-
-    for start_idx in range(0, total, bs):
-        end_idx = min(start_idx + bs, total)
-        batch_df = df.iloc[start_idx:end_idx]
-        objs, batch_errors = _create_delegation_batch(batch_df, assign_by_user)
-        created.extend(objs)
-        errors.extend(batch_errors)
-        if connection.vendor == "sqlite":
-            time.sleep(0.01)
+    created, errors = import_delegation_upload(file, assign_by_user)
 
     if created:
         if send_emails and SEND_EMAILS_FOR_AUTO_RECUR and not SEND_RECUR_EMAILS_ONLY_AT_10AM:
@@ -498,106 +809,6 @@ def process_delegation_bulk_upload(file, assign_by_user, *, send_emails: bool =
     return created, errors
 
 
-# -----------------------------
-# Internal batch creators
-# -----------------------------
-def _create_checklist_batch(batch_df, assign_by_user):
-    objs, errors = [], []
-    for idx, row in batch_df.iterrows():
-        try:
-            task_name = _clean_str(row.get("Task Name"))
-            if not task_name:
-                errors.append(f"Row {idx+1}: Missing 'Task Name'")
-                continue
-
-            assign_to_username = _clean_str(row.get("Assign To"))
-            if not assign_to_username:
-                errors.append(f"Row {idx+1}: Missing 'Assign To'")
-                continue
-            if not _user_cache.get_user(assign_to_username):
-                errors.append(f"Row {idx+1}: User '{assign_to_username}' not found or inactive")
-                continue
-
-            planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-            if not planned_dt:
-                errors.append(f"Row {idx+1}: Invalid or missing planned date")
-                continue
-
-            obj = _build_checklist_from_row(row, assign_by_user)
-            objs.append(obj)
-        except Exception as e:
-            errors.append(f"Row {idx+1}: {e}")
-
-    created = []
-    if objs:
-        try:
-            with transaction.atomic():
-                created = Checklist.objects.bulk_create(objs, batch_size=min(len(objs), _optimal_batch_size()))
-        except Exception as e:
-            logger.error("Checklist bulk_create failed; attempting partial fallback: %s", e)
-            # partial fallback
-            for i in range(0, len(objs), 50):
-                chunk = objs[i:i+50]
-                try:
-                    created.extend(Checklist.objects.bulk_create(chunk, batch_size=50))
-                except Exception:
-                    for o in chunk:
-                        try:
-                            o.save()
-                            created.append(o)
-                        except Exception as save_err:
-                            errors.append(f"Failed to save '{clean_unicode_string(o.task_name)}': {save_err}")
-    return created, errors
-
-
-def _create_delegation_batch(batch_df, assign_by_user):
-    objs, errors = [], []
-    for idx, row in batch_df.iterrows():
-        try:
-            task_name = _clean_str(row.get("Task Name"))
-            if not task_name:
-                errors.append(f"Row {idx+1}: Missing 'Task Name'")
-                continue
-
-            assign_to_username = _clean_str(row.get("Assign To"))
-            if not assign_to_username:
-                errors.append(f"Row {idx+1}: Missing 'Assign To'")
-                continue
-            if not _user_cache.get_user(assign_to_username):
-                errors.append(f"Row {idx+1}: User '{assign_to_username}' not found or inactive")
-                continue
-
-            planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-            if not planned_dt:
-                errors.append(f"Row {idx+1}: Invalid or missing planned date")
-                continue
-
-            obj = _build_delegation_from_row(row, assign_by_user)
-            objs.append(obj)
-        except Exception as e:
-            errors.append(f"Row {idx+1}: {e}")
-
-    created = []
-    if objs:
-        try:
-            with transaction.atomic():
-                created = Delegation.objects.bulk_create(objs, batch_size=min(len(objs), _optimal_batch_size()))
-        except Exception as e:
-            logger.error("Delegation bulk_create failed; attempting partial fallback: %s", e)
-            for i in range(0, len(objs), 50):
-                chunk = objs[i:i+50]
-                try:
-                    created.extend(Delegation.objects.bulk_create(chunk, batch_size=50))
-                except Exception:
-                    for o in chunk:
-                        try:
-                            o.save()
-                            created.append(o)
-                        except Exception as save_err:
-                            errors.append(f"Failed to save delegation '{clean_unicode_string(o.task_name)}': {save_err}")
-    return created, errors
-
-
 # -----------------------------
 # Email helpers (async)
 # -----------------------------
@@ -685,6 +896,12 @@ def _send_admin_preview_async(
 __all__ = [
     "process_checklist_bulk_upload",
     "process_delegation_bulk_upload",
+    "import_checklist_upload",
+    "import_delegation_upload",
+    "preflight_checklist_upload",
+    "preflight_delegation_upload",
+    "PreflightReport",
+    "RowError",
     # lower-level helpers (optional)
     "parse_excel_file_optimized",
     "validate_and_prepare_excel_data",
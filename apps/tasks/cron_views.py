@@ -60,8 +60,8 @@ def _is_sunday_ist(d: date) -> bool:
 
 def _is_holiday_ist(d: date) -> bool:
     try:
-        from apps.settings.models import Holiday  # optional
-        return Holiday.objects.filter(date=d).exists()
+        from apps.settings.holiday_calendar import get_holiday_calendar  # optional
+        return get_holiday_calendar(d).is_holiday(d)
     except Exception:
         return False
 
@@ -10,6 +10,7 @@ from django.contrib.auth import get_user_model
 from django.core.mail import EmailMultiAlternatives, send_mail
 from django.template.loader import render_to_string
 from django.utils import timezone
+from apps.common.mail_pipeline import send_message
 from apps.tasks.services.holiday_guard import is_holiday_for_user
 try:
     from zoneinfo import ZoneInfo
@@ -338,7 +339,7 @@ def _send_unified_assignment_email(
             bcc=filt_bcc or None,
         )
         msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=_fail_silently())
+        send_message(msg, fail_silently=_fail_silently())
         logger.info(
             "Sent assignment email to %s (%s)%s",
             ", ".join(filt_to or []),
@@ -401,7 +402,7 @@ def send_html_email(
             bcc=filt_bcc or None,
         )
         msg.attach_alternative(html_message, "text/html")
-        msg.send(fail_silently=effective_fail_silently)
+        send_message(msg, fail_silently=effective_fail_silently)
 
         logger.info("Sent HTML email to %d recipient(s): %s", len(filt_to or []), subject)
     except Exception as e:
@@ -1122,7 +1123,7 @@ def send_welcome_email(*, user: User, raw_password: Optional[str] = None) -> Non
             to=to_list,
         )
         msg.attach_alternative(html_body, "text/html")
-        msg.send(fail_silently=_fail_silently())
+        send_message(msg, fail_silently=_fail_silently())
         logger.info("Welcome email sent to %s", ", ".join(to_list))
     except Exception as e:
         logger.error("Failed to send welcome email to %s: %s", ", ".join(to_list), e)
@@ -0,0 +1,117 @@
+# apps/tasks/management/commands/reconcile_holiday.py
+from __future__ import annotations
+
+import json
+import logging
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.services.auto_assign import (
+    reconcile_holiday_added,
+    reconcile_holiday_removed,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Reconcile task occurrences with one Holiday Master date.
+
+    The Holiday save/delete hooks already queue this automatically; the
+    command is for previews (--dry-run) and for re-running a date by hand.
+
+    - default: the date is a holiday; pending checklists / delegations on it
+      are moved to the next working day (Daily checklists are skipped) and
+      recurring series are advanced past it;
+    - --removed: undo the moves recorded for the date.
+    """
+
+    help = (
+        "Move or restore task occurrences for a holiday date. "
+        "Use --dry-run to print the report without writing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            required=True,
+            help="Holiday date (YYYY-MM-DD).",
+        )
+
+        parser.add_argument(
+            "--removed",
+            action="store_true",
+            help="The holiday was removed: restore the recorded moves.",
+        )
+
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without writing.",
+        )
+
+        parser.add_argument(
+            "--show-details",
+            action="store_true",
+            help="Print one JSON line per change (first 50).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            holiday_date = date.fromisoformat(str(options["date"]))
+        except ValueError as exc:
+            raise CommandError("--date must be YYYY-MM-DD.") from exc
+
+        dry_run = bool(options.get("dry_run"))
+        removed = bool(options.get("removed"))
+
+        self.stdout.write("")
+        self.stdout.write(self.style.MIGRATE_HEADING("Holiday reconciliation"))
+        self.stdout.write(f"Mode        : {'DRY-RUN' if dry_run else 'APPLY'}")
+        self.stdout.write(f"Holiday     : {holiday_date.isoformat()} ({'removed' if removed else 'added'})")
+        self.stdout.write("")
+
+        try:
+            if removed:
+                report = reconcile_holiday_removed(holiday_date, dry_run=dry_run)
+            else:
+                report = reconcile_holiday_added(holiday_date, dry_run=dry_run)
+
+        except Exception as exc:
+            logger.exception(
+                "reconcile_holiday failed: date=%s removed=%s dry_run=%s",
+                holiday_date,
+                removed,
+                dry_run,
+            )
+
+            raise CommandError(
+                f"Holiday reconciliation failed: {type(exc).__name__}: {exc}"
+            ) from exc
+
+        if options.get("show_details"):
+            for change in report.changes:
+                self.stdout.write(json.dumps(change, default=str, sort_keys=True))
+            self.stdout.write("")
+
+        self.stdout.write("Summary")
+        self.stdout.write("-" * 72)
+
+        if report.reason:
+            self.stdout.write(self.style.WARNING(f"Nothing to do: {report.reason}"))
+            return
+
+        if report.target_date:
+            self.stdout.write(f"Moved to       : {report.target_date.isoformat()}")
+
+        for key in sorted(report.counts):
+            self.stdout.write(f"{key:<22}: {report.counts[key]}")
+
+        if not report.counts:
+            self.stdout.write("No affected tasks.")
+
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-16 19:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0041_delegation_delete_reason_delegation_deleted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HolidayShift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('holiday_date', models.DateField()),
+                ('kind', models.CharField(choices=[('checklist', 'Checklist'), ('delegation', 'Delegation'), ('series', 'Recurring series')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('shifted', 'Shifted'), ('skipped', 'Skipped')], max_length=10)),
+                ('original_value', models.DateTimeField()),
+                ('new_value', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reverted_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['holiday_date', 'reverted_at'], name='tasks_holid_holiday_f5924d_idx'), models.Index(fields=['kind', 'object_id'], name='tasks_holid_kind_b43747_idx')],
+            },
+        ),
+    ]
@@ -29,7 +29,7 @@ def is_holiday_or_sunday(date_val):
 
     return (
         hasattr(date_val, "weekday") and date_val.weekday() == 6
-    ) or Holiday.objects.filter(date=date_val).exists()
+    ) or Holiday.is_holiday(date_val)
 
 
 def _validate_non_working_day(planned_value, *, label: str = "task") -> None:
@@ -829,6 +829,50 @@ class BulkUpload(models.Model):
         return f"{self.get_form_type_display()} upload @ {self.uploaded_at:%Y-%m-%d}"
 
 
+# ---------------------------------------------------------------------------
+# Holiday reconciliation log
+# ---------------------------------------------------------------------------
+
+class HolidayShift(models.Model):
+    """
+    One change made by holiday reconciliation
+    (apps.tasks.services.auto_assign), kept so that removing the holiday can
+    put the row back where it was.
+    """
+
+    KIND_CHOICES = [
+        ("checklist", "Checklist"),
+        ("delegation", "Delegation"),
+        ("series", "Recurring series"),
+    ]
+    ACTION_CHOICES = [
+        ("shifted", "Shifted"),
+        ("skipped", "Skipped"),
+    ]
+
+    holiday_date = models.DateField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+
+    # planned_date (tasks) or next_run_at (series) before / after the change;
+    # new_value is empty for skipped occurrences.
+    original_value = models.DateTimeField()
+    new_value = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    reverted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["holiday_date", "reverted_at"]),
+            models.Index(fields=["kind", "object_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.holiday_date}: {self.kind} #{self.object_id} {self.action}"
+
+
 # ---------------------------------------------------------------------------
 # FMS
 # ---------------------------------------------------------------------------
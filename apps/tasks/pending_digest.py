@@ -16,12 +16,14 @@ from django.utils import timezone
 
 from .models import Checklist, Delegation, HelpTicket
 from .utils import (
+    build_html_email,
     send_html_email,
     _fmt_dt_date,
     _safe_console_text,
     _dedupe_emails,
 )
 
+from apps.common.mail_pipeline import MailPipeline
 from apps.tasks.services.holiday_guard import get_holiday_status
 
 # ---------------------------------------------------------------------------
@@ -110,12 +112,12 @@ def _is_sunday_ist(value: date) -> bool:
 
 def _is_holiday_ist(value: date) -> bool:
     """
-    Uses Holiday model if available. If unavailable, holidays are ignored.
+    Uses the shared holiday calendar. If unavailable, holidays are ignored.
     Sundays are handled separately.
     """
     try:
-        from apps.settings.models import Holiday  # type: ignore
-        return Holiday.objects.filter(date=value).exists()
+        from apps.settings.holiday_calendar import get_holiday_calendar
+        return get_holiday_calendar(value).is_holiday(value)
     except Exception:
         return False
 
@@ -238,30 +240,21 @@ def _sort_rows_for_admin(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
 # ---------------------------------------------------------------------------
 # Leave-aware guard
 # ---------------------------------------------------------------------------
-def _is_on_leave_today(user) -> bool:
+def _on_leave_user_ids(today: date, user_ids=None) -> set:
     """
-    Returns True if the user is blocked/on leave today in IST.
+    Returns the IDs of users blocked/on leave on the given IST date.
 
-    The function tries the central blocking utility first, then falls back to
-    LeaveRequest.is_user_blocked_on if available.
+    One LeaveRequest query for everyone, using the same rules as
+    apps.tasks.utils.blocking.is_user_blocked.
     """
-    today = _today_ist()
-
-    try:
-        from apps.tasks.utils.blocking import is_user_blocked  # type: ignore
-        return bool(is_user_blocked(user, today))
-    except Exception:
-        pass
-
     try:
-        from apps.leave.models import LeaveRequest  # type: ignore
-        checker = getattr(LeaveRequest, "is_user_blocked_on", None)
-        if callable(checker):
-            return bool(checker(user, today))
+        from apps.tasks.utils.blocking import blocked_user_ids  # type: ignore
+        return set(blocked_user_ids(today, user_ids))
     except Exception:
-        pass
-
-    return False
+        logger.exception(
+            _safe_console_text("[PENDING DIGEST] Bulk leave lookup failed")
+        )
+        return set()
 
 
 # ---------------------------------------------------------------------------
@@ -301,28 +294,6 @@ def _planned_date_to_ist_date(value) -> Optional[date]:
     return None
 
 
-def _include_only_past_and_today(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Keeps only rows where planned_date <= today IST.
-
-    Rows with no planned date are excluded to prevent future/unknown items from
-    appearing in the pending digest.
-    """
-    today = _today_ist()
-    output: List[Dict[str, Any]] = []
-
-    for row in rows:
-        planned_date = _planned_date_to_ist_date(row.get("_planned_date_raw"))
-
-        if planned_date is None:
-            continue
-
-        if planned_date <= today:
-            output.append(row)
-
-    return output
-
-
 # ---------------------------------------------------------------------------
 # Idempotency keys
 # ---------------------------------------------------------------------------
@@ -353,9 +324,67 @@ def _try_claim(key: str, ttl: int) -> bool:
 # ---------------------------------------------------------------------------
 # Row builders
 # ---------------------------------------------------------------------------
-def _rows_for_user(user) -> List[Dict[str, Any]]:
+SNAPSHOT_TTL = int(getattr(settings, "PENDING_DIGEST_SNAPSHOT_TTL", 600))
+
+
+def _snapshot_key(day_iso: str) -> str:
+    return f"pending_digest:snapshot:{day_iso}"
+
+
+def _checklist_row(obj) -> Dict[str, Any]:
+    title = _safe_str(getattr(obj, "task_name", ""), "")
+    description = _safe_str(getattr(obj, "message", ""), "")
+    title_description = title if not description else f"{title} - {description}"
+
+    return Row(
+        task_id=f"CL-{obj.id}",
+        task_title=title_description,
+        assigned_to=_display_user(getattr(obj, "assign_to", None)),
+        assigned_by=_display_user(getattr(obj, "assign_by", None)),
+        due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
+        task_type="Checklist",
+        status="Pending",
+    ).__dict__
+
+
+def _delegation_row(obj) -> Dict[str, Any]:
+    title = _safe_str(getattr(obj, "task_name", ""), "")
+    description = (
+        _safe_str(getattr(obj, "message", ""), "")
+        or _safe_str(getattr(obj, "description", ""), "")
+    )
+    title_description = title if not description else f"{title} - {description}"
+
+    return Row(
+        task_id=f"DL-{obj.id}",
+        task_title=title_description,
+        assigned_to=_display_user(getattr(obj, "assign_to", None)),
+        assigned_by=_display_user(getattr(obj, "assign_by", None)),
+        due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
+        task_type="Delegation",
+        status="Pending",
+    ).__dict__
+
+
+def _help_ticket_row(obj) -> Dict[str, Any]:
+    title = _safe_str(getattr(obj, "title", ""), "")
+    description = _safe_str(getattr(obj, "description", ""), "")
+    title_description = title if not description else f"{title} - {description}"
+
+    return Row(
+        task_id=f"HT-{obj.id}",
+        task_title=title_description,
+        assigned_to=_display_user(getattr(obj, "assign_to", None)),
+        assigned_by=_display_user(getattr(obj, "assign_by", None)),
+        due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
+        task_type="Help Ticket",
+        status=_safe_str(getattr(obj, "status", "Pending"), "Pending"),
+    ).__dict__
+
+
+def _pending_sources(today: date):
     """
-    Builds pending task rows for one employee.
+    (label, queryset, row builder) for every pending-task source.
 
     Includes:
     - Checklist with status Pending
@@ -363,261 +392,150 @@ def _rows_for_user(user) -> List[Dict[str, Any]]:
     - HelpTicket where status is not Closed
 
     Excludes:
-    - future planned_date rows
+    - future planned_date rows (planned_date in IST after today)
     - rows skipped due to leave if model has is_skipped_due_to_leave
     """
-    rows: List[Dict[str, Any]] = []
+    tomorrow_start = IST.localize(
+        datetime.combine(today + timedelta(days=1), datetime.min.time())
+    )
 
-    # Checklist
-    try:
-        qs = Checklist.objects.filter(status="Pending", assign_to=user)
+    checklist_qs = _exclude_inactive_checklists(
+        Checklist.objects.filter(status="Pending")
+    )
 
-        qs = _exclude_inactive_checklists(qs)
+    delegation_qs = Delegation.objects.filter(status="Pending")
+    if _model_has_field(Delegation, "is_skipped_due_to_leave"):
+        delegation_qs = delegation_qs.filter(is_skipped_due_to_leave=False)
 
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
+    help_ticket_qs = HelpTicket.objects.exclude(status="Closed")
+    if _model_has_field(HelpTicket, "is_skipped_due_to_leave"):
+        help_ticket_qs = help_ticket_qs.filter(is_skipped_due_to_leave=False)
 
-        for obj in qs:
-            title = _safe_str(getattr(obj, "task_name", ""), "")
-            description = _safe_str(getattr(obj, "message", ""), "")
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"CL-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Checklist",
-                    status="Pending",
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
-            )
+    sources = (
+        ("Checklist", checklist_qs, _checklist_row),
+        ("Delegation", delegation_qs, _delegation_row),
+        ("HelpTicket", help_ticket_qs, _help_ticket_row),
+    )
 
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(
-                f"[PENDING DIGEST] Checklist fetch failed for user_id={getattr(user, 'id', '?')}: {exc}"
-            )
+    return [
+        (
+            label,
+            qs.filter(planned_date__lt=tomorrow_start)
+            .select_related("assign_to", "assign_by")
+            .order_by("planned_date", "id"),
+            builder,
         )
+        for label, qs, builder in sources
+    ]
 
-    # Delegation
-    try:
-        qs = Delegation.objects.filter(status="Pending", assign_to=user)
 
-        if _model_has_field(Delegation, "is_skipped_due_to_leave"):
-            qs = qs.filter(is_skipped_due_to_leave=False)
-
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
+@dataclass
+class PendingSnapshot:
+    """
+    Pending rows for every employee, grouped by assign_to_id, plus the set
+    of users on leave. Built once and shared by the employee and admin
+    digests.
+    """
+    day: date
+    rows_by_user: Dict[int, List[Dict[str, Any]]]
+    on_leave_ids: set
+
+    def rows_for_user(self, user_id: int) -> List[Dict[str, Any]]:
+        rows = [dict(row) for row in self.rows_by_user.get(user_id, ())]
+        return _sort_rows_for_employee(rows)
+
+    def all_rows(self) -> List[Dict[str, Any]]:
+        rows = [
+            dict(row)
+            for user_rows in self.rows_by_user.values()
+            for row in user_rows
+        ]
+        return _sort_rows_for_admin(rows)
 
-        for obj in qs:
-            title = _safe_str(getattr(obj, "task_name", ""), "")
-            description = (
-                _safe_str(getattr(obj, "message", ""), "")
-                or _safe_str(getattr(obj, "description", ""), "")
-            )
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"DL-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Delegation",
-                    status="Pending",
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
-            )
 
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(
-                f"[PENDING DIGEST] Delegation fetch failed for user_id={getattr(user, 'id', '?')}: {exc}"
-            )
-        )
-
-    # Help Ticket
-    try:
-        qs = HelpTicket.objects.exclude(status="Closed").filter(assign_to=user)
+def build_pending_snapshot(
+    today: Optional[date] = None,
+    user_ids=None,
+) -> PendingSnapshot:
+    """
+    Fetches all pending rows and on-leave users in a constant number of
+    queries (one per source + one for leave), grouped by assign_to_id.
+    """
+    today = today or _today_ist()
+    rows_by_user: Dict[int, List[Dict[str, Any]]] = {}
 
-        if _model_has_field(HelpTicket, "is_skipped_due_to_leave"):
-            qs = qs.filter(is_skipped_due_to_leave=False)
+    for label, qs, builder in _pending_sources(today):
+        if user_ids is not None:
+            qs = qs.filter(assign_to_id__in=list(user_ids))
 
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
+        try:
+            for obj in qs:
+                planned_date = _planned_date_to_ist_date(
+                    getattr(obj, "planned_date", None)
+                )
+                if planned_date is None or planned_date > today:
+                    continue
 
-        for obj in qs:
-            title = _safe_str(getattr(obj, "title", ""), "")
-            description = _safe_str(getattr(obj, "description", ""), "")
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"HT-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Help Ticket",
-                    status=_safe_str(getattr(obj, "status", "Pending"), "Pending"),
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
-            )
+                rows_by_user.setdefault(obj.assign_to_id, []).append(
+                    _normalise_row(builder(obj))
+                )
 
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(
-                f"[PENDING DIGEST] HelpTicket fetch failed for user_id={getattr(user, 'id', '?')}: {exc}"
+        except Exception as exc:
+            logger.error(
+                _safe_console_text(f"[PENDING DIGEST] {label} fetch failed: {exc}")
             )
-        )
-
-    filtered_rows = _include_only_past_and_today(rows)
 
-    for row in filtered_rows:
-        row.pop("_planned_date_raw", None)
-
-    filtered_rows = [_normalise_row(row) for row in filtered_rows]
-    return _sort_rows_for_employee(filtered_rows)
+    return PendingSnapshot(
+        day=today,
+        rows_by_user=rows_by_user,
+        on_leave_ids=_on_leave_user_ids(today, user_ids),
+    )
 
 
-def _rows_for_all_users() -> List[Dict[str, Any]]:
+def _get_pending_snapshot(today: date) -> PendingSnapshot:
     """
-    Builds pending task rows for all employees.
-
-    Used by admin consolidated digest.
+    Returns today's all-employee snapshot, reusing the cached copy when the
+    employee and admin digests run back to back.
     """
-    rows: List[Dict[str, Any]] = []
+    key = _snapshot_key(today.isoformat())
 
-    # Checklist
     try:
-        qs = Checklist.objects.filter(status="Pending")
-
-        qs = _exclude_inactive_checklists(qs)
-
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
-
-        for obj in qs:
-            title = _safe_str(getattr(obj, "task_name", ""), "")
-            description = _safe_str(getattr(obj, "message", ""), "")
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"CL-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Checklist",
-                    status="Pending",
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
-            )
+        cached = cache.get(key)
+        if isinstance(cached, PendingSnapshot) and cached.day == today:
+            return cached
+    except Exception:
+        pass
 
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(f"[ADMIN DIGEST] Checklist fetch failed: {exc}")
-        )
+    snapshot = build_pending_snapshot(today)
 
-    # Delegation
     try:
-        qs = Delegation.objects.filter(status="Pending")
-
-        if _model_has_field(Delegation, "is_skipped_due_to_leave"):
-            qs = qs.filter(is_skipped_due_to_leave=False)
-
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
-
-        for obj in qs:
-            title = _safe_str(getattr(obj, "task_name", ""), "")
-            description = (
-                _safe_str(getattr(obj, "message", ""), "")
-                or _safe_str(getattr(obj, "description", ""), "")
-            )
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"DL-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Delegation",
-                    status="Pending",
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
+        cache.set(key, snapshot, SNAPSHOT_TTL)
+    except Exception:
+        logger.warning(
+            _safe_console_text(
+                f"[PENDING DIGEST] Snapshot cache write failed for key={key}"
             )
-
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(f"[ADMIN DIGEST] Delegation fetch failed: {exc}")
         )
 
-    # Help Ticket
-    try:
-        qs = HelpTicket.objects.exclude(status="Closed")
-
-        if _model_has_field(HelpTicket, "is_skipped_due_to_leave"):
-            qs = qs.filter(is_skipped_due_to_leave=False)
-
-        qs = qs.select_related("assign_to", "assign_by").order_by(
-            "planned_date",
-            "id",
-        )
+    return snapshot
 
-        for obj in qs:
-            title = _safe_str(getattr(obj, "title", ""), "")
-            description = _safe_str(getattr(obj, "description", ""), "")
-            title_description = title if not description else f"{title} - {description}"
-
-            rows.append(
-                Row(
-                    task_id=f"HT-{obj.id}",
-                    task_title=title_description,
-                    assigned_to=_display_user(getattr(obj, "assign_to", None)),
-                    assigned_by=_display_user(getattr(obj, "assign_by", None)),
-                    due_date=_fmt_dt_date(getattr(obj, "planned_date", None)),
-                    task_type="Help Ticket",
-                    status=_safe_str(getattr(obj, "status", "Pending"), "Pending"),
-                ).__dict__ | {
-                    "_planned_date_raw": getattr(obj, "planned_date", None),
-                }
-            )
 
-    except Exception as exc:
-        logger.error(
-            _safe_console_text(f"[ADMIN DIGEST] HelpTicket fetch failed: {exc}")
-        )
+def _rows_for_user(user) -> List[Dict[str, Any]]:
+    """
+    Builds pending task rows for one employee.
+    """
+    user_id = int(getattr(user, "id", 0) or 0)
+    snapshot = build_pending_snapshot(user_ids=[user_id])
+    return snapshot.rows_for_user(user_id)
 
-    filtered_rows = _include_only_past_and_today(rows)
 
-    for row in filtered_rows:
-        row.pop("_planned_date_raw", None)
+def _rows_for_all_users() -> List[Dict[str, Any]]:
+    """
+    Builds pending task rows for all employees.
 
-    filtered_rows = [_normalise_row(row) for row in filtered_rows]
-    return _sort_rows_for_admin(filtered_rows)
+    Used by admin consolidated digest.
+    """
+    return _get_pending_snapshot(_today_ist()).all_rows()
 
 
 # ---------------------------------------------------------------------------
@@ -634,6 +552,46 @@ def _email_notifications_enabled() -> bool:
     return True
 
 
+# ---------------------------------------------------------------------------
+# Pipeline callbacks
+# ---------------------------------------------------------------------------
+def _release_claim(claim_key: Optional[str]) -> None:
+    if not claim_key:
+        return
+    try:
+        cache.delete(claim_key)
+    except Exception:
+        pass
+
+
+def _on_digest_sent(outcome: Dict[str, int], user, to_email: str, items: int):
+    def callback() -> None:
+        outcome["sent"] += 1
+        logger.info(
+            _safe_console_text(
+                f"[PENDING DIGEST] Sent employee digest to "
+                f"{to_email} "
+                f"user_id={getattr(user, 'id', '?')} "
+                f"items={items}"
+            )
+        )
+    return callback
+
+
+def _on_digest_failed(outcome: Dict[str, int], user, claim_key: Optional[str]):
+    def callback(exc: Exception) -> None:
+        outcome["failed"] += 1
+        logger.error(
+            _safe_console_text(
+                f"[PENDING DIGEST] Email failure for "
+                f"user_id={getattr(user, 'id', '?')}: {exc}"
+            )
+        )
+        # Do not leave a false "already sent" marker after email failure.
+        _release_claim(claim_key)
+    return callback
+
+
 # ---------------------------------------------------------------------------
 # Employee digest task
 # ---------------------------------------------------------------------------
@@ -717,15 +675,29 @@ def send_daily_employee_pending_digest(
 
     users_qs = users_qs.order_by("id")
 
-    sent = 0
     skipped = 0
     candidates = 0
     ttl = _ttl_until_next_3am_ist(now_ist)
 
+    # Digests are rendered here and sent in batches over one pooled SMTP
+    # connection; outcome is filled in by the pipeline callbacks.
+    pipeline = MailPipeline(label="pending-digest")
+    outcome = {"sent": 0, "failed": 0}
+
+    # One snapshot for the whole run instead of per-user queries. A username
+    # filter builds a narrow snapshot for just the matching users.
+    if username:
+        snapshot = build_pending_snapshot(
+            today,
+            user_ids=list(users_qs.values_list("id", flat=True)),
+        )
+    else:
+        snapshot = _get_pending_snapshot(today)
+
     for user in users_qs.iterator(chunk_size=500):
         candidates += 1
 
-        if _is_on_leave_today(user) and not force:
+        if user.id in snapshot.on_leave_ids and not force:
             skipped += 1
 
             logger.info(
@@ -787,7 +759,7 @@ def send_daily_employee_pending_digest(
                 )
                 continue
 
-        rows = _rows_for_user(user)
+        rows = snapshot.rows_for_user(user.id)
 
         try:
             rows = strip_rows_to_delegations_only_if_pankaj_target(
@@ -860,52 +832,37 @@ def send_daily_employee_pending_digest(
         subject = f"Your Pending Tasks - {day_iso}"
         title = f"Your Pending Tasks ({day_iso})"
 
-        try:
-            send_html_email(
-                subject=subject,
-                template_name=EMPLOYEE_DIGEST_TEMPLATE,
-                context={
-                    "title": title,
-                    "report_date": day_iso,
-                    "total_pending": len(rows),
-                    "has_rows": bool(rows),
-                    "items_table": rows,
-                    "site_url": SITE_URL,
-                    "recipient_name": _display_user(user),
-                    "employee_name": _display_user(user),
-                    "employee_email": _display_user_email(user),
-                },
-                to=filtered_to,
-                fail_silently=False,
-            )
-
-            logger.info(
-                _safe_console_text(
-                    f"[PENDING DIGEST] Sent employee digest to "
-                    f"{filtered_to[0]} "
-                    f"user_id={getattr(user, 'id', '?')} "
-                    f"items={len(rows)}"
-                )
-            )
-
-            sent += 1
+        message = build_html_email(
+            subject=subject,
+            template_name=EMPLOYEE_DIGEST_TEMPLATE,
+            context={
+                "title": title,
+                "report_date": day_iso,
+                "total_pending": len(rows),
+                "has_rows": bool(rows),
+                "items_table": rows,
+                "site_url": SITE_URL,
+                "recipient_name": _display_user(user),
+                "employee_name": _display_user(user),
+                "employee_email": _display_user_email(user),
+            },
+            to=filtered_to,
+        )
 
-        except Exception as exc:
+        if message is None:
             skipped += 1
+            _release_claim(claim_key)
+            continue
 
-            logger.exception(
-                _safe_console_text(
-                    f"[PENDING DIGEST] Email failure for "
-                    f"user_id={getattr(user, 'id', '?')}: {exc}"
-                )
-            )
+        pipeline.add(
+            message,
+            on_sent=_on_digest_sent(outcome, user, filtered_to[0], len(rows)),
+            on_failed=_on_digest_failed(outcome, user, claim_key),
+        )
 
-            # Do not leave a false "already sent" marker after email failure.
-            if claim_key:
-                try:
-                    cache.delete(claim_key)
-                except Exception:
-                    pass
+    pipeline.flush()
+    sent = outcome["sent"]
+    skipped += outcome["failed"]
 
     logger.info(
         _safe_console_text(
@@ -925,6 +882,7 @@ def send_daily_employee_pending_digest(
         "candidates": candidates,
         "scheduler_skipped": False,
         "day": day_iso,
+        "mail": pipeline.stats.as_dict(),
     }
 
 
@@ -1048,7 +1006,7 @@ def send_admin_all_pending_digest(
                 "day": day_iso,
             }
 
-    rows = _rows_for_all_users()
+    rows = _get_pending_snapshot(today).all_rows()
 
     try:
         rows = strip_rows_to_delegations_only_if_pankaj_target(
@@ -59,14 +59,6 @@ def _from_ist(dt: datetime) -> datetime:
     return dt.astimezone(timezone.get_current_timezone())
 
 
-def _holiday_model():
-    try:
-        from apps.settings.models import Holiday  # type: ignore
-        return Holiday
-    except Exception:
-        return None
-
-
 def normalize_mode(mode: Optional[str]) -> str:
     if not mode:
         return ""
@@ -88,18 +80,21 @@ def is_working_day(d: date) -> bool:
     but core "next planned" functions DO NOT shift automatically.
     """
     try:
-        if d.weekday() == 6:  # Sunday
-            return False
-        Holiday = _holiday_model()
-        if Holiday is None:
-            return True
-        return not Holiday.objects.filter(date=d).exists()
+        from apps.settings.holiday_calendar import get_holiday_calendar
+
+        return get_holiday_calendar(d).is_working_day(d)
     except Exception as e:
         logger.debug("is_working_day fallback due to error: %s", e)
         return d.weekday() != 6
 
 
 def next_working_day(d: date) -> date:
+    try:
+        from apps.settings.holiday_calendar import get_holiday_calendar
+
+        return get_holiday_calendar(d).next_working_day(d)
+    except Exception as e:
+        logger.debug("next_working_day fallback due to error: %s", e)
     tries = 0
     while not is_working_day(d) and tries < 31:
         d += timedelta(days=1)
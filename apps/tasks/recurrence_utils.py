@@ -52,27 +52,29 @@ def pin_7pm_ist_on_date(d: date) -> datetime:
     return _from_ist(fixed_ist)
 
 
+def pin_7pm_ist(dt: datetime) -> datetime:
+    """
+    Checklist / Delegation planned datetime rule: 19:00 IST on the IST date
+    of `dt` (naive values are taken in the project timezone). Applied on
+    save by the tasks pre_save receivers and by writers that bypass save().
+    """
+    return pin_7pm_ist_on_date(_to_ist(dt).date())
+
+
 # -----------------------------
 # Working-day helpers
 # NOTE: recurrence stepping functions below do NOT shift automatically.
 # Shifting is performed by call-sites (signals/materializers) to avoid double shifts.
 # -----------------------------
-def _lazy_holiday_model():
-    try:
-        from apps.settings.models import Holiday  # type: ignore
-        return Holiday
-    except Exception:
-        return None
-
-
 def is_working_day(d: date) -> bool:
     # Sunday == 6
     if d.weekday() == 6:
         return False
-    Holiday = _lazy_holiday_model()
-    if Holiday is None:
+    try:
+        from apps.settings.holiday_calendar import get_holiday_calendar
+    except Exception:
         return True
-    return not Holiday.objects.filter(date=d).exists()
+    return get_holiday_calendar(d).is_working_day(d)
 
 
 def next_working_day(d: date) -> date:
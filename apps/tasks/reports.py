@@ -1,16 +1,16 @@
 # E:\CLIENT PROJECT\employee management system bos\employee_management_system\apps\tasks\reports.py
 from __future__ import annotations
 
-import csv
-import io
 from dataclasses import dataclass
 from datetime import datetime, date, time as dt_time, timedelta
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.db.models import Q
 
+from apps.common.exports import csv_response, keyset_rows
+
 from .models import Checklist
 from .recurrence_utils import RECURRING_MODES, IST
 
@@ -105,34 +105,30 @@ def _status_filtered_queryset(query: RecurringReportQuery):
 # -----------------------------
 # Public API
 # -----------------------------
-def generate_recurring_report(query: RecurringReportQuery) -> List[dict]:
+def iter_recurring_report(query: RecurringReportQuery) -> Iterator[dict]:
     """
-    Build a list of rows for the recurring tasks report.
-
-    Columns:
-      id, task_name, assign_to, planned_date, planned_date_ist, status,
-      completed_at, completed_at_ist, delay_minutes, category
-        - category ∈ {"Completed", "Missed", "Pending"}
-
-    Delay:
-      - Completed → minutes between completed_at and planned_date (>= 0)
-      - Missed    → minutes between now and planned_date
-      - Pending   → 0 if planned_date > now, else minutes between now and planned_date
-                    (but since pending = planned_date >= now, it will be 0)
+    Yield the recurring report rows (see generate_recurring_report) from
+    keyset pages of values() rows, without loading the whole report.
     """
-    qs = _status_filtered_queryset(query).order_by("planned_date", "id")
-
-    rows: List[dict] = []
+    rows = keyset_rows(
+        _status_filtered_queryset(query),
+        [
+            "id", "task_name", "group_name", "planned_date", "status",
+            "completed_at", "priority", "mode", "frequency",
+            "assign_to_id", "assign_to__first_name", "assign_to__last_name", "assign_to__username",
+        ],
+        order_by=("planned_date", "id"),
+    )
     now = _now()
 
-    for obj in qs:
-        planned_dt = obj.planned_date
+    for obj in rows:
+        planned_dt = obj["planned_date"]
         planned_ist = planned_dt.astimezone(IST) if planned_dt else None
 
-        comp_dt = obj.completed_at
+        comp_dt = obj["completed_at"]
         comp_ist = comp_dt.astimezone(IST) if comp_dt else None
 
-        if obj.status == "Completed":
+        if obj["status"] == "Completed":
             category = "Completed"
             delay_mins = _minutes_between(comp_dt, planned_dt)
         else:
@@ -144,65 +140,78 @@ def generate_recurring_report(query: RecurringReportQuery) -> List[dict]:
                 category = "Pending"
                 delay_mins = 0
 
-        rows.append({
-            "id": obj.id,
-            "task_name": obj.task_name,
-            "assign_to": (obj.assign_to.get_full_name() or obj.assign_to.username) if obj.assign_to_id else "",
-            "group_name": obj.group_name or "",
+        full_name = f"{obj['assign_to__first_name']} {obj['assign_to__last_name']}".strip()
+
+        yield {
+            "id": obj["id"],
+            "task_name": obj["task_name"],
+            "assign_to": (full_name or obj["assign_to__username"]) if obj["assign_to_id"] else "",
+            "group_name": obj["group_name"] or "",
             "planned_date": planned_dt,
             "planned_date_ist": planned_ist,
-            "status": obj.status,
+            "status": obj["status"],
             "completed_at": comp_dt,
             "completed_at_ist": comp_ist,
             "delay_minutes": delay_mins,
             "category": category,
-            "priority": obj.priority,
-            "mode": obj.mode,
-            "frequency": obj.frequency,
-        })
-
-    return rows
+            "priority": obj["priority"],
+            "mode": obj["mode"],
+            "frequency": obj["frequency"],
+        }
 
 
-def export_recurring_report_csv(query: RecurringReportQuery) -> HttpResponse:
+def generate_recurring_report(query: RecurringReportQuery) -> List[dict]:
     """
-    Return an HttpResponse with CSV attachment for the recurring report.
+    Build a list of rows for the recurring tasks report.
+
+    Columns:
+      id, task_name, assign_to, planned_date, planned_date_ist, status,
+      completed_at, completed_at_ist, delay_minutes, category
+        - category ∈ {"Completed", "Missed", "Pending"}
+
+    Delay:
+      - Completed → minutes between completed_at and planned_date (>= 0)
+      - Missed    → minutes between now and planned_date
+      - Pending   → 0 if planned_date > now, else minutes between now and planned_date
+                    (but since pending = planned_date >= now, it will be 0)
     """
-    rows = generate_recurring_report(query)
-    out = io.StringIO()
-    w = csv.writer(out)
-    w.writerow([
-        "ID", "Task Name", "Assign To", "Group", "Priority",
-        "Mode", "Frequency",
-        "Planned Date (Project TZ)", "Planned Date (IST)",
-        "Status", "Completed At (Project TZ)", "Completed At (IST)",
-        "Category", "Delay (minutes)"
-    ])
+    return list(iter_recurring_report(query))
+
 
+def export_recurring_report_csv(query: RecurringReportQuery) -> StreamingHttpResponse:
+    """
+    Return a streaming CSV attachment for the recurring report.
+    """
     def fmt(dt: Optional[datetime]) -> str:
         return dt.strftime("%Y-%m-%d %H:%M") if dt else ""
 
-    for r in rows:
-        w.writerow([
-            r["id"],
-            r["task_name"],
-            r["assign_to"],
-            r["group_name"],
-            r["priority"],
-            r["mode"] or "",
-            r["frequency"] or "",
-            fmt(r["planned_date"]),
-            fmt(r["planned_date_ist"]),
-            r["status"],
-            fmt(r["completed_at"]),
-            fmt(r["completed_at_ist"]),
-            r["category"],
-            r["delay_minutes"],
-        ])
-
-    data = out.getvalue()
-    out.close()
-
-    resp = HttpResponse(data, content_type="text/csv; charset=utf-8")
-    resp["Content-Disposition"] = 'attachment; filename="recurring_tasks_report.csv"'
-    return resp
+    def _rows():
+        for r in iter_recurring_report(query):
+            yield [
+                r["id"],
+                r["task_name"],
+                r["assign_to"],
+                r["group_name"],
+                r["priority"],
+                r["mode"] or "",
+                r["frequency"] or "",
+                fmt(r["planned_date"]),
+                fmt(r["planned_date_ist"]),
+                r["status"],
+                fmt(r["completed_at"]),
+                fmt(r["completed_at_ist"]),
+                r["category"],
+                r["delay_minutes"],
+            ]
+
+    return csv_response(
+        "recurring_tasks_report.csv",
+        [
+            "ID", "Task Name", "Assign To", "Group", "Priority",
+            "Mode", "Frequency",
+            "Planned Date (Project TZ)", "Planned Date (IST)",
+            "Status", "Completed At (Project TZ)", "Completed At (IST)",
+            "Category", "Delay (minutes)"
+        ],
+        _rows(),
+    )
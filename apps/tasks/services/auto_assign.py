@@ -0,0 +1,484 @@
+# apps/tasks/services/auto_assign.py
+"""
+Holiday reconciliation.
+
+apps.settings.models calls handle_holiday_added / handle_holiday_removed on
+every Holiday save / delete (and for bulk uploads), and handle_holiday_moved
+when a holiday's date is edited. They queue reconcile_holiday (Celery) after
+commit; the worker then:
+
+Holiday added on date H (today or later):
+  - Daily checklist occurrences planned on H are skipped (is_active=False,
+    skip_reason="holiday"), the next day already has its own occurrence;
+  - other pending checklist occurrences and delegations on H move to the next
+    working day, same IST wall-clock time;
+  - recurring series whose next_run_at falls on H are advanced along their own
+    recurrence until a working day, exactly as the generator would, so the
+    schedule never drifts.
+
+Holiday removed:
+  - every change logged in HolidayShift for H is reverted, as long as the row
+    has not been edited since.
+
+Holiday moved from H to H2:
+  - "removed" for H, then "added" for H2, in that order in one task run.
+
+The affected rows are found with one query per model and written in batches
+of HOLIDAY_RECONCILE_BATCH_SIZE with one UPDATE per distinct (old, new)
+value, so a company-wide holiday is a handful of statements per batch.
+Working days are read straight from the Holiday table (load_holiday_calendar),
+never from the shared calendar cache, which may not have caught up with the
+change being reconciled yet. Both directions support dry_run, which returns
+the same report without writing.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.settings.holiday_calendar import HolidayCalendar, load_holiday_calendar
+from apps.tasks.models import Checklist, ChecklistRecurringSeries, Delegation, HolidayShift
+from apps.tasks.recurrence_utils import normalize_mode
+from apps.tasks.services.holiday_guard import ist_day_project_bounds, to_ist_date
+from apps.tasks.services.recurring_series import MAX_ADVANCE_STEPS, calculate_next_run
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = max(int(getattr(settings, "HOLIDAY_RECONCILE_BATCH_SIZE", 500)), 1)
+
+# Changes listed individually in a report; counts always cover everything.
+REPORT_SAMPLE_SIZE = 50
+
+HOLIDAY_SKIP_REASON = "holiday"
+
+__all__ = [
+    "HolidayReconciliation",
+    "reconcile_holiday_added",
+    "reconcile_holiday_removed",
+    "handle_holiday_added",
+    "handle_holiday_removed",
+    "handle_holiday_moved",
+]
+
+
+@dataclass(frozen=True)
+class _Change:
+    kind: str
+    object_id: int
+    action: str
+    original_value: datetime
+    new_value: Optional[datetime]
+    assign_to_id: Optional[int] = None
+
+
+@dataclass
+class HolidayReconciliation:
+    holiday_date: date
+    action: str
+    dry_run: bool
+    target_date: Optional[date] = None
+    reason: str = ""
+    counts: dict = field(default_factory=dict)
+    changes: List[dict] = field(default_factory=list)
+    affected_user_ids: List[int] = field(default_factory=list)
+
+    def record(self, change: _Change, counted: str) -> None:
+        self.counts[counted] = self.counts.get(counted, 0) + 1
+        if len(self.changes) < REPORT_SAMPLE_SIZE:
+            self.changes.append({
+                "kind": change.kind,
+                "id": change.object_id,
+                "action": counted,
+                "from": change.original_value.isoformat(),
+                "to": change.new_value.isoformat() if change.new_value else None,
+            })
+
+    def as_dict(self) -> dict:
+        return {
+            "holiday_date": self.holiday_date.isoformat(),
+            "action": self.action,
+            "dry_run": self.dry_run,
+            "target_date": self.target_date.isoformat() if self.target_date else None,
+            "reason": self.reason,
+            "counts": dict(self.counts),
+            "changes": list(self.changes),
+            "affected_users": len(self.affected_user_ids),
+        }
+
+
+def _chunks(items: list, size: int = BATCH_SIZE) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _same_time_on(value: datetime, target: date) -> datetime:
+    """value moved to `target`, keeping its IST wall-clock time."""
+    local = timezone.localtime(value)
+    return timezone.make_aware(datetime.combine(target, local.time().replace(tzinfo=None)))
+
+
+def _calendar(holiday_date: date) -> HolidayCalendar:
+    # Covers the holiday's year and the two following, enough for any next
+    # working day or series step.
+    return load_holiday_calendar(holiday_date)
+
+
+# ---------------------------------------------------------------------------
+# Planning (read-only)
+# ---------------------------------------------------------------------------
+
+def _advance_series(series: ChecklistRecurringSeries, calendar: HolidayCalendar) -> Optional[datetime]:
+    """
+    Next recurrence step of `series` after next_run_at that lands on a working
+    day, or None when the recurrence ends first.
+    """
+    candidate = series.next_run_at
+    for _ in range(MAX_ADVANCE_STEPS):
+        candidate = calculate_next_run(series, candidate)
+        if candidate is None:
+            return None
+        if calendar.is_working_day(timezone.localtime(candidate).date()):
+            return candidate
+    return None
+
+
+def _plan_added(holiday_date: date, target: date, calendar: HolidayCalendar) -> List[_Change]:
+    start, end = ist_day_project_bounds(holiday_date)
+    changes: List[_Change] = []
+
+    checklist_rows = (
+        Checklist.objects
+        .filter(planned_date__range=(start, end), status="Pending", is_deleted=False, is_active=True)
+        .values_list("id", "assign_to_id", "planned_date", "mode")
+    )
+    for pk, user_id, planned, mode in checklist_rows:
+        if normalize_mode(mode) == "Daily":
+            changes.append(_Change("checklist", pk, "skipped", planned, None, user_id))
+        else:
+            changes.append(_Change("checklist", pk, "shifted", planned, _same_time_on(planned, target), user_id))
+
+    delegation_rows = (
+        Delegation.objects
+        .filter(planned_date__range=(start, end), status="Pending", is_deleted=False, is_active=True)
+        .values_list("id", "assign_to_id", "planned_date")
+    )
+    for pk, user_id, planned in delegation_rows:
+        changes.append(_Change("delegation", pk, "shifted", planned, _same_time_on(planned, target), user_id))
+
+    series_qs = ChecklistRecurringSeries.objects.filter(
+        next_run_at__range=(start, end),
+        is_active=True,
+        is_deleted=False,
+    )
+    for series in series_qs:
+        advanced = _advance_series(series, calendar)
+        if advanced is None:
+            # Ends before the next working day: the generator retires it.
+            continue
+        changes.append(_Change("series", series.pk, "shifted", series.next_run_at, advanced, series.assign_to_id))
+
+    return changes
+
+
+def _plan_removed(holiday_date: date) -> List[_Change]:
+    entries = (
+        HolidayShift.objects
+        .filter(holiday_date=holiday_date, reverted_at__isnull=True)
+        .order_by("id")
+        .values_list("kind", "object_id", "action", "original_value", "new_value")
+    )
+    return [_Change(*entry) for entry in entries]
+
+
+# ---------------------------------------------------------------------------
+# Applying (batched)
+# ---------------------------------------------------------------------------
+
+_MODELS = {
+    "checklist": Checklist,
+    "delegation": Delegation,
+    "series": ChecklistRecurringSeries,
+}
+
+_VALUE_FIELD = {
+    "checklist": "planned_date",
+    "delegation": "planned_date",
+    "series": "next_run_at",
+}
+
+
+@dataclass(frozen=True)
+class _Row:
+    value: Optional[datetime]
+    live: bool              # pending / active series, not deleted
+    active: bool
+    skip_reason: str
+    assign_to_id: Optional[int]
+
+
+def _locked_rows(kind: str, ids: List[int]) -> dict:
+    """Lock rows of `kind` and return id -> _Row."""
+    qs = _MODELS[kind].objects.select_for_update().filter(id__in=ids)
+
+    if kind == "series":
+        return {
+            pk: _Row(value, active and not deleted, True, "", user_id)
+            for pk, value, active, deleted, user_id in qs.values_list(
+                "id", "next_run_at", "is_active", "is_deleted", "assign_to_id",
+            )
+        }
+
+    has_skip_reason = kind == "checklist"
+    fields = ["id", "planned_date", "status", "is_deleted", "is_active", "assign_to_id"]
+    if has_skip_reason:
+        fields.append("skip_reason")
+
+    rows = {}
+    for row in qs.values_list(*fields):
+        pk, planned, status, deleted, active, user_id = row[:6]
+        rows[pk] = _Row(
+            planned,
+            status == "Pending" and not deleted,
+            active,
+            row[6] if has_skip_reason else "",
+            user_id,
+        )
+    return rows
+
+
+def _write(kind: str, updates: dict) -> None:
+    """updates: tuple of (field, value) pairs -> ids; one UPDATE per entry."""
+    model = _MODELS[kind]
+    stamp = {"updated_at": timezone.now()} if kind in ("checklist", "series") else {}
+
+    for values, ids in updates.items():
+        model.objects.filter(id__in=ids).update(**dict(values), **stamp)
+
+
+def _by_kind(changes: List[_Change]) -> dict:
+    grouped = defaultdict(list)
+    for change in changes:
+        grouped[change.kind].append(change)
+    return grouped
+
+
+def _apply_added(holiday_date: date, changes: List[_Change], report: HolidayReconciliation) -> None:
+    for kind, kind_changes in _by_kind(changes).items():
+        for chunk in _chunks(kind_changes):
+            with transaction.atomic():
+                rows = _locked_rows(kind, [c.object_id for c in chunk])
+                updates = defaultdict(list)
+                applied = []
+
+                for change in chunk:
+                    row = rows.get(change.object_id)
+                    # Edited, completed or deleted since planning: leave alone.
+                    if row is None or not row.live or not row.active or row.value != change.original_value:
+                        continue
+
+                    if change.action == "skipped":
+                        values = (("is_active", False), ("skip_reason", HOLIDAY_SKIP_REASON))
+                    else:
+                        values = ((_VALUE_FIELD[kind], change.new_value),)
+
+                    updates[values].append(change.object_id)
+                    applied.append(change)
+                    report.record(change, f"{kind}_{change.action}")
+
+                if report.dry_run or not applied:
+                    continue
+
+                _write(kind, updates)
+                HolidayShift.objects.bulk_create([
+                    HolidayShift(
+                        holiday_date=holiday_date,
+                        kind=c.kind,
+                        object_id=c.object_id,
+                        action=c.action,
+                        original_value=c.original_value,
+                        new_value=c.new_value,
+                    )
+                    for c in applied
+                ])
+                report.affected_user_ids.extend(c.assign_to_id for c in applied if c.assign_to_id)
+
+
+def _apply_removed(holiday_date: date, changes: List[_Change], report: HolidayReconciliation) -> None:
+    for kind, kind_changes in _by_kind(changes).items():
+        for chunk in _chunks(kind_changes):
+            with transaction.atomic():
+                rows = _locked_rows(kind, [c.object_id for c in chunk])
+                updates = defaultdict(list)
+                user_ids = []
+
+                for change in chunk:
+                    row = rows.get(change.object_id)
+
+                    if change.action == "skipped":
+                        # Still hidden by reconciliation, not re-activated since.
+                        restorable = row is not None and row.live and not row.active and row.skip_reason == HOLIDAY_SKIP_REASON
+                        values = (("is_active", True), ("skip_reason", ""))
+                    else:
+                        restorable = row is not None and row.live and row.value == change.new_value
+                        values = ((_VALUE_FIELD[kind], change.original_value),)
+
+                    if not restorable:
+                        report.record(change, f"{kind}_unchanged")
+                        continue
+
+                    updates[values].append(change.object_id)
+                    user_ids.append(row.assign_to_id)
+                    report.record(change, f"{kind}_restored")
+
+                if report.dry_run:
+                    continue
+
+                _write(kind, updates)
+                HolidayShift.objects.filter(
+                    holiday_date=holiday_date,
+                    kind=kind,
+                    object_id__in=[c.object_id for c in chunk],
+                    reverted_at__isnull=True,
+                ).update(reverted_at=timezone.now())
+                report.affected_user_ids.extend(uid for uid in user_ids if uid)
+
+
+def _after_reconcile(report: HolidayReconciliation) -> None:
+    """
+    Queryset updates skip the task signals: refresh leave skip flags for moved
+    tasks and drop cached dashboards of everyone affected.
+    """
+    user_ids = sorted(set(report.affected_user_ids))
+    if not user_ids:
+        return
+
+    try:
+        from apps.leave.models import LeaveRequest
+        from apps.leave.services.task_skips import (
+            ACTIVE_TASK_BLOCKING_STATUSES,
+            queue_leave_task_skip_resync,
+        )
+
+        on_leave = (
+            LeaveRequest.objects
+            .filter(employee_id__in=user_ids, status__in=ACTIVE_TASK_BLOCKING_STATUSES)
+            .filter(end_date__gte=min(report.holiday_date, report.target_date or report.holiday_date))
+            .values_list("employee_id", flat=True)
+            .distinct()
+        )
+        for employee_id in on_leave:
+            queue_leave_task_skip_resync(employee_id, reason=f"holiday_{report.action}")
+    except Exception:
+        logger.exception("Leave skip re-sync after holiday reconciliation failed")
+
+    try:
+        from dashboard.payload_cache import invalidate_user_dashboards
+
+        invalidate_user_dashboards(user_ids)
+    except Exception:
+        logger.debug("Dashboard invalidation skipped after holiday reconciliation", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def _coerce_date(value) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return to_ist_date(value)
+
+
+def reconcile_holiday_added(holiday_date, *, dry_run: bool = False) -> HolidayReconciliation:
+    """
+    Move or skip pending work planned on a new holiday. See module docstring.
+    """
+    holiday_date = _coerce_date(holiday_date)
+    report = HolidayReconciliation(holiday_date=holiday_date, action="added", dry_run=dry_run)
+    calendar = _calendar(holiday_date)
+
+    if not calendar.is_holiday(holiday_date):
+        report.reason = "not_a_holiday"
+        return report
+
+    if holiday_date < timezone.localdate():
+        # Overdue work stays where it is; its delay is already on record.
+        report.reason = "past_date"
+        return report
+
+    report.target_date = calendar.next_working_day(holiday_date)
+    _apply_added(holiday_date, _plan_added(holiday_date, report.target_date, calendar), report)
+
+    if not dry_run:
+        _after_reconcile(report)
+
+    logger.info("Holiday reconciliation: %s", report.as_dict())
+    return report
+
+
+def reconcile_holiday_removed(holiday_date, *, dry_run: bool = False) -> HolidayReconciliation:
+    """
+    Undo reconciliation for a holiday that no longer exists. Rows edited
+    since they were moved are left where they are.
+    """
+    holiday_date = _coerce_date(holiday_date)
+    report = HolidayReconciliation(holiday_date=holiday_date, action="removed", dry_run=dry_run)
+
+    if _calendar(holiday_date).is_holiday(holiday_date):
+        report.reason = "still_a_holiday"
+        return report
+
+    if holiday_date < timezone.localdate():
+        report.reason = "past_date"
+        return report
+
+    _apply_removed(holiday_date, _plan_removed(holiday_date), report)
+
+    if not dry_run:
+        _after_reconcile(report)
+
+    logger.info("Holiday reconciliation: %s", report.as_dict())
+    return report
+
+
+def _queue(action: str, holiday_date, previous_date=None) -> None:
+    holiday_iso = _coerce_date(holiday_date).isoformat()
+    previous_iso = _coerce_date(previous_date).isoformat() if previous_date else None
+
+    def _send():
+        try:
+            from apps.tasks.tasks import reconcile_holiday
+
+            reconcile_holiday.delay(holiday_iso, action=action, previous_date=previous_iso)
+        except Exception:
+            logger.exception("Could not queue holiday reconciliation for %s (%s); running inline.", holiday_iso, action)
+            if previous_iso:
+                reconcile_holiday_removed(previous_iso)
+            if action == "added":
+                reconcile_holiday_added(holiday_iso)
+            else:
+                reconcile_holiday_removed(holiday_iso)
+
+    transaction.on_commit(_send)
+
+
+def handle_holiday_added(holiday_date) -> None:
+    """Holiday post_save hook (apps.settings.models)."""
+    _queue("added", holiday_date)
+
+
+def handle_holiday_removed(holiday_date) -> None:
+    """Holiday post_delete hook (apps.settings.models)."""
+    _queue("removed", holiday_date)
+
+
+def handle_holiday_moved(previous_date, holiday_date) -> None:
+    """Holiday post_save hook when an existing holiday's date changed."""
+    _queue("added", holiday_date, previous_date=previous_date)
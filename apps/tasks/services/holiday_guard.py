@@ -9,7 +9,7 @@ import pytz
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 
-from apps.settings.models import Holiday
+from apps.settings.holiday_calendar import get_holiday_calendar
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +29,7 @@ def get_holiday_status(
     value: Optional[datetime | date] = None,
 ) -> HolidayStatus:
     """
-    Retrieve the current IST off-day status with one Holiday-table query.
+    Retrieve the current IST off-day status from the shared holiday calendar.
 
     This helper should be called once at the beginning of each scheduler
     execution and its result reused throughout that scheduler run.
@@ -40,17 +40,12 @@ def get_holiday_status(
     holiday_name = ""
 
     try:
-        holiday_row = (
-            Holiday.objects
-            .filter(date=target_date)
-            .values("name")
-            .first()
-        )
-
-        if holiday_row:
-            holiday_name = str(
-                holiday_row.get("name") or ""
-            ).strip()
+        calendar = get_holiday_calendar(target_date)
+        if calendar.is_holiday(target_date):
+            # A blank name still marks an official holiday.
+            holiday_name = (
+                calendar.holiday_name(target_date).strip() or "Holiday"
+            )
 
     except (OperationalError, ProgrammingError):
         logger.exception(
@@ -147,10 +142,7 @@ def is_holiday_master_date(d: date) -> bool:
     Check Holiday Master safely.
     """
     try:
-        if hasattr(Holiday, "is_holiday"):
-            return bool(Holiday.is_holiday(d))
-
-        return Holiday.objects.filter(date=d).exists()
+        return get_holiday_calendar(d).is_holiday(d)
 
     except (OperationalError, ProgrammingError):
         logger.exception("Holiday table not ready while checking date=%s", d)
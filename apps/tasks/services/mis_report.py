@@ -3,22 +3,22 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
-from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from io import BytesIO
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import EmailMultiAlternatives
-from django.db.models import Count, Q, QuerySet
+from django.db.models import Q
 from django.template.loader import render_to_string
 from django.utils import timezone
 from django.utils.html import strip_tags
 from zoneinfo import ZoneInfo
 
+from .scoring import ON_TIME_BY_DAY, TaskModelConfig, get_task_config, window_scores
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
@@ -70,31 +70,6 @@ DEFAULT_EXCLUDE_USERNAMES = ["admin", "pankaj"]
 DEFAULT_EXCLUDE_EMAILS = ["admin@gmail.com", "pankaj@blueoceansteels.com"]
 DEFAULT_EXCLUDE_FULL_NAMES = ["Pankaj Jain", "Pankaj Sir"]
 
-COMPLETED_STATUS_BY_MODEL = {
-    "Checklist": ("Completed",),
-    "Delegation": ("Completed",),
-    "HelpTicket": ("Closed",),
-}
-
-COMPLETED_DATETIME_FIELDS_BY_MODEL = {
-    "Checklist": ("completed_at",),
-    "Delegation": ("completed_at",),
-    "HelpTicket": ("resolved_at",),
-}
-
-
-@dataclass(frozen=True)
-class TaskModelConfig:
-    model_name: str
-    model: Any
-    assignee_field: str
-    planned_field: str
-    status_field: str
-    completed_datetime_field: str
-    completed_statuses: Tuple[str, ...]
-    skipped_field: Optional[str]
-
-
 def _safe_console_text(value: object) -> str:
     try:
         text = "" if value is None else str(value)
@@ -149,71 +124,8 @@ def _from_email() -> str:
     )
 
 
-def _field_names(model: Any) -> set[str]:
-    return {field.name for field in model._meta.fields}
-
-
-def _first_existing_field(model: Any, candidates: Sequence[str]) -> Optional[str]:
-    names = _field_names(model)
-
-    for field_name in candidates:
-        if field_name in names:
-            return field_name
-
-    return None
-
-
 def _get_model_config(model_name: str) -> Optional[TaskModelConfig]:
-    try:
-        model = apps.get_model("tasks", model_name)
-    except LookupError:
-        logger.warning(_safe_console_text(f"[MIS] Model not found: tasks.{model_name}"))
-        return None
-
-    assignee_field = _first_existing_field(model, ("assign_to", "assigned_to"))
-    planned_field = _first_existing_field(model, ("planned_date",))
-    status_field = _first_existing_field(model, ("status",))
-    completed_datetime_field = _first_existing_field(
-        model,
-        COMPLETED_DATETIME_FIELDS_BY_MODEL.get(
-            model_name,
-            ("completed_at", "resolved_at", "closed_at"),
-        ),
-    )
-    skipped_field = _first_existing_field(model, ("is_skipped_due_to_leave",))
-
-    missing_fields = []
-
-    if not assignee_field:
-        missing_fields.append("assign_to")
-    if not planned_field:
-        missing_fields.append("planned_date")
-    if not status_field:
-        missing_fields.append("status")
-    if not completed_datetime_field:
-        missing_fields.append("completed_at/resolved_at")
-
-    if missing_fields:
-        logger.warning(
-            _safe_console_text(
-                f"[MIS] Skipping {model_name}. Missing fields: {', '.join(missing_fields)}"
-            )
-        )
-        return None
-
-    return TaskModelConfig(
-        model_name=model_name,
-        model=model,
-        assignee_field=assignee_field,
-        planned_field=planned_field,
-        status_field=status_field,
-        completed_datetime_field=completed_datetime_field,
-        completed_statuses=COMPLETED_STATUS_BY_MODEL.get(
-            model_name,
-            ("Completed", "Closed"),
-        ),
-        skipped_field=skipped_field,
-    )
+    return get_task_config(model_name)
 
 
 def get_available_task_configs() -> List[TaskModelConfig]:
@@ -431,149 +343,6 @@ def _eligible_active_employee_users() -> List[Any]:
     return final_users
 
 
-def _base_queryset(
-    config: TaskModelConfig,
-    *,
-    start_dt: datetime,
-    end_dt: datetime,
-    eligible_employee_ids: Sequence[int],
-) -> QuerySet:
-    """
-    Base MIS queryset.
-
-    Critical production rule:
-        Only eligible active employees are counted.
-
-    This excludes:
-        - inactive employees
-        - Pankaj Sir
-        - configured admin/system accounts
-    """
-    filters = {
-        f"{config.planned_field}__gte": start_dt,
-        f"{config.planned_field}__lt": end_dt,
-        f"{config.assignee_field}__isnull": False,
-        f"{config.assignee_field}_id__in": list(eligible_employee_ids),
-    }
-
-    qs = config.model.objects.filter(**filters)
-
-    if config.skipped_field:
-        qs = qs.filter(**{config.skipped_field: False})
-
-    return qs
-
-
-def _inactive_assignee_queryset(
-    config: TaskModelConfig,
-    *,
-    start_dt: datetime,
-    end_dt: datetime,
-) -> QuerySet:
-    filters = {
-        f"{config.planned_field}__gte": start_dt,
-        f"{config.planned_field}__lt": end_dt,
-        f"{config.assignee_field}__isnull": False,
-        f"{config.assignee_field}__is_active": False,
-    }
-
-    qs = config.model.objects.filter(**filters)
-
-    if config.skipped_field:
-        qs = qs.filter(**{config.skipped_field: False})
-
-    return qs
-
-
-def _excluded_active_assignee_queryset(
-    config: TaskModelConfig,
-    *,
-    start_dt: datetime,
-    end_dt: datetime,
-    eligible_employee_ids: Sequence[int],
-) -> QuerySet:
-    """
-    Audit-only queryset.
-
-    Counts rows assigned to active users who were excluded from MIS,
-    such as Pankaj Sir or configured admin/system users.
-    """
-    filters = {
-        f"{config.planned_field}__gte": start_dt,
-        f"{config.planned_field}__lt": end_dt,
-        f"{config.assignee_field}__isnull": False,
-        f"{config.assignee_field}__is_active": True,
-    }
-
-    qs = config.model.objects.filter(**filters).exclude(
-        **{f"{config.assignee_field}_id__in": list(eligible_employee_ids)}
-    )
-
-    if config.skipped_field:
-        qs = qs.filter(**{config.skipped_field: False})
-
-    return qs
-
-
-def _completed_queryset(base_qs: QuerySet, config: TaskModelConfig) -> QuerySet:
-    return base_qs.filter(
-        **{
-            f"{config.status_field}__in": config.completed_statuses,
-            f"{config.completed_datetime_field}__isnull": False,
-        }
-    )
-
-
-def _count_by_assignee(qs: QuerySet, assignee_field: str) -> Dict[int, int]:
-    user_id_key = f"{assignee_field}_id"
-
-    counts: Dict[int, int] = {}
-
-    for row in qs.values(user_id_key).annotate(total=Count("id")):
-        user_id = row.get(user_id_key)
-        if user_id:
-            counts[int(user_id)] = int(row.get("total") or 0)
-
-    return counts
-
-
-def _is_on_time(planned_dt: datetime, completed_dt: datetime) -> bool:
-    if not planned_dt or not completed_dt:
-        return False
-
-    planned_date_ist = timezone.localtime(planned_dt, IST).date()
-    completed_date_ist = timezone.localtime(completed_dt, IST).date()
-
-    return completed_date_ist <= planned_date_ist
-
-
-def _count_on_time_by_assignee(
-    completed_qs: QuerySet,
-    config: TaskModelConfig,
-) -> Dict[int, int]:
-    counts: Dict[int, int] = defaultdict(int)
-
-    qs = completed_qs.only(
-        "id",
-        config.assignee_field,
-        config.planned_field,
-        config.completed_datetime_field,
-    )
-
-    for obj in qs.iterator(chunk_size=1000):
-        user_id = getattr(obj, f"{config.assignee_field}_id", None)
-        planned_dt = getattr(obj, config.planned_field, None)
-        completed_dt = getattr(obj, config.completed_datetime_field, None)
-
-        if not user_id:
-            continue
-
-        if _is_on_time(planned_dt, completed_dt):
-            counts[int(user_id)] += 1
-
-    return dict(counts)
-
-
 def _score(
     *,
     actual: int,
@@ -626,7 +395,9 @@ def build_mis_report_dataset(
     generated_at = timezone.localtime(timezone.now(), IST)
     report_date = generated_at.date()
 
-    active_employee_count_in_db = User.objects.filter(is_active=True).count()
+    # Active ids also split skipped rows into inactive vs excluded below.
+    active_user_ids = set(User.objects.filter(is_active=True).values_list("id", flat=True))
+    active_employee_count_in_db = len(active_user_ids)
     inactive_employee_count_in_db = User.objects.filter(is_active=False).count()
 
     eligible_users = _eligible_active_employee_users()
@@ -650,49 +421,41 @@ def build_mis_report_dataset(
     configs = get_available_task_configs()
 
     for config in configs:
-        base_qs = _base_queryset(
+        # One grouped query per model over every assignee in the window;
+        # eligibility is applied to the per-assignee rows below.
+        scores = window_scores(
             config,
             start_dt=start_dt,
             end_dt=end_dt,
-            eligible_employee_ids=eligible_employee_ids,
+            on_time=ON_TIME_BY_DAY,
+            require_completed_at=True,
         )
 
-        inactive_qs = _inactive_assignee_queryset(
-            config,
-            start_dt=start_dt,
-            end_dt=end_dt,
-        )
-
-        excluded_active_qs = _excluded_active_assignee_queryset(
-            config,
-            start_dt=start_dt,
-            end_dt=end_dt,
-            eligible_employee_ids=eligible_employee_ids,
-        )
-
-        completed_qs = _completed_queryset(base_qs, config)
-
-        planned_counts = _count_by_assignee(base_qs, config.assignee_field)
-        actual_counts = _count_by_assignee(completed_qs, config.assignee_field)
-        on_time_counts = _count_on_time_by_assignee(completed_qs, config)
-
-        model_breakdown[config.model_name] = {
-            "planned": sum(planned_counts.values()),
-            "actual": sum(actual_counts.values()),
-            "on_time_actual": sum(on_time_counts.values()),
-            "inactive_assignee_tasks_skipped": inactive_qs.count(),
-            "excluded_active_assignee_tasks_skipped": excluded_active_qs.count(),
+        breakdown = {
+            "planned": 0,
+            "actual": 0,
+            "on_time_actual": 0,
+            "inactive_assignee_tasks_skipped": 0,
+            "excluded_active_assignee_tasks_skipped": 0,
         }
 
-        all_user_ids = set(planned_counts) | set(actual_counts) | set(on_time_counts)
-
-        for user_id in all_user_ids:
+        for user_id, score in scores.items():
             if user_id not in eligible_users_by_id:
+                if user_id in active_user_ids:
+                    breakdown["excluded_active_assignee_tasks_skipped"] += score.planned
+                else:
+                    breakdown["inactive_assignee_tasks_skipped"] += score.planned
                 continue
 
-            employee_stats[user_id]["planned"] += planned_counts.get(user_id, 0)
-            employee_stats[user_id]["actual"] += actual_counts.get(user_id, 0)
-            employee_stats[user_id]["on_time_actual"] += on_time_counts.get(user_id, 0)
+            breakdown["planned"] += score.planned
+            breakdown["actual"] += score.completed
+            breakdown["on_time_actual"] += score.on_time
+
+            employee_stats[user_id]["planned"] += score.planned
+            employee_stats[user_id]["actual"] += score.completed
+            employee_stats[user_id]["on_time_actual"] += score.on_time
+
+        model_breakdown[config.model_name] = breakdown
 
     employees: List[Dict[str, Any]] = []
 
@@ -812,50 +575,50 @@ def build_mis_report_dataset(
     }
 
 
-def build_mis_report_excel(report: Dict[str, Any]) -> bytes:
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-    except ImportError as exc:
-        raise RuntimeError(
-            "openpyxl is required for MIS Excel attachment. "
-            "Install it with: pip install openpyxl"
-        ) from exc
+# ----------------------------- Excel export ---------------------------------- #
+# The workbook is produced with an openpyxl write-only worksheet fed row by
+# row from iter_mis_report_rows(), and saved into a spooled temp file, so
+# memory stays flat however many employees / weeks the report covers.
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "MDO"
+MIS_EXCEL_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MIS_EXCEL_SPOOL_MAX_BYTES = int(getattr(settings, "MIS_EXCEL_SPOOL_MAX_BYTES", 5 * 1024 * 1024))
 
-    thin = Side(style="thin", color="000000")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+_ROW_TITLE = "title"
+_ROW_HEADER = "header"
+_ROW_GROUP = "group"
+_ROW_EMPLOYEE = "employee"
+_ROW_ON_TIME = "on_time"
+_ROW_SPACER = "spacer"
+_ROW_TOTAL = "total"
+_ROW_NOTICE = "notice"
+_ROW_BLANK = "blank"
+_ROW_FOOTER = "footer"
 
-    grey_fill = PatternFill("solid", fgColor="BFBFBF")
-    yellow_fill = PatternFill("solid", fgColor="F7DF9B")
-    teal_fill = PatternFill("solid", fgColor="0F5B66")
-    white_fill = PatternFill("solid", fgColor="FFFFFF")
-    green_fill = PatternFill("solid", fgColor="D9EAD3")
+_ON_TIME_LABEL = "work done on time ----->"
 
-    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    right = Alignment(horizontal="right", vertical="center")
-    left = Alignment(horizontal="left", vertical="center")
 
-    ws.merge_cells("A1:D1")
-    ws["A1"] = "MDO"
-    ws["A1"].fill = grey_fill
-    ws["A1"].font = Font(bold=True, color="000000", size=14)
-    ws["A1"].alignment = center
-    ws["A1"].border = border
+def _employee_rows(row: Dict[str, Any]) -> Iterator[Tuple[str, List[Any]]]:
+    yield _ROW_EMPLOYEE, [
+        row["employee_name"],
+        row["planned"],
+        row["actual"],
+        row["current_week_score"],
+    ]
+    yield _ROW_ON_TIME, [
+        _ON_TIME_LABEL,
+        row["on_time_planned"],
+        row["on_time_actual"],
+        row["on_time_score"],
+    ]
+    yield _ROW_SPACER, []
 
-    headers = ["Doer Name", "Planned", "Actual", "Current\nWeek"]
-    for col, header in enumerate(headers, start=1):
-        cell = ws.cell(row=2, column=col)
-        cell.value = header
-        cell.fill = yellow_fill
-        cell.font = Font(bold=True, color="000000", size=12)
-        cell.alignment = center
-        cell.border = border
 
-    row_no = 3
+def iter_mis_report_rows(report: Dict[str, Any]) -> Iterator[Tuple[str, List[Any]]]:
+    """
+    (row_kind, values) for every sheet row of the MIS workbook, top to bottom.
+    """
+    yield _ROW_TITLE, ["MDO"]
+    yield _ROW_HEADER, ["Doer Name", "Planned", "Actual", "Current\nWeek"]
 
     if report.get("employees"):
         groups = report.get("team_groups") or [
@@ -871,175 +634,202 @@ def build_mis_report_excel(report: Dict[str, Any]) -> bytes:
             if not group_rows:
                 continue
 
-            ws.merge_cells(start_row=row_no, start_column=1, end_row=row_no, end_column=4)
-            team_cell = ws.cell(row=row_no, column=1)
-            team_cell.value = group.get("team_name") or "Team"
-            team_cell.fill = grey_fill
-            team_cell.font = Font(bold=True, color="000000", size=12)
-            team_cell.alignment = left
-            team_cell.border = border
+            yield _ROW_GROUP, [group.get("team_name") or "Team"]
 
-            for col in range(1, 5):
-                ws.cell(row=row_no, column=col).border = border
+            for row in group_rows:
+                yield from _employee_rows(row)
 
-            row_no += 1
+        other_active_users = report.get("other_active_users") or report.get("unmapped_employees") or []
 
-            for row in group_rows:
-                ws.cell(row=row_no, column=1).value = row["employee_name"]
-                ws.cell(row=row_no, column=2).value = row["planned"]
-                ws.cell(row=row_no, column=3).value = row["actual"]
-                ws.cell(row=row_no, column=4).value = row["current_week_score"]
+        if other_active_users:
+            yield _ROW_GROUP, [report.get("other_active_users_group_name") or OTHER_ACTIVE_USERS_GROUP_NAME]
 
-                ws.cell(row=row_no, column=1).fill = teal_fill
-                ws.cell(row=row_no, column=1).font = Font(bold=True, color="FFFFFF", size=11)
-                ws.cell(row=row_no, column=1).alignment = left
+            for row in other_active_users:
+                yield from _employee_rows(row)
+
+        totals = report["totals"]
+        yield _ROW_TOTAL, ["Total", totals["planned"], totals["actual"], totals["current_week_score"]]
+        yield _ROW_ON_TIME, [
+            _ON_TIME_LABEL,
+            totals["on_time_planned"],
+            totals["on_time_actual"],
+            totals["on_time_score"],
+        ]
+    else:
+        yield _ROW_NOTICE, ["No active eligible employees found for MIS report."]
 
-                for col in range(2, 5):
-                    ws.cell(row=row_no, column=col).fill = white_fill
-                    ws.cell(row=row_no, column=col).font = Font(color="000000", size=11)
-                    ws.cell(row=row_no, column=col).alignment = right
+    yield _ROW_BLANK, []
 
-                for col in range(1, 5):
-                    ws.cell(row=row_no, column=col).border = border
+    yield _ROW_FOOTER, [f"Report Date: {report['report_date_display']}"]
+    yield _ROW_FOOTER, [f"Week Number: {report['week_number']} / {report['week_year']}"]
+    yield _ROW_FOOTER, [f"Report Week: {report['week_start_display']} to {report['week_end_display']}"]
+    yield _ROW_FOOTER, [f"Generated At: {report['generated_at_display']}"]
+    yield _ROW_FOOTER, [
+        "Only active eligible employees are included. "
+        "Pankaj Sir, inactive users, and configured admin/system users are excluded."
+    ]
+    yield _ROW_FOOTER, ["This is a system-generated report from BOS Lakshya ERP."]
 
-                row_no += 1
 
-                ws.cell(row=row_no, column=1).value = "work done on time ----->"
-                ws.cell(row=row_no, column=2).value = row["on_time_planned"]
-                ws.cell(row=row_no, column=3).value = row["on_time_actual"]
-                ws.cell(row=row_no, column=4).value = row["on_time_score"]
+def write_mis_report_excel(report: Dict[str, Any], fileobj) -> None:
+    """
+    Write the MIS workbook for `report` into the binary file object `fileobj`.
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    except ImportError as exc:
+        raise RuntimeError(
+            "openpyxl is required for MIS Excel attachment. "
+            "Install it with: pip install openpyxl"
+        ) from exc
 
-                for col in range(1, 5):
-                    cell = ws.cell(row=row_no, column=col)
-                    cell.fill = white_fill
-                    cell.font = Font(color="000000", size=11)
-                    cell.border = border
-                    cell.alignment = left if col == 1 else right
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="MDO")
 
-                row_no += 1
+    thin = Side(style="thin", color="000000")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
 
-                ws.row_dimensions[row_no].height = 8
-                row_no += 1
+    grey_fill = PatternFill("solid", fgColor="BFBFBF")
+    yellow_fill = PatternFill("solid", fgColor="F7DF9B")
+    teal_fill = PatternFill("solid", fgColor="0F5B66")
+    white_fill = PatternFill("solid", fgColor="FFFFFF")
+    green_fill = PatternFill("solid", fgColor="D9EAD3")
 
-        other_active_users = report.get("other_active_users") or report.get("unmapped_employees") or []
+    center = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    right = Alignment(horizontal="right", vertical="center")
+    left = Alignment(horizontal="left", vertical="center")
 
-        if other_active_users:
-            ws.merge_cells(start_row=row_no, start_column=1, end_row=row_no, end_column=4)
-            other_cell = ws.cell(row=row_no, column=1)
-            other_cell.value = report.get("other_active_users_group_name") or OTHER_ACTIVE_USERS_GROUP_NAME
-            other_cell.fill = grey_fill
-            other_cell.font = Font(bold=True, color="000000", size=12)
-            other_cell.alignment = left
-            other_cell.border = border
+    # Column widths must be set before the first row is written.
+    ws.column_dimensions["A"].width = 34
+    ws.column_dimensions["B"].width = 13
+    ws.column_dimensions["C"].width = 13
+    ws.column_dimensions["D"].width = 15
 
-            for col in range(1, 5):
-                ws.cell(row=row_no, column=col).border = border
+    def _cell(value, *, fill=None, font=None, alignment=None, cell_border=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if fill is not None:
+            cell.fill = fill
+        if font is not None:
+            cell.font = font
+        if alignment is not None:
+            cell.alignment = alignment
+        if cell_border is not None:
+            cell.border = cell_border
+        return cell
+
+    def _styled(values, fill, font_for, alignment_for):
+        return [
+            _cell(
+                value,
+                fill=fill(col) if callable(fill) else fill,
+                font=font_for(col),
+                alignment=alignment_for(col),
+                cell_border=border,
+            )
+            for col, value in enumerate(values, start=1)
+        ]
 
-            row_no += 1
+    def _merge_row(row_no: int) -> None:
+        ws.merged_cells.add(f"A{row_no}:D{row_no}")
 
-            for row in other_active_users:
-                ws.cell(row=row_no, column=1).value = row["employee_name"]
-                ws.cell(row=row_no, column=2).value = row["planned"]
-                ws.cell(row=row_no, column=3).value = row["actual"]
-                ws.cell(row=row_no, column=4).value = row["current_week_score"]
-
-                ws.cell(row=row_no, column=1).fill = teal_fill
-                ws.cell(row=row_no, column=1).font = Font(bold=True, color="FFFFFF", size=11)
-                ws.cell(row=row_no, column=1).alignment = left
-
-                for col in range(2, 5):
-                    ws.cell(row=row_no, column=col).fill = white_fill
-                    ws.cell(row=row_no, column=col).font = Font(color="000000", size=11)
-                    ws.cell(row=row_no, column=col).alignment = right
-
-                for col in range(1, 5):
-                    ws.cell(row=row_no, column=col).border = border
-
-                row_no += 1
-
-                ws.cell(row=row_no, column=1).value = "work done on time ----->"
-                ws.cell(row=row_no, column=2).value = row["on_time_planned"]
-                ws.cell(row=row_no, column=3).value = row["on_time_actual"]
-                ws.cell(row=row_no, column=4).value = row["on_time_score"]
-
-                for col in range(1, 5):
-                    cell = ws.cell(row=row_no, column=col)
-                    cell.fill = white_fill
-                    cell.font = Font(color="000000", size=11)
-                    cell.border = border
-                    cell.alignment = left if col == 1 else right
-
-                row_no += 1
-
-                ws.row_dimensions[row_no].height = 8
-                row_no += 1
-
-        ws.cell(row=row_no, column=1).value = "Total"
-        ws.cell(row=row_no, column=2).value = report["totals"]["planned"]
-        ws.cell(row=row_no, column=3).value = report["totals"]["actual"]
-        ws.cell(row=row_no, column=4).value = report["totals"]["current_week_score"]
-
-        for col in range(1, 5):
-            cell = ws.cell(row=row_no, column=col)
-            cell.fill = green_fill
-            cell.font = Font(bold=True, color="000000", size=11)
-            cell.border = border
-            cell.alignment = left if col == 1 else right
+    bold_12 = Font(bold=True, color="000000", size=12)
+    bold_11 = Font(bold=True, color="000000", size=11)
+    white_bold_11 = Font(bold=True, color="FFFFFF", size=11)
+    plain_11 = Font(color="000000", size=11)
+    label_then_right = (lambda col: left if col == 1 else right)
 
+    row_no = 0
+
+    for kind, values in iter_mis_report_rows(report):
         row_no += 1
 
-        ws.cell(row=row_no, column=1).value = "work done on time ----->"
-        ws.cell(row=row_no, column=2).value = report["totals"]["on_time_planned"]
-        ws.cell(row=row_no, column=3).value = report["totals"]["on_time_actual"]
-        ws.cell(row=row_no, column=4).value = report["totals"]["on_time_score"]
+        if kind == _ROW_TITLE:
+            ws.row_dimensions[row_no].height = 20
+            _merge_row(row_no)
+            cells = [_cell(
+                values[0],
+                fill=grey_fill,
+                font=Font(bold=True, color="000000", size=14),
+                alignment=center,
+                cell_border=border,
+            )]
+
+        elif kind == _ROW_HEADER:
+            ws.row_dimensions[row_no].height = 36
+            cells = _styled(values, yellow_fill, lambda col: bold_12, lambda col: center)
+
+        elif kind == _ROW_GROUP:
+            _merge_row(row_no)
+            cells = [_cell(values[0], fill=grey_fill, font=bold_12, alignment=left, cell_border=border)]
+            cells += [_cell(None, cell_border=border) for _ in range(3)]
+
+        elif kind == _ROW_EMPLOYEE:
+            cells = _styled(
+                values,
+                lambda col: teal_fill if col == 1 else white_fill,
+                lambda col: white_bold_11 if col == 1 else plain_11,
+                label_then_right,
+            )
 
-        for col in range(1, 5):
-            cell = ws.cell(row=row_no, column=col)
-            cell.fill = white_fill
-            cell.font = Font(color="000000", size=11)
-            cell.border = border
-            cell.alignment = left if col == 1 else right
+        elif kind == _ROW_ON_TIME:
+            cells = _styled(values, white_fill, lambda col: plain_11, label_then_right)
 
-        row_no += 2
-    else:
-        ws.merge_cells(start_row=row_no, start_column=1, end_row=row_no, end_column=4)
-        cell = ws.cell(row=row_no, column=1)
-        cell.value = "No active eligible employees found for MIS report."
-        cell.fill = white_fill
-        cell.alignment = center
-        cell.border = border
-        cell.font = Font(size=11)
-        row_no += 2
-
-    ws.cell(row=row_no, column=1).value = f"Report Date: {report['report_date_display']}"
-    ws.cell(row=row_no + 1, column=1).value = f"Week Number: {report['week_number']} / {report['week_year']}"
-    ws.cell(row=row_no + 2, column=1).value = (
-        f"Report Week: {report['week_start_display']} to {report['week_end_display']}"
-    )
-    ws.cell(row=row_no + 3, column=1).value = f"Generated At: {report['generated_at_display']}"
-    ws.cell(row=row_no + 4, column=1).value = (
-        "Only active eligible employees are included. "
-        "Pankaj Sir, inactive users, and configured admin/system users are excluded."
-    )
-    ws.cell(row=row_no + 5, column=1).value = (
-        "This is a system-generated report from BOS Lakshya ERP."
-    )
+        elif kind == _ROW_TOTAL:
+            cells = _styled(values, green_fill, lambda col: bold_11, label_then_right)
 
-    for r in range(row_no, row_no + 6):
-        ws.cell(row=r, column=1).font = Font(size=11)
+        elif kind == _ROW_NOTICE:
+            _merge_row(row_no)
+            cells = [_cell(values[0], fill=white_fill, font=Font(size=11), alignment=center, cell_border=border)]
 
-    ws.column_dimensions["A"].width = 34
-    ws.column_dimensions["B"].width = 13
-    ws.column_dimensions["C"].width = 13
-    ws.column_dimensions["D"].width = 15
+        elif kind == _ROW_SPACER:
+            ws.row_dimensions[row_no].height = 8
+            cells = []
+
+        elif kind == _ROW_FOOTER:
+            cells = [_cell(values[0], font=Font(size=11))]
+
+        else:
+            cells = []
 
-    ws.row_dimensions[1].height = 20
-    ws.row_dimensions[2].height = 36
+        ws.append(cells)
 
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output.getvalue()
+        # Row attributes are emitted with the row; drop them so the
+        # dimension map does not grow with the sheet.
+        ws.row_dimensions.pop(row_no, None)
+
+    wb.save(fileobj)
+
+
+def build_mis_report_excel_file(report: Dict[str, Any]):
+    """
+    The MIS workbook in a SpooledTemporaryFile, rewound to the start. Kept in
+    memory up to MIS_EXCEL_SPOOL_MAX_BYTES, on disk beyond that; the caller
+    closes it.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=MIS_EXCEL_SPOOL_MAX_BYTES, mode="w+b")
+    try:
+        write_mis_report_excel(report, spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def build_mis_report_excel(report: Dict[str, Any]) -> bytes:
+    with build_mis_report_excel_file(report) as spool:
+        return spool.read()
+
+
+def mis_report_excel_filename(report: Dict[str, Any]) -> str:
+    return (
+        "MIS_Report_MDO_"
+        f"Week_{report['week_number']}_"
+        f"{report['week_start'].strftime('%Y-%m-%d')}_to_"
+        f"{report['week_end'].strftime('%Y-%m-%d')}.xlsx"
+    )
 
 
 def send_mis_report_email(
@@ -1069,12 +859,7 @@ def send_mis_report_email(
         cc or getattr(settings, "MIS_REPORT_CC", DEFAULT_CC_RECIPIENTS)
     )
 
-    excel_filename = (
-        "MIS_Report_MDO_"
-        f"Week_{report['week_number']}_"
-        f"{report['week_start'].strftime('%Y-%m-%d')}_to_"
-        f"{report['week_end'].strftime('%Y-%m-%d')}.xlsx"
-    )
+    excel_filename = mis_report_excel_filename(report)
 
     if dry_run:
         return {
@@ -1114,7 +899,7 @@ def send_mis_report_email(
     email.attach(
         excel_filename,
         excel_bytes,
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        MIS_EXCEL_CONTENT_TYPE,
     )
     email.send(fail_silently=False)
 
@@ -2,26 +2,40 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import asdict, dataclass
+from collections import defaultdict
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 from typing import Optional
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Max
 from django.utils import timezone
 
 from apps.tasks.models import Checklist, ChecklistRecurringSeries
-from apps.tasks.recurrence_utils import get_next_planned_date, normalize_mode
-from apps.tasks.services.blocking import guard_assign
+from apps.tasks.recurrence_utils import get_next_planned_date, normalize_mode, pin_7pm_ist
 from apps.tasks.services.holiday_guard import (
     get_holiday_status,
     is_holiday_for_user,
 )
+from apps.tasks.utils.blocking import (
+    blocking_leaves_by_user,
+    leaves_block_at,
+)
 
 
 logger = logging.getLogger(__name__)
 
 MAX_ADVANCE_STEPS = 730
 
+# Series masters locked, inspected and written per transaction.
+GENERATION_BATCH_SIZE = max(
+    int(getattr(settings, "RECURRING_GENERATION_BATCH_SIZE", 500)),
+    1,
+)
+
 
 @dataclass(frozen=True)
 class GenerationResult:
@@ -60,43 +74,6 @@ def _date_after_end(
     return _local_date(value) > series.recurrence_end_date
 
 
-def _assignee_is_available(
-    series: ChecklistRecurringSeries,
-    planned_dt: datetime,
-) -> bool:
-    """
-    Return True only when the occurrence can safely be assigned.
-
-    Fail closed:
-    if holiday or leave validation fails, no occurrence is created.
-    """
-    planned_dt = _aware(planned_dt)
-
-    try:
-        if is_holiday_for_user(series.assign_to, planned_dt):
-            return False
-    except Exception:
-        logger.exception(
-            "Holiday validation failed for recurring series %s",
-            series.pk,
-        )
-        return False
-
-    try:
-        return bool(
-            guard_assign(
-                series.assign_to,
-                planned_dt,
-            )
-        )
-    except Exception:
-        logger.exception(
-            "Leave validation failed for recurring series %s",
-            series.pk,
-        )
-        return False
-
-
 def calculate_next_run(
     series: ChecklistRecurringSeries,
     from_dt: datetime,
@@ -132,6 +109,47 @@ def calculate_next_run(
     return candidate
 
 
+def _occurrence_fields(
+    series: ChecklistRecurringSeries,
+    planned_dt: datetime,
+) -> dict:
+    """Checklist field values for one occurrence of series."""
+    return {
+        "recurring_series": series,
+        "assign_by_id": series.assign_by_id,
+        "task_name": series.task_name,
+        "message": series.message or "",
+        "assign_to_id": series.assign_to_id,
+        "planned_date": _aware(planned_dt),
+        "priority": series.priority,
+        "attachment_mandatory": series.attachment_mandatory,
+        "mode": series.mode,
+        "frequency": max(int(series.frequency or 1), 1),
+        "recurrence_end_date": series.recurrence_end_date,
+        "time_per_task_minutes": series.time_per_task_minutes or 0,
+        "remind_before_days": series.remind_before_days or 0,
+        "assign_pc_id": series.assign_pc_id,
+        "group_name": series.group_name or "",
+        "notify_to_id": series.notify_to_id,
+        "auditor_id": series.auditor_id,
+        "set_reminder": series.set_reminder,
+        "reminder_mode": series.reminder_mode,
+        "reminder_frequency": series.reminder_frequency,
+        "reminder_starting_time": series.reminder_starting_time,
+        "checklist_auto_close": series.checklist_auto_close,
+        "checklist_auto_close_days": (
+            series.checklist_auto_close_days or 0
+        ),
+        "actual_duration_minutes": 0,
+        "status": "Pending",
+        "is_skipped_due_to_leave": False,
+        "is_deleted": False,
+        "is_active": True,
+        "delete_reason": "",
+        "skip_reason": "",
+    }
+
+
 def create_occurrence_from_series(
     series: ChecklistRecurringSeries,
     planned_dt: datetime,
@@ -152,112 +170,159 @@ def create_occurrence_from_series(
             f"Recurring series {series.pk} has no active assignee."
         )
 
-    planned_dt = _aware(planned_dt)
-
     return Checklist.objects.create(
-        recurring_series=series,
-        assign_by=series.assign_by,
-        task_name=series.task_name,
-        message=series.message or "",
-        assign_to=series.assign_to,
-        planned_date=planned_dt,
-        priority=series.priority,
-        attachment_mandatory=series.attachment_mandatory,
-        mode=series.mode,
-        frequency=max(int(series.frequency or 1), 1),
-        recurrence_end_date=series.recurrence_end_date,
-        time_per_task_minutes=series.time_per_task_minutes or 0,
-        remind_before_days=series.remind_before_days or 0,
-        assign_pc=series.assign_pc,
-        group_name=series.group_name or "",
-        notify_to=series.notify_to,
-        auditor=series.auditor,
-        set_reminder=series.set_reminder,
-        reminder_mode=series.reminder_mode,
-        reminder_frequency=series.reminder_frequency,
-        reminder_starting_time=series.reminder_starting_time,
-        checklist_auto_close=series.checklist_auto_close,
-        checklist_auto_close_days=(
-            series.checklist_auto_close_days or 0
-        ),
-        actual_duration_minutes=0,
-        status="Pending",
-        is_skipped_due_to_leave=False,
-        is_deleted=False,
-        is_active=True,
-        delete_reason="",
-        skip_reason="",
+        **_occurrence_fields(series, planned_dt),
     )
 
 
-def _active_pending_exists(
-    series: ChecklistRecurringSeries,
-) -> bool:
-    """Return True when the series has any active pending occurrence."""
-    return Checklist.objects.filter(
-        recurring_series=series,
-        status="Pending",
-        is_deleted=False,
-        is_active=True,
-        is_skipped_due_to_leave=False,
-    ).exists()
+# ---------------------------------------------------------------------------
+# Batch state
+# ---------------------------------------------------------------------------
 
-
-def _pending_occurrence_blocks_generation(
-    series: ChecklistRecurringSeries,
-) -> bool:
+class _BatchState:
     """
-    Decide whether an existing pending occurrence blocks the next occurrence.
+    Everything generation needs for a batch of locked series masters, loaded
+    with one set-based query per concern:
 
-    Daily checklist series must continue producing one occurrence per valid
-    recurrence date even when an older occurrence remains Pending. Same-date
-    duplicates are still prevented later by _occurrence_exists().
+    - active assignees;
+    - series with an active pending occurrence;
+    - latest completed planned_date per series;
+    - future occurrence datetimes per series (deleted/skipped included);
+    - blocking leave rows per assignee.
 
-    Weekly, Monthly and Yearly series retain the existing completion-gated
-    behaviour: one active pending occurrence blocks another occurrence.
+    Holidays and Sundays come from the cached holiday calendar.
     """
-    if normalize_mode(series.mode) == "Daily":
-        return False
 
-    return _active_pending_exists(series)
+    def __init__(self, series_list: list[ChecklistRecurringSeries], *, now: datetime):
+        self.now = now
 
+        series_ids = [series.pk for series in series_list]
+        assignee_ids = {series.assign_to_id for series in series_list if series.assign_to_id}
 
-def _latest_completed(
-    series: ChecklistRecurringSeries,
-) -> Optional[Checklist]:
-    return (
-        Checklist.objects
-        .filter(
-            recurring_series=series,
-            status="Completed",
-            is_deleted=False,
+        User = get_user_model()
+        self.assignees = User.objects.filter(
+            pk__in=assignee_ids,
             is_active=True,
-            is_skipped_due_to_leave=False,
+        ).in_bulk()
+
+        self.pending_series_ids = set(
+            Checklist.objects
+            .filter(
+                recurring_series_id__in=series_ids,
+                status="Pending",
+                is_deleted=False,
+                is_active=True,
+                is_skipped_due_to_leave=False,
+            )
+            .values_list("recurring_series_id", flat=True)
+            .distinct()
         )
-        .order_by("-planned_date", "-id")
-        .first()
-    )
 
+        self.latest_completed = dict(
+            Checklist.objects
+            .filter(
+                recurring_series_id__in=series_ids,
+                status="Completed",
+                is_deleted=False,
+                is_active=True,
+                is_skipped_due_to_leave=False,
+            )
+            .values("recurring_series_id")
+            .annotate(latest=Max("planned_date"))
+            .values_list("recurring_series_id", "latest")
+        )
+
+        # Only future datetimes matter: past candidates are advanced before
+        # the existence check.
+        self.existing: dict[int, set[datetime]] = defaultdict(set)
+        for series_id, planned_date in (
+            Checklist.objects
+            .filter(
+                recurring_series_id__in=series_ids,
+                planned_date__gt=now,
+            )
+            .values_list("recurring_series_id", "planned_date")
+        ):
+            self.existing[series_id].add(planned_date)
+
+        self.leaves = blocking_leaves_by_user(
+            self.assignees.keys(),
+            timezone.localtime(now).date(),
+        )
+
+    def occurrence_exists(
+        self,
+        series: ChecklistRecurringSeries,
+        planned_dt: datetime,
+    ) -> bool:
+        """
+        Treat any occurrence on the calculated datetime as already consumed.
+
+        Deleted or skipped rows are included intentionally. This prevents a
+        deleted occurrence from being resurrected for the same recurrence date.
+        """
+        return _aware(planned_dt) in self.existing[series.pk]
+
+    def assignee_is_available(
+        self,
+        series: ChecklistRecurringSeries,
+        planned_dt: datetime,
+    ) -> bool:
+        """
+        Return True only when the occurrence can safely be assigned.
+
+        Fail closed:
+        if holiday or leave validation fails, no occurrence is created.
+        """
+        planned_dt = _aware(planned_dt)
+        assignee = self.assignees.get(series.assign_to_id)
+
+        try:
+            if is_holiday_for_user(assignee, planned_dt):
+                return False
+        except Exception:
+            logger.exception(
+                "Holiday validation failed for recurring series %s",
+                series.pk,
+            )
+            return False
+
+        try:
+            return not leaves_block_at(
+                self.leaves.get(series.assign_to_id),
+                planned_dt,
+            )
+        except Exception:
+            logger.exception(
+                "Leave validation failed for recurring series %s",
+                series.pk,
+            )
+            return False
 
-def _occurrence_exists(
+
+def _pending_occurrence_blocks_generation(
     series: ChecklistRecurringSeries,
-    planned_dt: datetime,
+    state: _BatchState,
 ) -> bool:
     """
-    Treat any occurrence on the calculated datetime as already consumed.
+    Decide whether an existing pending occurrence blocks the next occurrence.
 
-    Deleted or skipped rows are included intentionally. This prevents a
-    deleted occurrence from being resurrected for the same recurrence date.
+    Daily checklist series must continue producing one occurrence per valid
+    recurrence date even when an older occurrence remains Pending. Same-date
+    duplicates are still prevented later by occurrence_exists().
+
+    Weekly, Monthly and Yearly series retain the existing completion-gated
+    behaviour: one active pending occurrence blocks another occurrence.
     """
-    return Checklist.objects.filter(
-        recurring_series=series,
-        planned_date=_aware(planned_dt),
-    ).exists()
+    if normalize_mode(series.mode) == "Daily":
+        return False
+
+    return series.pk in state.pending_series_ids
 
 
 def _initial_candidate(
     series: ChecklistRecurringSeries,
-    completed: Checklist,
+    completed_dt: datetime,
 ) -> Optional[datetime]:
     """
     Determine where generation should resume.
@@ -266,7 +331,7 @@ def _initial_candidate(
     completed occurrence. This is important after a holiday/leave occurrence
     was skipped because no Checklist row exists for that skipped date.
     """
-    completed_dt = _aware(completed.planned_date)
+    completed_dt = _aware(completed_dt)
 
     if series.next_run_at is not None:
         stored_candidate = _aware(series.next_run_at)
@@ -286,6 +351,7 @@ def _initial_candidate(
 def _find_next_creatable_candidate(
     series: ChecklistRecurringSeries,
     initial_candidate: datetime,
+    state: _BatchState,
 ) -> tuple[Optional[datetime], int, str]:
     """
     Advance until a valid future occurrence is found.
@@ -299,7 +365,6 @@ def _find_next_creatable_candidate(
     - each advance follows the configured recurrence interval.
     """
     candidate = _aware(initial_candidate)
-    now = timezone.now()
     skipped_steps = 0
     last_reason = "candidate_ready"
 
@@ -307,49 +372,25 @@ def _find_next_creatable_candidate(
         if _date_after_end(series, candidate):
             return None, skipped_steps, "recurrence_finished"
 
-        if candidate <= now:
-            skipped_steps += 1
-            last_reason = "past_occurrence_advanced"
-
-            candidate = calculate_next_run(
-                series,
-                candidate,
-            )
-
-            if candidate is None:
-                return None, skipped_steps, "recurrence_finished"
-
-            continue
-
-        if _occurrence_exists(series, candidate):
-            skipped_steps += 1
-            last_reason = "existing_occurrence_advanced"
-
-            candidate = calculate_next_run(
-                series,
-                candidate,
-            )
-
-            if candidate is None:
-                return None, skipped_steps, "recurrence_finished"
-
-            continue
-
-        if not _assignee_is_available(series, candidate):
-            skipped_steps += 1
-            last_reason = "holiday_or_leave_advanced"
-
-            candidate = calculate_next_run(
-                series,
-                candidate,
-            )
+        if candidate <= state.now:
+            reason = "past_occurrence_advanced"
+        elif state.occurrence_exists(series, candidate):
+            reason = "existing_occurrence_advanced"
+        elif not state.assignee_is_available(series, candidate):
+            reason = "holiday_or_leave_advanced"
+        else:
+            return candidate, skipped_steps, last_reason
 
-            if candidate is None:
-                return None, skipped_steps, "recurrence_finished"
+        skipped_steps += 1
+        last_reason = reason
 
-            continue
+        candidate = calculate_next_run(
+            series,
+            candidate,
+        )
 
-        return candidate, skipped_steps, last_reason
+        if candidate is None:
+            return None, skipped_steps, "recurrence_finished"
 
     logger.error(
         "Maximum recurrence advancement reached for series_id=%s",
@@ -359,7 +400,7 @@ def _find_next_creatable_candidate(
     return None, skipped_steps, "advance_limit_reached"
 
 
-def _save_series_schedule(
+def _set_series_schedule(
     series: ChecklistRecurringSeries,
     *,
     next_run_at: Optional[datetime],
@@ -367,195 +408,295 @@ def _save_series_schedule(
 ) -> None:
     series.next_run_at = next_run_at
 
-    update_fields = [
-        "next_run_at",
-        "updated_at",
-    ]
-
     if is_active is not None:
         series.is_active = is_active
-        update_fields.append("is_active")
 
-    series.save(update_fields=update_fields)
 
+# ---------------------------------------------------------------------------
+# Batch engine
+# ---------------------------------------------------------------------------
 
-@transaction.atomic
-def generate_one_series(
-    series_id: int,
+@dataclass
+class _SeriesPlan:
+    series: ChecklistRecurringSeries
+    result: GenerationResult
+    occurrence: Optional[Checklist] = None
+    series_dirty: bool = False
+
+
+def _plan_series(
+    series: ChecklistRecurringSeries,
+    state: _BatchState,
     *,
-    dry_run: bool = False,
-) -> GenerationResult:
+    dry_run: bool,
+) -> _SeriesPlan:
     """
-    Generate at most one active future occurrence for one series.
+    Decide the outcome for one locked series master in memory.
 
-    The series master is locked for the full decision and creation transaction.
+    Series field changes are applied to the instance and flagged in
+    series_dirty; writes happen in _apply_plans.
     """
-    try:
-        # Lock only the recurring-series master row.
-        #
-        # Do not use select_related() on this locked query. Nullable related
-        # user fields create outer joins, and PostgreSQL does not allow
-        # FOR UPDATE on the nullable side of an outer join.
-        series = (
-            ChecklistRecurringSeries.objects
-            .select_for_update()
-            .get(pk=series_id)
-        )
-    except ChecklistRecurringSeries.DoesNotExist:
-        return GenerationResult(
-            series_id=series_id,
-            created=False,
-            occurrence_id=None,
-            reason="series_not_found",
-        )
 
-    if series.is_deleted or not series.is_active:
+    def _result(reason, **kwargs) -> GenerationResult:
         return GenerationResult(
             series_id=series.id,
             created=False,
             occurrence_id=None,
-            reason="inactive_or_deleted",
+            reason=reason,
+            **kwargs,
         )
 
+    if series.is_deleted or not series.is_active:
+        return _SeriesPlan(series, _result("inactive_or_deleted"))
+
     # A recurring series assigned to a deactivated employee must never create
     # another occurrence. Stop the master permanently when encountered.
-    if not series.assign_to_id or not series.assign_to.is_active:
-        if not dry_run:
-            series.is_active = False
-            series.is_deleted = True
-            series.next_run_at = None
-            series.save(
-                update_fields=[
-                    "is_active",
-                    "is_deleted",
-                    "next_run_at",
-                    "updated_at",
-                ]
-            )
+    assignee = state.assignees.get(series.assign_to_id)
 
-        return GenerationResult(
-            series_id=series.id,
-            created=False,
-            occurrence_id=None,
-            reason="inactive_assignee",
-        )
+    if assignee is None:
+        if dry_run:
+            return _SeriesPlan(series, _result("inactive_assignee"))
 
-    if _pending_occurrence_blocks_generation(series):
-        return GenerationResult(
-            series_id=series.id,
-            created=False,
-            occurrence_id=None,
-            reason="pending_exists",
-        )
+        series.is_active = False
+        series.is_deleted = True
+        series.next_run_at = None
 
-    completed = _latest_completed(series)
+        return _SeriesPlan(series, _result("inactive_assignee"), series_dirty=True)
 
-    if completed is None or completed.planned_date is None:
-        return GenerationResult(
-            series_id=series.id,
-            created=False,
-            occurrence_id=None,
-            reason="no_completed_source",
-        )
+    if _pending_occurrence_blocks_generation(series, state):
+        return _SeriesPlan(series, _result("pending_exists"))
+
+    completed_dt = state.latest_completed.get(series.pk)
+
+    if completed_dt is None:
+        return _SeriesPlan(series, _result("no_completed_source"))
 
     initial_candidate = _initial_candidate(
         series,
-        completed,
+        completed_dt,
     )
 
     if initial_candidate is None:
-        if not dry_run:
-            _save_series_schedule(
-                series,
-                next_run_at=None,
-                is_active=False,
-            )
+        if dry_run:
+            return _SeriesPlan(series, _result("recurrence_finished"))
 
-        return GenerationResult(
-            series_id=series.id,
-            created=False,
-            occurrence_id=None,
-            reason="recurrence_finished",
+        _set_series_schedule(
+            series,
+            next_run_at=None,
+            is_active=False,
         )
 
+        return _SeriesPlan(series, _result("recurrence_finished"), series_dirty=True)
+
     candidate, skipped_steps, advance_reason = (
         _find_next_creatable_candidate(
             series,
             initial_candidate,
+            state,
         )
     )
 
     if candidate is None:
-        if not dry_run:
-            _save_series_schedule(
-                series,
-                next_run_at=None,
-                is_active=False,
-            )
+        result = _result(advance_reason, skipped_steps=skipped_steps)
 
-        return GenerationResult(
-            series_id=series.id,
-            created=False,
-            occurrence_id=None,
-            reason=advance_reason,
-            skipped_steps=skipped_steps,
+        if dry_run:
+            return _SeriesPlan(series, result)
+
+        _set_series_schedule(
+            series,
+            next_run_at=None,
+            is_active=False,
         )
 
+        return _SeriesPlan(series, result, series_dirty=True)
+
     if dry_run:
-        return GenerationResult(
+        return _SeriesPlan(
+            series,
+            _result(
+                "dry_run_would_create",
+                planned_date=candidate.isoformat(),
+                skipped_steps=skipped_steps,
+            ),
+        )
+
+    occurrence = Checklist(**_occurrence_fields(series, candidate))
+    occurrence.assign_to = assignee
+
+    next_run = calculate_next_run(
+        series,
+        candidate,
+    )
+
+    _set_series_schedule(
+        series,
+        next_run_at=next_run,
+        is_active=next_run is not None,
+    )
+
+    return _SeriesPlan(
+        series,
+        GenerationResult(
             series_id=series.id,
-            created=False,
+            created=True,
             occurrence_id=None,
-            reason="dry_run_would_create",
+            reason="created",
             planned_date=candidate.isoformat(),
             skipped_steps=skipped_steps,
+        ),
+        occurrence=occurrence,
+        series_dirty=True,
+    )
+
+
+# Checklist FKs are not re-validated per occurrence: the ids are copied from
+# the locked series master and the assignee comes from _BatchState.assignees.
+_OCCURRENCE_FK_FIELDS = [
+    field.name
+    for field in Checklist._meta.concrete_fields
+    if field.is_relation
+]
+
+
+def _invalidate_dashboards(user_ids) -> None:
+    try:
+        from dashboard.payload_cache import invalidate_user_dashboards_on_commit
+
+        invalidate_user_dashboards_on_commit(user_ids)
+    except Exception:
+        logger.debug("Dashboard invalidation skipped for generated checklists", exc_info=True)
+
+
+def _validate_occurrence(plan: _SeriesPlan, state: _BatchState) -> None:
+    """
+    Checklist.full_clean() without its per-row queries: clean_fields() on the
+    non-FK fields, and Checklist.clean()'s holiday / Sunday / leave block
+    checked against the calendar and the leave rows loaded in `state`.
+    """
+    occurrence = plan.occurrence
+    occurrence.clean_fields(exclude=_OCCURRENCE_FK_FIELDS)
+
+    if not state.assignee_is_available(plan.series, occurrence.planned_date):
+        raise ValidationError(
+            f"Series {plan.series.pk}: {occurrence.planned_date.isoformat()} is a holiday, "
+            "Sunday or inside an assignee leave window."
         )
 
-    # Final duplicate check while the series master remains locked.
-    if _occurrence_exists(series, candidate):
-        next_run = calculate_next_run(
-            series,
-            candidate,
+
+def _apply_plans(plans: list[_SeriesPlan], *, now: datetime, state: _BatchState) -> None:
+    """
+    Write a batch: one bulk_create for occurrences, one bulk_update for masters.
+
+    Checklist.save() is bypassed; its effects are applied set-wise instead:
+
+    - validation: _validate_occurrence (a ValidationError fails the batch and
+      generate_due_series retries it series by series);
+    - the 19:00 IST pinning of the tasks pre_save receiver (pin_7pm_ist);
+    - one dashboard invalidation for all assignees after commit. The other
+      Checklist post_save receivers only log on create.
+    """
+    occurrence_plans = [plan for plan in plans if plan.occurrence is not None]
+
+    if occurrence_plans:
+        for plan in occurrence_plans:
+            _validate_occurrence(plan, state)
+            plan.occurrence.planned_date = pin_7pm_ist(plan.occurrence.planned_date)
+
+        occurrences = [plan.occurrence for plan in occurrence_plans]
+        Checklist.objects.bulk_create(occurrences)
+        _invalidate_dashboards(occurrence.assign_to_id for occurrence in occurrences)
+
+    dirty = [plan.series for plan in plans if plan.series_dirty]
+
+    if dirty:
+        for series in dirty:
+            series.updated_at = now
+
+        ChecklistRecurringSeries.objects.bulk_update(
+            dirty,
+            [
+                "next_run_at",
+                "is_active",
+                "is_deleted",
+                "updated_at",
+            ],
         )
 
-        _save_series_schedule(
-            series,
-            next_run_at=next_run,
-            is_active=next_run is not None,
+    for plan in plans:
+        if plan.occurrence is not None:
+            plan.result = replace(plan.result, occurrence_id=plan.occurrence.pk)
+
+
+def _generate_batch(
+    series_ids: list[int],
+    *,
+    dry_run: bool,
+) -> list[GenerationResult]:
+    """
+    Generate at most one active future occurrence for each series in the batch.
+
+    The series masters are locked for the full decision and creation
+    transaction, so state loaded afterwards cannot change underneath it.
+    """
+    with transaction.atomic():
+        # Do not use select_related() on this locked query. Nullable related
+        # user fields create outer joins, and PostgreSQL does not allow
+        # FOR UPDATE on the nullable side of an outer join.
+        locked = (
+            ChecklistRecurringSeries.objects
+            .select_for_update()
+            .filter(pk__in=series_ids)
+            .order_by("pk")
+            .in_bulk()
         )
 
-        return GenerationResult(
-            series_id=series.id,
+        now = timezone.now()
+        state = _BatchState(list(locked.values()), now=now)
+
+        plans = [
+            _plan_series(series, state, dry_run=dry_run)
+            for series in locked.values()
+        ]
+
+        if not dry_run:
+            _apply_plans(plans, now=now, state=state)
+
+    by_id = {plan.series.pk: plan.result for plan in plans}
+
+    return [
+        by_id.get(series_id)
+        or GenerationResult(
+            series_id=series_id,
             created=False,
             occurrence_id=None,
-            reason="duplicate_advanced",
-            planned_date=candidate.isoformat(),
-            skipped_steps=skipped_steps + 1,
+            reason="series_not_found",
         )
+        for series_id in series_ids
+    ]
 
-    occurrence = create_occurrence_from_series(
-        series,
-        candidate,
-    )
 
-    next_run = calculate_next_run(
-        series,
-        candidate,
-    )
+def generate_one_series(
+    series_id: int,
+    *,
+    dry_run: bool = False,
+) -> GenerationResult:
+    """
+    Generate at most one active future occurrence for one series.
+
+    The series master is locked for the full decision and creation transaction.
+    """
+    return _generate_batch([series_id], dry_run=dry_run)[0]
 
-    _save_series_schedule(
-        series,
-        next_run_at=next_run,
-        is_active=next_run is not None,
-    )
 
+def _error_result(series_id: int, exc: Exception) -> GenerationResult:
     return GenerationResult(
-        series_id=series.id,
-        created=True,
-        occurrence_id=occurrence.id,
-        reason="created",
-        planned_date=candidate.isoformat(),
-        skipped_steps=skipped_steps,
+        series_id=series_id,
+        created=False,
+        occurrence_id=None,
+        reason=(
+            f"error:{type(exc).__name__}:"
+            f"{str(exc)[:200]}"
+        ),
     )
 
 
@@ -563,7 +704,7 @@ def generate_due_series(
     *,
     user_id: int | None = None,
     dry_run: bool = False,
-    limit: int = 1000,
+    limit: int | None = None,
 ) -> dict:
     """
     Inspect active recurring-series masters and generate missing occurrences.
@@ -578,6 +719,11 @@ def generate_due_series(
     All active masters are inspected on working days instead of filtering only
     by next_run_at <= now. This preserves the existing completion-gated
     recurrence behavior.
+
+    Masters are processed GENERATION_BATCH_SIZE at a time with set-based
+    state queries and one bulk write per batch. A batch that fails is retried
+    series by series so one bad master cannot block the rest. limit=None
+    inspects every active master.
     """
     now = timezone.now()
     holiday_status = get_holiday_status(now)
@@ -603,10 +749,11 @@ def generate_due_series(
             "results": [],
         }
 
-    try:
-        limit = max(int(limit or 1000), 1)
-    except (TypeError, ValueError):
-        limit = 1000
+    if limit is not None:
+        try:
+            limit = max(int(limit), 1)
+        except (TypeError, ValueError):
+            limit = None
 
     queryset = ChecklistRecurringSeries.objects.filter(
         is_active=True,
@@ -622,37 +769,52 @@ def generate_due_series(
     series_ids = list(
         queryset
         .order_by("next_run_at", "id")
-        .values_list("id", flat=True)[:limit]
+        .values_list("id", flat=True)
     )
 
+    if limit is not None:
+        series_ids = series_ids[:limit]
+
     results: list[dict] = []
     created = 0
 
-    for series_id in series_ids:
+    for offset in range(0, len(series_ids), GENERATION_BATCH_SIZE):
+        batch_ids = series_ids[offset:offset + GENERATION_BATCH_SIZE]
+
         try:
-            result = generate_one_series(
-                series_id,
+            batch_results = _generate_batch(
+                batch_ids,
                 dry_run=dry_run,
             )
 
-        except Exception as exc:
+        except Exception:
             logger.exception(
-                "Recurring generation failed for series_id=%s",
-                series_id,
+                "Recurring generation batch failed (%d series); retrying one by one",
+                len(batch_ids),
             )
 
-            result = GenerationResult(
-                series_id=series_id,
-                created=False,
-                occurrence_id=None,
-                reason=(
-                    f"error:{type(exc).__name__}:"
-                    f"{str(exc)[:200]}"
-                ),
-            )
+            batch_results = []
+
+            for series_id in batch_ids:
+                try:
+                    result = generate_one_series(
+                        series_id,
+                        dry_run=dry_run,
+                    )
+
+                except Exception as exc:
+                    logger.exception(
+                        "Recurring generation failed for series_id=%s",
+                        series_id,
+                    )
+
+                    result = _error_result(series_id, exc)
+
+                batch_results.append(result)
 
-        results.append(asdict(result))
-        created += int(result.created)
+        for result in batch_results:
+            results.append(asdict(result))
+            created += int(result.created)
 
     return {
         "checked": len(series_ids),
@@ -662,4 +824,4 @@ def generate_due_series(
         "skipped": False,
         "day": holiday_status["date"].isoformat(),
         "results": results,
-    }
\ No newline at end of file
+    }
@@ -0,0 +1,307 @@
+# apps/tasks/services/scoring.py
+"""
+Weekly scoring engine shared by the MIS email, the weekly MIS / performance
+score reports and the WeeklyScore upsert.
+
+One conditional-aggregation query per task model returns, for every
+assignee in a planned-date window:
+
+    planned, completed, on_time, assigned_minutes, actual_minutes
+
+On-time is decided in SQL, with one of two rules:
+
+    ON_TIME_BY_DEADLINE  completed_at <= planned_date           (report views)
+    ON_TIME_BY_DAY       completed on/before the planned IST day (MIS email)
+
+backlog_by_assignee() adds the "pending before the window" and
+"completed late inside the window" counters in one more query per model.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+IST = ZoneInfo(getattr(settings, "MIS_REPORT_TIME_ZONE", "Asia/Kolkata"))
+
+ON_TIME_BY_DEADLINE = "deadline"
+ON_TIME_BY_DAY = "day"
+
+COMPLETED_STATUS_BY_MODEL = {
+    "Checklist": ("Completed",),
+    "Delegation": ("Completed",),
+    "HelpTicket": ("Closed",),
+}
+
+COMPLETED_DATETIME_FIELDS_BY_MODEL = {
+    "Checklist": ("completed_at",),
+    "Delegation": ("completed_at",),
+    "HelpTicket": ("resolved_at",),
+}
+
+
+@dataclass(frozen=True)
+class TaskModelConfig:
+    model_name: str
+    model: Any
+    assignee_field: str
+    planned_field: str
+    status_field: str
+    completed_datetime_field: str
+    completed_statuses: Tuple[str, ...]
+    skipped_field: Optional[str]
+    assigned_minutes_field: Optional[str] = None
+    actual_minutes_field: Optional[str] = None
+
+
+@dataclass
+class AssigneeScore:
+    planned: int = 0
+    completed: int = 0
+    on_time: int = 0
+    assigned_minutes: int = 0
+    actual_minutes: int = 0
+
+    def __add__(self, other: "AssigneeScore") -> "AssigneeScore":
+        return AssigneeScore(
+            planned=self.planned + other.planned,
+            completed=self.completed + other.completed,
+            on_time=self.on_time + other.on_time,
+            assigned_minutes=self.assigned_minutes + other.assigned_minutes,
+            actual_minutes=self.actual_minutes + other.actual_minutes,
+        )
+
+
+@dataclass
+class AssigneeBacklog:
+    pending_before: int = 0
+    delayed: int = 0
+
+
+# ----------------------------- model configs --------------------------------- #
+def _field_names(model: Any) -> set[str]:
+    return {field.name for field in model._meta.fields}
+
+
+def _first_existing_field(model: Any, candidates: Sequence[str]) -> Optional[str]:
+    names = _field_names(model)
+
+    for field_name in candidates:
+        if field_name in names:
+            return field_name
+
+    return None
+
+
+def get_task_config(model_name: str) -> Optional[TaskModelConfig]:
+    """
+    Field mapping for tasks.<model_name>, or None (with a warning) when the
+    model or one of the required fields is missing.
+    """
+    try:
+        model = apps.get_model("tasks", model_name)
+    except LookupError:
+        logger.warning("[SCORING] Model not found: tasks.%s", model_name)
+        return None
+
+    assignee_field = _first_existing_field(model, ("assign_to", "assigned_to"))
+    planned_field = _first_existing_field(model, ("planned_date",))
+    status_field = _first_existing_field(model, ("status",))
+    completed_datetime_field = _first_existing_field(
+        model,
+        COMPLETED_DATETIME_FIELDS_BY_MODEL.get(
+            model_name,
+            ("completed_at", "resolved_at", "closed_at"),
+        ),
+    )
+    skipped_field = _first_existing_field(model, ("is_skipped_due_to_leave",))
+
+    missing_fields = []
+
+    if not assignee_field:
+        missing_fields.append("assign_to")
+    if not planned_field:
+        missing_fields.append("planned_date")
+    if not status_field:
+        missing_fields.append("status")
+    if not completed_datetime_field:
+        missing_fields.append("completed_at/resolved_at")
+
+    if missing_fields:
+        logger.warning(
+            "[SCORING] Skipping %s. Missing fields: %s", model_name, ", ".join(missing_fields)
+        )
+        return None
+
+    return TaskModelConfig(
+        model_name=model_name,
+        model=model,
+        assignee_field=assignee_field,
+        planned_field=planned_field,
+        status_field=status_field,
+        completed_datetime_field=completed_datetime_field,
+        completed_statuses=COMPLETED_STATUS_BY_MODEL.get(
+            model_name,
+            ("Completed", "Closed"),
+        ),
+        skipped_field=skipped_field,
+        assigned_minutes_field=_first_existing_field(model, ("time_per_task_minutes",)),
+        actual_minutes_field=_first_existing_field(model, ("actual_duration_minutes",)),
+    )
+
+
+# ------------------------------- engine -------------------------------------- #
+def _scoped_queryset(
+    config: TaskModelConfig,
+    *,
+    assignee_ids: Optional[Iterable[int]],
+    exclude_skipped: bool,
+):
+    qs = config.model.objects.filter(**{f"{config.assignee_field}__isnull": False})
+
+    if assignee_ids is not None:
+        qs = qs.filter(**{f"{config.assignee_field}_id__in": list(assignee_ids)})
+
+    if exclude_skipped and config.skipped_field:
+        qs = qs.filter(**{config.skipped_field: False})
+
+    return qs
+
+
+def _completed_q(config: TaskModelConfig, *, require_completed_at: bool) -> Q:
+    q = Q(**{f"{config.status_field}__in": config.completed_statuses})
+    if require_completed_at:
+        q &= Q(**{f"{config.completed_datetime_field}__isnull": False})
+    return q
+
+
+def _minutes_sum(field_name: Optional[str], filter_q: Optional[Q] = None):
+    if not field_name:
+        return None
+    return Coalesce(Sum(field_name, filter=filter_q), 0)
+
+
+def window_scores(
+    config: TaskModelConfig,
+    *,
+    start_dt: datetime,
+    end_dt: datetime,
+    assignee_ids: Optional[Iterable[int]] = None,
+    on_time: str = ON_TIME_BY_DEADLINE,
+    require_completed_at: bool = False,
+    exclude_skipped: bool = True,
+) -> Dict[int, AssigneeScore]:
+    """
+    {assignee_id: AssigneeScore} for tasks planned in [start_dt, end_dt),
+    in a single grouped query. Assignees with no tasks are absent.
+    `assignee_ids=None` scores every assignee.
+    """
+    planned = config.planned_field
+    completed_at = config.completed_datetime_field
+    assignee_key = f"{config.assignee_field}_id"
+
+    qs = _scoped_queryset(
+        config, assignee_ids=assignee_ids, exclude_skipped=exclude_skipped
+    ).filter(**{f"{planned}__gte": start_dt, f"{planned}__lt": end_dt})
+
+    completed_q = _completed_q(config, require_completed_at=require_completed_at)
+
+    if on_time == ON_TIME_BY_DAY:
+        qs = qs.alias(
+            _planned_day=TruncDate(planned, tzinfo=IST),
+            _completed_day=TruncDate(completed_at, tzinfo=IST),
+        )
+        on_time_q = Q(_completed_day__lte=F("_planned_day"))
+    else:
+        on_time_q = Q(**{f"{completed_at}__lte": F(planned)})
+
+    aggregates = {
+        "planned_count": Count("pk"),
+        "completed_count": Count("pk", filter=completed_q),
+        "on_time_count": Count("pk", filter=completed_q & on_time_q),
+    }
+    if config.assigned_minutes_field:
+        aggregates["assigned_minutes"] = _minutes_sum(config.assigned_minutes_field)
+    if config.actual_minutes_field:
+        aggregates["actual_minutes"] = _minutes_sum(config.actual_minutes_field)
+
+    out: Dict[int, AssigneeScore] = {}
+    for row in qs.values(assignee_key).annotate(**aggregates).order_by():
+        out[int(row[assignee_key])] = AssigneeScore(
+            planned=int(row["planned_count"] or 0),
+            completed=int(row["completed_count"] or 0),
+            on_time=int(row["on_time_count"] or 0),
+            assigned_minutes=int(row.get("assigned_minutes") or 0),
+            actual_minutes=int(row.get("actual_minutes") or 0),
+        )
+    return out
+
+
+def backlog_by_assignee(
+    config: TaskModelConfig,
+    *,
+    start_dt: datetime,
+    end_dt: datetime,
+    assignee_ids: Optional[Iterable[int]] = None,
+    pending_status: str = "Pending",
+    exclude_skipped: bool = True,
+) -> Dict[int, AssigneeBacklog]:
+    """
+    {assignee_id: AssigneeBacklog} in one query:
+      pending_before  still `pending_status`, planned before start_dt
+      delayed         completed inside [start_dt, end_dt) after the planned time
+    """
+    planned = config.planned_field
+    completed_at = config.completed_datetime_field
+    assignee_key = f"{config.assignee_field}_id"
+
+    pending_q = Q(**{f"{planned}__lt": start_dt, config.status_field: pending_status})
+    delayed_q = Q(
+        **{
+            f"{completed_at}__gte": start_dt,
+            f"{completed_at}__lt": end_dt,
+            f"{completed_at}__gt": F(planned),
+        }
+    )
+
+    rows = (
+        _scoped_queryset(config, assignee_ids=assignee_ids, exclude_skipped=exclude_skipped)
+        .filter(pending_q | delayed_q)
+        .values(assignee_key)
+        .annotate(
+            pending_count=Count("pk", filter=pending_q),
+            delayed_count=Count("pk", filter=delayed_q),
+        )
+        .order_by()
+    )
+
+    return {
+        int(row[assignee_key]): AssigneeBacklog(
+            pending_before=int(row["pending_count"] or 0),
+            delayed=int(row["delayed_count"] or 0),
+        )
+        for row in rows
+    }
+
+
+__all__ = [
+    "AssigneeBacklog",
+    "AssigneeScore",
+    "COMPLETED_DATETIME_FIELDS_BY_MODEL",
+    "COMPLETED_STATUS_BY_MODEL",
+    "ON_TIME_BY_DAY",
+    "ON_TIME_BY_DEADLINE",
+    "TaskModelConfig",
+    "backlog_by_assignee",
+    "get_task_config",
+    "window_scores",
+]
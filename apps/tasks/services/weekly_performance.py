@@ -12,8 +12,8 @@ from django.template.loader import render_to_string
 from django.utils import timezone
 from zoneinfo import ZoneInfo
 
-from apps.tasks.models import Checklist, Delegation
 from apps.reports.models import WeeklyScore
+from apps.tasks.services.scoring import AssigneeScore, get_task_config, window_scores
 from apps.tasks.utils import (
     send_html_email,
     _safe_console_text,
@@ -96,6 +96,24 @@ def _send_congrats_email(user: User, score: Decimal, week_start: date, week_end:
 
 
 # --------------------------- scoring core (ORM-only) -------------------------- #
+def _completion_by_user(start_dt: datetime, end_dt: datetime) -> dict[int, AssigneeScore]:
+    """
+    Checklist + Delegation planned/completed per assignee for the window:
+    one grouped query per model. Leave-skipped rows count, as before.
+    """
+    totals: dict[int, AssigneeScore] = {}
+    for model_name in ("Checklist", "Delegation"):
+        scores = window_scores(
+            get_task_config(model_name),
+            start_dt=start_dt,
+            end_dt=end_dt,
+            exclude_skipped=False,
+        )
+        for user_id, score in scores.items():
+            totals[user_id] = totals.get(user_id, AssigneeScore()) + score
+    return totals
+
+
 def upsert_weekly_scores_for_last_week() -> dict:
     """
     Pure ORM (no SQLite UDFs): computes last week's (Mon..Sun IST) completion %
@@ -103,37 +121,44 @@ def upsert_weekly_scores_for_last_week() -> dict:
     """
     start_dt, end_dt, week_start_date, week_end_date = _last_week_bounds_ist()
 
-    users = User.objects.filter(is_active=True).only("id", "first_name", "last_name", "username", "email").order_by("id")
-    created = updated = 0
-
-    for u in users:
-        assigned = (
-            Checklist.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt).count()
-            + Delegation.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt).count()
-        )
-        completed = (
-            Checklist.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt, status="Completed").count()
-            + Delegation.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt, status="Completed").count()
-        )
-
-        score = _pct(completed, assigned)
-
-        # idempotent upsert
-        obj, was_created = WeeklyScore.objects.update_or_create(
-            user=u,
-            week_start=week_start_date,
-            defaults={"score": score},
-        )
-        created += int(was_created)
-        updated += int(not was_created)
+    user_ids = list(User.objects.filter(is_active=True).order_by("id").values_list("id", flat=True))
+    completion = _completion_by_user(start_dt, end_dt)
+
+    scores = {}
+    for user_id in user_ids:
+        stats = completion.get(user_id, AssigneeScore())
+        scores[user_id] = _pct(stats.completed, stats.planned)
+
+    # idempotent upsert: one read, one bulk insert, one bulk update
+    with transaction.atomic():
+        existing = {
+            ws.user_id: ws
+            for ws in WeeklyScore.objects.select_for_update().filter(
+                week_start=week_start_date, user_id__in=user_ids
+            )
+        }
+        to_create = [
+            WeeklyScore(user_id=user_id, week_start=week_start_date, score=score)
+            for user_id, score in scores.items()
+            if user_id not in existing
+        ]
+        to_update = []
+        for user_id, ws in existing.items():
+            ws.score = scores[user_id]
+            to_update.append(ws)
+
+        WeeklyScore.objects.bulk_create(to_create, ignore_conflicts=True)
+        WeeklyScore.objects.bulk_update(to_update, ["score"])
+
+    created, updated = len(to_create), len(to_update)
 
     logger.info(
         _safe_console_text(
-            f"WeeklyScore upsert done: users={users.count()} created={created} updated={updated} "
+            f"WeeklyScore upsert done: users={len(user_ids)} created={created} updated={updated} "
             f"window={week_start_date}..{week_end_date}"
         )
     )
-    return {"created": created, "updated": updated, "total_users": users.count(), "week_start": str(week_start_date)}
+    return {"created": created, "updated": updated, "total_users": len(user_ids), "week_start": str(week_start_date)}
 
 
 # ------------------------------ mail wrapper --------------------------------- #
@@ -144,20 +169,13 @@ def send_weekly_congratulations_mails() -> dict:
     """
     start_dt, end_dt, week_start_date, week_end_date = _last_week_bounds_ist()
     users = User.objects.filter(is_active=True).order_by("id")
+    completion = _completion_by_user(start_dt, end_dt)
 
     sent = skipped = 0
 
     for u in users:
-        total_assigned = (
-            Checklist.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt).count()
-            + Delegation.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt).count()
-        )
-        total_completed = (
-            Checklist.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt, status="Completed").count()
-            + Delegation.objects.filter(assign_to=u, planned_date__gte=start_dt, planned_date__lt=end_dt, status="Completed").count()
-        )
-
-        score = _pct(total_completed, total_assigned)
+        stats = completion.get(u.id, AssigneeScore())
+        score = _pct(stats.completed, stats.planned)
 
         # Only congratulate if >= 90%
         if score >= Decimal("90.00"):
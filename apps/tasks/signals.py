@@ -6,7 +6,6 @@ from __future__ import annotations
 
 import inspect
 import logging
-from datetime import datetime, time as dt_time
 
 import pytz
 from django.conf import settings
@@ -17,6 +16,7 @@ from django.urls import reverse
 from django.utils import timezone
 
 from .models import Checklist, Delegation, HelpTicket, is_holiday_or_sunday
+from .recurrence_utils import pin_7pm_ist
 from . import utils as _utils  # email helpers & console-safe logging
 
 # Leave-blocking helpers
@@ -216,14 +216,7 @@ def force_checklist_planned_time(sender, instance: Checklist, **kwargs):
     try:
         if not instance.planned_date:
             return
-        dt = instance.planned_date
-        tz = timezone.get_current_timezone()
-        if timezone.is_naive(dt):
-            dt = timezone.make_aware(dt, tz)
-        dt_ist = dt.astimezone(IST)
-        d = dt_ist.date()
-        new_ist = IST.localize(datetime.combine(d, dt_time(19, 0, 0)))
-        instance.planned_date = new_ist.astimezone(tz)
+        instance.planned_date = pin_7pm_ist(instance.planned_date)
     except Exception as e:
         logger.error(_utils._safe_console_text(f"force_checklist_planned_time failed: {e}"))
 
@@ -237,14 +230,7 @@ def force_delegation_planned_time(sender, instance: Delegation, **kwargs):
     try:
         if not instance.planned_date:
             return
-        dt = instance.planned_date
-        tz = timezone.get_current_timezone()
-        if timezone.is_naive(dt):
-            dt = timezone.make_aware(dt, tz)
-        dt_ist = dt.astimezone(IST)
-        d = dt_ist.date()
-        new_ist = IST.localize(datetime.combine(d, dt_time(19, 0, 0)))
-        instance.planned_date = new_ist.astimezone(tz)
+        instance.planned_date = pin_7pm_ist(instance.planned_date)
     except Exception as e:
         logger.error(_utils._safe_console_text(f"force_delegation_planned_time failed: {e}"))
 
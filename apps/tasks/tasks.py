@@ -19,13 +19,19 @@ from .models import Checklist, ChecklistRecurringSeries, Delegation, FMS, HelpTi
 from .recurrence_utils import is_working_day
 from .utils import (
     _safe_console_text,
+    build_html_email,
     send_checklist_assignment_to_user,
     send_html_email,
     get_admin_emails,
     _dedupe_emails,
     _fmt_dt_date,
 )
+from apps.common.mail_pipeline import MailPipeline
 from apps.tasks.services.blocking import guard_assign
+from apps.tasks.services.auto_assign import (
+    reconcile_holiday_added,
+    reconcile_holiday_removed,
+)
 from apps.tasks.services.holiday_guard import (
     get_holiday_status,
     holiday_skip_reason,
@@ -511,6 +517,18 @@ def _rows_for_checklists(objs: List[Checklist]) -> List[Dict[str, Any]]:
     return rows
 
 
+def _due_digest_callbacks(outcome: Dict[str, int], uid: int, items: int) -> Dict[str, Any]:
+    def on_sent() -> None:
+        outcome["emails"] += 1
+        outcome["tasks"] += items
+        logger.info(_safe_console_text(f"[DUE@10] Sent digest to user_id={uid} items={items}"))
+
+    def on_failed(exc: Exception) -> None:
+        logger.error(_safe_console_text(f"[DUE@10] Digest email failure for user_id={uid}: {exc}"))
+
+    return {"on_sent": on_sent, "on_failed": on_failed}
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=30)
 def send_due_today_assignments(self) -> dict:
     if not _email_notifications_enabled():
@@ -602,8 +620,10 @@ def send_due_today_assignments(self) -> dict:
 
             per_user.setdefault(uid, []).append(obj)
 
-        cl_emails_sent = 0
-        cl_tasks_included = 0
+        # Per-user digests are queued and sent in batches on one pooled
+        # SMTP connection; outcome is filled in by the callbacks.
+        pipeline = MailPipeline(label="due-today")
+        outcome = {"emails": 0, "tasks": 0}
 
         for uid, items in per_user.items():
             if not items:
@@ -642,30 +662,30 @@ def send_due_today_assignments(self) -> dict:
             subject = f"Checklist Tasks Pending for Today ({len(rows)} Tasks)"
             title = f"Checklist Tasks Pending for Today — {day_iso}"
 
-            try:
-                send_html_email(
-                    subject=subject,
-                    template_name="email/daily_pending_tasks_summary.html",
-                    context={
-                        "title": title,
-                        "report_date": day_iso,
-                        "total_pending": len(rows),
-                        "has_rows": bool(rows),
-                        "items_table": rows,
-                        "site_url": SITE_URL,
-                    },
-                    to=to_list,
-                    fail_silently=False,
-                )
-
-                cl_emails_sent += 1
-                cl_tasks_included += len(rows)
-                sent_total += 1
+            message = build_html_email(
+                subject=subject,
+                template_name="email/daily_pending_tasks_summary.html",
+                context={
+                    "title": title,
+                    "report_date": day_iso,
+                    "total_pending": len(rows),
+                    "has_rows": bool(rows),
+                    "items_table": rows,
+                    "site_url": SITE_URL,
+                },
+                to=to_list,
+            )
 
-                logger.info(_safe_console_text(f"[DUE@10] Sent digest to user_id={uid} items={len(rows)}"))
+            if message is not None:
+                pipeline.add(
+                    message,
+                    **_due_digest_callbacks(outcome, uid, len(rows)),
+                )
 
-            except Exception as e:
-                logger.error(_safe_console_text(f"[DUE@10] Digest email failure for user_id={uid}: {e}"))
+        pipeline.flush()
+        cl_emails_sent = outcome["emails"]
+        cl_tasks_included = outcome["tasks"]
+        sent_total += cl_emails_sent
 
         de_sent = 0
 
@@ -1284,6 +1304,53 @@ def run_pre10am_unblock_and_generate(self, user_id: int | None = None) -> dict:
     return pre10am_unblock_and_generate(user_id=user_id)
 
 
+# -----------------------------------------------------------------------------
+# Holiday reconciliation
+# -----------------------------------------------------------------------------
+HOLIDAY_RECONCILE_LOCK_TTL = 15 * 60
+
+
+@shared_task(
+    bind=True,
+    name="apps.tasks.tasks.reconcile_holiday",
+    max_retries=5,
+    default_retry_delay=30,
+)
+def reconcile_holiday(self, holiday_date: str, action: str = "added", previous_date: str | None = None) -> dict:
+    """
+    Move/skip (action="added") or restore (action="removed") task
+    occurrences for one holiday date. Queued by the Holiday save/delete hooks
+    through apps.tasks.services.auto_assign; one run per date at a time.
+
+    previous_date (a holiday whose date was edited): that date is restored
+    first, then holiday_date is reconciled, so the two never race.
+    """
+    dates = [d for d in (previous_date, holiday_date) if d]
+    locked = []
+
+    for d in dates:
+        if not cache.add(f"holiday_reconcile:{d}", True, HOLIDAY_RECONCILE_LOCK_TTL):
+            for held in locked:
+                cache.delete(f"holiday_reconcile:{held}")
+            raise self.retry(countdown=30)
+        locked.append(d)
+
+    try:
+        result = {}
+        if previous_date:
+            result["previous"] = reconcile_holiday_removed(previous_date).as_dict()
+
+        if action == "removed":
+            report = reconcile_holiday_removed(holiday_date)
+        else:
+            report = reconcile_holiday_added(holiday_date)
+    finally:
+        for d in locked:
+            cache.delete(f"holiday_reconcile:{d}")
+
+    return {**report.as_dict(), **result}
+
+
 # -----------------------------------------------------------------------------
 # Weekly MIS Report
 # -----------------------------------------------------------------------------
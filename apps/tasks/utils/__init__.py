@@ -6,10 +6,12 @@ import re
 from typing import Iterable, List, Optional, Sequence, Callable, Any
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils import timezone as dj_tz
 
+from apps.common.mail_pipeline import send_message
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -102,17 +104,17 @@ def get_admin_emails(exclude: Optional[Sequence[str]] = None) -> List[str]:
 
     return _dedupe_emails(emails)
 
-def send_html_email(
+def build_html_email(
     *,
     subject: str,
     template_name: Optional[str] = None,
     context: Optional[dict] = None,
     to: Sequence[str],
     body_fallback: Optional[str] = None,
-    fail_silently: bool = True,
-) -> None:
+) -> Optional[EmailMultiAlternatives]:
     """
-    Simple, robust HTML email sender with template fallback.
+    Render an HTML email (with template fallback) without sending it.
+    Returns None when there are no recipients.
     """
     html_body = ""
     txt_body = body_fallback or (subject or "")
@@ -130,18 +132,40 @@ def send_html_email(
     to = [t for t in (to or []) if t]
     if not to:
         logger.info(_safe_console_text(f"[MAIL] Skipped send: no recipients for '{subject}'"))
-        return
+        return None
 
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=txt_body,
+        to=list(to),
+    )
+    msg.attach_alternative(html_body, "text/html")
+    return msg
+
+def send_html_email(
+    *,
+    subject: str,
+    template_name: Optional[str] = None,
+    context: Optional[dict] = None,
+    to: Sequence[str],
+    body_fallback: Optional[str] = None,
+    fail_silently: bool = True,
+) -> None:
+    """
+    Simple, robust HTML email sender with template fallback.
+    Sends on the shared pooled connection (apps.common.mail_pipeline).
+    """
     try:
-        connection = get_connection(fail_silently=fail_silently)
-        msg = EmailMultiAlternatives(
+        msg = build_html_email(
             subject=subject,
-            body=txt_body,
-            to=list(to),
-            connection=connection,
+            template_name=template_name,
+            context=context,
+            to=to,
+            body_fallback=body_fallback,
         )
-        msg.attach_alternative(html_body, "text/html")
-        msg.send()
+        if msg is None:
+            return
+        send_message(msg, fail_silently=False)
     except Exception as e:
         logger.error(_safe_console_text(f"[MAIL] Send failed for '{subject}' to {to}: {e}"))
         if not fail_silently:
@@ -286,6 +310,7 @@ __all__ = [
     "SITE_URL",
     "build_absolute_url",
     "_safe_console_text",
+    "build_html_email",
     "send_html_email",
     "_dedupe_emails",
     "get_admin_emails",
@@ -19,6 +19,10 @@ Public API
 is_user_blocked_at(user, when_dt) -> bool
 is_user_blocked(user, ist_date) -> bool
 is_user_blocked_for_task_time(user, ist_date, at_time_ist) -> bool
+blocked_user_ids_at(when_dt, user_ids=None) -> set[int]
+blocked_user_ids(ist_date, user_ids=None) -> set[int]
+blocking_leaves_by_user(user_ids, from_date) -> dict[int, list]
+leaves_block_at(leaves, when_dt) -> bool
 """
 
 import logging
@@ -286,6 +290,89 @@ def _half_day_blocks_time(
     return leave_start_ist <= check_at_ist < leave_end_ist
 
 
+def _leave_blocks_at(
+    leave,
+    check_at_ist: datetime,
+    target_date: date,
+) -> bool:
+    """
+    Apply the blocking rules to one candidate leave row.
+    """
+    status = _normalize_status(
+        getattr(
+            leave,
+            "status",
+            None,
+        )
+    )
+
+    if status not in TASK_BLOCKING_STATUSES:
+        return False
+
+    is_half_day = bool(
+        getattr(
+            leave,
+            "is_half_day",
+            False,
+        )
+    )
+
+    if is_half_day:
+        return _half_day_blocks_time(
+            leave,
+            check_at_ist,
+        )
+
+    return _full_day_covers_target_date(
+        leave,
+        target_date,
+    )
+
+
+def _candidate_leaves(
+    LeaveRequest,
+    target_date: date,
+):
+    """
+    Leave rows that may block someone on target_date (status + overlap).
+    """
+    day_start, next_day_start = _ist_day_bounds(
+        target_date
+    )
+
+    return (
+        LeaveRequest.objects
+        .filter(
+            status__in=TASK_BLOCKING_STATUSES,
+        )
+        .filter(
+            Q(
+                start_date__lte=target_date,
+                end_date__gte=target_date,
+            )
+            |
+            Q(
+                start_at__lt=next_day_start,
+                end_at__gt=day_start,
+            )
+        )
+        .only(
+            "id",
+            "employee_id",
+            "status",
+            "start_at",
+            "end_at",
+            "start_date",
+            "end_date",
+            "is_half_day",
+        )
+        .order_by(
+            "start_at",
+            "id",
+        )
+    )
+
+
 def is_user_blocked_at(
     user,
     when_dt: date | datetime,
@@ -316,10 +403,6 @@ def is_user_blocked_at(
         check_at_ist = _coerce_check_datetime(when_dt)
         target_date = check_at_ist.date()
 
-        day_start, next_day_start = _ist_day_bounds(
-            target_date
-        )
-
         LeaveRequest = apps.get_model(
             "leave",
             "LeaveRequest",
@@ -331,74 +414,17 @@ def is_user_blocked_at(
             )
             return False
 
-        candidates = (
-            LeaveRequest.objects
-            .filter(
-                employee_id=user_id,
-                status__in=TASK_BLOCKING_STATUSES,
-            )
-            .filter(
-                Q(
-                    start_date__lte=target_date,
-                    end_date__gte=target_date,
-                )
-                |
-                Q(
-                    start_at__lt=next_day_start,
-                    end_at__gt=day_start,
-                )
-            )
-            .only(
-                "id",
-                "status",
-                "start_at",
-                "end_at",
-                "start_date",
-                "end_date",
-                "is_half_day",
-            )
-            .order_by(
-                "start_at",
-                "id",
-            )
+        candidates = _candidate_leaves(
+            LeaveRequest,
+            target_date,
+        ).filter(
+            employee_id=user_id,
         )
 
-        for leave in candidates:
-            status = _normalize_status(
-                getattr(
-                    leave,
-                    "status",
-                    None,
-                )
-            )
-
-            if status not in TASK_BLOCKING_STATUSES:
-                continue
-
-            is_half_day = bool(
-                getattr(
-                    leave,
-                    "is_half_day",
-                    False,
-                )
-            )
-
-            if is_half_day:
-                if _half_day_blocks_time(
-                    leave,
-                    check_at_ist,
-                ):
-                    return True
-
-                continue
-
-            if _full_day_covers_target_date(
-                leave,
-                target_date,
-            ):
-                return True
-
-        return False
+        return any(
+            _leave_blocks_at(leave, check_at_ist, target_date)
+            for leave in candidates
+        )
 
     except (TypeError, ValueError):
         logger.warning(
@@ -418,6 +444,149 @@ def is_user_blocked_at(
         return False
 
 
+def blocked_user_ids_at(
+    when_dt: date | datetime,
+    user_ids=None,
+) -> set[int]:
+    """
+    Set-based variant of is_user_blocked_at().
+
+    Returns the IDs of every user blocked by leave at when_dt, using one
+    query. Pass user_ids to restrict the lookup. Errors are logged and an
+    empty set is returned, matching the per-user helper.
+    """
+    try:
+        check_at_ist = _coerce_check_datetime(when_dt)
+        target_date = check_at_ist.date()
+
+        LeaveRequest = apps.get_model(
+            "leave",
+            "LeaveRequest",
+        )
+
+        candidates = _candidate_leaves(
+            LeaveRequest,
+            target_date,
+        )
+
+        if user_ids is not None:
+            candidates = candidates.filter(
+                employee_id__in=list(user_ids),
+            )
+
+        return {
+            leave.employee_id
+            for leave in candidates
+            if _leave_blocks_at(leave, check_at_ist, target_date)
+        }
+
+    except Exception:
+        logger.exception(
+            "Bulk leave blocking check failed: when=%r",
+            when_dt,
+        )
+        return set()
+
+
+def blocked_user_ids(
+    ist_date: date,
+    user_ids=None,
+) -> set[int]:
+    """
+    Set-based variant of is_user_blocked(): checks at 10:00 AM IST.
+    """
+    if not isinstance(ist_date, date) or isinstance(ist_date, datetime):
+        return set()
+
+    return blocked_user_ids_at(
+        datetime.combine(
+            ist_date,
+            ASSIGN_ANCHOR_IST,
+        ),
+        user_ids,
+    )
+
+
+def blocking_leaves_by_user(
+    user_ids,
+    from_date: date,
+) -> dict[int, list]:
+    """
+    Preload every PENDING/APPROVED leave of user_ids that can block on or
+    after from_date (IST), in one query, grouped by employee_id.
+
+    Pair with leaves_block_at() to check many dates without a query per
+    check. Unlike the per-user helpers, errors propagate so batch callers
+    can fail closed.
+    """
+    user_ids = list(user_ids or ())
+
+    if not user_ids:
+        return {}
+
+    LeaveRequest = apps.get_model(
+        "leave",
+        "LeaveRequest",
+    )
+
+    day_start, _next_day_start = _ist_day_bounds(
+        from_date
+    )
+
+    rows = (
+        LeaveRequest.objects
+        .filter(
+            status__in=TASK_BLOCKING_STATUSES,
+            employee_id__in=user_ids,
+        )
+        .filter(
+            Q(end_date__gte=from_date)
+            |
+            Q(end_at__gt=day_start)
+        )
+        .only(
+            "id",
+            "employee_id",
+            "status",
+            "start_at",
+            "end_at",
+            "start_date",
+            "end_date",
+            "is_half_day",
+        )
+        .order_by(
+            "start_at",
+            "id",
+        )
+    )
+
+    by_user: dict[int, list] = {}
+
+    for leave in rows:
+        by_user.setdefault(leave.employee_id, []).append(leave)
+
+    return by_user
+
+
+def leaves_block_at(
+    leaves,
+    when_dt: date | datetime,
+) -> bool:
+    """
+    In-memory is_user_blocked_at() over one user's preloaded leave rows.
+    """
+    if not leaves:
+        return False
+
+    check_at_ist = _coerce_check_datetime(when_dt)
+    target_date = check_at_ist.date()
+
+    return any(
+        _leave_blocks_at(leave, check_at_ist, target_date)
+        for leave in leaves
+    )
+
+
 def is_user_blocked(
     user,
     ist_date: date,
@@ -502,7 +671,11 @@ def is_user_blocked_for_task_time(
 __all__ = [
     "ASSIGN_ANCHOR_IST",
     "TASK_BLOCKING_STATUSES",
+    "blocked_user_ids",
+    "blocked_user_ids_at",
+    "blocking_leaves_by_user",
     "is_user_blocked",
     "is_user_blocked_at",
     "is_user_blocked_for_task_time",
+    "leaves_block_at",
 ]
\ No newline at end of file
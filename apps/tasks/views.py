@@ -1,18 +1,14 @@
 # apps/tasks/views.py
 from __future__ import annotations
 
-import csv
 import logging
 import pytz
-import re
 import time  # stdlib time module (we alias datetime.time as dt_time below)
 import unicodedata
 from typing import Optional
 from datetime import datetime, timedelta, date, time as dt_time
-from functools import wraps
-from threading import Lock, Thread
+from threading import Thread
 
-import pandas as pd
 from dateutil.relativedelta import relativedelta  # (kept if used by other helpers)
 
 from django.apps import apps
@@ -24,11 +20,12 @@ from django.contrib.staticfiles import finders
 from django.core.paginator import Paginator
 from django.db import transaction, OperationalError, connection, close_old_connections
 from django.db.models import Q, Sum, Count, Min, Max
-from django.http import FileResponse, Http404, HttpResponse
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.common.exports import export_response, keyset_rows
 from apps.users.permissions import has_permission
 from apps.settings.models import Holiday
 
@@ -57,6 +54,7 @@ from .utils import (
 )
 from .recurrence_utils import preserve_first_occurrence_time, normalize_mode
 from .services.checklist_series_creation import create_recurring_checklist
+from .bulk_upload import import_checklist_upload, import_delegation_upload
 
 # ✅ Single source of truth: leave blocking
 from apps.tasks.utils.blocking import (
@@ -74,7 +72,9 @@ SEND_EMAILS_FOR_AUTO_RECUR = getattr(settings, "SEND_EMAILS_FOR_AUTO_RECUR", Tru
 SEND_RECUR_EMAILS_ONLY_AT_10AM = getattr(settings, "SEND_RECUR_EMAILS_ONLY_AT_10AM", True)
 RECURRING_MODES = ["Daily", "Weekly", "Monthly", "Yearly"]
 
-BULK_BATCH_SIZE = 500
+# Checklist master list / export ordering; ends in a unique key for keyset export.
+CHECKLIST_LIST_ORDER = ("assign_to__first_name", "assign_to__last_name", "task_name", "-planned_date", "-id")
+
 site_url = getattr(settings, "SITE_URL", "https://ems-system-d26q.onrender.com")
 
 
@@ -203,39 +203,6 @@ def clean_unicode_string(text):
     return unicodedata.normalize("NFKD", text)
 
 
-def robust_db_operation(max_retries=3, base_delay=0.05):
-    def deco(fn):
-        @wraps(fn)
-        def inner(*args, **kwargs):
-            last = None
-            for attempt in range(max_retries):
-                try:
-                    return fn(*args, **kwargs)
-                except OperationalError as e:
-                    txt = str(e).lower()
-                    last = e
-                    if "locked" in txt and attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
-                        logger.warning("DB locked; retrying %s/%s in %.3fs", attempt + 1, max_retries, delay)
-                        time.sleep(delay)
-                        continue
-                    raise
-            if last is not None:
-                raise last
-            return None
-        return inner
-    return deco
-
-
-def optimal_batch_size() -> int:
-    try:
-        if connection.vendor == "sqlite":
-            return 250
-        return min(BULK_BATCH_SIZE, 500)
-    except Exception:
-        return 250
-
-
 def _minutes_between(now_dt: datetime, planned_dt: datetime) -> int:
     if not planned_dt:
         return 0
@@ -612,208 +579,6 @@ def _should_show_today_or_past(task_dt: datetime, now_ist: datetime) -> bool:
     return now_ist >= anchor_10am
 
 
-# -----------------------------------------------------------------------------
-# Parsing helpers
-# -----------------------------------------------------------------------------
-def parse_datetime_flexible(value):
-    if value is None or (isinstance(value, float) and pd.isna(value)):
-        return None
-    if isinstance(value, (pd.Timestamp,)):
-        return value.to_pydatetime()
-    s = str(value).strip()
-    if not s:
-        return None
-    fmts = [
-        "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S",
-        "%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M",
-        "%d-%m-%Y %H:%M", "%d.%m.%Y %H:%M",
-        "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y",
-    ]
-    for f in fmts:
-        try:
-            dt = datetime.strptime(s, f)
-            if f in {"%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y"}:
-                dt = dt.replace(hour=19, minute=0, second=0, microsecond=0)
-            return dt
-        except ValueError:
-            continue
-    try:
-        dt = pd.to_datetime(s, dayfirst=True, errors="coerce")
-        if pd.isna(dt):
-            dt = pd.to_datetime(s, dayfirst=False, errors="coerce")
-        if pd.isna(dt):
-            return None
-        py = dt.to_pydatetime()
-        if py.hour == 0 and py.minute == 0 and (re.match(r"^\d{4}[-/]\d{1,2}[-/]\d{1,2}$", s) is not None):
-            py = py.replace(hour=19, minute=0, second=0, microsecond=0)
-        return py
-    except Exception:
-        return None
-
-
-_SYN_MODE = {
-    "day": "Daily", "daily": "Daily",
-    "week": "Weekly", "weekly": "Weekly",
-    "month": "Monthly", "monthly": "Monthly",
-    "year": "Yearly", "yearly": "Yearly",
-}
-_RECURRENCE_RE = re.compile(r"(?i)\b(?:every|evry)?\s*(\d+)?\s*(day|daily|week|weekly|month|monthly|year|yearly)\b")
-
-
-def _clean_str(val):
-    return clean_unicode_string("" if val is None else str(val).strip())
-
-
-def parse_mode_frequency_from_row(row):
-    raw_mode = _clean_str(row.get("Mode"))
-    raw_freq = _clean_str(row.get("Frequency"))
-    if raw_mode:
-        mode = _SYN_MODE.get(raw_mode.lower(), raw_mode.title())
-        if mode not in RECURRING_MODES:
-            mode = ""
-        freq = None
-        if raw_freq:
-            try:
-                freq = max(1, int(float(raw_freq)))
-            except Exception:
-                m = _RECURRENCE_RE.search(raw_freq)
-                if m:
-                    n = m.group(1)
-                    freq = max(1, int(n)) if n else 1
-        if mode:
-            return mode, (freq or 1)
-
-    for key in ["Recurrence", "Repeat", "Frequency", "Every"]:
-        text = _clean_str(row.get(key))
-        if not text:
-            continue
-        m = _RECURRENCE_RE.search(text)
-        if m:
-            n = m.group(1)
-            unit = m.group(2).lower()
-            mode = _SYN_MODE.get(unit, "")
-            if mode in RECURRING_MODES:
-                return mode, (max(1, int(n)) if n else 1)
-        unit = text.lower()
-        if unit in _SYN_MODE:
-            mode = _SYN_MODE[unit]
-            return mode, 1
-    return "", None
-
-
-def parse_bool(val) -> bool:
-    return _clean_str(val).lower() in {"1", "true", "yes", "y", "on"}
-
-
-def parse_int(val, default=0) -> int:
-    s = _clean_str(val)
-    if not s:
-        return default
-    m = re.search(r"(-?\d+)", s)
-    if not m:
-        return default
-    try:
-        return int(float(m.group(1)))
-    except Exception:
-        return default
-
-
-def parse_excel_file_optimized(file):
-    file.seek(0)
-    name = (file.name or "").lower()
-    if name.endswith(".csv"):
-        return pd.read_csv(file, dtype=str, na_filter=False, engine="c", encoding="utf-8-sig", skipinitialspace=True)
-    if name.endswith((".xlsx", ".xls")):
-        return pd.read_excel(
-            file,
-            dtype=str,
-            na_filter=False,
-            engine="openpyxl" if name.endswith(".xlsx") else "xlrd",
-            keep_default_na=False,
-        )
-    raise ValueError("Unsupported file format. Please upload .xlsx, .xls or .csv")
-
-
-def validate_and_prepare_excel_data(df, task_type="checklist"):
-    df.columns = (
-        df.columns.str.strip()
-        .str.replace(r"\s+", " ", regex=True)
-        .str.replace("\n", " ").str.replace("\r", " ")
-    )
-    cmap = {
-        "task name": "Task Name", "taskname": "Task Name", "task_name": "Task Name",
-        "assign to": "Assign To", "assignto": "Assign To", "assign_to": "Assign To", "assigned to": "Assign To",
-        "planned date": "Planned Date", "planned_date": "Planned Date", "due date": "Planned Date", "date": "Planned Date",
-        "reminder before days": "Remind Before Days", "remind before days": "Remind Before Days",
-        "remind days": "Remind Before Days", "remind before": "Remind Before Days",
-        "time per task (minutes)": "Time per Task (minutes)", "time per task": "Time per Task (minutes)",
-        "mode": "Mode", "frequency": "Frequency", "recurrence": "Recurrence", "repeat": "Recurrence", "every": "Recurrence",
-    }
-    df.columns = [cmap.get(col.lower(), col) for col in df.columns]
-
-    required = ["Task Name", "Assign To", "Planned Date"]
-    missing = [c for c in required if c not in df.columns]
-    if missing:
-        return None, [f"Missing required columns: {', '.join(missing)}. Available: {', '.join(df.columns)}"]
-
-    df = df.replace("", pd.NA).dropna(subset=["Task Name"])
-    df = df[df["Task Name"].astype(str).str.strip().astype(bool)]
-    if len(df) == 0:
-        return None, ["No valid rows found in the file"]
-
-    usernames = set()
-    for col in ["Assign To", "Assign PC", "Notify To", "Auditor"]:
-        if col in df.columns:
-            ser = df[col].astype(str).str.strip()
-            ser = ser[(ser != "") & ser.notna()]
-            usernames.update(ser.unique().tolist())
-    user_cache.preload_usernames(list(usernames))
-
-    return df, []
-
-
-class UserCache:
-    def __init__(self):
-        self._cache = {}
-        self._lock = Lock()
-
-    def get_user(self, username_or_email):
-        key = (username_or_email or "").strip()
-        if not key:
-            return None
-        with self._lock:
-            if key in self._cache:
-                return self._cache[key]
-        u = None
-        try:
-            u = User.objects.get(username=key, is_active=True)
-        except User.DoesNotExist:
-            try:
-                u = User.objects.get(email__iexact=key, is_active=True)
-            except User.DoesNotExist:
-                u = None
-        with self._lock:
-            self._cache[key] = u
-        return u
-
-    def preload_usernames(self, usernames):
-        if not usernames:
-            return
-        qs = User.objects.filter(is_active=True).filter(Q(username__in=usernames) | Q(email__in=usernames))
-        with self._lock:
-            for u in qs:
-                self._cache[u.username] = u
-                if u.email:
-                    self._cache[u.email] = u
-
-    def clear(self):
-        with self._lock:
-            self._cache.clear()
-
-
-user_cache = UserCache()
-
-
 # -----------------------------------------------------------------------------
 # NEW: enforce awareness at save boundaries
 # -----------------------------------------------------------------------------
@@ -916,373 +681,14 @@ def _void_task_row(obj, *, deleted_by=None, reason: str = "") -> int:
 
 
 # -----------------------------------------------------------------------------
-# Bulk upload: Checklist
+# Bulk upload (vectorized preflight + all-or-nothing write: see bulk_upload.py)
 # -----------------------------------------------------------------------------
-@robust_db_operation()
-def process_checklist_batch_excel_ultra_optimized(batch_df, assign_by_user, start_idx):
-    """
-    Create one-time Checklist rows directly and recurring Checklist rows only
-    through create_recurring_checklist().
-    """
-    one_time_objects = []
-    created = []
-    errors = []
-
-    for idx, row in batch_df.iterrows():
-        row_no = start_idx + idx + 1
-
-        try:
-            task_name = _clean_str(row.get("Task Name"))
-            if not task_name:
-                errors.append(f"Row {row_no}: Missing 'Task Name'")
-                continue
-
-            assign_to_username = _clean_str(row.get("Assign To"))
-            if not assign_to_username:
-                errors.append(f"Row {row_no}: Missing 'Assign To'")
-                continue
-
-            assign_to = user_cache.get_user(assign_to_username)
-            if not assign_to:
-                errors.append(
-                    f"Row {row_no}: User '{assign_to_username}' not found or inactive"
-                )
-                continue
-
-            planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-            if not planned_dt:
-                errors.append(f"Row {row_no}: Invalid or missing planned date")
-                continue
-
-            planned_dt = ensure_aware(preserve_first_occurrence_time(planned_dt))
-            planned_ist_date = _as_ist_aware(planned_dt).date()
-
-            if not is_working_day(planned_ist_date):
-                errors.append(
-                    f"Row {row_no}: Planned date {planned_ist_date} is Sunday/holiday. "
-                    "Task not created."
-                )
-                continue
-
-            if _assignee_blocked_for_planned_time(assign_to, planned_dt):
-                errors.append(
-                    f"Row {row_no}: Assigned person '{assign_to_username}' is on leave "
-                    "during planned time. Task not created."
-                )
-                continue
-
-            message = _clean_str(row.get("Message"))
-            priority = (_clean_str(row.get("Priority")) or "Low").title()
-            if priority not in ["Low", "Medium", "High"]:
-                priority = "Low"
-
-            mode, frequency = parse_mode_frequency_from_row(row)
-            time_per_task = parse_int(row.get("Time per Task (minutes)"), default=0)
-            remind_before_days = max(
-                parse_int(
-                    row.get("Remind Before Days")
-                    or row.get("Reminder Before Days")
-                    or row.get("Remind days")
-                    or row.get("Remind Before"),
-                    default=0,
-                ),
-                0,
-            )
-
-            assign_pc = user_cache.get_user(_clean_str(row.get("Assign PC")))
-            notify_to = user_cache.get_user(_clean_str(row.get("Notify To")))
-            auditor = user_cache.get_user(_clean_str(row.get("Auditor")))
-            group_name = _clean_str(row.get("Group Name"))
-
-            set_reminder = parse_bool(row.get("Set Reminder"))
-            reminder_mode = None
-            reminder_frequency = None
-            reminder_starting_time = None
-
-            if set_reminder:
-                raw_reminder_mode = _clean_str(row.get("Reminder Mode"))
-                raw_reminder_mode = (
-                    _SYN_MODE.get(raw_reminder_mode.lower(), raw_reminder_mode.title())
-                    if raw_reminder_mode
-                    else "Daily"
-                )
-                reminder_mode = (
-                    raw_reminder_mode if raw_reminder_mode in RECURRING_MODES else "Daily"
-                )
-                reminder_frequency = max(
-                    parse_int(row.get("Reminder Frequency"), default=1),
-                    1,
-                )
-
-                raw_time = row.get("Reminder Starting Time")
-                if raw_time:
-                    text_time = _clean_str(raw_time)
-                    try:
-                        if ":" in text_time:
-                            reminder_starting_time = datetime.strptime(text_time, "%H:%M").time()
-                        else:
-                            fraction = float(text_time)
-                            hour = int(fraction * 24) % 24
-                            minute = int(round(fraction * 24 * 60)) % 60
-                            reminder_starting_time = dt_time(hour, minute)
-                    except Exception:
-                        reminder_starting_time = None
-
-            common = {
-                "assign_by": assign_by_user,
-                "task_name": task_name,
-                "message": message,
-                "assign_to": assign_to,
-                "planned_date": planned_dt,
-                "priority": priority,
-                "attachment_mandatory": False,
-                "time_per_task_minutes": time_per_task,
-                "remind_before_days": remind_before_days,
-                "assign_pc": assign_pc,
-                "group_name": group_name,
-                "notify_to": notify_to,
-                "auditor": auditor,
-                "set_reminder": set_reminder,
-                "reminder_mode": reminder_mode,
-                "reminder_frequency": reminder_frequency,
-                "reminder_starting_time": reminder_starting_time,
-                "checklist_auto_close": parse_bool(row.get("Checklist Auto Close")),
-                "checklist_auto_close_days": max(
-                    parse_int(row.get("Checklist Auto Close Days"), default=0),
-                    0,
-                ),
-            }
-
-            if mode in RECURRING_MODES:
-                try:
-                    _, first_occurrence = create_recurring_checklist(
-                        assign_by=common["assign_by"],
-                        assign_to=common["assign_to"],
-                        task_name=common["task_name"],
-                        planned_date=common["planned_date"],
-                        mode=mode,
-                        frequency=max(int(frequency or 1), 1),
-                        group_name=common["group_name"],
-                        message=common["message"],
-                        priority=common["priority"],
-                        attachment_mandatory=common["attachment_mandatory"],
-                        time_per_task_minutes=common["time_per_task_minutes"],
-                        remind_before_days=common["remind_before_days"],
-                        assign_pc=common["assign_pc"],
-                        notify_to=common["notify_to"],
-                        auditor=common["auditor"],
-                        set_reminder=common["set_reminder"],
-                        reminder_mode=common["reminder_mode"],
-                        reminder_frequency=common["reminder_frequency"],
-                        reminder_starting_time=common["reminder_starting_time"],
-                        checklist_auto_close=common["checklist_auto_close"],
-                        checklist_auto_close_days=common["checklist_auto_close_days"],
-                    )
-                    created.append(first_occurrence)
-                except Exception as exc:
-                    errors.append(f"Row {row_no}: Could not create recurring checklist: {exc}")
-            else:
-                one_time_objects.append(
-                    Checklist(
-                        **common,
-                        mode=None,
-                        frequency=None,
-                        actual_duration_minutes=0,
-                        status="Pending",
-                    )
-                )
-
-        except Exception as exc:
-            errors.append(f"Row {row_no}: {exc}")
-
-    if one_time_objects:
-        try:
-            with transaction.atomic():
-                batch_size = min(len(one_time_objects), optimal_batch_size())
-                created.extend(
-                    Checklist.objects.bulk_create(
-                        one_time_objects,
-                        batch_size=batch_size,
-                        ignore_conflicts=False,
-                    )
-                )
-        except Exception as exc:
-            logger.error("One-time Checklist bulk_create failed; falling back: %s", exc)
-            for obj in one_time_objects:
-                try:
-                    obj.save()
-                    created.append(obj)
-                except Exception as save_exc:
-                    errors.append(
-                        f"Failed to save '{clean_unicode_string(obj.task_name)}': {save_exc}"
-                    )
-
-    return created, errors
-
-# -----------------------------------------------------------------------------
-# Bulk upload: Delegation
-# -----------------------------------------------------------------------------
-@robust_db_operation()
-def process_delegation_batch_excel_ultra_optimized(batch_df, assign_by_user, start_idx):
-    task_objects, errors = [], []
-
-    for idx, row in batch_df.iterrows():
-        row_no = start_idx + idx + 1
-
-        try:
-            task_name = _clean_str(row.get("Task Name"))
-            if not task_name:
-                errors.append(f"Row {row_no}: Missing 'Task Name'")
-                continue
-
-            assign_to_username = _clean_str(row.get("Assign To"))
-            if not assign_to_username:
-                errors.append(f"Row {row_no}: Missing 'Assign To'")
-                continue
-
-            assign_to = user_cache.get_user(assign_to_username)
-            if not assign_to:
-                errors.append(f"Row {row_no}: User '{assign_to_username}' not found or inactive")
-                continue
-
-            planned_dt = parse_datetime_flexible(row.get("Planned Date"))
-            if not planned_dt:
-                errors.append(f"Row {row_no}: Invalid or missing planned date")
-                continue
-
-            planned_dt = preserve_first_occurrence_time(planned_dt)
-            planned_dt = ensure_aware(planned_dt)
-
-            planned_ist = _as_ist_aware(planned_dt)
-            planned_ist_date = planned_ist.date()
-
-            # Production rule:
-            # Do NOT shift Sunday/holiday tasks to another date.
-            # Block creation.
-            if not is_working_day(planned_ist_date):
-                errors.append(
-                    f"Row {row_no}: Planned date {planned_ist_date} is Sunday/holiday. Task not created."
-                )
-                continue
-
-            # Production rule:
-            # PENDING + APPROVED leave blocks immediately.
-            # Half-day leave blocks only exact planned time.
-            if _assignee_blocked_for_planned_time(assign_to, planned_dt):
-                errors.append(
-                    f"Row {row_no}: Assigned person '{assign_to_username}' is on leave during planned time. Task not created."
-                )
-                continue
-
-            priority = (_clean_str(row.get("Priority")) or "Low").title()
-            if priority not in ["Low", "Medium", "High"]:
-                priority = "Low"
-
-            time_per_task = parse_int(row.get("Time per Task (minutes)"), default=0)
-
-            delegation = Delegation(
-                assign_by=assign_by_user,
-                task_name=task_name,
-                assign_to=assign_to,
-                planned_date=planned_dt,
-                priority=priority,
-                attachment_mandatory=False,
-                mode=None,
-                frequency=None,
-                time_per_task_minutes=time_per_task,
-                actual_duration_minutes=0,
-                status="Pending",
-            )
-
-            task_objects.append(delegation)
-
-        except Exception as e:
-            errors.append(f"Row {row_no}: {str(e)}")
-
-    created = []
-
-    if task_objects:
-        try:
-            with transaction.atomic():
-                bs = min(len(task_objects), optimal_batch_size())
-                created = Delegation.objects.bulk_create(task_objects, batch_size=bs)
-
-        except Exception as e:
-            logger.error("Delegation bulk_create fallback: %s", e)
-
-            for i in range(0, len(task_objects), 50):
-                batch = task_objects[i:i + 50]
-
-                try:
-                    created.extend(Delegation.objects.bulk_create(batch, batch_size=50))
-
-                except Exception:
-                    for obj in batch:
-                        try:
-                            obj.save()
-                            created.append(obj)
-                        except Exception as save_err:
-                            errors.append(
-                                f"Failed to save delegation '{clean_unicode_string(obj.task_name)}': {save_err}"
-                            )
-
-    return created, errors
-
-
 def process_checklist_bulk_upload_excel_friendly(file, assign_by_user):
-    try:
-        df = parse_excel_file_optimized(file)
-    except Exception as e:
-        return [], [f"Error reading file: {e}. Please upload .xlsx, .xls or .csv"]
-
-    df, v_errors = validate_and_prepare_excel_data(df, "checklist")
-    if v_errors:
-        return [], v_errors
-
-    created, errors = [], []
-    user_cache.clear()
-
-    total = len(df)
-    bs = optimal_batch_size()
-    for start_idx in range(0, total, bs):
-        end_idx = min(start_idx + bs, total)
-        batch_df = df.iloc[start_idx:end_idx]
-        batch_created, batch_errors = process_checklist_batch_excel_ultra_optimized(
-            batch_df, assign_by_user, start_idx
-        )
-        created.extend(batch_created)
-        errors.extend(batch_errors)
-        if connection.vendor == "sqlite":
-            time.sleep(0.01)
-    return created, errors
+    return import_checklist_upload(file, assign_by_user)
 
 
 def process_delegation_bulk_upload_excel_friendly(file, assign_by_user):
-    try:
-        df = parse_excel_file_optimized(file)
-    except Exception as e:
-        return [], [f"Error reading file: {e}. Please upload .xlsx, .xls or .csv"]
-
-    df, v_errors = validate_and_prepare_excel_data(df, "delegation")
-    if v_errors:
-        return [], v_errors
-
-    created, errors = [], []
-    user_cache.clear()
-
-    total = len(df)
-    bs = optimal_batch_size()
-    for start_idx in range(0, total, bs):
-        end_idx = min(start_idx + bs, total)
-        batch_df = df.iloc[start_idx:end_idx]
-        batch_created, batch_errors = process_delegation_batch_excel_ultra_optimized(
-            batch_df, assign_by_user, start_idx
-        )
-        created.extend(batch_created)
-        errors.extend(batch_errors)
-        if connection.vendor == "sqlite":
-            time.sleep(0.01)
-    return created, errors
+    return import_delegation_upload(file, assign_by_user)
 
 
 def _send_bulk_emails_by_ids(task_ids, *, task_type: str):
@@ -1582,69 +988,83 @@ def list_checklist(request):
     # ------------------------------------------------------------------
     qs = _build_checklist_base_queryset(base_qs)
 
-    qs = qs.order_by(
-        "assign_to__first_name",
-        "assign_to__last_name",
-        "task_name",
-        "-planned_date",
-        "-id",
-    )
-
-    total_assigned = qs.count()
+    qs = qs.order_by(*CHECKLIST_LIST_ORDER)
 
     # ------------------------------------------------------------------
-    # CSV download
+    # CSV / XLSX download (streamed, keyset pages of values() rows)
     # ------------------------------------------------------------------
     if request.GET.get("download") == "1":
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="checklist_master_tasks.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            "Task Name",
-            "Message",
-            "Assign To",
-            "Frequency",
-            "Planned Date",
-            "Priority",
-            "Remind Before Days",
-            "Reminder",
-        ])
-
-        for obj in qs.iterator(chunk_size=500):
-            assign_to_name = (
-                obj.assign_to.get_full_name()
-                or obj.assign_to.username
-                or obj.assign_to.email
-            )
+        rows = keyset_rows(
+            qs,
+            [
+                "task_name",
+                "message",
+                "assign_to__username",
+                "assign_to__email",
+                "mode",
+                "frequency",
+                "priority",
+                "remind_before_days",
+                "set_reminder",
+                "reminder_mode",
+                "reminder_frequency",
+                "reminder_starting_time",
+            ],
+            order_by=CHECKLIST_LIST_ORDER,
+        )
 
-            if obj.mode and obj.frequency:
-                frequency_text = f"Every {obj.frequency} {obj.mode}"
-            elif obj.mode:
-                frequency_text = obj.mode
-            else:
-                frequency_text = "One-time"
-
-            reminder_text = ""
-            if getattr(obj, "set_reminder", False):
-                reminder_text = getattr(obj, "reminder_mode", "") or ""
-                if getattr(obj, "reminder_frequency", None):
-                    reminder_text += f" ({obj.reminder_frequency})"
-                if getattr(obj, "reminder_starting_time", None):
-                    reminder_text += f" @ {obj.reminder_starting_time}"
-
-            writer.writerow([
-                obj.task_name,
-                obj.message,
-                assign_to_name,
-                frequency_text,
-                timezone.localtime(obj.planned_date).strftime("%Y-%m-%d %H:%M") if obj.planned_date else "",
-                obj.priority,
-                obj.remind_before_days or 0,
-                reminder_text,
-            ])
-
-        return response
+        def _export_rows():
+            for row in rows:
+                assign_to_name = (
+                    f"{row['assign_to__first_name']} {row['assign_to__last_name']}".strip()
+                    or row["assign_to__username"]
+                    or row["assign_to__email"]
+                )
+
+                if row["mode"] and row["frequency"]:
+                    frequency_text = f"Every {row['frequency']} {row['mode']}"
+                elif row["mode"]:
+                    frequency_text = row["mode"]
+                else:
+                    frequency_text = "One-time"
+
+                reminder_text = ""
+                if row["set_reminder"]:
+                    reminder_text = row["reminder_mode"] or ""
+                    if row["reminder_frequency"]:
+                        reminder_text += f" ({row['reminder_frequency']})"
+                    if row["reminder_starting_time"]:
+                        reminder_text += f" @ {row['reminder_starting_time']}"
+
+                yield [
+                    row["task_name"],
+                    row["message"],
+                    assign_to_name,
+                    frequency_text,
+                    timezone.localtime(row["planned_date"]).strftime("%Y-%m-%d %H:%M") if row["planned_date"] else "",
+                    row["priority"],
+                    row["remind_before_days"] or 0,
+                    reminder_text,
+                ]
+
+        return export_response(
+            request,
+            "checklist_master_tasks",
+            [
+                "Task Name",
+                "Message",
+                "Assign To",
+                "Frequency",
+                "Planned Date",
+                "Priority",
+                "Remind Before Days",
+                "Reminder",
+            ],
+            _export_rows(),
+            sheet_title="Checklist",
+        )
+
+    total_assigned = qs.count()
 
     # ------------------------------------------------------------------
     # Pagination
@@ -1,7 +1,6 @@
 # apps/tasks/views_reports.py
 from __future__ import annotations
 
-import csv
 import logging
 from typing import Optional
 
@@ -10,11 +9,12 @@ from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.db.models import Count, Q
-from django.http import HttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
+from apps.common.exports import export_response, keyset_rows
+
 from .models import Checklist, Delegation
 from .views import is_admin_user, clean_unicode_string
 
@@ -101,6 +101,10 @@ def checklist_report(request):
             qs = qs.filter(status=status_param)
         return qs
 
+    # ── CSV / XLSX download: streamed straight from the querysets ──────────────
+    if request.GET.get("download"):
+        return _export_report(request, task_type, _apply_filters)
+
     items = []
     summary_by_employee: dict = {}
     now = timezone.now()
@@ -187,10 +191,6 @@ def checklist_report(request):
         ).lower(),
     )
 
-    # ── CSV download ───────────────────────────────────────────────────────────
-    if request.GET.get("download"):
-        return _export_csv(items)
-
     return render(request, "tasks/checklist_report.html", {
         "items": items,
         "summary_list": summary_list,
@@ -297,34 +297,71 @@ def _accum_summary(summary: dict, uid, employee, row: dict,
             s["_delay_count"] += 1
 
 
-def _export_csv(items: list) -> HttpResponse:
-    resp = HttpResponse(content_type="text/csv")
-    resp["Content-Disposition"] = 'attachment; filename="task_performance_report.csv"'
-    w = csv.writer(resp)
-    w.writerow([
-        "Task ID", "Type", "Task Name",
-        "Assigned By", "Assigned To",
-        "Planned Date", "Completed Date",
-        "Status", "Priority",
-        "Delay", "Deleted/Skipped",
-    ])
-    for row in items:
-        def _name(u):
-            if not u:
-                return ""
-            return u.get_full_name() or u.username
-
-        w.writerow([
-            row["task_id"],
-            row["task_type"],
-            clean_unicode_string(row["task_name"]),
-            _name(row["assign_by"]),
-            _name(row["assign_to"]),
-            row["planned_date"].strftime("%Y-%m-%d %H:%M") if row["planned_date"] else "",
-            row["completed_at"].strftime("%Y-%m-%d %H:%M") if row["completed_at"] else "",
-            row["status"],
-            row["priority"],
-            row["delay_display"],
-            "Yes" if row["is_deleted"] else "No",
-        ])
-    return resp
\ No newline at end of file
+_REPORT_EXPORT_SOURCES = (
+    ("checklist", "CL", "Checklist", Checklist),
+    ("delegation", "DL", "Delegation", Delegation),
+)
+
+_REPORT_EXPORT_FIELDS = [
+    "task_name",
+    "assign_by__first_name",
+    "assign_by__last_name",
+    "assign_by__username",
+    "assign_to__first_name",
+    "assign_to__last_name",
+    "assign_to__username",
+    "planned_date",
+    "completed_at",
+    "status",
+    "priority",
+    "is_skipped_due_to_leave",
+]
+
+
+def _export_user_name(row: dict, prefix: str) -> str:
+    full_name = f"{row[f'{prefix}__first_name'] or ''} {row[f'{prefix}__last_name'] or ''}".strip()
+    return full_name or row[f"{prefix}__username"] or ""
+
+
+def _export_report(request, task_type: str, apply_filters):
+    """Same columns as the on-screen report, one keyset page at a time."""
+
+    def _rows():
+        for key, id_prefix, label, model in _REPORT_EXPORT_SOURCES:
+            if task_type not in (key, "all"):
+                continue
+
+            rows = keyset_rows(
+                apply_filters(model.objects.all()),
+                _REPORT_EXPORT_FIELDS,
+                order_by=("assign_to__first_name", "assign_to__username", "-planned_date", "-id"),
+            )
+            for row in rows:
+                delay_minutes = _calc_delay(row["planned_date"], row["completed_at"], row["status"])
+                yield [
+                    f"{id_prefix}-{row['id']}",
+                    label,
+                    clean_unicode_string(row["task_name"]),
+                    _export_user_name(row, "assign_by"),
+                    _export_user_name(row, "assign_to"),
+                    row["planned_date"].strftime("%Y-%m-%d %H:%M") if row["planned_date"] else "",
+                    row["completed_at"].strftime("%Y-%m-%d %H:%M") if row["completed_at"] else "",
+                    row["status"],
+                    row["priority"] or "Low",
+                    _fmt_delay(delay_minutes),
+                    "Yes" if row["is_skipped_due_to_leave"] else "No",
+                ]
+
+    return export_response(
+        request,
+        "task_performance_report",
+        [
+            "Task ID", "Type", "Task Name",
+            "Assigned By", "Assigned To",
+            "Planned Date", "Completed Date",
+            "Status", "Priority",
+            "Delay", "Deleted/Skipped",
+        ],
+        _rows(),
+        sheet_title="Task Performance",
+    )
@@ -17,5 +17,7 @@ class UsersConfig(AppConfig):
           1. Profile.post_save  → ensure Admin role marks user.is_staff = True
           2. User.post_save     → sync Employee.is_active from User.is_active
                                   (single source of truth enforcement)
+          3. Profile / User / group membership / Group / ApproverMapping
+             changes            → drop cached permission codes
         """
         import apps.users.signals  # noqa: F401  — registers all receivers
\ No newline at end of file
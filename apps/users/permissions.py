@@ -10,6 +10,7 @@ from django import template
 from django.apps import apps as django_apps
 from django.conf import settings
 from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
 from django.http import HttpResponseForbidden
 
 register = template.Library()
@@ -293,7 +294,85 @@ def _baseline_dynamic_grants(user) -> Set[str]:
     return {"reimbursement_apply", "reimbursement_list", "kam_plan", "kam_visits"}
 
 
+# -----------------------------------------------------------------------------
+# Permission-code cache
+#
+# Resolved codes are memoised on the user object for the rest of the request
+# and in the shared cache (Redis in production) across requests. Entries are
+# dropped by apps.users.signals when a Profile, group membership or
+# ApproverMapping changes; bump PERMISSION_CACHE_VERSION whenever the grant
+# rules in this module change so stale entries are ignored after deploy.
+# -----------------------------------------------------------------------------
+PERMISSION_CACHE_VERSION = 1
+PERMISSION_CACHE_TIMEOUT = int(getattr(settings, "PERMISSION_CACHE_TIMEOUT", 600))
+_REQUEST_MEMO_ATTR = "_permission_codes_cache"
+
+
+def _permission_cache_key(user_id) -> str:
+    return f"perm_codes:v{PERMISSION_CACHE_VERSION}:{user_id}"
+
+
+def invalidate_permission_cache(*user_ids) -> None:
+    """Drop cached permission codes for the given user ids."""
+    keys = [_permission_cache_key(uid) for uid in user_ids if uid]
+    if not keys:
+        return
+    try:
+        cache.delete_many(keys)
+    except Exception:
+        logger.exception("Could not invalidate permission cache for users %s", user_ids)
+
+
+def forget_request_permissions(user) -> None:
+    """Clear the per-request memo on a user instance (after in-request edits)."""
+    if user is not None:
+        user.__dict__.pop(_REQUEST_MEMO_ATTR, None)
+
+
 def _user_permission_codes(user) -> Set[str]:
+    """
+    Cached wrapper around _compute_permission_codes.
+
+    Lookup order: per-request memo on the user object → shared cache →
+    recompute (and store). Returns a fresh set each call so callers may
+    mutate it.
+    """
+    if getattr(user, "is_superuser", False):
+        return {"*"}
+
+    user_id = getattr(user, "pk", None)
+    if not user_id or not getattr(user, "is_authenticated", False):
+        return _compute_permission_codes(user)
+
+    memo = getattr(user, _REQUEST_MEMO_ATTR, None)
+    if memo is not None:
+        return set(memo)
+
+    key = _permission_cache_key(user_id)
+    codes = None
+    try:
+        codes = cache.get(key)
+    except Exception:
+        logger.exception("Permission cache read failed for user %s", user_id)
+
+    if codes is None:
+        codes = frozenset(_compute_permission_codes(user))
+        try:
+            cache.set(key, codes, PERMISSION_CACHE_TIMEOUT)
+        except Exception:
+            logger.exception("Permission cache write failed for user %s", user_id)
+    else:
+        codes = frozenset(codes)
+
+    try:
+        setattr(user, _REQUEST_MEMO_ATTR, codes)
+    except Exception:
+        pass
+
+    return set(codes)
+
+
+def _compute_permission_codes(user) -> Set[str]:
     """
     Get all permission codes for a user, including:
     - Profile.permissions
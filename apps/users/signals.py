@@ -5,10 +5,12 @@ import logging
 from typing import Optional
 
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from .models import Profile
+from .permissions import forget_request_permissions, invalidate_permission_cache
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -88,4 +90,71 @@ def sync_employee_active_from_user(sender, instance: User, created: bool, **kwar
             "Failed to sync Employee.is_active for User(id=%s). "
             "Manual reconciliation may be required.",
             getattr(instance, "pk", "?"),
-        )
\ No newline at end of file
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Permission-code cache invalidation (see apps.users.permissions)
+# ─────────────────────────────────────────────────────────────────────────────
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_permissions_on_profile_change(sender, instance: Profile, **kwargs):
+    invalidate_permission_cache(instance.user_id)
+    forget_request_permissions(instance._state.fields_cache.get("user"))
+
+
+@receiver(post_save, sender=User)
+def invalidate_permissions_on_user_change(sender, instance: User, **kwargs):
+    invalidate_permission_cache(instance.pk)
+    forget_request_permissions(instance)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_permissions_on_group_membership(sender, instance, action: str, reverse: bool, pk_set, **kwargs):
+    """
+    user.groups.add(...) → instance is the User;
+    group.user_set.add(...) → instance is the Group and pk_set holds user ids.
+    """
+    if action not in {"post_add", "post_remove", "post_clear", "pre_clear"}:
+        return
+
+    if not reverse:
+        invalidate_permission_cache(instance.pk)
+        forget_request_permissions(instance)
+    elif action == "pre_clear":
+        invalidate_permission_cache(*instance.user_set.values_list("pk", flat=True))
+    elif pk_set:
+        invalidate_permission_cache(*pk_set)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_permissions_on_group_change(sender, instance: Group, **kwargs):
+    """Group grants are name-based, so a rename changes every member's codes."""
+    try:
+        invalidate_permission_cache(*instance.user_set.values_list("pk", flat=True))
+    except Exception:
+        logger.exception("Could not invalidate permission cache for group %s", instance.pk)
+
+
+@receiver(pre_save, sender="leave.ApproverMapping")
+def remember_previous_reporting_person(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("reporting_person_id", flat=True)
+            .first()
+        )
+    instance._previous_reporting_person_id = previous
+
+
+@receiver(post_save, sender="leave.ApproverMapping")
+@receiver(post_delete, sender="leave.ApproverMapping")
+def invalidate_permissions_on_mapping_change(sender, instance, **kwargs):
+    """The reporting person gains/loses 'leave_pending_manager'."""
+    invalidate_permission_cache(
+        instance.reporting_person_id,
+        getattr(instance, "_previous_reporting_person_id", None),
+    )
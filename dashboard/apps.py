@@ -32,3 +32,6 @@ class DashboardConfig(AppConfig):
                     logger.error("Failed to append dashboard_extras to template_builtins: %s", e)
         except Exception as e:
             logger.error("Failed to register dashboard_extras builtin: %s", e)
+
+        # Task / handover changes invalidate cached dashboard payloads.
+        from . import signals  # noqa: F401
@@ -0,0 +1,159 @@
+# dashboard/payload_cache.py
+"""
+Per-user dashboard payload cache.
+
+dashboard_home splits its work into a payload that depends only on the user
+and the IST day (counts, candidate task lists, time cards, handover blocks)
+and a cheap per-request pass (10:00 visibility rule, tab, today-only). The
+payload is cached here under dash:payload:u<id>:<IST day>.
+
+Each entry records the user's dashboard version at build time. Task, leave
+request and handover save/delete signals (dashboard/signals.py) bump the
+version of the users they touch, which makes the entry stale. Writers that
+bypass signals (bulk_create, queryset .update()) call
+invalidate_user_dashboards / invalidate_handover_dashboards themselves:
+
+- default: a stale entry is rebuilt inline on the next visit;
+- DASHBOARD_STALE_WHILE_REVALIDATE=True: the stale entry is served and a
+  Celery task rebuilds it in the background (one refresh per user at a time).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_TTL = int(getattr(settings, "DASHBOARD_PAYLOAD_CACHE_TIMEOUT", 3600) or 3600)
+STALE_WHILE_REVALIDATE = bool(getattr(settings, "DASHBOARD_STALE_WHILE_REVALIDATE", False))
+
+_REFRESH_LOCK_TTL = 120
+
+
+def _version_key(user_id: int) -> str:
+    return f"dash:ver:u{user_id}"
+
+
+def _payload_key(user_id: int, day: date) -> str:
+    return f"dash:payload:u{user_id}:{day.isoformat()}"
+
+
+def _refresh_lock_key(user_id: int, day: date) -> str:
+    return f"dash:refresh:u{user_id}:{day.isoformat()}"
+
+
+def _fresh_version() -> int:
+    # Time-based so an evicted counter never restarts at a value an old
+    # entry may still carry.
+    return int(time.time() * 1000)
+
+
+def user_version(user_id: int) -> int:
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key, 0)
+    return int(version)
+
+
+def invalidate_user_dashboards(user_ids: Iterable[int | None]) -> None:
+    """Mark the cached payloads of `user_ids` stale (None ids are ignored)."""
+    for user_id in {uid for uid in user_ids if uid}:
+        key = _version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), timeout=None)
+        except Exception:
+            logger.debug("Dashboard invalidation failed for user %s", user_id, exc_info=True)
+
+
+def invalidate_user_dashboards_on_commit(user_ids: Iterable[int | None]) -> None:
+    """invalidate_user_dashboards(user_ids) once the current transaction commits."""
+    user_ids = [uid for uid in user_ids if uid]
+    if user_ids:
+        transaction.on_commit(lambda: invalidate_user_dashboards(user_ids))
+
+
+def invalidate_handover_dashboards(handovers) -> None:
+    """
+    Invalidate, on commit, the original and new assignees of `handovers` (a
+    LeaveHandover queryset). Call before a queryset .update() that may take
+    the rows out of the filter.
+    """
+    rows = handovers.values_list("new_assignee_id", "original_assignee_id")
+    invalidate_user_dashboards_on_commit([uid for pair in rows for uid in pair])
+
+
+def store_payload(user_id: int, day: date, version: int, payload: dict) -> None:
+    try:
+        cache.set(
+            _payload_key(user_id, day),
+            {"version": version, "payload": payload},
+            PAYLOAD_TTL,
+        )
+    except Exception:
+        logger.debug("Dashboard payload cache set failed for user %s", user_id, exc_info=True)
+
+
+def release_refresh_lock(user_id: int, day: date) -> None:
+    cache.delete(_refresh_lock_key(user_id, day))
+
+
+def _schedule_refresh(user_id: int, day: date) -> None:
+    lock_key = _refresh_lock_key(user_id, day)
+    if not cache.add(lock_key, True, timeout=_REFRESH_LOCK_TTL):
+        return
+
+    try:
+        from .tasks import refresh_dashboard_payload  # lazy import
+
+        refresh_dashboard_payload.delay(user_id, day.isoformat())
+    except Exception:
+        cache.delete(lock_key)
+        logger.warning("Dashboard refresh could not be queued for user %s", user_id, exc_info=True)
+
+
+def get_payload(user_id: int, day: date, build: Callable[[], dict]) -> dict:
+    """
+    Cached payload for (user, IST day); `build()` computes it on a miss or,
+    outside stale-while-revalidate mode, when the entry is stale.
+    """
+    try:
+        version = user_version(user_id)
+        entry = cache.get(_payload_key(user_id, day))
+    except Exception:
+        logger.debug("Dashboard payload cache unavailable", exc_info=True)
+        return build()
+
+    if entry is not None:
+        if entry.get("version") == version:
+            return entry["payload"]
+
+        if STALE_WHILE_REVALIDATE:
+            _schedule_refresh(user_id, day)
+            return entry["payload"]
+
+    payload = build()
+    store_payload(user_id, day, version, payload)
+    return payload
+
+
+__all__ = [
+    "PAYLOAD_TTL",
+    "STALE_WHILE_REVALIDATE",
+    "get_payload",
+    "invalidate_handover_dashboards",
+    "invalidate_user_dashboards",
+    "invalidate_user_dashboards_on_commit",
+    "release_refresh_lock",
+    "store_payload",
+    "user_version",
+]
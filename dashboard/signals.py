@@ -0,0 +1,104 @@
+# dashboard/signals.py
+# PURPOSE: Mark cached dashboard payloads stale when a task, leave handover or
+#          leave request changes. Bulk writers (bulk_create, queryset .update())
+#          bypass these receivers and invalidate through payload_cache directly.
+from __future__ import annotations
+
+import logging
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from apps.tasks.models import Checklist, Delegation, HelpTicket
+
+from .payload_cache import invalidate_handover_dashboards, invalidate_user_dashboards_on_commit
+
+logger = logging.getLogger(__name__)
+
+_HANDOVER_TASK_TYPES = {
+    Checklist: "checklist",
+    Delegation: "delegation",
+    HelpTicket: "help_ticket",
+}
+
+
+def _handover_user_ids(sender, task_id) -> list[int]:
+    """Delegates and original assignees who see this task through a handover."""
+    try:
+        from apps.leave.models import LeaveHandover
+
+        rows = LeaveHandover.objects.filter(
+            task_type=_HANDOVER_TASK_TYPES[sender],
+            original_task_id=task_id,
+        ).values_list("new_assignee_id", "original_assignee_id")
+        return [uid for pair in rows for uid in pair]
+    except Exception:
+        logger.debug("Dashboard handover lookup failed for %s %s", sender.__name__, task_id, exc_info=True)
+        return []
+
+
+def _remember_previous_assignee(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    try:
+        instance._dashboard_previous_assignee_id = (
+            sender.objects.filter(pk=instance.pk).values_list("assign_to_id", flat=True).first()
+        )
+    except Exception:
+        logger.debug("Dashboard previous assignee lookup failed for %s %s", sender.__name__, instance.pk, exc_info=True)
+
+
+def _task_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_user_dashboards_on_commit([
+        instance.assign_to_id,
+        getattr(instance, "_dashboard_previous_assignee_id", None),
+        *_handover_user_ids(sender, instance.pk),
+    ])
+
+
+def _task_deleted(sender, instance, **kwargs):
+    invalidate_user_dashboards_on_commit([instance.assign_to_id, *_handover_user_ids(sender, instance.pk)])
+
+
+def _handover_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_user_dashboards_on_commit([instance.new_assignee_id, instance.original_assignee_id])
+
+
+def _leave_request_changed(sender, instance, raw=False, **kwargs):
+    # Handover blocks filter on leave_request__status, and approve/reject/
+    # cancel deactivate handovers with a queryset update.
+    if raw or instance.pk is None:
+        return
+    try:
+        from apps.leave.models import LeaveHandover
+
+        invalidate_handover_dashboards(LeaveHandover.objects.filter(leave_request_id=instance.pk))
+    except Exception:
+        logger.debug("Dashboard handover invalidation failed for leave %s", instance.pk, exc_info=True)
+
+
+for _model in _HANDOVER_TASK_TYPES:
+    _uid = f"dashboard_payload_{_model.__name__}"
+    pre_save.connect(_remember_previous_assignee, sender=_model, dispatch_uid=f"{_uid}_pre_save")
+    post_save.connect(_task_saved, sender=_model, dispatch_uid=f"{_uid}_post_save")
+    post_delete.connect(_task_deleted, sender=_model, dispatch_uid=f"{_uid}_post_delete")
+
+
+def _connect_handover_signals() -> None:
+    try:
+        from apps.leave.models import LeaveHandover, LeaveRequest
+    except Exception:
+        logger.warning("Leave app unavailable; dashboard handover invalidation disabled.")
+        return
+
+    post_save.connect(_handover_changed, sender=LeaveHandover, dispatch_uid="dashboard_payload_LeaveHandover_post_save")
+    post_delete.connect(_handover_changed, sender=LeaveHandover, dispatch_uid="dashboard_payload_LeaveHandover_post_delete")
+    post_save.connect(_leave_request_changed, sender=LeaveRequest, dispatch_uid="dashboard_payload_LeaveRequest_post_save")
+    # pre_delete: the handovers are still there to be looked up.
+    pre_delete.connect(_leave_request_changed, sender=LeaveRequest, dispatch_uid="dashboard_payload_LeaveRequest_pre_delete")
+
+
+_connect_handover_signals()
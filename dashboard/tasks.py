@@ -0,0 +1,36 @@
+# dashboard/tasks.py
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from .payload_cache import release_refresh_lock, store_payload, user_version
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def refresh_dashboard_payload(user_id: int, day_iso: str) -> None:
+    """Stale-while-revalidate: rebuild one user's cached dashboard payload."""
+    from .views import IST, build_dashboard_payload  # lazy import
+
+    day = date.fromisoformat(day_iso)
+
+    try:
+        if day != timezone.localtime(timezone.now(), IST).date():
+            return
+
+        user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            return
+
+        version = user_version(user_id)
+        store_payload(user_id, day, version, build_dashboard_payload(user, day))
+    except Exception:
+        logger.exception("Dashboard payload refresh failed for user %s", user_id)
+    finally:
+        release_refresh_lock(user_id, day)
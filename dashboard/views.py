@@ -4,33 +4,34 @@ from __future__ import annotations
 import logging
 import sys
 from datetime import date, datetime, time as dt_time, timedelta
+from zoneinfo import ZoneInfo
 
 import pytz
 from dateutil.relativedelta import relativedelta
 
-from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.cache import cache
-from django.db.models import Sum
+from django.db.models import DateField, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, TruncDate
 from django.db.utils import OperationalError, ProgrammingError
 from django.shortcuts import render
 from django.utils import timezone
 
-from apps.settings.models import Holiday
+from apps.settings.holiday_calendar import get_holiday_calendar
 from apps.tasks.models import Checklist, Delegation, HelpTicket
 from apps.tasks.services.holiday_guard import is_holiday_for_user, holiday_skip_reason
 
+from .payload_cache import get_payload
+
 logger = logging.getLogger(__name__)
 
 IST = pytz.timezone("Asia/Kolkata")
+# zoneinfo twin of IST: safe for make_aware (pytz needs localize) and DB date truncation
+_IST_ZONE = ZoneInfo("Asia/Kolkata")
 RECURRING_MODES = ["Daily", "Weekly", "Monthly", "Yearly"]
 
 EVENING_HOUR = 19
 EVENING_MINUTE = 0
 
-_DASH_TTL = int(getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300) or 300)
-_DASH_FAST_TTL = min(_DASH_TTL, 60)
-
 
 # ---------------------------------------------------------------------
 # Logging helper
@@ -116,11 +117,11 @@ def _ist_span_to_project_bounds(d_from: date, d_to_inclusive: date):
 
     start_ist = timezone.make_aware(
         datetime.combine(d_from, dt_time.min),
-        IST,
+        _IST_ZONE,
     )
     end_ist = timezone.make_aware(
         datetime.combine(d_to_inclusive + timedelta(days=1), dt_time.min),
-        IST,
+        _IST_ZONE,
     )
 
     return (
@@ -137,11 +138,11 @@ def _today_project_bounds(today_ist: date):
 
     start_ist = timezone.make_aware(
         datetime.combine(today_ist, dt_time.min),
-        IST,
+        _IST_ZONE,
     )
     end_ist = timezone.make_aware(
         datetime.combine(today_ist, dt_time.max),
-        IST,
+        _IST_ZONE,
     )
 
     return (
@@ -166,10 +167,7 @@ def next_working_day(dt_: date) -> date:
     Dashboard does not use this to shift tasks.
     Recurring engine must skip holidays, not shift.
     """
-    while not is_working_day(dt_):
-        dt_ += timedelta(days=1)
-
-    return dt_
+    return get_holiday_calendar(dt_).next_working_day(dt_)
 
 
 def get_next_planned_date(prev_dt: datetime, mode: str, frequency: int) -> datetime | None:
@@ -439,9 +437,122 @@ def _get_handover_tasks_for_user(user, today_date: date):
 # ---------------------------------------------------------------------
 # Time aggregations
 # ---------------------------------------------------------------------
+def _clamped_frequency(value) -> int:
+    try:
+        freq = int(value or 1)
+    except Exception:
+        freq = 1
+    return max(1, min(freq, 10))
+
+
+def _occurrences(mode: str, freq: int, start_date: date, end_date: date) -> int:
+    """
+    Closed-form count of `mode`/`freq` occurrences from start_date through
+    end_date (inclusive); 0 when the span is empty.
+    """
+    if mode == "Daily":
+        span = (end_date - start_date).days
+    elif mode == "Weekly":
+        span = (end_date - start_date).days // 7
+    elif mode == "Monthly":
+        span = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
+        if end_date.day < start_date.day:
+            span -= 1
+    elif mode == "Yearly":
+        span = end_date.year - start_date.year
+        if (end_date.month, end_date.day) < (start_date.month, start_date.day):
+            span -= 1
+    else:
+        return 0
+
+    return (span // freq) + 1 if span >= 0 else 0
+
+
 def calculate_checklist_assigned_time(qs, date_from, date_to):
     """
     Calculate estimated checklist assigned time in minutes.
+
+    Tasks are grouped in SQL by (mode, frequency, effective start date), where
+    the effective start is the IST planned date clamped up to date_from, so
+    the Python side only does the occurrence arithmetic once per group.
+    """
+    date_from = _coerce_date_safe(date_from)
+    date_to = _coerce_date_safe(date_to)
+
+    if not date_from or not date_to:
+        return 0
+
+    try:
+        start_dt, end_dt = _ist_span_to_project_bounds(date_from, date_to)
+
+        groups = (
+            qs.filter(planned_date__lt=end_dt)
+            .annotate(
+                start_day=Greatest(
+                    TruncDate("planned_date", tzinfo=_IST_ZONE),
+                    Value(date_from, output_field=DateField()),
+                ),
+            )
+            .values("mode", "frequency", "start_day")
+            .annotate(
+                minutes=Coalesce(Sum("time_per_task_minutes"), 0),
+                in_window_minutes=Coalesce(
+                    Sum("time_per_task_minutes", filter=Q(planned_date__gte=start_dt)),
+                    0,
+                ),
+            )
+            .order_by()
+        )
+
+        total_minutes = 0
+
+        for row in groups:
+            mode = row["mode"] or ""
+
+            if mode in RECURRING_MODES:
+                occur = _occurrences(
+                    mode,
+                    _clamped_frequency(row["frequency"]),
+                    _coerce_date_safe(row["start_day"]),
+                    date_to,
+                )
+                total_minutes += int(row["minutes"] or 0) * occur
+            else:
+                # One-time tasks count only when planned inside the window.
+                total_minutes += int(row["in_window_minutes"] or 0)
+
+        return total_minutes
+
+    except Exception as e:
+        logger.error(
+            _safe_console_text(f"Grouped checklist time estimate failed, using row-wise path: {e}")
+        )
+        return _checklist_assigned_time_rowwise(qs, date_from, date_to)
+
+
+def _assigned_time_cards(user, start_prev: date, end_prev: date, start_current: date, today_ist: date) -> dict:
+    """
+    Previous/current week assigned minutes for checklists and delegations.
+    Cached with the rest of the dashboard payload (per user per IST day).
+    """
+    pending_checklists = Checklist.objects.filter(
+        assign_to=user,
+        status="Pending",
+        is_skipped_due_to_leave=False,
+    )
+
+    return {
+        "prev_min": calculate_checklist_assigned_time(pending_checklists, start_prev, end_prev),
+        "curr_min": calculate_checklist_assigned_time(pending_checklists, start_current, today_ist),
+        "prev_min_del": calculate_delegation_assigned_time_safe(user, start_prev, end_prev),
+        "curr_min_del": calculate_delegation_assigned_time_safe(user, start_current, today_ist),
+    }
+
+
+def _checklist_assigned_time_rowwise(qs, date_from, date_to):
+    """
+    Row-by-row fallback for calculate_checklist_assigned_time (used only if
+    the grouped query fails, e.g. on a backend without date functions).
     """
     total_minutes = 0
 
@@ -607,307 +718,181 @@ def minutes_to_hhmm(minutes):
 
 
 # ---------------------------------------------------------------------
-# Main dashboard view
+# Dashboard payload (per user per IST day; cached in payload_cache)
 # ---------------------------------------------------------------------
-@login_required
-def dashboard_home(request):
-    """
-    Final BOS Lakshya dashboard rule:
+_EMPTY_WEEK_SCORE = {
+    "checklist": {"previous": 0, "current": 0},
+    "delegation": {"previous": 0, "current": 0},
+    "help_ticket": {"previous": 0, "current": 0},
+}
 
-    Sunday/Holiday = complete off day.
+_EMPTY_TASK_COUNTS = {
+    "checklist": 0,
+    "delegation": 0,
+    "help_ticket": 0,
+}
 
-    On Sunday/Holiday:
-    - no checklist visible
-    - no delegation visible
-    - no help ticket visible
-    - no handover actionable item visible
-    - old wrongly-created holiday tasks are suppressed
-
-    Normal day:
-    - checklist follows 10:00 IST visibility rule
-    - delegation/help ticket visible as per existing date logic
-    """
-    now_ist = timezone.localtime(timezone.now(), IST)
-    today_ist = now_ist.date()
-
-    project_tz = timezone.get_current_timezone()
-    now_project_tz = timezone.localtime(now_ist, project_tz)
-
-    selected = request.GET.get("task_type")
-    today_only = (
-        request.GET.get("today") == "1"
-        or request.GET.get("today_only") == "1"
-    )
 
-    logger.info(
-        _safe_console_text(
-            f"Dashboard accessed by {request.user.username} "
-            f"at {now_ist.strftime('%Y-%m-%d %H:%M:%S IST')}"
-        )
-    )
-
-    # ---------------------------------------------------------------
-    # Holiday / Sunday detection
-    # ---------------------------------------------------------------
-    try:
-        is_holiday_today = Holiday.objects.filter(date=today_ist).exists()
-    except (OperationalError, ProgrammingError):
-        is_holiday_today = False
-    except Exception:
-        is_holiday_today = False
+def _empty_task_blocks() -> dict:
+    return {
+        "checklist": [],
+        "delegation": [],
+        "help_ticket": [],
+    }
 
-    is_sunday_today = today_ist.weekday() == 6
-    is_off_day_today = bool(is_holiday_today or is_sunday_today)
 
-    # ---------------------------------------------------------------
-    # Week ranges
-    # ---------------------------------------------------------------
+def _week_score_and_pending(user, today_ist: date, is_off_day_today: bool):
+    """
+    Completed counts for the previous/current week and open task counts.
+    """
     start_current = today_ist - timedelta(days=today_ist.weekday())
     start_prev = start_current - timedelta(days=7)
     end_prev = start_current - timedelta(days=1)
 
-    # ---------------------------------------------------------------
-    # Weekly score and pending count
-    # ---------------------------------------------------------------
-    cache_key_week = f"dash:week_score:u{request.user.id}:{today_ist.isoformat()}"
-    cache_key_pending = f"dash:pending:u{request.user.id}:{today_ist.isoformat()}"
-
-    week_score = cache.get(cache_key_week)
-    pending_tasks = cache.get(cache_key_pending)
-
-    if week_score is None or pending_tasks is None:
-        try:
-            curr_start_dt, curr_end_dt = _ist_span_to_project_bounds(
-                start_current,
-                today_ist,
-            )
-            prev_start_dt, prev_end_dt = _ist_span_to_project_bounds(
-                start_prev,
-                end_prev,
-            )
-
-            curr_chk = Checklist.objects.filter(
-                assign_to=request.user,
-                status="Completed",
-                planned_date__gte=curr_start_dt,
-                planned_date__lt=curr_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            prev_chk = Checklist.objects.filter(
-                assign_to=request.user,
-                status="Completed",
-                planned_date__gte=prev_start_dt,
-                planned_date__lt=prev_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            curr_del = Delegation.objects.filter(
-                assign_to=request.user,
-                status="Completed",
-                planned_date__gte=curr_start_dt,
-                planned_date__lt=curr_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            prev_del = Delegation.objects.filter(
-                assign_to=request.user,
-                status="Completed",
-                planned_date__gte=prev_start_dt,
-                planned_date__lt=prev_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            curr_help = HelpTicket.objects.filter(
-                assign_to=request.user,
-                status="Closed",
-                planned_date__gte=curr_start_dt,
-                planned_date__lt=curr_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            prev_help = HelpTicket.objects.filter(
-                assign_to=request.user,
-                status="Closed",
-                planned_date__gte=prev_start_dt,
-                planned_date__lt=prev_end_dt,
-                is_skipped_due_to_leave=False,
-            ).count()
-
-            week_score = {
-                "checklist": {
-                    "previous": prev_chk,
-                    "current": curr_chk,
-                },
-                "delegation": {
-                    "previous": prev_del,
-                    "current": curr_del,
-                },
-                "help_ticket": {
-                    "previous": prev_help,
-                    "current": curr_help,
-                },
-            }
-
-            if is_off_day_today:
-                pending_tasks = {
-                    "checklist": 0,
-                    "delegation": 0,
-                    "help_ticket": 0,
-                }
-            else:
-                pending_tasks = {
-                    "checklist": Checklist.objects.filter(
-                        assign_to=request.user,
-                        status="Pending",
-                        is_skipped_due_to_leave=False,
-                    ).count(),
-                    "delegation": Delegation.objects.filter(
-                        assign_to=request.user,
-                        status="Pending",
-                        is_skipped_due_to_leave=False,
-                    ).count(),
-                    "help_ticket": HelpTicket.objects.filter(
-                        assign_to=request.user,
-                        is_skipped_due_to_leave=False,
-                    ).exclude(status="Closed").count(),
-                }
-
-            cache.set(cache_key_week, week_score, _DASH_FAST_TTL)
-            cache.set(cache_key_pending, pending_tasks, _DASH_FAST_TTL)
+    try:
+        curr_start_dt, curr_end_dt = _ist_span_to_project_bounds(
+            start_current,
+            today_ist,
+        )
+        prev_start_dt, prev_end_dt = _ist_span_to_project_bounds(
+            start_prev,
+            end_prev,
+        )
 
-        except Exception as e:
-            logger.error(_safe_console_text(f"Error calculating weekly scores: {e}"))
-
-            week_score = {
-                "checklist": {
-                    "previous": 0,
-                    "current": 0,
-                },
-                "delegation": {
-                    "previous": 0,
-                    "current": 0,
-                },
-                "help_ticket": {
-                    "previous": 0,
-                    "current": 0,
-                },
-            }
+        curr_chk = Checklist.objects.filter(
+            assign_to=user,
+            status="Completed",
+            planned_date__gte=curr_start_dt,
+            planned_date__lt=curr_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        prev_chk = Checklist.objects.filter(
+            assign_to=user,
+            status="Completed",
+            planned_date__gte=prev_start_dt,
+            planned_date__lt=prev_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        curr_del = Delegation.objects.filter(
+            assign_to=user,
+            status="Completed",
+            planned_date__gte=curr_start_dt,
+            planned_date__lt=curr_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        prev_del = Delegation.objects.filter(
+            assign_to=user,
+            status="Completed",
+            planned_date__gte=prev_start_dt,
+            planned_date__lt=prev_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        curr_help = HelpTicket.objects.filter(
+            assign_to=user,
+            status="Closed",
+            planned_date__gte=curr_start_dt,
+            planned_date__lt=curr_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        prev_help = HelpTicket.objects.filter(
+            assign_to=user,
+            status="Closed",
+            planned_date__gte=prev_start_dt,
+            planned_date__lt=prev_end_dt,
+            is_skipped_due_to_leave=False,
+        ).count()
+
+        week_score = {
+            "checklist": {
+                "previous": prev_chk,
+                "current": curr_chk,
+            },
+            "delegation": {
+                "previous": prev_del,
+                "current": curr_del,
+            },
+            "help_ticket": {
+                "previous": prev_help,
+                "current": curr_help,
+            },
+        }
 
+        if is_off_day_today:
+            pending_tasks = dict(_EMPTY_TASK_COUNTS)
+        else:
             pending_tasks = {
-                "checklist": 0,
-                "delegation": 0,
-                "help_ticket": 0,
+                "checklist": Checklist.objects.filter(
+                    assign_to=user,
+                    status="Pending",
+                    is_skipped_due_to_leave=False,
+                ).count(),
+                "delegation": Delegation.objects.filter(
+                    assign_to=user,
+                    status="Pending",
+                    is_skipped_due_to_leave=False,
+                ).count(),
+                "help_ticket": HelpTicket.objects.filter(
+                    assign_to=user,
+                    is_skipped_due_to_leave=False,
+                ).exclude(status="Closed").count(),
             }
 
-    # ---------------------------------------------------------------
-    # Today boundaries
-    # ---------------------------------------------------------------
-    start_today_proj, end_today_proj = _today_project_bounds(today_ist)
-
-    # ---------------------------------------------------------------
-    # BOS Lakshya hard holiday dashboard stop
-    # ---------------------------------------------------------------
-    if is_off_day_today:
-        reason = holiday_skip_reason(today_ist)
+        return week_score, pending_tasks
 
-        logger.info(
-            _safe_console_text(
-                f"Dashboard actionable items suppressed for "
-                f"user={request.user.username} "
-                f"date={today_ist} reason={reason or 'off_day'}"
-            )
+    except Exception as e:
+        logger.error(_safe_console_text(f"Error calculating weekly scores: {e}"))
+        return (
+            {key: dict(val) for key, val in _EMPTY_WEEK_SCORE.items()},
+            dict(_EMPTY_TASK_COUNTS),
         )
 
-        return render(
-            request,
-            "dashboard/dashboard.html",
-            {
-                "week_score": week_score,
-                "pending_tasks": {
-                    "checklist": 0,
-                    "delegation": 0,
-                    "help_ticket": 0,
-                },
-                "tasks": [],
-                "selected": selected,
-                "prev_time": "00:00",
-                "curr_time": "00:00",
-                "today_only": today_only,
-                "handed_over": {
-                    "checklist": [],
-                    "delegation": [],
-                    "help_ticket": [],
-                },
-                "completed_by_delegate": {
-                    "checklist": [],
-                    "delegation": [],
-                    "help_ticket": [],
-                },
-                "holiday_today": True,
-            },
-        )
 
-    # ---------------------------------------------------------------
-    # Normal working day flow
-    # ---------------------------------------------------------------
-    handover_incoming = _get_handover_tasks_for_user(
-        request.user,
-        today_ist,
-    )
+def _candidate_task_lists(user, today_ist: date, handover_incoming: dict) -> dict:
+    """
+    Every task the dashboard may show today, before the time-of-day rules:
+    own open tasks planned up to the end of today plus incoming handover
+    tasks (flagged is_handover), with holiday-dated tasks removed.
+    """
+    _, end_today_proj = _today_project_bounds(today_ist)
 
-    after_10 = now_ist.timetz().replace(tzinfo=None) >= dt_time(10, 0, 0)
+    def _visible(objs):
+        return [obj for obj in objs if _not_holiday_task(obj)]
 
-    checklist_qs = []
-    delegation_qs = []
-    help_ticket_qs = []
+    def _handover(objs):
+        objs = list(objs)
+        for task in objs:
+            task.is_handover = True
+        return _visible(objs)
 
-    try:
-        # -----------------------------------------------------------
-        # Checklists
-        # -----------------------------------------------------------
-        if today_only:
-            if after_10:
-                base_checklists = list(
-                    Checklist.objects
-                    .filter(
-                        assign_to=request.user,
-                        status="Pending",
-                        planned_date__gte=start_today_proj,
-                        planned_date__lte=end_today_proj,
-                        is_skipped_due_to_leave=False,
-                    )
-                    .select_related("assign_by", "assign_to")
-                    .order_by("planned_date")
-                )
-            else:
-                base_checklists = []
-        else:
-            if after_10:
-                planned_filter = {
-                    "planned_date__lte": end_today_proj,
-                }
-            else:
-                planned_filter = {
-                    "planned_date__lt": start_today_proj,
-                }
+    lists = {
+        "checklist": [],
+        "checklist_handover": [],
+        "delegation": [],
+        "delegation_handover": [],
+        "help_ticket": [],
+        "help_ticket_handover": [],
+    }
 
-            base_checklists = list(
-                Checklist.objects
-                .filter(
-                    assign_to=request.user,
-                    status="Pending",
-                    is_skipped_due_to_leave=False,
-                    **planned_filter,
-                )
-                .select_related("assign_by", "assign_to")
-                .order_by("planned_date")
+    try:
+        lists["checklist"] = _visible(
+            Checklist.objects
+            .filter(
+                assign_to=user,
+                status="Pending",
+                planned_date__lte=end_today_proj,
+                is_skipped_due_to_leave=False,
             )
-
-        ho_checklists = []
+            .select_related("assign_by", "assign_to")
+            .order_by("planned_date")
+        )
 
         if handover_incoming["checklist"]:
-            ho_checklists = list(
+            lists["checklist_handover"] = _handover(
                 Checklist.objects
                 .filter(
                     id__in=handover_incoming["checklist"],
@@ -918,66 +903,20 @@ def dashboard_home(request):
                 .order_by("planned_date")
             )
 
-            for task in ho_checklists:
-                task.is_handover = True
-
-        all_checklists = [
-            obj
-            for obj in _dedupe_by_id(base_checklists + ho_checklists)
-            if _not_holiday_task(obj)
-        ]
-
-        if today_only:
-            checklist_qs = [
-                task
-                for task in all_checklists
-                if _ist_date(task.planned_date) == today_ist
-                and (
-                    getattr(task, "is_handover", False)
-                    or _should_show_checklist(task.planned_date, now_ist)
-                )
-            ]
-        else:
-            checklist_qs = [
-                task
-                for task in all_checklists
-                if getattr(task, "is_handover", False)
-                or _should_show_checklist(task.planned_date, now_ist)
-            ]
-
-        # -----------------------------------------------------------
-        # Delegations
-        # -----------------------------------------------------------
-        if today_only:
-            base_delegations = list(
-                Delegation.objects
-                .filter(
-                    assign_to=request.user,
-                    status="Pending",
-                    planned_date__gte=start_today_proj,
-                    planned_date__lte=now_project_tz,
-                    is_skipped_due_to_leave=False,
-                )
-                .select_related("assign_by", "assign_to")
-                .order_by("planned_date")
-            )
-        else:
-            base_delegations = list(
-                Delegation.objects
-                .filter(
-                    assign_to=request.user,
-                    status="Pending",
-                    planned_date__lte=end_today_proj,
-                    is_skipped_due_to_leave=False,
-                )
-                .select_related("assign_by", "assign_to")
-                .order_by("planned_date")
+        lists["delegation"] = _visible(
+            Delegation.objects
+            .filter(
+                assign_to=user,
+                status="Pending",
+                planned_date__lte=end_today_proj,
+                is_skipped_due_to_leave=False,
             )
-
-        ho_delegations = []
+            .select_related("assign_by", "assign_to")
+            .order_by("planned_date")
+        )
 
         if handover_incoming["delegation"]:
-            ho_delegations = list(
+            lists["delegation_handover"] = _handover(
                 Delegation.objects
                 .filter(
                     id__in=handover_incoming["delegation"],
@@ -988,48 +927,20 @@ def dashboard_home(request):
                 .order_by("planned_date")
             )
 
-            for task in ho_delegations:
-                task.is_handover = True
-
-        delegation_qs = [
-            obj
-            for obj in _dedupe_by_id(base_delegations + ho_delegations)
-            if _not_holiday_task(obj)
-        ]
-
-        # -----------------------------------------------------------
-        # Help tickets
-        # -----------------------------------------------------------
-        if today_only:
-            base_help = list(
-                HelpTicket.objects
-                .filter(
-                    assign_to=request.user,
-                    planned_date__gte=start_today_proj,
-                    planned_date__lte=now_project_tz,
-                    is_skipped_due_to_leave=False,
-                )
-                .exclude(status="Closed")
-                .select_related("assign_by", "assign_to")
-                .order_by("planned_date")
-            )
-        else:
-            base_help = list(
-                HelpTicket.objects
-                .filter(
-                    assign_to=request.user,
-                    planned_date__lte=end_today_proj,
-                    is_skipped_due_to_leave=False,
-                )
-                .exclude(status="Closed")
-                .select_related("assign_by", "assign_to")
-                .order_by("planned_date")
+        lists["help_ticket"] = _visible(
+            HelpTicket.objects
+            .filter(
+                assign_to=user,
+                planned_date__lte=end_today_proj,
+                is_skipped_due_to_leave=False,
             )
-
-        ho_help = []
+            .exclude(status="Closed")
+            .select_related("assign_by", "assign_to")
+            .order_by("planned_date")
+        )
 
         if handover_incoming["help_ticket"]:
-            ho_help = list(
+            lists["help_ticket_handover"] = _handover(
                 HelpTicket.objects
                 .filter(
                     id__in=handover_incoming["help_ticket"],
@@ -1040,106 +951,21 @@ def dashboard_home(request):
                 .order_by("planned_date")
             )
 
-            for task in ho_help:
-                task.is_handover = True
-
-        help_ticket_qs = [
-            obj
-            for obj in _dedupe_by_id(base_help + ho_help)
-            if _not_holiday_task(obj)
-        ]
-
-        logger.info(
-            _safe_console_text(
-                f"Dashboard filter for {request.user.username} | "
-                f"today_only={today_only} | "
-                f"holiday_today={is_holiday_today} | "
-                f"sunday_today={is_sunday_today} | "
-                f"checklist={len(checklist_qs)} | "
-                f"delegation={len(delegation_qs)} | "
-                f"help={len(help_ticket_qs)} | "
-                f"incoming handover: "
-                f"CL={len(handover_incoming['checklist'])}, "
-                f"DL={len(handover_incoming['delegation'])}, "
-                f"HT={len(handover_incoming['help_ticket'])}"
-            )
-        )
-
     except Exception as e:
         logger.error(_safe_console_text(f"Error querying dashboard task lists: {e}"))
 
-        checklist_qs = []
-        delegation_qs = []
-        help_ticket_qs = []
+        for key in lists:
+            lists[key] = []
 
-    # ---------------------------------------------------------------
-    # Selected tab task list
-    # ---------------------------------------------------------------
-    if selected == "delegation":
-        tasks = delegation_qs
-    elif selected == "help_ticket":
-        tasks = help_ticket_qs
-    else:
-        tasks = checklist_qs
+    return lists
 
-    # ---------------------------------------------------------------
-    # Time cards
-    # ---------------------------------------------------------------
-    try:
-        prev_min = calculate_checklist_assigned_time(
-            Checklist.objects.filter(
-                assign_to=request.user,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            ),
-            start_prev,
-            end_prev,
-        )
 
-        curr_min = calculate_checklist_assigned_time(
-            Checklist.objects.filter(
-                assign_to=request.user,
-                status="Pending",
-                is_skipped_due_to_leave=False,
-            ),
-            start_current,
-            today_ist,
-        )
-
-        prev_min_del = calculate_delegation_assigned_time_safe(
-            request.user,
-            start_prev,
-            end_prev,
-        )
-
-        curr_min_del = calculate_delegation_assigned_time_safe(
-            request.user,
-            start_current,
-            today_ist,
-        )
-
-    except Exception as e:
-        logger.error(_safe_console_text(f"Error calculating time aggregations: {e}"))
-
-        prev_min = 0
-        curr_min = 0
-        prev_min_del = 0
-        curr_min_del = 0
-
-    # ---------------------------------------------------------------
-    # Handover display blocks
-    # ---------------------------------------------------------------
-    handed_over_full = {
-        "checklist": [],
-        "delegation": [],
-        "help_ticket": [],
-    }
-
-    completed_by_delegate = {
-        "checklist": [],
-        "delegation": [],
-        "help_ticket": [],
-    }
+def _handover_blocks(user, today_ist: date):
+    """
+    (handed_over, completed_by_delegate) display blocks.
+    """
+    handed_over_full = _empty_task_blocks()
+    completed_by_delegate = _empty_task_blocks()
 
     try:
         from apps.leave.models import LeaveHandover, LeaveStatus
@@ -1149,7 +975,7 @@ def dashboard_home(request):
         active_handover = (
             LeaveHandover.objects
             .filter(
-                new_assignee=request.user,
+                new_assignee=user,
                 is_active=True,
                 effective_start_date__lte=today_ist,
                 effective_end_date__gte=today_ist,
@@ -1258,7 +1084,7 @@ def dashboard_home(request):
         try:
             recent_handover = (
                 LeaveHandover.objects
-                .filter(original_assignee=request.user)
+                .filter(original_assignee=user)
                 .select_related("new_assignee")
                 .order_by("-updated_at", "-id")
             )
@@ -1370,6 +1196,255 @@ def dashboard_home(request):
     except Exception as e:
         logger.error(_safe_console_text(f"Error building handed_over section: {e}"))
 
+    return handed_over_full, completed_by_delegate
+
+
+def build_dashboard_payload(user, today_ist: date) -> dict:
+    """
+    Everything dashboard_home shows for `user` on IST day `today_ist` that
+    does not depend on the time of day or the query string.
+    """
+    try:
+        is_holiday_today = get_holiday_calendar(today_ist).is_holiday(today_ist)
+    except (OperationalError, ProgrammingError):
+        is_holiday_today = False
+    except Exception:
+        is_holiday_today = False
+
+    is_sunday_today = today_ist.weekday() == 6
+    is_off_day_today = bool(is_holiday_today or is_sunday_today)
+
+    week_score, pending_tasks = _week_score_and_pending(user, today_ist, is_off_day_today)
+
+    payload = {
+        "is_holiday_today": is_holiday_today,
+        "is_sunday_today": is_sunday_today,
+        "is_off_day_today": is_off_day_today,
+        "week_score": week_score,
+        "pending_tasks": pending_tasks,
+    }
+
+    # Sunday/Holiday: nothing actionable is shown, so nothing else is built.
+    if is_off_day_today:
+        return payload
+
+    handover_incoming = _get_handover_tasks_for_user(user, today_ist)
+
+    start_current = today_ist - timedelta(days=today_ist.weekday())
+    start_prev = start_current - timedelta(days=7)
+    end_prev = start_current - timedelta(days=1)
+
+    try:
+        time_cards = _assigned_time_cards(
+            user,
+            start_prev,
+            end_prev,
+            start_current,
+            today_ist,
+        )
+    except Exception as e:
+        logger.error(_safe_console_text(f"Error calculating time aggregations: {e}"))
+        time_cards = {"prev_min": 0, "curr_min": 0, "prev_min_del": 0, "curr_min_del": 0}
+
+    handed_over_full, completed_by_delegate = _handover_blocks(user, today_ist)
+
+    payload.update({
+        "handover_incoming": handover_incoming,
+        "lists": _candidate_task_lists(user, today_ist, handover_incoming),
+        "time_cards": time_cards,
+        "handed_over": handed_over_full,
+        "completed_by_delegate": completed_by_delegate,
+    })
+    return payload
+
+
+def _visible_task_lists(lists: dict, *, today_ist: date, now_ist: datetime, today_only: bool):
+    """
+    Apply the time-of-day rules to the cached candidate lists:
+    checklist 10:00 IST rule, delegation/help-ticket "planned by now" in
+    today-only mode. Returns (checklists, delegations, help_tickets).
+    """
+    start_today_proj, end_today_proj = _today_project_bounds(today_ist)
+    now_project_tz = timezone.localtime(now_ist, timezone.get_current_timezone())
+    after_10 = now_ist.timetz().replace(tzinfo=None) >= dt_time(10, 0, 0)
+
+    # Checklists
+    if today_only:
+        base_checklists = [
+            task
+            for task in lists["checklist"]
+            if after_10 and start_today_proj <= task.planned_date <= end_today_proj
+        ]
+    elif after_10:
+        base_checklists = list(lists["checklist"])
+    else:
+        base_checklists = [
+            task for task in lists["checklist"] if task.planned_date < start_today_proj
+        ]
+
+    all_checklists = _dedupe_by_id(base_checklists + lists["checklist_handover"])
+
+    if today_only:
+        checklists = [
+            task
+            for task in all_checklists
+            if _ist_date(task.planned_date) == today_ist
+            and (
+                getattr(task, "is_handover", False)
+                or _should_show_checklist(task.planned_date, now_ist)
+            )
+        ]
+    else:
+        checklists = [
+            task
+            for task in all_checklists
+            if getattr(task, "is_handover", False)
+            or _should_show_checklist(task.planned_date, now_ist)
+        ]
+
+    # Delegations / help tickets
+    def _in_range(objs):
+        if not today_only:
+            return list(objs)
+        return [
+            task
+            for task in objs
+            if start_today_proj <= task.planned_date <= now_project_tz
+        ]
+
+    delegations = _dedupe_by_id(_in_range(lists["delegation"]) + lists["delegation_handover"])
+    help_tickets = _dedupe_by_id(_in_range(lists["help_ticket"]) + lists["help_ticket_handover"])
+
+    return checklists, delegations, help_tickets
+
+
+# ---------------------------------------------------------------------
+# Main dashboard view
+# ---------------------------------------------------------------------
+@login_required
+def dashboard_home(request):
+    """
+    Final BOS Lakshya dashboard rule:
+
+    Sunday/Holiday = complete off day.
+
+    On Sunday/Holiday:
+    - no checklist visible
+    - no delegation visible
+    - no help ticket visible
+    - no handover actionable item visible
+    - old wrongly-created holiday tasks are suppressed
+
+    Normal day:
+    - checklist follows 10:00 IST visibility rule
+    - delegation/help ticket visible as per existing date logic
+
+    The per-user, per-IST-day part comes from payload_cache (invalidated by
+    task / handover signals); only the time-of-day filtering runs per request.
+    """
+    now_ist = timezone.localtime(timezone.now(), IST)
+    today_ist = now_ist.date()
+
+    selected = request.GET.get("task_type")
+    today_only = (
+        request.GET.get("today") == "1"
+        or request.GET.get("today_only") == "1"
+    )
+
+    logger.info(
+        _safe_console_text(
+            f"Dashboard accessed by {request.user.username} "
+            f"at {now_ist.strftime('%Y-%m-%d %H:%M:%S IST')}"
+        )
+    )
+
+    payload = get_payload(
+        request.user.id,
+        today_ist,
+        lambda: build_dashboard_payload(request.user, today_ist),
+    )
+
+    week_score = payload["week_score"]
+    pending_tasks = payload["pending_tasks"]
+
+    # ---------------------------------------------------------------
+    # BOS Lakshya hard holiday dashboard stop
+    # ---------------------------------------------------------------
+    if payload["is_off_day_today"]:
+        reason = holiday_skip_reason(today_ist)
+
+        logger.info(
+            _safe_console_text(
+                f"Dashboard actionable items suppressed for "
+                f"user={request.user.username} "
+                f"date={today_ist} reason={reason or 'off_day'}"
+            )
+        )
+
+        return render(
+            request,
+            "dashboard/dashboard.html",
+            {
+                "week_score": week_score,
+                "pending_tasks": dict(_EMPTY_TASK_COUNTS),
+                "tasks": [],
+                "selected": selected,
+                "prev_time": "00:00",
+                "curr_time": "00:00",
+                "today_only": today_only,
+                "handed_over": _empty_task_blocks(),
+                "completed_by_delegate": _empty_task_blocks(),
+                "holiday_today": True,
+            },
+        )
+
+    # ---------------------------------------------------------------
+    # Normal working day flow
+    # ---------------------------------------------------------------
+    try:
+        checklist_qs, delegation_qs, help_ticket_qs = _visible_task_lists(
+            payload["lists"],
+            today_ist=today_ist,
+            now_ist=now_ist,
+            today_only=today_only,
+        )
+    except Exception as e:
+        logger.error(_safe_console_text(f"Error filtering dashboard task lists: {e}"))
+
+        checklist_qs = []
+        delegation_qs = []
+        help_ticket_qs = []
+
+    handover_incoming = payload["handover_incoming"]
+
+    logger.info(
+        _safe_console_text(
+            f"Dashboard filter for {request.user.username} | "
+            f"today_only={today_only} | "
+            f"holiday_today={payload['is_holiday_today']} | "
+            f"sunday_today={payload['is_sunday_today']} | "
+            f"checklist={len(checklist_qs)} | "
+            f"delegation={len(delegation_qs)} | "
+            f"help={len(help_ticket_qs)} | "
+            f"incoming handover: "
+            f"CL={len(handover_incoming['checklist'])}, "
+            f"DL={len(handover_incoming['delegation'])}, "
+            f"HT={len(handover_incoming['help_ticket'])}"
+        )
+    )
+
+    # ---------------------------------------------------------------
+    # Selected tab task list
+    # ---------------------------------------------------------------
+    if selected == "delegation":
+        tasks = delegation_qs
+    elif selected == "help_ticket":
+        tasks = help_ticket_qs
+    else:
+        tasks = checklist_qs
+
+    time_cards = payload["time_cards"]
+
     # ---------------------------------------------------------------
     # Debug samples
     # ---------------------------------------------------------------
@@ -1402,11 +1477,11 @@ def dashboard_home(request):
             "pending_tasks": pending_tasks,
             "tasks": tasks,
             "selected": selected,
-            "prev_time": minutes_to_hhmm(prev_min + prev_min_del),
-            "curr_time": minutes_to_hhmm(curr_min + curr_min_del),
+            "prev_time": minutes_to_hhmm(time_cards["prev_min"] + time_cards["prev_min_del"]),
+            "curr_time": minutes_to_hhmm(time_cards["curr_min"] + time_cards["curr_min_del"]),
             "today_only": today_only,
-            "handed_over": handed_over_full,
-            "completed_by_delegate": completed_by_delegate,
-            "holiday_today": bool(is_holiday_today or is_sunday_today),
+            "handed_over": payload["handed_over"],
+            "completed_by_delegate": payload["completed_by_delegate"],
+            "holiday_today": bool(payload["is_holiday_today"] or payload["is_sunday_today"]),
         },
-    )
\ No newline at end of file
+    )
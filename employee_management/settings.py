@@ -774,6 +774,11 @@ REIMBURSEMENT_EMAIL_DUP_WINDOW_SECONDS = env_int(
 
 EMAIL_TIMEOUT = env_int("EMAIL_TIMEOUT", 10)
 EMAIL_FAIL_SILENTLY = env_bool("EMAIL_FAIL_SILENTLY", False if DEBUG else True)
+
+# Outbound mail pipeline (apps/common/mail_pipeline.py): one pooled SMTP
+# connection per worker thread, closed after each request / Celery task.
+MAIL_CONNECTION_IDLE_TIMEOUT = env_int("MAIL_CONNECTION_IDLE_TIMEOUT", 60)
+MAIL_PIPELINE_BATCH_SIZE = env_int("MAIL_PIPELINE_BATCH_SIZE", 50)
 SEND_EMAILS_FOR_AUTO_RECUR = env_bool("SEND_EMAILS_FOR_AUTO_RECUR", True)
 SEND_DELEGATION_IMMEDIATE_EMAIL = env_bool("SEND_DELEGATION_IMMEDIATE_EMAIL", False)
 
@@ -796,6 +801,10 @@ ADMIN_PENDING_DIGEST_TO = os.getenv(
     "pankaj@blueoceansteels.com",
 )
 
+# Seconds the shared pending-task snapshot is reused between the employee
+# and admin digests of the same run.
+PENDING_DIGEST_SNAPSHOT_TTL = env_int("PENDING_DIGEST_SNAPSHOT_TTL", 600)
+
 # -----------------------------------------------------------------------------
 # MIS REPORT SETTINGS
 # -----------------------------------------------------------------------------
@@ -1038,6 +1047,8 @@ FEATURES = {
 KAM_FEATURE_ENABLED = env_bool("KAM_FEATURE_ENABLED", True)
 KAM_DEFAULT_CALLS_PER_WEEK = env_int("KAM_DEFAULT_CALLS_PER_WEEK", 24)
 KAM_DEFAULT_VISITS_PER_WEEK = env_int("KAM_DEFAULT_VISITS_PER_WEEK", 6)
+# Trailing days rebuilt nightly / by default in `manage.py kam_snapshot_daily`.
+KAM_DAILY_FACTS_RECONCILE_DAYS = env_int("KAM_DAILY_FACTS_RECONCILE_DAYS", 35)
 
 # -----------------------------------------------------------------------------
 # CONSTANTS
@@ -1066,6 +1077,7 @@ LEAVE_ROUTING_FILE = str(BASE_DIR / "apps" / "users" / "data" / "leave_routing.j
 # -----------------------------------------------------------------------------
 PERMISSION_DENIED_REDIRECT = "dashboard:home"
 PERMISSION_DEBUG_ENABLED = env_bool("PERMISSION_DEBUG_ENABLED", DEBUG and not ON_RENDER)
+PERMISSION_CACHE_TIMEOUT = env_int("PERMISSION_CACHE_TIMEOUT", 600)
 
 # -----------------------------------------------------------------------------
 # CELERY
@@ -1155,10 +1167,22 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour=10, minute=30, day_of_week="1"),
         "args": (),
     },
+    "reimbursement_sheet_outbox_every_minute": {
+        "task": "apps.reimbursement.tasks.flush_reimbursement_sheet_outbox",
+        "schedule": crontab(minute="*"),
+    },
+    "vendor_payment_sheet_outbox_every_minute": {
+        "task": "apps.vendor.tasks.flush_vendor_payment_sheet_outbox",
+        "schedule": crontab(minute="*"),
+    },
     "kam-sync-google-sheet-to-db": {
         "task": "apps.kam.tasks.sync_google_sheet_to_db",
         "schedule": _KAM_SYNC_INTERVAL,
     },
+    "kam_daily_facts_rebuild_nightly": {
+        "task": "apps.kam.tasks.rebuild_recent_kam_daily_facts",
+        "schedule": crontab(hour=1, minute=45),
+    },
 
     # KAM weekly consolidated report:
     # Every Monday at 10:00 AM IST.